@@ -7,6 +7,10 @@ python_path = "/app"
 graceful_timeout = 90
 timeout = 90
 workers = 3
+# Lobby long polling (LOBBY_LONG_POLL_ENABLED) holds a sync worker for each
+# waiting guest, up to LOBBY_LONG_POLL_MAX_WAITERS at once across all workers.
+# Keep that cap well below the number of workers, or run asynchronous workers
+# (e.g. worker_class = "gevent") before raising it.
 
 # Logging
 # Using '-' for the access log file makes gunicorn log accesses to stdout
@@ -183,6 +183,7 @@ class FileAdmin(admin.ModelAdmin):
         "key_base",
         "file_key",
         "upload_state",
+        "rejection_reason",
         "type",
         "mimetype",
         "size",
@@ -199,6 +200,7 @@ class FileAdmin(admin.ModelAdmin):
                     "creator",
                     "filename",
                     "upload_state",
+                    "rejection_reason",
                 )
             },
         ),
@@ -517,3 +519,34 @@ class ApplicationAdmin(admin.ModelAdmin):
         return _("No scopes")
 
     get_scopes_display.short_description = _("Scopes")
+
+
+@admin.register(models.LiveKitWebhookEvent)
+class LiveKitWebhookEventAdmin(admin.ModelAdmin):
+    """Admin class for the LiveKitWebhookEvent model."""
+
+    list_display = (
+        "event_id",
+        "event_type",
+        "room_name",
+        "status",
+        "attempts",
+        "created_at",
+        "processed_at",
+    )
+    list_filter = ("status", "event_type", "created_at")
+    search_fields = ("event_id", "room_name")
+    ordering = ("-created_at",)
+    readonly_fields = (
+        "id",
+        "event_id",
+        "event_type",
+        "room_name",
+        "emitted_at",
+        "payload",
+        "created_at",
+        "updated_at",
+        "processed_at",
+        "attempts",
+        "next_attempt_at",
+    )
@@ -5,7 +5,7 @@ from django.http import Http404
 
 from rest_framework import permissions
 
-from ..models import RoleChoices
+from ..models import FileUploadStateChoices, RoleChoices
 from ..services.participants_management import (
     ParticipantNotFoundException,
     ParticipantsManagement,
@@ -131,10 +131,17 @@ class FilePermission(IsAuthenticated):
 
     def has_object_permission(self, request, view, obj):
         """
-        Return a 404 on deleted files or if the user is not the owner
+        Return a 404 on deleted files or if the user is not the owner.
+        Rejected files can still be retrieved, for clients to learn why.
         """
 
-        if obj.deleted_at is not None or obj.hard_deleted_at is not None:
+        is_retrievable_rejected_file = (
+            view.action == "retrieve"
+            and obj.upload_state == FileUploadStateChoices.REJECTED
+        )
+        if obj.hard_deleted_at is not None or (
+            obj.deleted_at is not None and not is_retrievable_rejected_file
+        ):
             raise Http404
 
         if obj.creator != request.user:
@@ -178,8 +178,13 @@ class RoomSerializer(serializers.ModelSerializer):
         ) or models.RoleChoices.check_owner_role(role)
 
         if is_admin_or_owner:
+            accesses = instance.accesses.all()
+            # Accesses prefetched along a list of rooms already carry their users
+            # pylint: disable-next=protected-access
+            if "accesses" not in getattr(instance, "_prefetched_objects_cache", {}):
+                accesses = accesses.select_related("user")
             access_serializer = NestedResourceAccessSerializer(
-                instance.accesses.select_related("resource", "user").all(),
+                accesses,
                 context=self.context,
                 many=True,
             )
@@ -292,6 +297,7 @@ class RequestEntrySerializer(BaseValidationOnlySerializer):
     """Validate request entry data."""
 
     username = serializers.CharField(required=True)
+    wait = serializers.BooleanField(required=False, default=False)
 
 
 class ParticipantEntrySerializer(BaseValidationOnlySerializer):
@@ -439,6 +445,58 @@ class UpdateParticipantSerializer(BaseParticipantsManagementSerializer):
         return attrs
 
 
+class BaseBulkParticipantsManagementSerializer(BaseValidationOnlySerializer):
+    """Base serializer for bulk participant management operations."""
+
+    participants = BaseParticipantsManagementSerializer(many=True, allow_empty=False)
+
+    def validate_participants(self, participants):
+        """Cap the number of operations processed by a single request."""
+
+        max_size = settings.PARTICIPANTS_MANAGEMENT_BULK_MAX_SIZE
+        if len(participants) > max_size:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than {max_size} elements."
+            )
+
+        return participants
+
+
+class BulkMuteParticipantsSerializer(BaseBulkParticipantsManagementSerializer):
+    """Validate bulk participant muting data."""
+
+    participants = MuteParticipantSerializer(many=True, allow_empty=False)
+
+
+class BulkUpdateParticipantsSerializer(BaseBulkParticipantsManagementSerializer):
+    """Validate bulk participant update data."""
+
+    participants = UpdateParticipantSerializer(many=True, allow_empty=False)
+
+
+class ParticipantTokenSerializer(BaseValidationOnlySerializer):
+    """Validate the participant an access token is issued for."""
+
+    username = serializers.CharField(max_length=255, required=False, allow_blank=True)
+
+
+class BulkParticipantsTokensSerializer(BaseValidationOnlySerializer):
+    """Validate bulk access tokens issuing data."""
+
+    participants = ParticipantTokenSerializer(many=True, allow_empty=False)
+
+    def validate_participants(self, participants):
+        """Cap the number of tokens issued by a single request."""
+
+        max_size = settings.LIVEKIT_TOKEN_BULK_MAX_SIZE
+        if len(participants) > max_size:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than {max_size} elements."
+            )
+
+        return participants
+
+
 class ListFileSerializer(serializers.ModelSerializer):
     """Serialize File model for the API."""
 
@@ -462,6 +520,7 @@ class ListFileSerializer(serializers.ModelSerializer):
             "mimetype",
             "size",
             "description",
+            "rejection_reason",
             "url",
             "abilities",
         ]
@@ -476,6 +535,7 @@ class ListFileSerializer(serializers.ModelSerializer):
             "upload_state",
             "mimetype",
             "size",
+            "rejection_reason",
             "url",
             "abilities",
         ]
@@ -9,7 +9,6 @@ from uuid import uuid4
 
 from django.conf import settings
 from django.core.exceptions import ValidationError as DjangoValidationError
-from django.core.files.storage import default_storage
 from django.db import IntegrityError, transaction
 from django.db.models import Q
 from django.http import Http404
@@ -74,6 +73,10 @@ from core.recording.worker.factories import (
 from core.recording.worker.mediator import (
     WorkerServiceMediator,
 )
+from core.services.file_upload import (
+    FileUploadVerificationService,
+    FileVerificationError,
+)
 from core.services.invitation import InvitationService
 from core.services.livekit_events import (
     LiveKitEventsService,
@@ -83,6 +86,7 @@ from core.services.lobby import (
     LobbyParticipantNotFound,
     LobbyService,
 )
+from core.services.media_auth import MediaAuthorizationCache
 from core.services.participants_management import (
     ParticipantNotFoundException,
     ParticipantsManagement,
@@ -100,7 +104,8 @@ from core.services.room_roles import (
 )
 from core.services.subtitle import SubtitleException, SubtitleService
 from core.tasks.connection_test import delete_connection_test_room
-from core.tasks.file import process_file_deletion
+from core.tasks.file import process_file_upload_verification
+from core.tasks.livekit_events import process_livekit_webhook_events
 from core.utils import generate_token
 
 from ..authentication.livekit import LiveKitTokenAuthentication
@@ -185,12 +190,63 @@ class SerializerPerActionMixin:
         return self.serializer_classes.get(self.action, self.default_serializer_class)
 
 
+class CursorPagination(pagination.CursorPagination):
+    """Keyset pagination to display no more than 100 objects per page.
+
+    Objects are sorted by creation date, with their id as a tie-breaker, so that
+    pages are stable and fetched from an index whatever their depth. Orderings
+    requested through an ordering filter are ignored, as a cursor can only walk
+    an immutable ordering.
+    """
+
+    ordering = ("-created_at", "-id")
+    max_page_size = 100
+    page_size_query_param = "page_size"
+
+    def get_ordering(self, request, queryset, view):
+        """Always walk the creation date ordering."""
+        return self.ordering
+
+
 class Pagination(pagination.PageNumberPagination):
-    """Pagination to display no more than 100 objects per page sorted by creation date."""
+    """Pagination to display no more than 100 objects per page sorted by creation date.
+
+    Pages are numbered by default. Requests passing a `cursor` query parameter,
+    empty for the first page, are paginated with a CursorPagination instead,
+    which neither counts objects nor skips an offset of rows.
+    """
 
     ordering = "-created_on"
     max_page_size = 100
     page_size_query_param = "page_size"
+    cursor_query_param = CursorPagination.cursor_query_param
+
+    def __init__(self):
+        super().__init__()
+        self.cursor_pagination = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Paginate with a cursor when one is requested, with page numbers otherwise."""
+        if self.cursor_query_param in request.query_params:
+            self.cursor_pagination = CursorPagination()
+            return self.cursor_pagination.paginate_queryset(queryset, request, view)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        """Return the response of the pagination mode used for the request."""
+        if self.cursor_pagination:
+            return self.cursor_pagination.get_paginated_response(data)
+
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        """Document the cursor parameter along the page number ones."""
+        return super().get_schema_operation_parameters(view) + [
+            parameter
+            for parameter in CursorPagination().get_schema_operation_parameters(view)
+            if parameter["name"] == self.cursor_query_param
+        ]
 
 
 class UserViewSet(
@@ -238,6 +294,7 @@ class UserViewSet(
         )
 
 
+# pylint: disable=too-many-public-methods
 class RoomViewSet(
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -253,6 +310,10 @@ class RoomViewSet(
     queryset = models.Room.objects.all()
     serializer_class = serializers.RoomSerializer
 
+    def get_queryset(self):
+        """Resolve the role of the requesting user along the rooms."""
+        return super().get_queryset().annotate_user_role(self.request.user)
+
     def get_object(self):
         """Allow getting a room by its slug."""
         try:
@@ -301,8 +362,12 @@ class RoomViewSet(
         user = self.request.user
 
         if user.is_authenticated:
+            # A user has at most one access per room, so the join can't duplicate
+            # rooms and doesn't need a distinct.
             queryset = (
-                self.filter_queryset(self.get_queryset()).filter(users=user).distinct()
+                self.filter_queryset(self.get_queryset())
+                .filter(accesses__user=user)
+                .prefetch_administered_accesses(user)
             )
         else:
             queryset = self.get_queryset().none()
@@ -601,7 +666,12 @@ class RoomViewSet(
         livekit_events_service = LiveKitEventsService()
 
         try:
-            livekit_events_service.receive(request)
+            event = livekit_events_service.receive(request)
+            if event is not None:
+                room_name = event.room_name
+                transaction.on_commit(
+                    lambda: process_livekit_webhook_events.delay(room_name)
+                )
             return drf_response.Response(
                 {"status": "success"}, status=drf_status.HTTP_200_OK
             )
@@ -748,6 +818,36 @@ class RoomViewSet(
             {"status": "success"}, status=drf_status.HTTP_200_OK
         )
 
+    @staticmethod
+    def _check_caller_presence(request, room):
+        """Deny muting to LiveKit token holders not connected to the room.
+
+        Returns an error response when the caller's presence can't be verified.
+        """
+        # TEMPORARY: a LiveKit token proves access was granted, not that the caller
+        # joined. Cross-check identity against the live participant list until auth
+        # is hardened. Skipped for non-LiveKit auth backends.
+        caller_identity = getattr(request.auth, "identity", None)
+        if caller_identity is None:
+            return None
+
+        try:
+            ParticipantsManagement().check_if_in_meeting(
+                room_name=str(room.pk),
+                identity=caller_identity,
+            )
+        except (ParticipantNotFoundException, ParticipantsManagementException):
+            logger.warning(
+                "Failed to verify caller presence for mute in room %s; denying",
+                room.pk,
+            )
+            return drf_response.Response(
+                {"error": "Could not verify caller presence"},
+                status=drf_status.HTTP_403_FORBIDDEN,
+            )
+
+        return None
+
     @decorators.action(
         detail=True,
         methods=["post"],
@@ -766,25 +866,8 @@ class RoomViewSet(
         serializer = serializers.MuteParticipantSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        # TEMPORARY: a LiveKit token proves access was granted, not that the caller
-        # joined. Cross-check identity against the live participant list until auth
-        # is hardened. Skipped for non-LiveKit auth backends.
-        caller_identity = getattr(request.auth, "identity", None)
-        if caller_identity is not None:
-            try:
-                ParticipantsManagement().check_if_in_meeting(
-                    room_name=str(room.pk),
-                    identity=caller_identity,
-                )
-            except (ParticipantNotFoundException, ParticipantsManagementException):
-                logger.warning(
-                    "Failed to verify caller presence for mute in room %s; denying",
-                    room.pk,
-                )
-                return drf_response.Response(
-                    {"error": "Could not verify caller presence"},
-                    status=drf_status.HTTP_403_FORBIDDEN,
-                )
+        if (error_response := self._check_caller_presence(request, room)) is not None:
+            return error_response
 
         try:
             ParticipantsManagement().mute(
@@ -887,6 +970,175 @@ class RoomViewSet(
             {"status": "success"}, status=drf_status.HTTP_200_OK
         )
 
+    @decorators.action(
+        detail=True,
+        methods=["post"],
+        url_path="mute-participants",
+        url_name="mute-participants",
+        permission_classes=[permissions.CanMuteParticipant],
+        authentication_classes=[
+            LiveKitTokenAuthentication,
+            *api_settings.DEFAULT_AUTHENTICATION_CLASSES,
+        ],
+    )
+    def mute_participants(self, request, pk=None):  # pylint: disable=unused-argument
+        """Mute many tracks of many participants in the room at once.
+
+        Tracks are muted concurrently, and the outcome of each one is reported
+        in the order they were given.
+        """
+        room = self.get_object()
+
+        serializer = serializers.BulkMuteParticipantsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        if (error_response := self._check_caller_presence(request, room)) is not None:
+            return error_response
+
+        participants = serializer.validated_data["participants"]
+        statuses = ParticipantsManagement().bulk_mute(
+            room_name=str(room.pk),
+            tracks=[
+                {
+                    "identity": str(participant["participant_identity"]),
+                    "track_sid": participant["track_sid"],
+                }
+                for participant in participants
+            ],
+        )
+
+        return drf_response.Response(
+            {
+                "results": [
+                    {
+                        "participant_identity": str(
+                            participant["participant_identity"]
+                        ),
+                        "track_sid": participant["track_sid"],
+                        "status": status.value,
+                    }
+                    for participant, status in zip(participants, statuses, strict=True)
+                ]
+            },
+            status=drf_status.HTTP_200_OK,
+        )
+
+    @decorators.action(
+        detail=True,
+        methods=["post"],
+        url_path="update-participants",
+        url_name="update-participants",
+        permission_classes=[permissions.HasPrivilegesOnRoom],
+    )
+    def update_participants(self, request, pk=None):  # pylint: disable=unused-argument
+        """Update attributes, permissions, or metadata of many participants at once."""
+        room = self.get_object()
+
+        serializer = serializers.BulkUpdateParticipantsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        participants = serializer.validated_data["participants"]
+        updates = []
+        for participant in participants:
+            permission = participant.get("permission")
+            updates.append(
+                {
+                    "identity": str(participant["participant_identity"]),
+                    "metadata": participant.get("metadata"),
+                    "attributes": participant.get("attributes"),
+                    "permission": permission.model_dump() if permission else None,
+                    "name": participant.get("name"),
+                }
+            )
+
+        statuses = ParticipantsManagement().bulk_update(
+            room_name=str(room.pk), updates=updates
+        )
+
+        return drf_response.Response(
+            {
+                "results": [
+                    {
+                        "participant_identity": update["identity"],
+                        "status": status.value,
+                    }
+                    for update, status in zip(updates, statuses, strict=True)
+                ]
+            },
+            status=drf_status.HTTP_200_OK,
+        )
+
+    @decorators.action(
+        detail=True,
+        methods=["post"],
+        url_path="remove-participants",
+        url_name="remove-participants",
+        permission_classes=[permissions.HasPrivilegesOnRoom],
+    )
+    def remove_participants(self, request, pk=None):  # pylint: disable=unused-argument
+        """Remove many participants from the room at once."""
+        room = self.get_object()
+
+        serializer = serializers.BaseBulkParticipantsManagementSerializer(
+            data=request.data
+        )
+        serializer.is_valid(raise_exception=True)
+
+        identities = [
+            str(participant["participant_identity"])
+            for participant in serializer.validated_data["participants"]
+        ]
+        statuses = ParticipantsManagement().bulk_remove(
+            room_name=str(room.pk), identities=identities
+        )
+
+        return drf_response.Response(
+            {
+                "results": [
+                    {"participant_identity": identity, "status": status.value}
+                    for identity, status in zip(identities, statuses, strict=True)
+                ]
+            },
+            status=drf_status.HTTP_200_OK,
+        )
+
+    @decorators.action(
+        detail=True,
+        methods=["post"],
+        url_path="participants-tokens",
+        url_name="participants-tokens",
+        permission_classes=[permissions.HasPrivilegesOnRoom],
+    )
+    def participants_tokens(self, request, pk=None):  # pylint: disable=unused-argument
+        """Issue access tokens for many anonymous participants at once.
+
+        Meant to pre-provision attendees, e.g. of a webinar. Each participant gets
+        a new identity, returned with its token in the order they were given.
+        """
+        room = self.get_object()
+
+        serializer = serializers.BulkParticipantsTokensSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        participants = serializer.validated_data["participants"]
+        tokens = utils.generate_tokens(
+            room=str(room.pk),
+            usernames=[participant.get("username") for participant in participants],
+            sources=room.configuration.get("can_publish_sources", None),
+        )
+
+        return drf_response.Response(
+            {
+                "url": settings.LIVEKIT_CONFIGURATION["url"],
+                "room": str(room.pk),
+                "results": [
+                    {"username": participant.get("username", ""), **token}
+                    for participant, token in zip(participants, tokens, strict=True)
+                ],
+            },
+            status=drf_status.HTTP_200_OK,
+        )
+
     @decorators.action(
         detail=True,
         methods=["post"],
@@ -986,6 +1238,7 @@ class ResourceAccessViewSet(
     API endpoints to access and perform actions on resource accesses.
     """
 
+    pagination_class = Pagination
     permission_classes = [permissions.ResourceAccessPermission]
     queryset = models.ResourceAccess.objects.all()
     serializer_class = serializers.ResourceAccessSerializer
@@ -1028,11 +1281,12 @@ class RecordingViewSet(
     def get_queryset(self):
         """Restrict recordings to the user's ones."""
         user = self.request.user
-        return (
-            super()
-            .get_queryset()
-            .filter(Q(accesses__user=user) | Q(accesses__team__in=user.get_teams()))
-        )
+
+        query = Q(accesses__user=user)
+        if teams := user.get_teams():
+            query |= Q(accesses__team__in=teams)
+
+        return super().get_queryset().filter(query)
 
     @decorators.action(
         detail=False,
@@ -1183,15 +1437,27 @@ class RecordingViewSet(
         the request going through thanks to the nginx.ingress.kubernetes.io/auth-response-headers
         annotation. The request will then be proxied to the object storage backend who will
         respond with the file after checking the signature included in headers.
+
+        Authorizations are cached for a short time, so that the byte-range requests
+        of a media player skip the database once the first one is authorized.
         """
 
+        user = request.user
+        original_url = request.META.get("HTTP_X_ORIGINAL_URL")
+        media_auth_cache = MediaAuthorizationCache()
+
+        if key := media_auth_cache.get(user, original_url):
+            request = utils.generate_s3_authorization_headers(key)
+            return drf_response.Response(
+                "authorized", headers=request.headers, status=200
+            )
+
         parsed_url = self._auth_get_original_url(request)
 
         url_params = self._auth_get_url_params(
             enums.RECORDING_STORAGE_URL_PATTERN, parsed_url.path
         )
 
-        user = request.user
         recording_id = url_params["recording_id"]
 
         extension = url_params["extension"]
@@ -1199,7 +1465,10 @@ class RecordingViewSet(
             raise drf_exceptions.ValidationError({"detail": "Unsupported extension."})
 
         try:
-            recording = models.Recording.objects.get(id=recording_id)
+            # Fetch the user's roles along the recording, to check abilities
+            recording = models.Recording.objects.annotate_user_roles(user).get(
+                id=recording_id
+            )
         except models.Recording.DoesNotExist as e:
             raise drf_exceptions.NotFound("No recording found for this event.") from e
 
@@ -1216,6 +1485,7 @@ class RecordingViewSet(
             logger.debug("Recording '%s' has not been saved", recording)
             raise drf_exceptions.PermissionDenied()
 
+        media_auth_cache.set(user, original_url, recording.key)
         request = utils.generate_s3_authorization_headers(recording.key)
 
         return drf_response.Response("authorized", headers=request.headers, status=200)
@@ -1228,6 +1498,7 @@ class FileViewSet(
     mixins.DestroyModelMixin,
     mixins.UpdateModelMixin,
     mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
     viewsets.GenericViewSet,
 ):
     """
@@ -1246,7 +1517,8 @@ class FileViewSet(
        Example: PUT /files/{id}/
     5. **Delete**: Soft delete a file by its ID.
        Example: DELETE /files/{id}/
-
+    6. **Upload ended**: Verify an uploaded file and mark it as ready.
+       Example: POST /files/{id}/upload-ended/
 
     ### Ordering: created_at, updated_at, title
 
@@ -1341,6 +1613,10 @@ class FileViewSet(
     def upload_ended(self, request, *args, **kwargs):
         """
         Check the actual uploaded file and mark it as ready.
+
+        Files from FILE_UPLOAD_ASYNC_VERIFICATION_MIN_SIZE bytes are checked by a
+        Celery task: a 202 is returned while the file is ANALYZING, and clients
+        retrieve the file until it is READY, or REJECTED with its rejection reason.
         """
         # Ensures we go through authorization checks
         file = self.get_object()
@@ -1358,107 +1634,30 @@ class FileViewSet(
             )
         file.refresh_from_db()
 
-        s3_client = default_storage.connection.meta.client
-        validation_error = None
-
+        verification_service = FileUploadVerificationService()
         try:
-            # We copy the file to its final destination, we will run the checks on that
-            # final file and ignore any updates to the temporary file. (We cannot revoke the policy,
-            # so the temporary file might still be updated after that.)
-            # The temporary folders will need to be cleaned periodically
-            s3_client.copy_object(
-                Bucket=default_storage.bucket_name,
-                Key=file.file_key,
-                CopySource={
-                    "Bucket": default_storage.bucket_name,
-                    "Key": file.temporary_file_key,
-                },
-            )
-
-            head_response = s3_client.head_object(
-                Bucket=default_storage.bucket_name, Key=file.file_key
-            )
-            file_size = head_response["ContentLength"]
-            # python-magic recommends using at least the first 2048 bytes
-            # to reduce incorrect identification.
-            # This is a tradeoff between pulling in the whole file and
-            # the most likely relevant bytes
-            # of the file for mime type identification.
-            if file_size > 2048:
-                range_response = s3_client.get_object(
-                    Bucket=default_storage.bucket_name,
-                    Key=file.file_key,
-                    Range="bytes=0-2047",
-                )
-                file_head = range_response["Body"].read()
-            else:
-                file_head = s3_client.get_object(
-                    Bucket=default_storage.bucket_name, Key=file.file_key
-                )["Body"].read()
-
-            logger.info("upload_ended: detecting mimetype for file: %s", file.file_key)
-            mimetype = utils.detect_mimetype(file_head, filename=file.filename)
-
-            if settings.FILE_UPLOAD_APPLY_RESTRICTIONS:
-                config_for_file_type = settings.FILE_UPLOAD_RESTRICTIONS[file.type]
-                if file_size > config_for_file_type["max_size"]:
-                    logger.info(
-                        "upload_ended: file size (%s) for file %s higher than the allowed max size",
-                        file_size,
-                        file.file_key,
-                    )
-                    validation_error = drf_exceptions.ValidationError(
-                        detail="The file size is higher than the allowed max size.",
-                        code="file_size_exceeded",
+            with verification_service.analyzing(file):
+                head_response = verification_service.head_temporary_object(file)
+
+                # Large files are verified by a worker, clients poll the file
+                # until it leaves the ANALYZING state.
+                async_min_size = settings.FILE_UPLOAD_ASYNC_VERIFICATION_MIN_SIZE
+                if (
+                    settings.CELERY_ENABLED
+                    and async_min_size
+                    and head_response["ContentLength"] >= async_min_size
+                ):
+                    transaction.on_commit(
+                        lambda: process_file_upload_verification.delay(file.id)
                     )
-                else:
-                    # Use improved MIME type detection combining magic bytes and file extension
-                    allowed_file_mimetypes = config_for_file_type["allowed_mimetypes"]
-                    if mimetype not in allowed_file_mimetypes:
-                        logger.warning(
-                            "upload_ended: mimetype not allowed %s for file %s",
-                            mimetype,
-                            file.file_key,
-                        )
-                        validation_error = drf_exceptions.ValidationError(
-                            detail="The file type is not allowed.",
-                            code="file_type_not_allowed",
-                        )
-
-            if validation_error is not None:
-                self._complete_file_deletion(file)
-            else:
-                file.upload_state = models.FileUploadStateChoices.READY
-                file.mimetype = mimetype
-                file.size = file_size
-                file.save(update_fields=["upload_state", "mimetype", "size"])
-
-                if head_response["ContentType"] != mimetype:
-                    logger.info(
-                        "upload_ended: content type mismatch between object storage and file,"
-                        " updating from %s to %s",
-                        head_response["ContentType"],
-                        mimetype,
+                    serializer = self.get_serializer(file)
+                    return drf_response.Response(
+                        serializer.data, status=drf_status.HTTP_202_ACCEPTED
                     )
-                    s3_client.copy_object(
-                        Bucket=default_storage.bucket_name,
-                        Key=file.file_key,
-                        CopySource={
-                            "Bucket": default_storage.bucket_name,
-                            "Key": file.file_key,
-                        },
-                        ContentType=mimetype,
-                        Metadata=head_response["Metadata"],
-                        MetadataDirective="REPLACE",
-                    )
-        except Exception as e:
-            logger.exception("Failed to analyze file, reverting to pending state")
-            file.upload_state = models.FileUploadStateChoices.PENDING
-            file.save()
-            raise e
 
-        if validation_error:
-            raise validation_error
+                verification_service.verify(file, head_response)
+        except FileVerificationError as e:
+            raise drf_exceptions.ValidationError(detail=e.detail, code=e.code) from e
 
         # Not yet implemented
         # Change the file.upload_state when this will be done
@@ -1468,12 +1667,6 @@ class FileViewSet(
 
         return drf_response.Response(serializer.data, status=drf_status.HTTP_200_OK)
 
-    def _complete_file_deletion(self, file):
-        """Delete a file completely."""
-        file.soft_delete()
-        file.hard_delete()
-        transaction.on_commit(lambda: process_file_deletion.delay(file.id))
-
     def _authorize_subrequest(self, request, pattern):
         """
         Authorize access based on the original URL of an Nginx subrequest
@@ -1558,17 +1751,27 @@ class FileViewSet(
         the request going through thanks to the nginx.ingress.kubernetes.io/auth-response-headers
         annotation. The request will then be proxied to the object storage backend who will
         respond with the file after checking the signature included in headers.
+
+        Authorizations are cached for a short time, so that the byte-range requests
+        of a media player skip the database once the first one is authorized.
         """
-        url_params, _, file = self._authorize_subrequest(
-            request, MEDIA_STORAGE_URL_PATTERN
-        )
+        original_url = request.META.get("HTTP_X_ORIGINAL_URL")
+        media_auth_cache = MediaAuthorizationCache()
 
-        if not file.is_ready:
-            logger.warning("File '%s' is not ready", file.id)
-            raise drf_exceptions.PermissionDenied()
+        if not (key := media_auth_cache.get(request.user, original_url)):
+            url_params, _, file = self._authorize_subrequest(
+                request, MEDIA_STORAGE_URL_PATTERN
+            )
+
+            if not file.is_ready:
+                logger.warning("File '%s' is not ready", file.id)
+                raise drf_exceptions.PermissionDenied()
+
+            key = f"{url_params.get('key'):s}"
+            media_auth_cache.set(request.user, original_url, key)
 
         # Generate S3 authorization headers using the extracted URL parameters
-        request = utils.generate_s3_authorization_headers(f"{url_params.get('key'):s}")
+        request = utils.generate_s3_authorization_headers(key)
 
         return drf_response.Response("authorized", headers=request.headers, status=200)
 
@@ -17,6 +17,7 @@ from core.services.marketing import (
     ContactData,
     get_marketing_service,
 )
+from core.services.team_membership import TeamMembershipService
 
 
 class OIDCAuthenticationBackend(LaSuiteOIDCAuthenticationBackend):
@@ -26,6 +27,26 @@ class OIDCAuthenticationBackend(LaSuiteOIDCAuthenticationBackend):
     in the User and Identity models, and handles signed and/or encrypted UserInfo response.
     """
 
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the OIDC Authentication Backend.
+
+        Adds an internal attribute to store the teams claimed in user info, until
+        they are pushed to the team membership cache once the user is known.
+        """
+        super().__init__(*args, **kwargs)
+        self._teams = None
+
+    def get_userinfo(self, access_token, id_token, payload):
+        """Return user info, keeping the user's teams when they are claimed."""
+        user_info = super().get_userinfo(access_token, id_token, payload)
+
+        if settings.OIDC_USERINFO_TEAMS_FIELD:
+            teams = user_info.get(settings.OIDC_USERINFO_TEAMS_FIELD) or []
+            self._teams = [teams] if isinstance(teams, str) else teams
+
+        return user_info
+
     def get_extra_claims(self, user_info):
         """
         Return extra claims from user_info.
@@ -60,6 +81,9 @@ class OIDCAuthenticationBackend(LaSuiteOIDCAuthenticationBackend):
         if is_new_user and email and settings.SIGNUP_NEW_USER_TO_MARKETING_EMAIL:
             self.signup_to_marketing_email(email)
 
+        if self._teams is not None:
+            TeamMembershipService().set_teams(user, self._teams)
+
     @staticmethod
     def signup_to_marketing_email(email):
         """Pragmatic approach to newsletter signup during authentication flow.
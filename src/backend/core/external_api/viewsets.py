@@ -24,6 +24,7 @@ from rest_framework import (
 
 from core import analytics, api, models
 from core.api.feature_flag import FeatureFlag
+from core.api.viewsets import Pagination
 from core.services.jwt_token import JwtTokenService
 
 from ..services.provisional_user_service import (
@@ -161,6 +162,7 @@ class RoomViewSet(
         authentication.AddonsJWTAuthentication,
         ResourceServerAuthentication,
     ]
+    pagination_class = Pagination
     permission_classes = [
         api.permissions.IsAuthenticated
         & permissions.HasRequiredRoomScope
@@ -169,14 +171,20 @@ class RoomViewSet(
     queryset = models.Room.objects.all()
     serializer_class = serializers.RoomSerializer
 
+    def get_queryset(self):
+        """Resolve the role of the requesting user along the rooms."""
+        return super().get_queryset().annotate_user_role(self.request.user)
+
     def list(self, request, *args, **kwargs):
         """Limit listed rooms to the ones related to the authenticated user."""
 
         user = self.request.user
 
         if user.is_authenticated:
-            queryset = (
-                self.filter_queryset(self.get_queryset()).filter(users=user).distinct()
+            # A user has at most one access per room, so the join can't duplicate
+            # rooms and doesn't need a distinct.
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                accesses__user=user
             )
         else:
             queryset = self.get_queryset().none()
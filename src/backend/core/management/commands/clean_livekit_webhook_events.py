@@ -0,0 +1,40 @@
+"""Delete the LiveKit webhook events handled before the retention period."""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import LiveKitWebhookEvent, LiveKitWebhookEventStatusChoices
+
+
+class Command(BaseCommand):
+    """
+    Delete the LiveKit webhook events processed, or failed for good, more than
+    LIVEKIT_WEBHOOK_EVENTS_RETENTION_DAYS days ago. Pending events are kept.
+    """
+
+    help = "Delete the LiveKit webhook events handled before the retention period"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.LIVEKIT_WEBHOOK_EVENTS_RETENTION_DAYS,
+            help=(
+                "Delete events handled more than this number of days ago "
+                f"(default: {settings.LIVEKIT_WEBHOOK_EVENTS_RETENTION_DAYS})"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        deleted, _ = LiveKitWebhookEvent.objects.filter(
+            status__in=[
+                LiveKitWebhookEventStatusChoices.PROCESSED,
+                LiveKitWebhookEventStatusChoices.FAILED,
+            ],
+            processed_at__lt=timezone.now() - timedelta(days=options["days"]),
+        ).delete()
+
+        self.stdout.write(f"Deleted {deleted} LiveKit webhook event(s).")
@@ -6,7 +6,7 @@ from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 
 from core.models import File, FileUploadStateChoices
-from core.tasks.file import process_file_deletion
+from core.services.file_purge import FILE_PURGE_BATCH_SIZE, FilePurgeService
 
 
 class Command(BaseCommand):
@@ -21,12 +21,27 @@ class Command(BaseCommand):
             default=24,
             help="Age threshold in hours (default: 24)",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=FILE_PURGE_BATCH_SIZE,
+            help=f"Number of files deleted per batch (default: {FILE_PURGE_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--after",
+            help="Resume the cleaning after this file ID, as reported by a previous run",
+        )
 
     def handle(self, *args, **options):
         hours = options["hours"]
         if hours < 0:
             raise CommandError("Hours must be greater than 0")
 
+        try:
+            purge_service = FilePurgeService(batch_size=options["batch_size"])
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
         threshold = timezone.now() - timedelta(hours=hours)
 
         files = File.objects.filter(
@@ -35,13 +50,20 @@ class Command(BaseCommand):
             hard_deleted_at__isnull=True,
         )
 
-        count = 0
-        for file in files.iterator():
-            # This check shouldn't happen, but just in case we do it to avoid an error
-            if not file.deleted_at:
-                file.soft_delete()
-            file.hard_delete()
-            process_file_deletion(file.id)
-            count += 1
+        progress = purge_service.purge(
+            files, after=options["after"], on_progress=self.write_progress
+        )
+
+        self.stdout.write(f"Cleaned {progress['purged']} stale pending file(s).")
+        if progress["failed"]:
+            self.stderr.write(
+                f"Failed to clean {progress['failed']} file(s), "
+                "they will be purged by purge_deleted_files."
+            )
 
-        self.stdout.write(f"Cleaned {count} stale pending file(s).")
+    def write_progress(self, progress):
+        """Report the progress of the cleaning, with the ID to resume it after."""
+        self.stdout.write(
+            f"{progress['purged']} file(s) cleaned, {progress['failed']} failed, "
+            f"{progress['throughput']:.1f} file(s)/s, last ID: {progress['last_id']}"
+        )
@@ -3,12 +3,12 @@
 from datetime import timedelta
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db.models import Q
 from django.utils import timezone
 
 from core.models import File
-from core.tasks.file import process_file_deletion
+from core.services.file_purge import FILE_PURGE_BATCH_SIZE, FilePurgeService
 
 
 class Command(BaseCommand):
@@ -20,8 +20,20 @@ class Command(BaseCommand):
 
     help = "Purge deleted files"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=FILE_PURGE_BATCH_SIZE,
+            help=f"Number of files purged per batch (default: {FILE_PURGE_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--after",
+            help="Resume the purge after this file ID, as reported by a previous run",
+        )
+
     def handle(self, *args, **options):
-        """Browse purgeable files and queue them through the file deletion task."""
+        """Browse purgeable files and purge them by batches."""
 
         is_hard_deleted = Q(hard_deleted_at__isnull=False)
         is_purgeable = Q(
@@ -29,12 +41,27 @@ class Command(BaseCommand):
             - timedelta(days=settings.FILE_PURGE_GRACE_DAYS)
         )
 
-        count = 0
-        for file in File.objects.filter(is_hard_deleted | is_purgeable).iterator():
-            if file.hard_deleted_at is None:
-                file.hard_delete()
+        try:
+            purge_service = FilePurgeService(batch_size=options["batch_size"])
+        except ValueError as e:
+            raise CommandError(str(e)) from e
 
-            process_file_deletion.delay(file.id)
-            count += 1
+        progress = purge_service.purge(
+            File.objects.filter(is_hard_deleted | is_purgeable),
+            after=options["after"],
+            on_progress=self.write_progress,
+        )
+
+        self.stdout.write(f"Purged {progress['purged']} deleted file(s).")
+        if progress["failed"]:
+            self.stderr.write(
+                f"Failed to purge {progress['failed']} file(s), "
+                "they will be purged again by the next run."
+            )
 
-        self.stdout.write(f"Purged {count} deleted file(s).")
+    def write_progress(self, progress):
+        """Report the progress of the purge, with the ID to resume it after."""
+        self.stdout.write(
+            f"{progress['purged']} file(s) purged, {progress['failed']} failed, "
+            f"{progress['throughput']:.1f} file(s)/s, last ID: {progress['last_id']}"
+        )
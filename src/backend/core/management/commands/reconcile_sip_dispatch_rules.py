@@ -0,0 +1,27 @@
+"""Repair drift between the SIP dispatch rules registry and LiveKit."""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.sip_management import SIPException, SIPManagement
+
+
+class Command(BaseCommand):
+    """Reconcile the SIP dispatch rules registry with LiveKit."""
+
+    help = "Sync the registry of SIP dispatch rules with the rules existing in LiveKit"
+
+    def handle(self, *args, **options):
+        if not (settings.ROOM_TELEPHONY_ENABLED or settings.ROOMKIT_ENABLED):
+            self.stdout.write("Telephony is disabled, nothing to reconcile.")
+            return
+
+        try:
+            counts = SIPManagement().reconcile_dispatch_rules()
+        except SIPException as e:
+            raise CommandError("Could not list SIP dispatch rules") from e
+
+        self.stdout.write(
+            f"Reconciled SIP dispatch rules: {counts['added']} added, "
+            f"{counts['updated']} updated, {counts['removed']} removed room(s)."
+        )
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.16 on 2026-10-18 05:17
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_user_default_room_access_level_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LiveKitWebhookEvent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='primary key for the record as UUID', primary_key=True, serialize=False, verbose_name='id')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='date and time at which a record was created', verbose_name='created on')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='date and time at which a record was last updated', verbose_name='updated on')),
+                ('event_id', models.CharField(max_length=255, unique=True, verbose_name='event id')),
+                ('event_type', models.CharField(max_length=50, verbose_name='event type')),
+                ('room_name', models.CharField(max_length=255, verbose_name='room name')),
+                ('emitted_at', models.BigIntegerField(help_text='Unix timestamp at which LiveKit emitted the event.', verbose_name='emitted at')),
+                ('payload', models.TextField(help_text='Webhook body, as verified on reception.', verbose_name='payload')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processed', 'Processed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'LiveKit webhook event',
+                'verbose_name_plural': 'LiveKit webhook events',
+                'db_table': 'meet_livekit_webhook_event',
+                'ordering': ('emitted_at', 'created_at'),
+                'indexes': [models.Index(fields=['room_name', 'status', 'emitted_at', 'created_at'], name='meet_liveki_room_na_de6dcb_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.16 on 2026-10-18 06:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_livekit_webhook_event'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='file',
+            index=models.Index(fields=['creator', 'created_at', 'id'], name='file_creator_f253be_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recording',
+            index=models.Index(fields=['created_at', 'id'], name='meet_record_created_bc2a0e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(fields=['created_at', 'id'], name='meet_resour_created_21a227_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resourceaccess',
+            index=models.Index(fields=['created_at', 'id'], name='meet_resour_created_654838_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.16 on 2026-10-18 06:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_resource_created_at_id_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recordingaccess',
+            index=models.Index(fields=['team'], name='meet_record_team_987aa8_idx'),
+        ),
+    ]
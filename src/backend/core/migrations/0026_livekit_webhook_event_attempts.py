@@ -0,0 +1,23 @@
+# Generated by Django 5.2.16 on 2026-10-18 06:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_recordingaccess_team_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='livekitwebhookevent',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Number of times handling the event failed.', verbose_name='attempts'),
+        ),
+        migrations.AddField(
+            model_name='livekitwebhookevent',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, help_text='Time before which a failed event is not handled again.', null=True, verbose_name='next attempt at'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.16 on 2026-10-18 07:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_livekit_webhook_event_attempts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='file',
+            name='rejection_reason',
+            field=models.CharField(blank=True, help_text='Why the verification of the uploaded file rejected it.', max_length=50, null=True),
+        ),
+        migrations.AlterField(
+            model_name='file',
+            name='upload_state',
+            field=models.CharField(choices=[('pending', 'Pending'), ('analyzing', 'Analyzing'), ('ready', 'Ready'), ('rejected', 'Rejected')], max_length=25),
+        ),
+    ]
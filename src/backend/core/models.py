@@ -14,6 +14,7 @@ from typing import List, Optional
 from django.conf import settings
 from django.contrib.auth import models as auth_models
 from django.contrib.auth.base_user import AbstractBaseUser
+from django.contrib.postgres.expressions import ArraySubquery
 from django.contrib.postgres.fields import ArrayField
 from django.core import mail, validators
 from django.core.exceptions import PermissionDenied, ValidationError
@@ -27,6 +28,7 @@ from timezone_field import TimeZoneField
 
 from . import fields, utils
 from .recording.enums import FileExtension
+from .services.team_membership import TeamMembershipService
 
 logger = getLogger(__name__)
 
@@ -257,9 +259,13 @@ class User(AbstractBaseUser, BaseModel, auth_models.PermissionsMixin):
     def get_teams(self):
         """
         Get list of teams in which the user is, as a list of strings.
-        Must be cached if retrieved remotely.
+
+        Teams are resolved by the configured team membership provider, cached per
+        user, and memoized on the instance so that a request resolves them once.
         """
-        return []
+        if "_teams" not in self.__dict__:
+            self.__dict__["_teams"] = TeamMembershipService().get_teams(self)
+        return self.__dict__["_teams"]
 
 
 def get_resource_roles(resource: models.Model, user: User) -> List[str]:
@@ -290,6 +296,43 @@ def get_resource_roles(resource: models.Model, user: User) -> List[str]:
         return []
 
 
+class ResourceQuerySet(models.QuerySet):
+    """Queryset of resources, able to resolve a user's role along the resources."""
+
+    def annotate_user_role(self, user):
+        """Annotate the role of a user on each resource, read back by get_role."""
+        if not user or not user.is_authenticated:
+            return self
+
+        return self.annotate(
+            user_role=models.Subquery(
+                ResourceAccess.objects.filter(
+                    resource=models.OuterRef("pk"), user=user
+                ).values("role")[:1]
+            ),
+            user_role_user_id=models.Value(user.pk, output_field=models.UUIDField()),
+        )
+
+    def prefetch_administered_accesses(self, user):
+        """Prefetch, with their users, the accesses of the resources a user administers.
+
+        Accesses are only exposed to administrators and owners, so resources on
+        which the user has a lesser role get no accesses prefetched.
+        """
+        if not user or not user.is_authenticated:
+            return self
+
+        return self.prefetch_related(
+            models.Prefetch(
+                "accesses",
+                queryset=ResourceAccess.objects.select_related("user").filter(
+                    resource__accesses__user=user,
+                    resource__accesses__role__in=[RoleChoices.ADMIN, RoleChoices.OWNER],
+                ),
+            )
+        )
+
+
 class Resource(BaseModel):
     """Model to define access control"""
 
@@ -300,10 +343,15 @@ class Resource(BaseModel):
         related_name="resources",
     )
 
+    objects = ResourceQuerySet.as_manager()
+
     class Meta:
         db_table = "meet_resource"
         verbose_name = _("Resource")
         verbose_name_plural = _("Resources")
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+        ]
 
     def __str__(self):
         try:
@@ -311,13 +359,34 @@ class Resource(BaseModel):
         except AttributeError:
             return f"Resource {self.id!s}"
 
+    def refresh_from_db(self, *args, **kwargs):
+        """Forget the roles resolved before reloading, as accesses may have changed."""
+        self.__dict__.pop("_roles_cache", None)
+        super().refresh_from_db(*args, **kwargs)
+
     def get_role(self, user):
         """
         Determine the role of a given user in this resource.
+
+        The role is read from the annotation of ResourceQuerySet.annotate_user_role
+        when the resource was fetched for this user. Otherwise it is queried once
+        and memoized on the instance, so that permissions and serializers checking
+        it during a request share a single query.
         """
         if not user or not user.is_authenticated:
             return None
 
+        if getattr(self, "user_role_user_id", None) == user.pk:
+            return self.user_role  # pylint: disable=no-member
+
+        roles_cache = self.__dict__.setdefault("_roles_cache", {})
+        if user.pk not in roles_cache:
+            roles_cache[user.pk] = self._get_role(user)
+
+        return roles_cache[user.pk]
+
+    def _get_role(self, user):
+        """Query the role of a given user in this resource."""
         role = None
         for access in self.accesses.filter(user=user):
             if access.role == RoleChoices.OWNER:
@@ -372,6 +441,9 @@ class ResourceAccess(BaseModel):
                 ),
             ),
         ]
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+        ]
 
     def __str__(self):
         role = capfirst(self.get_role_display())
@@ -514,7 +586,10 @@ class BaseAccessManager(models.Manager):
 
     def filter_user(self, user):
         """Filter accesses for a given user, including both direct and team-based access."""
-        return self.filter(models.Q(user=user) | models.Q(team__in=user.get_teams()))
+        query = models.Q(user=user)
+        if teams := user.get_teams():
+            query |= models.Q(team__in=teams)
+        return self.filter(query)
 
 
 class BaseAccess(BaseModel):
@@ -578,6 +653,25 @@ class BaseAccess(BaseModel):
         }
 
 
+class RecordingQuerySet(models.QuerySet):
+    """Queryset of recordings, able to resolve a user's roles along the recordings."""
+
+    def annotate_user_roles(self, user):
+        """Annotate the roles of a user on each recording, read by get_resource_roles."""
+        if not user or not user.is_authenticated:
+            return self
+
+        return self.annotate(
+            user_roles=ArraySubquery(
+                RecordingAccess.objects.filter_user(user)
+                .filter(recording=models.OuterRef("pk"))
+                .order_by()
+                .values("role")
+                .distinct()
+            )
+        )
+
+
 class Recording(BaseModel):
     """Model for recordings that take place in a room.
 
@@ -640,6 +734,8 @@ class Recording(BaseModel):
         help_text=_("ID of the external process associated with the recording."),
     )
 
+    objects = RecordingQuerySet.as_manager()
+
     class Meta:
         db_table = "meet_recording"
         ordering = ("-created_at",)
@@ -657,6 +753,9 @@ class Recording(BaseModel):
                 name="unique_initiated_or_active_recording_per_room",
             )
         ]
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+        ]
 
     def __str__(self):
         return f"Recording {self.id} ({self.status})"
@@ -776,6 +875,9 @@ class RecordingAccess(BaseAccess):
                 violation_error_message=_("Either user or team must be set, not both."),
             ),
         ]
+        indexes = [
+            models.Index(fields=["team"]),
+        ]
 
     def __str__(self):
         return f"{self.user!s} is {self.role:s} in {self.recording!s}"
@@ -885,6 +987,58 @@ class ApplicationDomain(BaseModel):
         super().save(*args, **kwargs)
 
 
+class LiveKitWebhookEventStatusChoices(models.TextChoices):
+    """Processing states of a LiveKit webhook event."""
+
+    PENDING = "pending", _("Pending")
+    PROCESSED = "processed", _("Processed")
+    FAILED = "failed", _("Failed")
+
+
+class LiveKitWebhookEvent(BaseModel):
+    """LiveKit webhook event, acknowledged and queued for asynchronous processing."""
+
+    event_id = models.CharField(_("event id"), max_length=255, unique=True)
+    event_type = models.CharField(_("event type"), max_length=50)
+    room_name = models.CharField(_("room name"), max_length=255)
+    emitted_at = models.BigIntegerField(
+        _("emitted at"),
+        help_text=_("Unix timestamp at which LiveKit emitted the event."),
+    )
+    payload = models.TextField(
+        _("payload"), help_text=_("Webhook body, as verified on reception.")
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=LiveKitWebhookEventStatusChoices.choices,
+        default=LiveKitWebhookEventStatusChoices.PENDING,
+    )
+    processed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(
+        _("attempts"),
+        default=0,
+        help_text=_("Number of times handling the event failed."),
+    )
+    next_attempt_at = models.DateTimeField(
+        _("next attempt at"),
+        null=True,
+        blank=True,
+        help_text=_("Time before which a failed event is not handled again."),
+    )
+
+    class Meta:
+        db_table = "meet_livekit_webhook_event"
+        verbose_name = _("LiveKit webhook event")
+        verbose_name_plural = _("LiveKit webhook events")
+        ordering = ("emitted_at", "created_at")
+        indexes = [
+            models.Index(fields=["room_name", "status", "emitted_at", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} ({self.event_id})"
+
+
 class FileUploadStateChoices(models.TextChoices):
     """Possible states of a file."""
 
@@ -897,6 +1051,7 @@ class FileUploadStateChoices(models.TextChoices):
     #     _("File too large to analyze"),
     # )
     READY = "ready", _("Ready")
+    REJECTED = "rejected", _("Rejected")
 
 
 class FileTypeChoices(models.TextChoices):
@@ -934,6 +1089,12 @@ class File(BaseModel):
     mimetype = models.CharField(max_length=255, null=True, blank=True)
     size = models.BigIntegerField(null=True, blank=True)
     description = models.TextField(null=True, blank=True)
+    rejection_reason = models.CharField(
+        max_length=50,
+        null=True,
+        blank=True,
+        help_text=_("Why the verification of the uploaded file rejected it."),
+    )
     malware_detection_info = models.JSONField(
         null=True,
         blank=True,
@@ -948,6 +1109,7 @@ class File(BaseModel):
         ordering = ("created_at",)
         indexes = [
             models.Index(fields=["creator", "type", "-created_at"]),
+            models.Index(fields=["creator", "created_at", "id"]),
         ]
 
     def __str__(self):
@@ -1025,8 +1187,9 @@ class File(BaseModel):
         """
         Compute and return abilities for a given user on the file.
         """
-        # Characteristics that are based only on specific access
-        is_creator = user == self.creator
+        # Characteristics that are based only on specific access, compared by id
+        # to spare loading the creator
+        is_creator = self.creator_id is not None and self.creator_id == user.pk
         retrieve = is_creator
         is_deleted = self.deleted_at is not None
         can_update = is_creator and not is_deleted and user.is_authenticated
@@ -0,0 +1,128 @@
+"""Batched deletion of files from the object storage and the database."""
+
+import time
+from logging import getLogger
+
+from django.core.files.storage import default_storage
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.models import File
+
+logger = getLogger(__name__)
+
+# Maximum number of keys S3 accepts in a single DeleteObjects request
+DELETE_OBJECTS_MAX_KEYS = 1000
+
+# Both the final and the temporary keys of each file are deleted
+FILE_PURGE_BATCH_SIZE = DELETE_OBJECTS_MAX_KEYS // 2
+
+
+class FilePurgeService:
+    """Delete files in batches, with one request per batch to the object storage.
+
+    Files are paged by primary key, so that a purge interrupted by a failure can be
+    resumed after the last reported file. For each batch, files are first marked
+    as hard deleted, which hides them and keeps them purgeable if the following
+    steps fail. Their final and temporary objects are then deleted with a single
+    DeleteObjects request, and the files whose objects were deleted are removed
+    from the database at once. Files whose objects could not be deleted are left
+    hard deleted, to be purged again by the next run.
+    """
+
+    def __init__(self, batch_size=FILE_PURGE_BATCH_SIZE):
+        if not 0 < batch_size <= FILE_PURGE_BATCH_SIZE:
+            raise ValueError(
+                f"The batch size must be between 1 and {FILE_PURGE_BATCH_SIZE:d}."
+            )
+
+        self._batch_size = batch_size
+        self._s3_client = default_storage.connection.meta.client
+        self._bucket_name = default_storage.bucket_name
+
+    def _delete_objects(self, files):
+        """Delete the objects of files from the object storage.
+
+        Returns:
+            set: The keys which could not be deleted.
+        """
+
+        response = self._s3_client.delete_objects(
+            Bucket=self._bucket_name,
+            Delete={
+                "Objects": [
+                    {"Key": key}
+                    for file in files
+                    for key in (file.file_key, file.temporary_file_key)
+                ],
+                "Quiet": True,
+            },
+        )
+
+        failed_keys = set()
+        for error in response.get("Errors", []):
+            logger.error(
+                "Failed to delete object %s: %s", error["Key"], error.get("Message")
+            )
+            failed_keys.add(error["Key"])
+
+        return failed_keys
+
+    def _purge_batch(self, files):
+        """Purge a batch of files, returning the number of files purged."""
+
+        now = timezone.now()
+        File.objects.filter(pk__in=[file.pk for file in files]).update(
+            deleted_at=Coalesce("deleted_at", now), hard_deleted_at=now
+        )
+
+        failed_keys = self._delete_objects(files)
+        purged_ids = [
+            file.pk
+            for file in files
+            if file.file_key not in failed_keys
+            and file.temporary_file_key not in failed_keys
+        ]
+        File.objects.filter(pk__in=purged_ids).delete()
+
+        return len(purged_ids)
+
+    def purge(self, queryset, after=None, on_progress=None):
+        """Purge the files of a queryset, batch after batch.
+
+        Args:
+            queryset: The files to purge
+            after: Resume the purge after this file ID
+            on_progress: Called after each batch with the purge progress
+
+        Returns:
+            dict: The number of files purged and failed, the ID of the last file
+                processed, the elapsed seconds and the throughput in files/s.
+        """
+
+        queryset = queryset.only("id", "filename").order_by("pk")
+        progress = {"purged": 0, "failed": 0, "last_id": after}
+        start = time.monotonic()
+
+        while True:
+            batch = queryset
+            if progress["last_id"] is not None:
+                batch = batch.filter(pk__gt=progress["last_id"])
+            files = list(batch[: self._batch_size])
+            if not files:
+                break
+
+            purged = self._purge_batch(files)
+            progress["purged"] += purged
+            progress["failed"] += len(files) - purged
+            progress["last_id"] = files[-1].pk
+
+            elapsed = time.monotonic() - start
+            progress["elapsed"] = elapsed
+            progress["throughput"] = progress["purged"] / elapsed if elapsed else 0
+            if on_progress is not None:
+                on_progress(progress)
+
+        progress.setdefault("elapsed", time.monotonic() - start)
+        progress.setdefault("throughput", 0)
+        return progress
@@ -0,0 +1,180 @@
+"""Verification of the files uploaded by users to the object storage."""
+
+from contextlib import contextmanager
+from logging import getLogger
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from core import models, utils
+
+logger = getLogger(__name__)
+
+# python-magic recommends using at least the first 2048 bytes
+# to reduce incorrect identification.
+MIMETYPE_DETECTION_BYTES = 2048
+
+
+class FileVerificationError(Exception):
+    """Raised when an uploaded file does not comply with the upload restrictions."""
+
+    def __init__(self, detail, code):
+        super().__init__(detail)
+        self.detail = detail
+        self.code = code
+
+
+class FileUploadVerificationService:
+    """Check files uploaded to their temporary key, then move them to their final key.
+
+    The temporary object is inspected in place, with a HEAD for its size and
+    metadata and a range read of its first bytes for mimetype detection. Only a
+    compliant file is copied, once, to its final key with the detected content
+    type, and the temporary object is then deleted. The copy is conditioned on
+    the ETag of the inspected object: the upload policy cannot be revoked, so the
+    temporary object might still be replaced after its inspection, which makes
+    the copy fail rather than publish unchecked content. Objects uploaded again
+    once a file is verified are left behind, so the temporary folders will need
+    to be cleaned periodically.
+    """
+
+    def __init__(self):
+        self._s3_client = default_storage.connection.meta.client
+        self._bucket_name = default_storage.bucket_name
+
+    def head_temporary_object(self, file):
+        """Return the HEAD response of the object uploaded for a file."""
+        return self._s3_client.head_object(
+            Bucket=self._bucket_name, Key=file.temporary_file_key
+        )
+
+    @contextmanager
+    def analyzing(self, file):
+        """Settle the state of a file whose analysis fails.
+
+        Files rejected by the verification are marked REJECTED with the reason of
+        their rejection and soft deleted, along with their temporary object, while
+        files whose analysis failed unexpectedly are reverted to the PENDING state,
+        so that the upload can be ended again.
+        """
+        try:
+            yield
+        except FileVerificationError as e:
+            self._reject(file, e.code)
+            raise
+        except Exception:
+            logger.exception("Failed to analyze file, reverting to pending state")
+            file.upload_state = models.FileUploadStateChoices.PENDING
+            file.save()
+            raise
+
+    def _reject(self, file, reason):
+        """Reject a file, deleting its object which was never copied to its final key.
+
+        The file is kept, so that clients polling it learn why it was rejected,
+        and soft deleted, so that it is purged with the other deleted files.
+        """
+        self._s3_client.delete_object(
+            Bucket=self._bucket_name, Key=file.temporary_file_key
+        )
+        file.upload_state = models.FileUploadStateChoices.REJECTED
+        file.rejection_reason = reason
+        file.save(update_fields=["upload_state", "rejection_reason"])
+        file.soft_delete()
+
+    def _read_head(self, file, head_response):
+        """Read the first bytes of the temporary object for mimetype detection."""
+
+        if not head_response["ContentLength"]:
+            return b""
+
+        return self._s3_client.get_object(
+            Bucket=self._bucket_name,
+            Key=file.temporary_file_key,
+            Range=f"bytes=0-{MIMETYPE_DETECTION_BYTES - 1:d}",
+            IfMatch=head_response["ETag"],
+        )["Body"].read()
+
+    @staticmethod
+    def _validate(file, file_size, mimetype):
+        """Check the size and mimetype of a file against its type restrictions."""
+
+        if not settings.FILE_UPLOAD_APPLY_RESTRICTIONS:
+            return
+
+        config_for_file_type = settings.FILE_UPLOAD_RESTRICTIONS[file.type]
+        if file_size > config_for_file_type["max_size"]:
+            logger.info(
+                "upload_ended: file size (%s) for file %s higher than the allowed max size",
+                file_size,
+                file.file_key,
+            )
+            raise FileVerificationError(
+                detail="The file size is higher than the allowed max size.",
+                code="file_size_exceeded",
+            )
+
+        if mimetype not in config_for_file_type["allowed_mimetypes"]:
+            logger.warning(
+                "upload_ended: mimetype not allowed %s for file %s",
+                mimetype,
+                file.file_key,
+            )
+            raise FileVerificationError(
+                detail="The file type is not allowed.",
+                code="file_type_not_allowed",
+            )
+
+    def verify(self, file, head_response=None):
+        """Verify the object uploaded for a file and mark the file as ready.
+
+        Should be called within the analyzing context manager.
+
+        Args:
+            file: The file in ANALYZING state
+            head_response: The HEAD response of the temporary object, if already
+                fetched
+
+        Raises:
+            FileVerificationError: If the file does not comply with the
+                restrictions of its type
+        """
+
+        if head_response is None:
+            head_response = self.head_temporary_object(file)
+
+        file_size = head_response["ContentLength"]
+        file_head = self._read_head(file, head_response)
+
+        logger.info("upload_ended: detecting mimetype for file: %s", file.file_key)
+        mimetype = utils.detect_mimetype(file_head, filename=file.filename)
+
+        self._validate(file, file_size, mimetype)
+
+        if head_response["ContentType"] != mimetype:
+            logger.info(
+                "upload_ended: content type mismatch between object storage and file,"
+                " updating from %s to %s",
+                head_response["ContentType"],
+                mimetype,
+            )
+
+        self._s3_client.copy_object(
+            Bucket=self._bucket_name,
+            Key=file.file_key,
+            CopySource={"Bucket": self._bucket_name, "Key": file.temporary_file_key},
+            CopySourceIfMatch=head_response["ETag"],
+            ContentType=mimetype,
+            Metadata=head_response["Metadata"],
+            MetadataDirective="REPLACE",
+        )
+        self._s3_client.delete_object(
+            Bucket=self._bucket_name, Key=file.temporary_file_key
+        )
+
+        file.upload_state = models.FileUploadStateChoices.READY
+        file.mimetype = mimetype
+        file.size = file_size
+        file.save(update_fields=["upload_state", "mimetype", "size"])
+
+        return file
@@ -4,12 +4,16 @@
 
 import re
 import uuid
+from datetime import timedelta
 from enum import Enum
 from logging import getLogger
 
 from django.conf import settings
+from django.utils import timezone
 
+from google.protobuf import json_format
 from livekit import api
+from livekit.protocol.webhook import WebhookEvent
 
 from core import models
 from core.recording.services.metadata_collector import (
@@ -23,12 +27,15 @@ from core.recording.services.recording_events import (
 )
 
 from .lobby import LobbyService
+from .room_liveness import RoomLivenessService
 from .room_management import (
     RoomManagement,
     RoomManagementException,
     RoomNotFoundException,
 )
+from .room_presence import RoomPresenceService
 from .sip_management import SIPException, SIPManagement
+from .webhook_deduplication import WebhookDeduplicationService
 
 logger = getLogger(__name__)
 
@@ -88,7 +95,7 @@ class LiveKitWebhookEventType(Enum):
     INGRESS_ENDED = "ingress_ended"
 
 
-class LiveKitEventsService:
+class LiveKitEventsService:  # pylint: disable=too-many-instance-attributes
     """Service for processing and handling LiveKit webhook events and notifications."""
 
     def __init__(self):
@@ -99,6 +106,8 @@ class LiveKitEventsService:
             "egress_ended": self._handle_egress_ended,
             "room_started": self._handle_room_started,
             "room_finished": self._handle_room_finished,
+            "participant_joined": self._handle_participant_joined,
+            "participant_left": self._handle_participant_left,
         }
 
         token_verifier = api.TokenVerifier(
@@ -107,6 +116,9 @@ class LiveKitEventsService:
         )
         self.webhook_receiver = api.WebhookReceiver(token_verifier)
         self.lobby_service = LobbyService()
+        self.room_liveness = RoomLivenessService()
+        self.room_presence = RoomPresenceService()
+        self.deduplication = WebhookDeduplicationService()
         self.sip_management = SIPManagement()
         self.recording_events = RecordingEventsService()
 
@@ -122,16 +134,22 @@ class LiveKitEventsService:
                 )
 
     def receive(self, request):
-        """Process webhook and route to appropriate handler."""
+        """Process webhook and route to appropriate handler.
+
+        With LIVEKIT_WEBHOOK_ASYNC_PROCESSING_ENABLED, the verified event is stored
+        instead of being handled, and returned for the caller to schedule its
+        processing. A retried event is returned again, in case scheduling failed
+        on first reception.
+        """
 
         auth_token = request.headers.get("Authorization")
         if not auth_token:
             raise AuthenticationError("Authorization header missing")
 
+        body = request.body.decode("utf-8")
+
         try:
-            data = self.webhook_receiver.receive(
-                request.body.decode("utf-8"), auth_token
-            )
+            data = self.webhook_receiver.receive(body, auth_token)
         except Exception as e:
             raise InvalidPayloadError("Invalid webhook payload") from e
 
@@ -142,11 +160,25 @@ class LiveKitEventsService:
                 "Ignoring webhook event for connection test room '%s'.",
                 room_name,
             )
-            return
+            return None
 
         if self._filter_regex and not self._filter_regex.search(room_name):
             logger.info("Filtered webhook event for room '%s'", room_name)
-            return
+            return None
+
+        handler = self._get_handler(data)
+
+        if handler is None:
+            return None
+
+        if settings.LIVEKIT_WEBHOOK_ASYNC_PROCESSING_ENABLED:
+            return self._store(data, body, room_name)
+
+        self._handle(data, handler)
+        return None
+
+    def _get_handler(self, data):
+        """Return the handler of a webhook event, or None if it's not handled."""
 
         try:
             webhook_type = LiveKitWebhookEventType(data.event)
@@ -156,10 +188,164 @@ class LiveKitEventsService:
             ) from e
 
         # Handle according to received webhook type
-        handler = self._webhook_handlers.get(webhook_type.value)
+        return self._webhook_handlers.get(webhook_type.value)
+
+    def _handle(self, data, handler):
+        """Run the handler of an event, unless it duplicates an event already handled.
 
-        if handler is not None:
+        Claims of a failing event are released, so that a retry is handled.
+        """
+
+        if not self.deduplication.claim(data):
+            logger.info(
+                "Dropped duplicate webhook event %s (%s) for room '%s'",
+                data.id,
+                data.event,
+                data.room.name,
+            )
+            return
+
+        try:
             handler(data)
+        except Exception:
+            self.deduplication.release(data)
+            raise
+
+    @staticmethod
+    def _store(data, body, room_name):
+        """Store a verified webhook event, once per event id.
+
+        A webhook retried by LiveKit returns the event stored on first reception,
+        so that it's not handled twice.
+        """
+
+        event, created = models.LiveKitWebhookEvent.objects.get_or_create(
+            event_id=data.id or str(uuid.uuid4()),
+            defaults={
+                "event_type": data.event,
+                "room_name": room_name,
+                "emitted_at": data.created_at,
+                "payload": body,
+            },
+        )
+
+        if not created:
+            logger.info("Webhook event %s already received", data.id)
+
+        return event
+
+    @staticmethod
+    def _get_pending_events(room_name):
+        """Return the stored events of a room which are still to be handled."""
+        return models.LiveKitWebhookEvent.objects.filter(
+            room_name=room_name,
+            status=models.LiveKitWebhookEventStatusChoices.PENDING,
+        )
+
+    def _get_next_event(self, room_name):
+        """Return the first pending event of a room, in emission order."""
+        return (
+            self._get_pending_events(room_name)
+            .order_by("emitted_at", "created_at")
+            .first()
+        )
+
+    @staticmethod
+    def _get_retry_delay(event):
+        """Return the seconds until a pending event is due, 0 if it is due now."""
+        if event.next_attempt_at is None:
+            return 0
+        return max((event.next_attempt_at - timezone.now()).total_seconds(), 0)
+
+    def has_due_events(self, room_name):
+        """Return whether the next pending event of a room is due to be handled now."""
+        event = self._get_next_event(room_name)
+        return event is not None and self._get_retry_delay(event) == 0
+
+    def process_pending_events(self, room_name, heartbeat=None):
+        """Handle the stored events of a room, in the order LiveKit emitted them.
+
+        Events stored while the room is being processed are handled too. A failing
+        event is handled again after a delay, doubling each attempt, and marked
+        failed after LIVEKIT_WEBHOOK_PROCESSING_MAX_ATTEMPTS attempts. The later
+        events of the room wait for it meanwhile, so that they are never handled
+        out of order, e.g. a room_finished before the room_started it follows.
+
+        Callers must ensure a single worker processes a given room at a time.
+
+        Args:
+            room_name: The name of the room whose events are handled
+            heartbeat: Called before handling each event, e.g. to extend the lock
+                of the room
+
+        Returns:
+            float | None: Seconds until the failed event holding back the room is
+                due to be handled again, if any.
+        """
+
+        while (event := self._get_next_event(room_name)) is not None:
+            retry_delay = self._get_retry_delay(event)
+            if retry_delay > 0:
+                return retry_delay
+
+            if heartbeat is not None:
+                heartbeat()
+            self._process_event(event)
+
+            if event.status == models.LiveKitWebhookEventStatusChoices.PENDING:
+                return self._get_retry_delay(event)
+
+        return None
+
+    def _process_event(self, event):
+        """Handle a stored event, scheduling its next attempt if it fails."""
+
+        data = json_format.Parse(
+            event.payload, WebhookEvent(), ignore_unknown_fields=True
+        )
+
+        try:
+            handler = self._get_handler(data)
+            if handler is not None:
+                self._handle(data, handler)
+        except Exception:  # pylint: disable=broad-exception-caught
+            event.attempts += 1
+            if event.attempts < settings.LIVEKIT_WEBHOOK_PROCESSING_MAX_ATTEMPTS:
+                delay = settings.LIVEKIT_WEBHOOK_PROCESSING_RETRY_DELAY * 2 ** (
+                    event.attempts - 1
+                )
+                logger.exception(
+                    "Failed to process webhook event %s for room '%s', "
+                    "retrying in %s seconds",
+                    event.event_id,
+                    event.room_name,
+                    delay,
+                )
+                event.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+                event.save(update_fields=["attempts", "next_attempt_at", "updated_at"])
+                return
+
+            logger.exception(
+                "Failed to process webhook event %s for room '%s' after %s attempts",
+                event.event_id,
+                event.room_name,
+                event.attempts,
+            )
+            event.status = models.LiveKitWebhookEventStatusChoices.FAILED
+        else:
+            event.status = models.LiveKitWebhookEventStatusChoices.PROCESSED
+
+        event.next_attempt_at = None
+        event.processed_at = timezone.now()
+        event.save(
+            update_fields=[
+                "status",
+                "attempts",
+                "next_attempt_at",
+                "processed_at",
+                "updated_at",
+            ]
+        )
 
     def _handle_egress_updated(self, data):
         """Handle 'egress_updated' event."""
@@ -243,6 +429,8 @@ class LiveKitEventsService:
     def _handle_room_started(self, data):
         """Handle 'room_started' event."""
 
+        self.room_liveness.mark_started(data.room.name)
+
         try:
             room_id = uuid.UUID(data.room.name)
         except ValueError as e:
@@ -268,6 +456,9 @@ class LiveKitEventsService:
     def _handle_room_finished(self, data):
         """Handle 'room_finished' event."""
 
+        self.room_liveness.mark_finished(data.room.name)
+        self.room_presence.clear(data.room.name)
+
         try:
             room_id = uuid.UUID(data.room.name)
         except ValueError as e:
@@ -291,3 +482,12 @@ class LiveKitEventsService:
             raise ActionFailedError(
                 f"Failed to clear room cache for room {room_id}"
             ) from e
+
+    def _handle_participant_joined(self, data):
+        """Handle 'participant_joined' event."""
+        self.room_liveness.mark_started(data.room.name)
+        self.room_presence.mark_joined(data.room.name, data.participant.identity)
+
+    def _handle_participant_left(self, data):
+        """Handle 'participant_left' event."""
+        self.room_presence.mark_left(data.room.name, data.participant.identity)
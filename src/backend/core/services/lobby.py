@@ -1,6 +1,7 @@
 """Lobby Service"""
 
 import logging
+import time
 import uuid
 from dataclasses import dataclass
 from enum import Enum
@@ -10,6 +11,8 @@ from uuid import UUID
 from django.conf import settings
 from django.core.cache import cache
 
+from django_redis import get_redis_connection
+
 from core import models, utils
 
 logger = logging.getLogger(__name__)
@@ -79,6 +82,10 @@ class LobbyService:
 
     Handles participant entry requests, status management, and notifications
     using cache for state management and LiveKit for real-time updates.
+
+    Participants of a room are tracked in a per-room Redis sorted set, scored
+    by the expiry timestamp of their cache entry, so that listing or clearing
+    a room only costs O(room size) instead of scanning the whole keyspace.
     """
 
     @staticmethod
@@ -86,6 +93,100 @@ class LobbyService:
         """Generate cache key for participant(s) data."""
         return f"{settings.LOBBY_KEY_PREFIX}_{room_id!s}_{participant_id}"
 
+    @staticmethod
+    def _get_index_key(room_id: UUID) -> str:
+        """Generate the Redis key of the room's participants index."""
+        return f"{settings.LOBBY_KEY_PREFIX}_index_{room_id!s}"
+
+    @staticmethod
+    def _get_channel_name(room_id: UUID) -> str:
+        """Generate the Redis pub/sub channel announcing the room's decisions."""
+        return f"{settings.LOBBY_KEY_PREFIX}_decisions_{room_id!s}"
+
+    @staticmethod
+    def _get_long_polls_key() -> str:
+        """Generate the Redis key of the lobby entry requests waiting at once."""
+        return f"{settings.LOBBY_KEY_PREFIX}_long_polls"
+
+    def _acquire_long_poll_slot(self) -> Optional[str]:
+        """Reserve one of the LOBBY_LONG_POLL_MAX_WAITERS long polling slots.
+
+        Waiting requests are tracked in a Redis sorted set shared by all workers,
+        scored by their deadline, so that the slots of crashed workers free
+        themselves. Returns the id of the reserved slot, or None when all slots
+        are taken.
+        """
+
+        now = time.time()
+        slot_id = uuid.uuid4().hex
+        cache_key = self._get_long_polls_key()
+        redis_connection = get_redis_connection("default")
+
+        pipeline = redis_connection.pipeline()
+        pipeline.zremrangebyscore(cache_key, "-inf", now)
+        pipeline.zadd(cache_key, {slot_id: now + settings.LOBBY_LONG_POLL_TIMEOUT})
+        pipeline.expire(cache_key, settings.LOBBY_LONG_POLL_TIMEOUT)
+        pipeline.zcard(cache_key)
+        waiters = pipeline.execute()[-1]
+
+        if waiters > settings.LOBBY_LONG_POLL_MAX_WAITERS:
+            self._release_long_poll_slot(slot_id)
+            return None
+
+        return slot_id
+
+    def _release_long_poll_slot(self, slot_id: str):
+        """Free a long polling slot reserved with _acquire_long_poll_slot."""
+        get_redis_connection("default").zrem(self._get_long_polls_key(), slot_id)
+
+    @staticmethod
+    def _get_index_timeout() -> int:
+        """Return the lifetime of a room index, covering its longest-lived entry."""
+        return max(
+            settings.LOBBY_WAITING_TIMEOUT,
+            settings.LOBBY_ACCEPTED_TIMEOUT,
+            settings.LOBBY_DENIED_TIMEOUT,
+        )
+
+    def _index_participant(
+        self, room_id: UUID, participant_id: str, timeout: int, only_existing=False
+    ) -> None:
+        """Record a participant in the room index, scored by its expiry time.
+
+        When only_existing is set, the score is only updated if the participant
+        is already indexed, so that refreshing an expired entry does not
+        resurrect it.
+        """
+        index_key = self._get_index_key(room_id)
+        pipeline = get_redis_connection("default").pipeline()
+        pipeline.zadd(
+            index_key, {participant_id: time.time() + timeout}, xx=only_existing
+        )
+        pipeline.expire(index_key, self._get_index_timeout())
+        pipeline.execute()
+
+    def _get_indexed_participant_ids(self, room_id: UUID) -> List[str]:
+        """Return ids of non-expired participants indexed for a room.
+
+        Expired members are purged from the index on the way.
+        """
+        index_key = self._get_index_key(room_id)
+        pipeline = get_redis_connection("default").pipeline()
+        pipeline.zremrangebyscore(index_key, "-inf", time.time())
+        pipeline.zrange(index_key, 0, -1)
+        _, participant_ids = pipeline.execute()
+        return [
+            pid.decode() if isinstance(pid, bytes) else pid for pid in participant_ids
+        ]
+
+    def _unindex_participants(self, room_id: UUID, *participant_ids: str) -> None:
+        """Remove participants from the room index."""
+        if not participant_ids:
+            return
+        get_redis_connection("default").zrem(
+            self._get_index_key(room_id), *participant_ids
+        )
+
     @staticmethod
     def _get_or_create_participant_id(request) -> str:
         """Extract unique participant identifier from the request."""
@@ -135,6 +236,7 @@ class LobbyService:
         room: models.Room,
         request,
         username: str,
+        wait: bool = False,
     ) -> Tuple[LobbyParticipant, Optional[Dict]]:
         """Request entry to a room for a participant.
 
@@ -143,7 +245,11 @@ class LobbyService:
 
         Flow:
         1. Check current status
-        2. If waiting, refresh timeout to maintain position
+        2. If waiting, refresh timeout to maintain position, and when long
+           polling is requested and enabled, block until a decision is made
+           or the long poll deadline passes. Requests beyond
+           LOBBY_LONG_POLL_MAX_WAITERS are answered at once, as each waiting
+           request holds a worker.
         3. If unknown, add to waiting list
         4. If accepted, generate LiveKit config
         5. If denied, do nothing.
@@ -185,7 +291,18 @@ class LobbyService:
         elif participant.status == LobbyParticipantStatus.WAITING:
             self.refresh_waiting_status(room.id, participant_id)
 
-        elif participant.status == LobbyParticipantStatus.ACCEPTED:
+            if wait and settings.LOBBY_LONG_POLL_ENABLED:
+                slot_id = self._acquire_long_poll_slot()
+                if slot_id is not None:
+                    try:
+                        participant = (
+                            self.wait_for_decision(room.id, participant_id)
+                            or participant
+                        )
+                    finally:
+                        self._release_long_poll_slot(slot_id)
+
+        if participant.status == LobbyParticipantStatus.ACCEPTED:
             # wrongly named, contains access token to join a room
             livekit_config = utils.generate_livekit_config(
                 room_id=room_id,
@@ -209,6 +326,67 @@ class LobbyService:
         cache.touch(
             self._get_cache_key(room_id, participant_id), settings.LOBBY_WAITING_TIMEOUT
         )
+        self._index_participant(
+            room_id,
+            participant_id,
+            settings.LOBBY_WAITING_TIMEOUT,
+            only_existing=True,
+        )
+
+    def wait_for_decision(
+        self, room_id: UUID, participant_id: str
+    ) -> Optional[LobbyParticipant]:
+        """Block until a decision is made on a waiting participant.
+
+        Subscribes to the room's decision channel, on which
+        handle_participant_entry publishes the id of each participant it
+        updates. The waiting entry is kept alive while parked, and the
+        participant's current state is returned once a decision is announced
+        or LOBBY_LONG_POLL_TIMEOUT elapses.
+        """
+
+        heartbeat_interval = max(settings.LOBBY_WAITING_TIMEOUT / 2, 0.5)
+        deadline = time.monotonic() + settings.LOBBY_LONG_POLL_TIMEOUT
+        last_refresh = time.monotonic()
+
+        pubsub = get_redis_connection("default").pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(self._get_channel_name(room_id))
+
+            # The decision may have been made before subscribing
+            participant = self._get_participant(room_id, participant_id)
+
+            while (
+                participant is not None
+                and participant.status == LobbyParticipantStatus.WAITING
+            ):
+                now = time.monotonic()
+                remaining = deadline - now
+                if remaining <= 0:
+                    break
+
+                # Decisions on other participants of the room are published on
+                # the same channel, so the entry is refreshed on time whether or
+                # not messages arrive.
+                if now - last_refresh >= heartbeat_interval:
+                    self.refresh_waiting_status(room_id, participant_id)
+                    last_refresh = now
+
+                message = pubsub.get_message(
+                    timeout=min(remaining, heartbeat_interval - (now - last_refresh))
+                )
+                if message is None:
+                    continue
+
+                data = message["data"]
+                if isinstance(data, bytes):
+                    data = data.decode()
+                if data == participant_id:
+                    participant = self._get_participant(room_id, participant_id)
+        finally:
+            pubsub.close()
+
+        return participant
 
     def enter(
         self, room_id: UUID, participant_id: str, username: str
@@ -245,6 +423,7 @@ class LobbyService:
             participant.to_dict(),
             timeout=settings.LOBBY_WAITING_TIMEOUT,
         )
+        self._index_participant(room_id, participant_id, settings.LOBBY_WAITING_TIMEOUT)
 
         return participant
 
@@ -269,13 +448,23 @@ class LobbyService:
     def list_waiting_participants(self, room_id: UUID) -> List[dict]:
         """List all waiting participants for a room."""
 
-        pattern = self._get_cache_key(room_id, "*")
-        keys = cache.keys(pattern)
+        participant_ids = self._get_indexed_participant_ids(room_id)
 
-        if not keys:
+        if not participant_ids:
             return []
 
-        data = cache.get_many(keys)
+        keys = {
+            self._get_cache_key(room_id, participant_id): participant_id
+            for participant_id in participant_ids
+        }
+        data = cache.get_many(list(keys))
+
+        # Entries evicted from the cache before their indexed expiry are stale
+        stale_participant_ids = [
+            participant_id
+            for cache_key, participant_id in keys.items()
+            if cache_key not in data
+        ]
 
         waiting_participants = []
         for cache_key, raw_participant in data.items():
@@ -283,10 +472,13 @@ class LobbyService:
                 participant = LobbyParticipant.from_dict(raw_participant)
             except LobbyParticipantParsingError:
                 cache.delete(cache_key)
+                stale_participant_ids.append(keys[cache_key])
                 continue
             if participant.status == LobbyParticipantStatus.WAITING:
                 waiting_participants.append(participant.to_dict())
 
+        self._unindex_participants(room_id, *stale_participant_ids)
+
         return waiting_participants
 
     def handle_participant_entry(
@@ -314,6 +506,11 @@ class LobbyService:
 
         self._update_participant_status(room_id, participant_id, **decision)
 
+        # Wake up the participant's long polling request, if any
+        get_redis_connection("default").publish(
+            self._get_channel_name(room_id), participant_id
+        )
+
     def _update_participant_status(
         self,
         room_id: UUID,
@@ -341,20 +538,27 @@ class LobbyService:
 
         participant.status = status
         cache.set(cache_key, participant.to_dict(), timeout=timeout)
+        self._index_participant(room_id, participant_id, timeout)
 
     def clear_room_cache(self, room_id: UUID) -> None:
         """Clear all participant entries from the cache for a specific room."""
 
-        pattern = self._get_cache_key(room_id, "*")
-        keys = cache.keys(pattern)
+        participant_ids = self._get_indexed_participant_ids(room_id)
+        get_redis_connection("default").delete(self._get_index_key(room_id))
 
-        if not keys:
+        if not participant_ids:
             return
 
-        cache.delete_many(keys)
+        cache.delete_many(
+            [
+                self._get_cache_key(room_id, participant_id)
+                for participant_id in participant_ids
+            ]
+        )
 
     def clear_participant_cache(self, room_id: UUID, participant_id: str) -> None:
         """Clear a given participant entry from the cache for a specific room."""
 
         cache_key = self._get_cache_key(room_id, participant_id)
         cache.delete(cache_key)
+        self._unindex_participants(room_id, participant_id)
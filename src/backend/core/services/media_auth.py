@@ -0,0 +1,51 @@
+"""Cache of the media authorizations granted to Nginx subrequests."""
+
+import hashlib
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+MEDIA_AUTH_KEY_PREFIX = "media_auth"
+
+
+class MediaAuthorizationCache:
+    """Remember for a short time which users were authorized to fetch which media.
+
+    Media players fetch a file with many byte-range requests, and Nginx asks the
+    backend to authorize each of them. Once a user is authorized to fetch a media
+    URL, the object storage key to sign is cached for MEDIA_AUTH_CACHE_TIMEOUT
+    seconds, so that following subrequests skip the database. Denials are never
+    cached, so that a media becoming available is served at once, whereas a
+    revoked access remains authorized until its entry expires.
+    """
+
+    @staticmethod
+    def _get_cache_key(user, original_url: str) -> str:
+        """Generate cache key for the authorization of a user on a media URL."""
+        digest = hashlib.sha256(original_url.encode()).hexdigest()
+        return f"{MEDIA_AUTH_KEY_PREFIX}_{user.pk!s}_{digest}"
+
+    def get(self, user, original_url: Optional[str]) -> Optional[str]:
+        """Return the object storage key the user was authorized to fetch, if any."""
+
+        if (
+            not settings.MEDIA_AUTH_CACHE_TIMEOUT
+            or not original_url
+            or not user.is_authenticated
+        ):
+            return None
+
+        return cache.get(self._get_cache_key(user, original_url))
+
+    def set(self, user, original_url: str, key: str) -> None:
+        """Record that the user is authorized to fetch the media URL."""
+
+        if not settings.MEDIA_AUTH_CACHE_TIMEOUT or not user.is_authenticated:
+            return
+
+        cache.set(
+            self._get_cache_key(user, original_url),
+            key,
+            timeout=settings.MEDIA_AUTH_CACHE_TIMEOUT,
+        )
@@ -3,12 +3,15 @@
 # pylint: disable=too-many-arguments,no-name-in-module,too-many-positional-arguments
 # ruff: noqa:PLR0913
 
+import asyncio
 import json
 import uuid
+from enum import Enum
 from logging import getLogger
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from django.conf import settings
 
-from asgiref.sync import async_to_sync
 from livekit.api import (
     MuteRoomTrackRequest,
     RoomParticipantIdentity,
@@ -20,6 +23,7 @@ from livekit.protocol.models import ParticipantInfo
 from core import utils
 
 from .lobby import LobbyService
+from .room_presence import RoomPresenceService
 
 logger = getLogger(__name__)
 
@@ -32,14 +36,104 @@ class ParticipantNotFoundException(ParticipantsManagementException):
     """Raised when the target participant does not exist in the room."""
 
 
+class BulkOperationStatus(Enum):
+    """Outcome of each operation of a bulk participants management request."""
+
+    SUCCESS = "success"
+    NOT_FOUND = "not_found"
+    ERROR = "error"
+
+
 class ParticipantsManagement:
     """Service for managing participants."""
 
-    @async_to_sync
+    @utils.livekit_async_to_sync
     async def mute(self, room_name: str, identity: str, track_sid: str):
         """Mute a specific audio or video track for a participant in a room."""
+        await self._mute(room_name, identity, track_sid)
+
+    @utils.livekit_async_to_sync
+    async def remove(self, room_name: str, identity: str):
+        """Remove a participant from a room and clear their lobby cache."""
+        await self._remove(room_name, identity)
+
+    @utils.livekit_async_to_sync
+    async def update(  # noqa: PLR0917
+        self,
+        room_name: str,
+        identity: str,
+        metadata: Optional[Dict] = None,
+        attributes: Optional[Dict] = None,
+        permission: Optional[Dict] = None,
+        name: Optional[str] = None,
+    ):
+        """Update participant properties such as metadata, attributes, permissions, or name."""
+        await self._update(room_name, identity, metadata, attributes, permission, name)
+
+    @utils.livekit_async_to_sync
+    async def bulk_mute(
+        self, room_name: str, tracks: List[Dict]
+    ) -> List[BulkOperationStatus]:
+        """Mute many tracks at once, each given by its participant identity and sid.
+
+        Returns the outcome of each mute, in the order of the given tracks.
+        """
+        return await self._run_bulk(
+            self._mute(room_name, track["identity"], track["track_sid"])
+            for track in tracks
+        )
+
+    @utils.livekit_async_to_sync
+    async def bulk_remove(
+        self, room_name: str, identities: List[str]
+    ) -> List[BulkOperationStatus]:
+        """Remove many participants from a room at once.
+
+        Returns the outcome of each removal, in the order of the given identities.
+        """
+        return await self._run_bulk(
+            self._remove(room_name, identity) for identity in identities
+        )
+
+    @utils.livekit_async_to_sync
+    async def bulk_update(
+        self, room_name: str, updates: List[Dict]
+    ) -> List[BulkOperationStatus]:
+        """Update many participants at once.
 
-        lkapi = utils.create_livekit_client()
+        Each update holds the `identity` of the participant and the `metadata`,
+        `attributes`, `permission` and `name` to set, as accepted by `update`.
+        Returns the outcome of each update, in the order of the given updates.
+        """
+        return await self._run_bulk(
+            self._update(room_name, **update) for update in updates
+        )
+
+    @staticmethod
+    async def _run_bulk(operations) -> List[BulkOperationStatus]:
+        """Run operations concurrently over the shared LiveKit client.
+
+        At most PARTICIPANTS_MANAGEMENT_BULK_CONCURRENCY operations are in
+        flight at the same time, so a large room does not flood LiveKit.
+        """
+        semaphore = asyncio.Semaphore(settings.PARTICIPANTS_MANAGEMENT_BULK_CONCURRENCY)
+
+        async def run(operation):
+            async with semaphore:
+                try:
+                    await operation
+                except ParticipantNotFoundException:
+                    return BulkOperationStatus.NOT_FOUND
+                except ParticipantsManagementException:
+                    return BulkOperationStatus.ERROR
+                return BulkOperationStatus.SUCCESS
+
+        return list(await asyncio.gather(*(run(operation) for operation in operations)))
+
+    async def _mute(self, room_name: str, identity: str, track_sid: str):
+        """Mute a track, see `mute`."""
+
+        lkapi = utils.get_livekit_client()
 
         try:
             await lkapi.room.mute_published_track(
@@ -67,12 +161,14 @@ class ParticipantsManagement:
             )
             raise ParticipantsManagementException("Could not mute participant") from e
 
-        finally:
-            await lkapi.aclose()
+    async def _remove(self, room_name: str, identity: str):
+        """Remove a participant, see `remove`.
 
-    @async_to_sync
-    async def remove(self, room_name: str, identity: str):
-        """Remove a participant from a room and clear their lobby cache."""
+        The participant is forgotten from the room presence first, so that it
+        stops passing presence checks even before LiveKit reports it left.
+        """
+
+        RoomPresenceService().mark_left(room_name, identity)
 
         try:
             LobbyService().clear_participant_cache(
@@ -86,7 +182,7 @@ class ParticipantsManagement:
                 exc_info=exc,
             )
 
-        lkapi = utils.create_livekit_client()
+        lkapi = utils.get_livekit_client()
 
         try:
             await lkapi.room.remove_participant(
@@ -108,11 +204,7 @@ class ParticipantsManagement:
             )
             raise ParticipantsManagementException("Could not remove participant") from e
 
-        finally:
-            await lkapi.aclose()
-
-    @async_to_sync
-    async def update(  # noqa: PLR0917
+    async def _update(  # noqa: PLR0917
         self,
         room_name: str,
         identity: str,
@@ -121,9 +213,9 @@ class ParticipantsManagement:
         permission: Optional[Dict] = None,
         name: Optional[str] = None,
     ):
-        """Update participant properties such as metadata, attributes, permissions, or name."""
+        """Update participant properties, see `update`."""
 
-        lkapi = utils.create_livekit_client()
+        lkapi = utils.get_livekit_client()
 
         try:
             await lkapi.room.update_participant(
@@ -153,13 +245,12 @@ class ParticipantsManagement:
             )
             raise ParticipantsManagementException("Could not update participant") from e
 
-        finally:
-            await lkapi.aclose()
-
-    @async_to_sync
-    async def check_if_in_meeting(self, room_name: str, identity: str) -> bool:
+    def check_if_in_meeting(self, room_name: str, identity: str) -> bool:
         """Check whether `identity` is currently a participant in `room_name`.
 
+        Participants known to be connected from webhooks are answered locally,
+        others are looked up in LiveKit and remembered when found connected.
+
         Raises ParticipantsManagementException for unexpected LiveKit errors
         so callers can fail closed rather than silently allowing the action.
         """
@@ -167,7 +258,21 @@ class ParticipantsManagement:
         if not room_name or not identity:
             return False
 
-        lkapi = utils.create_livekit_client()
+        room_presence = RoomPresenceService()
+        if room_presence.is_present(room_name, identity):
+            return True
+
+        is_in_meeting = self._check_if_in_meeting(room_name, identity)
+        if is_in_meeting:
+            room_presence.mark_joined(room_name, identity)
+
+        return is_in_meeting
+
+    @utils.livekit_async_to_sync
+    async def _check_if_in_meeting(self, room_name: str, identity: str) -> bool:
+        """Look `identity` up in the participants of `room_name` in LiveKit."""
+
+        lkapi = utils.get_livekit_client()
 
         try:
             participant = await lkapi.room.get_participant(
@@ -189,9 +294,6 @@ class ParticipantsManagement:
                 "Could not verify participant presence"
             ) from e
 
-        finally:
-            await lkapi.aclose()
-
         return (
             participant is not None
             and participant.state != ParticipantInfo.State.DISCONNECTED
@@ -0,0 +1,46 @@
+"""Room liveness cache, fed by LiveKit room webhooks."""
+
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+ROOM_LIVENESS_KEY_PREFIX = "room_liveness"
+
+
+class RoomLivenessService:
+    """Remember whether LiveKit rooms are running, to skip redundant ListRooms calls.
+
+    Entries are written by the 'room_started' webhook, and by callers which
+    observed a running room through ListRooms, and dropped by the
+    'room_finished' webhook. Finished rooms are never cached, as rooms are
+    created on the fly when the first participant joins: a room started again
+    while its 'room_started' webhook is pending, e.g. when webhooks are handled
+    asynchronously, would be hidden by such an entry. Every entry expires after
+    ROOM_LIVENESS_CACHE_TIMEOUT to bound the cost of a lost webhook.
+    """
+
+    @staticmethod
+    def _get_cache_key(room_name: str) -> str:
+        """Generate cache key for a room liveness."""
+        return f"{ROOM_LIVENESS_KEY_PREFIX}_{room_name}"
+
+    def is_alive(self, room_name: str) -> Optional[bool]:
+        """Return True when the room is known to be running, None otherwise."""
+        return cache.get(self._get_cache_key(room_name))
+
+    def mark_started(self, room_name: str) -> None:
+        """Record that the room is running."""
+        cache.set(
+            self._get_cache_key(room_name),
+            True,
+            timeout=settings.ROOM_LIVENESS_CACHE_TIMEOUT,
+        )
+
+    def mark_finished(self, room_name: str) -> None:
+        """Record that the room has finished, so the next caller asks LiveKit."""
+        cache.delete(self._get_cache_key(room_name))
+
+    def forget(self, room_name: str) -> None:
+        """Drop a stale entry, so the next caller asks LiveKit again."""
+        cache.delete(self._get_cache_key(room_name))
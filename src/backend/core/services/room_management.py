@@ -6,7 +6,6 @@ import json
 from logging import getLogger
 from typing import Dict, Optional
 
-from asgiref.sync import async_to_sync
 from livekit.api import (
     DeleteRoomRequest,
     ListRoomsRequest,
@@ -16,6 +15,8 @@ from livekit.api import (
 
 from core import utils
 
+from .room_liveness import RoomLivenessService
+
 logger = getLogger(__name__)
 
 
@@ -30,8 +31,11 @@ class RoomNotFoundException(RoomManagementException):
 class RoomManagement:
     """Service for managing LiveKit rooms."""
 
-    @async_to_sync
-    async def update_metadata(
+    def __init__(self):
+        """Initialize with required services."""
+        self.room_liveness = RoomLivenessService()
+
+    def update_metadata(
         self,
         room_name: str,
         metadata: Optional[Dict] = None,
@@ -47,7 +51,24 @@ class RoomManagement:
             RoomManagementException: the metadata update otherwise fails.
         """
 
-        lkapi = utils.create_livekit_client()
+        try:
+            self._update_metadata(room_name, metadata, remove_keys)
+        except RoomNotFoundException:
+            self.room_liveness.forget(room_name)
+            raise
+
+        self.room_liveness.mark_started(room_name)
+
+    @utils.livekit_async_to_sync
+    async def _update_metadata(
+        self,
+        room_name: str,
+        metadata: Optional[Dict],
+        remove_keys: Optional[list[str]],
+    ):
+        """Read-modify-write a LiveKit room's metadata."""
+
+        lkapi = utils.get_livekit_client()
 
         try:
             response = await lkapi.room.list_rooms(ListRoomsRequest(names=[room_name]))
@@ -87,10 +108,7 @@ class RoomManagement:
             )
             raise RoomManagementException("Could not update room metadata") from e
 
-        finally:
-            await lkapi.aclose()
-
-    @async_to_sync
+    @utils.livekit_async_to_sync
     async def delete_room(self, room_name: str):
         """Delete a LiveKit room and disconnect all participants.
 
@@ -99,7 +117,7 @@ class RoomManagement:
             RoomManagementException: the deletion otherwise fails.
         """
 
-        lkapi = utils.create_livekit_client()
+        lkapi = utils.get_livekit_client()
 
         try:
             await lkapi.room.delete_room(DeleteRoomRequest(room=room_name))
@@ -114,5 +132,3 @@ class RoomManagement:
 
             logger.exception("Unexpected error deleting room %s", room_name)
             raise RoomManagementException("Could not delete room") from e
-        finally:
-            await lkapi.aclose()
@@ -0,0 +1,63 @@
+"""Room presence cache, fed by LiveKit participant webhooks."""
+
+import time
+
+from django.conf import settings
+
+from django_redis import get_redis_connection
+
+ROOM_PRESENCE_KEY_PREFIX = "room_presence"
+
+
+class RoomPresenceService:
+    """Remember which participants are connected to LiveKit rooms.
+
+    Each room has a Redis sorted set of participant identities, scored by the
+    time their presence expires. Entries are written by the 'participant_joined'
+    webhook, and by callers which observed a connected participant through
+    LiveKit. They are removed by the 'participant_left' and 'room_finished'
+    webhooks, and when a participant is removed from the room. They expire after
+    ROOM_PRESENCE_CACHE_TIMEOUT, which bounds how long a participant who left
+    through a lost or delayed webhook still passes presence checks, e.g. to
+    mute others. Keep it short, as these checks back authorization.
+
+    Only presence is trusted: a participant missing from the set may have
+    joined through a lost webhook, so callers must ask LiveKit instead.
+    """
+
+    @staticmethod
+    def _get_cache_key(room_name: str) -> str:
+        """Generate cache key for the participants of a room."""
+        return f"{ROOM_PRESENCE_KEY_PREFIX}_{room_name}"
+
+    def is_present(self, room_name: str, identity: str) -> bool:
+        """Return whether the participant is known to be connected to the room."""
+
+        if not settings.ROOM_PRESENCE_CACHE_TIMEOUT:
+            return False
+
+        expires_at = get_redis_connection("default").zscore(
+            self._get_cache_key(room_name), identity
+        )
+        return expires_at is not None and expires_at > time.time()
+
+    def mark_joined(self, room_name: str, identity: str) -> None:
+        """Record that the participant is connected to the room."""
+
+        timeout = settings.ROOM_PRESENCE_CACHE_TIMEOUT
+        if not timeout:
+            return
+
+        cache_key = self._get_cache_key(room_name)
+        pipeline = get_redis_connection("default").pipeline()
+        pipeline.zadd(cache_key, {identity: time.time() + timeout})
+        pipeline.expire(cache_key, timeout)
+        pipeline.execute()
+
+    def mark_left(self, room_name: str, identity: str) -> None:
+        """Record that the participant left the room."""
+        get_redis_connection("default").zrem(self._get_cache_key(room_name), identity)
+
+    def clear(self, room_name: str) -> None:
+        """Forget every participant of a finished room."""
+        get_redis_connection("default").delete(self._get_cache_key(room_name))
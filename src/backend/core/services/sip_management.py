@@ -1,8 +1,12 @@
 """SIP management service for managing SIP dispatch rules for room access."""
 
+from collections import defaultdict
+from contextlib import contextmanager
 from logging import getLogger
 
-from asgiref.sync import async_to_sync
+from django.core.cache import cache
+
+from django_redis import get_redis_connection
 from livekit.api import TwirpError, TwirpErrorCode
 from livekit.protocol.sip import (
     CreateSIPDispatchRuleRequest,
@@ -16,6 +20,13 @@ from core import utils
 
 logger = getLogger(__name__)
 
+SIP_DISPATCH_RULES_REGISTRY_KEY = "sip_dispatch_rules"
+SIP_RULE_NAME_PREFIX = "SIP_"
+
+# Seconds a room's dispatch rules stay locked, and may be waited for, covering
+# the few LiveKit calls made while holding the lock
+SIP_DISPATCH_RULES_LOCK_TIMEOUT = 30
+
 
 class SIPException(Exception):
     """Exception raised when SIP operations fail."""
@@ -26,19 +37,72 @@ class DispatchRuleConflictError(SIPException):
 
 
 class SIPManagement:
-    """Service for managing SIP access through the telephony or roomkit system (SIP)."""
+    """Service for managing SIP access through the telephony or roomkit system (SIP).
+
+    The dispatch rules created for each room are recorded in a registry, a Redis
+    hash mapping room IDs to their rule IDs, so that checking a room's rule does
+    not list every rule from LiveKit. The registry is kept in sync on creation
+    and deletion, and any drift (e.g. rules managed outside of this service) is
+    repaired by the reconcile_sip_dispatch_rules management command.
+
+    Changes to the rules of a room, in LiveKit and in the registry, are made
+    under a per-room lock, so that concurrent changes and repairs don't leave
+    a deleted or replaced rule registered.
+    """
 
     def _rule_name(self, room_id):
         """Generate the rule name for a room based on its ID."""
-        return f"SIP_{str(room_id)}"
+        return f"{SIP_RULE_NAME_PREFIX}{str(room_id)}"
+
+    @staticmethod
+    @contextmanager
+    def _lock_room_rules(room_id):
+        """Hold the lock on the dispatch rules of a room."""
+        lock = cache.lock(
+            f"sip_dispatch_rules_lock_{room_id!s}",
+            timeout=SIP_DISPATCH_RULES_LOCK_TIMEOUT,
+        )
+        if not lock.acquire(blocking_timeout=SIP_DISPATCH_RULES_LOCK_TIMEOUT):
+            raise SIPException(f"Could not lock the dispatch rules of room {room_id}")
 
-    @async_to_sync
-    async def create_dispatch_rule(self, room):
+        try:
+            yield
+        finally:
+            if lock.owned():
+                lock.release()
+
+    @staticmethod
+    def _get_registered_rules_ids(room_id):
+        """Return the dispatch rule IDs registered for a room."""
+        rules_ids = get_redis_connection("default").hget(
+            SIP_DISPATCH_RULES_REGISTRY_KEY, str(room_id)
+        )
+        return rules_ids.decode("utf-8").split(",") if rules_ids else []
+
+    @staticmethod
+    def _register_rules_ids(room_id, rules_ids):
+        """Record the dispatch rule IDs of a room, or unregister it when empty."""
+        redis = get_redis_connection("default")
+        if rules_ids:
+            redis.hset(
+                SIP_DISPATCH_RULES_REGISTRY_KEY, str(room_id), ",".join(rules_ids)
+            )
+        else:
+            redis.hdel(SIP_DISPATCH_RULES_REGISTRY_KEY, str(room_id))
+
+    def create_dispatch_rule(self, room):
         """Create a SIP inbound dispatch rule for direct room routing.
 
         Configures livekit-sip to route incoming SIP calls directly to the specified room
         using the room's ID and PIN code for authentication.
         """
+        with self._lock_room_rules(room.pk):
+            rule_id = self._create_dispatch_rule(room)
+            self._register_rules_ids(room.pk, [rule_id])
+
+    @utils.livekit_async_to_sync
+    async def _create_dispatch_rule(self, room):
+        """Create the dispatch rule in LiveKit and return its ID."""
 
         direct_rule = SIPDispatchRule(
             dispatch_rule_direct=SIPDispatchRuleDirect(
@@ -50,10 +114,10 @@ class SIPManagement:
             rule=direct_rule, name=self._rule_name(room.pk)
         )
 
-        lkapi = utils.create_livekit_client()
+        lkapi = utils.get_livekit_client()
 
         try:
-            await lkapi.sip.create_sip_dispatch_rule(create=request)
+            rule = await lkapi.sip.create_sip_dispatch_rule(create=request)
         except TwirpError as e:
             if e.code == TwirpErrorCode.ALREADY_EXISTS:
                 raise DispatchRuleConflictError("Dispatch rule already exists") from e
@@ -62,48 +126,57 @@ class SIPManagement:
             )
             raise SIPException("Could not create dispatch rule") from e
 
-        finally:
-            await lkapi.aclose()
+        return rule.sip_dispatch_rule_id
 
-    async def _list_dispatch_rules_ids(self, room_id):
-        """List SIP dispatch rule IDs for a specific room.
+    async def _list_dispatch_rules(self):
+        """List all SIP dispatch rules existing in LiveKit.
 
-        Fetches all existing SIP dispatch rules and filters them by room name
-        since LiveKit API doesn't support server-side filtering by 'room_name'.
-        This approach is acceptable for moderate scale but may need refactoring
-        for high-volume scenarios.
+        LiveKit API doesn't support server-side filtering by 'room_name', so
+        this is only called to repair the registry.
 
         Note:
             Feature request for server-side filtering: livekit/sip#405
         """
 
-        lkapi = utils.create_livekit_client()
+        lkapi = utils.get_livekit_client()
 
         try:
             existing_rules = await lkapi.sip.list_sip_dispatch_rule(
                 list=ListSIPDispatchRuleRequest()
             )
         except TwirpError as e:
-            logger.exception("Failed to list dispatch rules for room %s", room_id)
             raise SIPException("Could not list dispatch rules") from e
-        finally:
-            await lkapi.aclose()
 
         if not existing_rules or not existing_rules.items:
             return []
 
+        return existing_rules.items
+
+    async def _list_dispatch_rules_ids(self, room_id):
+        """List SIP dispatch rule IDs for a specific room from LiveKit."""
+
+        try:
+            existing_rules = await self._list_dispatch_rules()
+        except SIPException:
+            logger.exception("Failed to list dispatch rules for room %s", room_id)
+            raise
+
         rule_name = self._rule_name(room_id)
 
         return [
             existing_rule.sip_dispatch_rule_id
-            for existing_rule in existing_rules.items
+            for existing_rule in existing_rules
             if existing_rule.name == rule_name
         ]
 
-    @async_to_sync
-    async def has_dispatch_rule(self, room_id):
-        """Check whether at least one dispatch rule exists for a specific room."""
-        return bool(await self._list_dispatch_rules_ids(room_id))
+    @utils.livekit_async_to_sync
+    async def _fetch_dispatch_rules_ids(self, room_id):
+        """Synchronously list SIP dispatch rule IDs for a specific room from LiveKit."""
+        return await self._list_dispatch_rules_ids(room_id)
+
+    def has_dispatch_rule(self, room_id):
+        """Check whether at least one dispatch rule is registered for a specific room."""
+        return bool(self._get_registered_rules_ids(room_id))
 
     def ensure_dispatch_rule(self, room):
         """Create the SIP dispatch rule for a room if it does not already exist.
@@ -115,38 +188,125 @@ class SIPManagement:
         if self.has_dispatch_rule(room.pk):
             return False
 
-        try:
-            self.create_dispatch_rule(room)
-        except DispatchRuleConflictError:
-            return False
+        with self._lock_room_rules(room.pk):
+            # The rule may have been created while waiting for the lock
+            if self.has_dispatch_rule(room.pk):
+                return False
+
+            try:
+                rule_id = self._create_dispatch_rule(room)
+            except DispatchRuleConflictError:
+                # The rule exists in LiveKit but is missing from the registry,
+                # fetch it so that next calls don't hit LiveKit again.
+                self._register_rules_ids(
+                    room.pk, self._fetch_dispatch_rules_ids(room.pk)
+                )
+                return False
+
+            self._register_rules_ids(room.pk, [rule_id])
 
         return True
 
-    @async_to_sync
-    async def delete_dispatch_rule(self, room_id):
-        """Delete all SIP inbound dispatch rules associated with a specific room."""
+    def delete_dispatch_rule(self, room_id):
+        """Delete all SIP inbound dispatch rules associated with a specific room.
 
-        rules_ids = await self._list_dispatch_rules_ids(room_id)
+        Rules missing from the registry are looked up in LiveKit, so that a drifted
+        registry never leaks a rule.
+        """
 
-        if not rules_ids:
-            logger.info("No dispatch rules found for room %s", room_id)
-            return False
+        with self._lock_room_rules(room_id):
+            rules_ids = self._get_registered_rules_ids(
+                room_id
+            ) or self._fetch_dispatch_rules_ids(room_id)
+
+            if not rules_ids:
+                logger.info("No dispatch rules found for room %s", room_id)
+                return False
+
+            if len(rules_ids) > 1:
+                logger.error("Multiple dispatch rules found for room %s", room_id)
+
+            self._delete_dispatch_rules(room_id, rules_ids)
+            self._register_rules_ids(room_id, [])
+
+        return True
 
-        if len(rules_ids) > 1:
-            logger.error("Multiple dispatch rules found for room %s", room_id)
+    @utils.livekit_async_to_sync
+    async def _delete_dispatch_rules(self, room_id, rules_ids):
+        """Delete dispatch rules from LiveKit."""
 
-        lkapi = utils.create_livekit_client()
+        lkapi = utils.get_livekit_client()
         try:
             for rule_id in rules_ids:
                 await lkapi.sip.delete_sip_dispatch_rule(
                     delete=DeleteSIPDispatchRuleRequest(sip_dispatch_rule_id=rule_id)
                 )
 
-            return True
-
         except TwirpError as e:
             logger.exception("Failed to delete dispatch rules for room %s", room_id)
             raise SIPException("Could not delete dispatch rules") from e
 
-        finally:
-            await lkapi.aclose()
+    @utils.livekit_async_to_sync
+    async def _fetch_all_dispatch_rules_ids(self):
+        """List the SIP dispatch rule IDs of all rooms from LiveKit, by room ID."""
+
+        rules_ids = defaultdict(list)
+
+        for existing_rule in await self._list_dispatch_rules():
+            if existing_rule.name.startswith(SIP_RULE_NAME_PREFIX):
+                room_id = existing_rule.name.removeprefix(SIP_RULE_NAME_PREFIX)
+                rules_ids[room_id].append(existing_rule.sip_dispatch_rule_id)
+
+        return rules_ids
+
+    def reconcile_dispatch_rules(self):
+        """Repair the registry drift against the dispatch rules existing in LiveKit.
+
+        Lists every rule from LiveKit once, then registers missing rooms, updates
+        rooms whose rules changed and unregisters rooms without any rule left.
+        Each room is repaired under its lock, and only if its registry entry is
+        unchanged since before the listing: otherwise its rules were changed
+        meanwhile, and the listing is outdated for that room.
+
+        Returns:
+            dict: The number of rooms added, updated and removed from the registry.
+        """
+
+        redis = get_redis_connection("default")
+        registered = {
+            room_id.decode("utf-8"): rules_ids.decode("utf-8")
+            for room_id, rules_ids in redis.hgetall(
+                SIP_DISPATCH_RULES_REGISTRY_KEY
+            ).items()
+        }
+
+        expected = {
+            room_id: ",".join(sorted(rules_ids))
+            for room_id, rules_ids in self._fetch_all_dispatch_rules_ids().items()
+        }
+
+        counts = {"added": 0, "updated": 0, "removed": 0}
+        for room_id in registered.keys() | expected.keys():
+            rules_ids = expected.get(room_id)
+            if registered.get(room_id) == rules_ids:
+                continue
+
+            with self._lock_room_rules(room_id):
+                current_rules_ids = redis.hget(SIP_DISPATCH_RULES_REGISTRY_KEY, room_id)
+                if current_rules_ids is not None:
+                    current_rules_ids = current_rules_ids.decode("utf-8")
+                if current_rules_ids != registered.get(room_id):
+                    logger.info(
+                        "Dispatch rules of room %s changed while reconciling",
+                        room_id,
+                    )
+                    continue
+
+                if rules_ids is None:
+                    redis.hdel(SIP_DISPATCH_RULES_REGISTRY_KEY, room_id)
+                    counts["removed"] += 1
+                else:
+                    redis.hset(SIP_DISPATCH_RULES_REGISTRY_KEY, room_id, rules_ids)
+                    counts["updated" if room_id in registered else "added"] += 1
+
+        return counts
@@ -4,7 +4,6 @@ from logging import getLogger
 
 from django.conf import settings
 
-from asgiref.sync import async_to_sync
 from livekit.protocol.agent_dispatch import CreateAgentDispatchRequest
 
 from core import utils
@@ -19,11 +18,11 @@ class SubtitleException(Exception):
 class SubtitleService:
     """Service for managing subtitle agents in LiveKit rooms."""
 
-    @async_to_sync
+    @utils.livekit_async_to_sync
     async def start_subtitle(self, room):
         """Start subtitle agent for the specified room."""
 
-        lkapi = utils.create_livekit_client()
+        lkapi = utils.get_livekit_client()
 
         try:
             # Transcriber agent prevents duplicate subtitle agents per room
@@ -37,10 +36,7 @@ class SubtitleService:
             logger.exception("Failed to create agent dispatch for room %s", room.id)
             raise SubtitleException("Failed to create subtitle agent") from e
 
-        finally:
-            await lkapi.aclose()
-
-    @async_to_sync
+    @utils.livekit_async_to_sync
     async def stop_subtitle(self, room) -> None:
         """Stop subtitle agent for the specified room."""
 
@@ -0,0 +1,85 @@
+"""Team membership of users, resolved by a pluggable provider and cached per user."""
+
+from functools import lru_cache
+from typing import List, Protocol
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+TEAM_MEMBERSHIP_KEY_PREFIX = "team_membership"
+
+
+class TeamMembershipProviderProtocol(Protocol):
+    """Interface for the sources of users' team membership."""
+
+    def get_teams(self, user) -> List[str]:
+        """Return the teams in which the user is.
+
+        Args:
+            user: The user whose teams are requested
+
+        Returns:
+            List[str]: The team identifiers, as used in accesses' team field
+        """
+
+
+class NoTeamMembershipProvider:
+    """Default provider, for which users belong to no team.
+
+    Teams pushed from OIDC claims or by a directory sync are still served from
+    the cache, see TeamMembershipService.set_teams.
+    """
+
+    def get_teams(self, user) -> List[str]:  # pylint: disable=unused-argument
+        """Return no team."""
+        return []
+
+
+@lru_cache(maxsize=1)
+def get_team_membership_provider() -> TeamMembershipProviderProtocol:
+    """Return cached instance of configured team membership provider."""
+    provider_cls = import_string(settings.TEAM_MEMBERSHIP_PROVIDER_CLASS)
+    return provider_cls()
+
+
+class TeamMembershipService:
+    """Resolve the teams of users, with one cache entry per user.
+
+    Teams fetched from the provider are cached for TEAM_MEMBERSHIP_CACHE_TIMEOUT
+    seconds, which bounds how stale a remote source can get. Teams pushed with
+    set_teams, by an OIDC login or a directory sync, replace the cached ones for
+    TEAM_MEMBERSHIP_PUSHED_CACHE_TIMEOUT seconds: a team removed at the source
+    stops granting access once they expire, even if they are never pushed
+    again. The provider is then asked for the teams of the user. Callers knowing
+    that a membership changed drop it explicitly with invalidate.
+    """
+
+    @staticmethod
+    def _get_cache_key(user) -> str:
+        """Generate cache key for the teams of a user."""
+        return f"{TEAM_MEMBERSHIP_KEY_PREFIX}_{user.pk!s}"
+
+    def get_teams(self, user) -> List[str]:
+        """Return the sorted teams of a user, from the cache or the provider."""
+
+        cache_key = self._get_cache_key(user)
+        teams = cache.get(cache_key)
+
+        if teams is None:
+            teams = sorted(set(get_team_membership_provider().get_teams(user)))
+            cache.set(cache_key, teams, timeout=settings.TEAM_MEMBERSHIP_CACHE_TIMEOUT)
+
+        return teams
+
+    def set_teams(self, user, teams) -> None:
+        """Record the teams of a user, as pushed by their source of truth."""
+        cache.set(
+            self._get_cache_key(user),
+            sorted(set(teams)),
+            timeout=settings.TEAM_MEMBERSHIP_PUSHED_CACHE_TIMEOUT,
+        )
+
+    def invalidate(self, user) -> None:
+        """Drop the cached teams of a user, so they are fetched again."""
+        cache.delete(self._get_cache_key(user))
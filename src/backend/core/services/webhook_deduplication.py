@@ -0,0 +1,95 @@
+"""Deduplication of LiveKit webhook events."""
+
+from django.conf import settings
+from django.core.cache import cache
+
+WEBHOOK_DEDUPLICATION_KEY_PREFIX = "livekit_webhook"
+
+
+class WebhookDeduplicationService:
+    """Drop LiveKit webhook events already handled within a time window.
+
+    An event is a duplicate when its id was already claimed, which happens when
+    LiveKit retries a webhook. Room lifecycle events are also duplicates when the
+    same room session already emitted them, as LiveKit sends them from each node
+    hosting the room, with distinct ids.
+
+    Claims are kept for LIVEKIT_WEBHOOK_DEDUPLICATION_WINDOW seconds, and shared
+    by all processes through the cache.
+    """
+
+    ROOM_SCOPED_EVENT_TYPES = ("room_started", "room_finished")
+
+    EVENT_ID = "event_id"
+    ROOM_EVENT = "room_event"
+
+    @staticmethod
+    def _get_claim_keys(data):
+        """Return the cache keys claimed by an event, with their duplicate reason."""
+
+        keys = []
+
+        if data.id:
+            keys.append(
+                (
+                    WebhookDeduplicationService.EVENT_ID,
+                    f"{WEBHOOK_DEDUPLICATION_KEY_PREFIX}_event_{data.id}",
+                )
+            )
+
+        if data.event in WebhookDeduplicationService.ROOM_SCOPED_EVENT_TYPES:
+            # A room session is identified by its sid, so that a room started again
+            # after finishing is not mistaken for a duplicate.
+            room = data.room.sid or data.room.name
+            keys.append(
+                (
+                    WebhookDeduplicationService.ROOM_EVENT,
+                    f"{WEBHOOK_DEDUPLICATION_KEY_PREFIX}_room_{room}_{data.event}",
+                )
+            )
+
+        return keys
+
+    @staticmethod
+    def _get_counter_key(reason):
+        """Generate cache key for the duplicates counter of a reason."""
+        return f"{WEBHOOK_DEDUPLICATION_KEY_PREFIX}_duplicates_{reason}"
+
+    def claim(self, data) -> bool:
+        """Claim an event for handling, returning False if it's a duplicate."""
+
+        timeout = settings.LIVEKIT_WEBHOOK_DEDUPLICATION_WINDOW
+        if not timeout:
+            return True
+
+        claimed_keys = []
+
+        for reason, key in self._get_claim_keys(data):
+            if not cache.add(key, True, timeout=timeout):
+                cache.delete_many(claimed_keys)
+                self._count_duplicate(reason)
+                return False
+            claimed_keys.append(key)
+
+        return True
+
+    def release(self, data) -> None:
+        """Release the claims of an event whose handling failed, so it can be retried."""
+        cache.delete_many([key for _reason, key in self._get_claim_keys(data)])
+
+    def _count_duplicate(self, reason):
+        """Increment the counter of duplicates dropped for a reason."""
+
+        key = self._get_counter_key(reason)
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+    def get_duplicate_counts(self) -> dict:
+        """Return the number of duplicate events dropped, by reason."""
+
+        reasons = (self.EVENT_ID, self.ROOM_EVENT)
+        counts = cache.get_many([self._get_counter_key(reason) for reason in reasons])
+
+        return {
+            reason: counts.get(self._get_counter_key(reason), 0) for reason in reasons
+        }
@@ -2,8 +2,10 @@
 
 from core.tasks.connection_test import delete_connection_test_room
 from core.tasks.file import process_file_deletion
+from core.tasks.livekit_events import process_livekit_webhook_events
 
 __all__ = (
     "delete_connection_test_room",
     "process_file_deletion",
+    "process_livekit_webhook_events",
 )
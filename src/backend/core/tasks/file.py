@@ -6,7 +6,11 @@ import logging
 
 from django.core.files.storage import default_storage
 
-from core.models import File
+from core.models import File, FileUploadStateChoices
+from core.services.file_upload import (
+    FileUploadVerificationService,
+    FileVerificationError,
+)
 from core.tasks._task import task
 
 logger = logging.getLogger(__name__)
@@ -34,3 +38,26 @@ def process_file_deletion(file_id):
     default_storage.delete(file.file_key)
 
     file.delete()
+
+
+@task
+def process_file_upload_verification(file_id):
+    """
+    Verify a file whose upload ended and mark it as ready.
+    Files not complying with the upload restrictions are rejected.
+    """
+    logger.info("Processing upload verification for %s", file_id)
+    try:
+        file = File.objects.get(
+            id=file_id, upload_state=FileUploadStateChoices.ANALYZING
+        )
+    except File.DoesNotExist:
+        logger.error("Item %s does not exist or is not being analyzed", file_id)
+        return
+
+    verification_service = FileUploadVerificationService()
+    try:
+        with verification_service.analyzing(file):
+            verification_service.verify(file)
+    except FileVerificationError as e:
+        logger.info("File %s rejected: %s", file_id, e.code)
@@ -0,0 +1,69 @@
+"""Tasks related to LiveKit webhook events."""
+
+import functools
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from redis.exceptions import LockError
+
+from core.services.livekit_events import LiveKitEventsService
+from core.tasks._task import task
+
+logger = logging.getLogger(__name__)
+
+
+@task
+def process_livekit_webhook_events(room_name: str):
+    """Handle the pending webhook events of a room, in the order LiveKit emitted them.
+
+    A lock per room keeps a single worker processing a room at a time. The holder
+    also handles the events stored while it runs, so a task failing to get the
+    lock has nothing left to do. The lock is extended before each event, so that
+    it only expires if a single event outlasts
+    LIVEKIT_WEBHOOK_PROCESSING_LOCK_TIMEOUT. Events stored between the last check
+    of the holder and the release of its lock are handled once it's released.
+    The room is scheduled again when the failed event holding back its later
+    events is due to be retried.
+    """
+    livekit_events_service = LiveKitEventsService()
+
+    while True:
+        lock = cache.lock(
+            f"livekit_webhook_events_{room_name}",
+            timeout=settings.LIVEKIT_WEBHOOK_PROCESSING_LOCK_TIMEOUT,
+        )
+
+        if not lock.acquire(blocking=False):
+            logger.info("Webhook events of room '%s' are being processed", room_name)
+            return
+
+        try:
+            retry_delay = livekit_events_service.process_pending_events(
+                room_name,
+                heartbeat=functools.partial(
+                    lock.extend,
+                    settings.LIVEKIT_WEBHOOK_PROCESSING_LOCK_TIMEOUT,
+                    replace_ttl=True,
+                ),
+            )
+        except LockError:
+            logger.error(
+                "Lock of room '%s' expired while processing its webhook events",
+                room_name,
+            )
+            return
+        finally:
+            if lock.owned():
+                lock.release()
+
+        if not livekit_events_service.has_due_events(room_name):
+            break
+
+    # Without Celery, tasks run synchronously and cannot be delayed: failed events
+    # are retried along with the next webhook event of the room.
+    if retry_delay is not None and settings.CELERY_ENABLED:
+        process_livekit_webhook_events.apply_async(
+            args=(room_name,), countdown=retry_delay
+        )
@@ -5,11 +5,15 @@ from unittest import mock
 from django.core.exceptions import ImproperlyConfigured, SuspiciousOperation
 
 import pytest
+from lasuite.oidc_login.backends import (
+    OIDCAuthenticationBackend as LaSuiteOIDCAuthenticationBackend,
+)
 
 from core import models
 from core.authentication.backends import OIDCAuthenticationBackend
 from core.factories import UserFactory
 from core.services import marketing
+from core.services.team_membership import TeamMembershipService
 
 pytestmark = pytest.mark.django_db
 
@@ -501,6 +505,53 @@ def test_marketing_signup_existing_user(
     mock_signup.assert_not_called()
 
 
+@pytest.mark.parametrize(
+    "claimed_teams,expected_teams",
+    [
+        (["team2", "team1"], ["team1", "team2"]),
+        ("team1", ["team1"]),
+        (None, []),
+    ],
+)
+@mock.patch.object(LaSuiteOIDCAuthenticationBackend, "get_userinfo")
+def test_authentication_teams_claim(
+    mock_get_userinfo, claimed_teams, expected_teams, settings
+):
+    """Teams claimed in user info should be pushed to the team membership cache."""
+    settings.OIDC_USERINFO_TEAMS_FIELD = "groups"
+
+    klass = OIDCAuthenticationBackend()
+    db_user = UserFactory()
+    mock_get_userinfo.return_value = {
+        "sub": db_user.sub,
+        "email": db_user.email,
+        "groups": claimed_teams,
+    }
+
+    with mock.patch.object(TeamMembershipService, "set_teams") as mock_set_teams:
+        user = klass.get_or_create_user("test-token", None, None)
+
+    assert user == db_user
+    mock_set_teams.assert_called_once_with(user, mock.ANY)
+    assert sorted(mock_set_teams.call_args[0][1]) == expected_teams
+
+
+@mock.patch.object(LaSuiteOIDCAuthenticationBackend, "get_userinfo")
+def test_authentication_teams_claim_disabled(mock_get_userinfo):
+    """Teams should not be pushed when no teams claim is configured."""
+    klass = OIDCAuthenticationBackend()
+    mock_get_userinfo.return_value = {
+        "sub": "123",
+        "email": "test@example.com",
+        "groups": ["team1"],
+    }
+
+    with mock.patch.object(TeamMembershipService, "set_teams") as mock_set_teams:
+        klass.get_or_create_user("test-token", None, None)
+
+    mock_set_teams.assert_not_called()
+
+
 @mock.patch("core.authentication.backends.get_marketing_service")
 def test_signup_to_marketing_email_success(mock_marketing):
     """Test successful marketing signup."""
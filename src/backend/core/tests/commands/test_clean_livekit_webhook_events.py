@@ -0,0 +1,59 @@
+"""Tests for the clean_livekit_webhook_events management command."""
+
+import uuid
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+import pytest
+
+from core import models
+
+pytestmark = pytest.mark.django_db
+
+
+def _event(status, processed_days_ago=None):
+    """Store a webhook event, handled the given number of days ago."""
+    return models.LiveKitWebhookEvent.objects.create(
+        event_id=str(uuid.uuid4()),
+        event_type="participant_joined",
+        room_name="room",
+        emitted_at=1,
+        payload="{}",
+        status=status,
+        processed_at=(
+            timezone.now() - timedelta(days=processed_days_ago)
+            if processed_days_ago is not None
+            else None
+        ),
+    )
+
+
+def test_clean_livekit_webhook_events(settings):
+    """Events handled before the retention period are deleted, others are kept."""
+    settings.LIVEKIT_WEBHOOK_EVENTS_RETENTION_DAYS = 7
+    _event("processed", processed_days_ago=8)
+    _event("failed", processed_days_ago=8)
+    kept = [
+        _event("processed", processed_days_ago=6),
+        _event("failed", processed_days_ago=1),
+        _event("pending"),
+    ]
+
+    stdout = StringIO()
+    call_command("clean_livekit_webhook_events", stdout=stdout)
+
+    assert set(models.LiveKitWebhookEvent.objects.all()) == set(kept)
+    assert "Deleted 2 LiveKit webhook event(s)." in stdout.getvalue()
+
+
+def test_clean_livekit_webhook_events_days():
+    """The retention period can be given as argument."""
+    _event("processed", processed_days_ago=2)
+    kept = _event("processed", processed_days_ago=0)
+
+    call_command("clean_livekit_webhook_events", days=1, stdout=StringIO())
+
+    assert list(models.LiveKitWebhookEvent.objects.all()) == [kept]
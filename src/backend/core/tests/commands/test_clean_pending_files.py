@@ -1,6 +1,8 @@
 """Tests for the clean_pending_files management command."""
 
 from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest.mock import patch
 
 from django.core.files.storage import default_storage
 from django.core.management import call_command
@@ -88,3 +90,41 @@ def test_clean_pending_files_custom_hours():
 
     assert not models.File.objects.filter(pk=file.pk).exists()
     assert not default_storage.exists(file.file_key)
+
+
+def test_clean_pending_files_deletes_temporary_objects():
+    """The objects uploaded to the temporary key of stale files should be deleted."""
+    old_date = timezone.now() - timedelta(hours=49)
+    file = factories.FileFactory(type=models.FileTypeChoices.BACKGROUND_IMAGE)
+    default_storage.save(file.temporary_file_key, BytesIO(b"hello"))
+    models.File.objects.filter(pk=file.pk).update(created_at=old_date)
+
+    out = StringIO()
+    call_command("clean_pending_files", stdout=out)
+
+    assert "1 file(s) cleaned, 0 failed" in out.getvalue()
+    assert "Cleaned 1 stale pending file(s)." in out.getvalue()
+    assert not models.File.objects.filter(pk=file.pk).exists()
+    assert not default_storage.exists(file.temporary_file_key)
+
+
+def test_clean_pending_files_storage_errors():
+    """Files whose objects could not be deleted should be left hard deleted."""
+    old_date = timezone.now() - timedelta(hours=49)
+    file = factories.FileFactory(type=models.FileTypeChoices.BACKGROUND_IMAGE)
+    models.File.objects.filter(pk=file.pk).update(created_at=old_date)
+
+    err = StringIO()
+    s3_client = default_storage.connection.meta.client
+    with patch.object(
+        s3_client,
+        "delete_objects",
+        return_value={"Errors": [{"Key": file.temporary_file_key, "Message": "Oops"}]},
+    ):
+        call_command("clean_pending_files", stdout=StringIO(), stderr=err)
+
+    assert "Failed to clean 1 file(s)" in err.getvalue()
+
+    file.refresh_from_db()
+    assert file.deleted_at is not None
+    assert file.hard_deleted_at is not None
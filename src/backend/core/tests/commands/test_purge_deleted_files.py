@@ -1,18 +1,18 @@
 """Tests for the purge_deleted_files management command."""
 
 from datetime import timedelta
-from io import StringIO
+from io import BytesIO, StringIO
 from random import randint
 from unittest.mock import patch
 
 from django.core.files.storage import default_storage
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.utils import timezone
 
 import pytest
 
 from core import factories, models
-from core.tasks.file import process_file_deletion
 
 pytestmark = pytest.mark.django_db
 
@@ -63,16 +63,11 @@ def test_purge_deleted_files_success(settings):
     hard_deleted_file.soft_delete()
     hard_deleted_file.hard_delete()
 
-    with patch(
-        "core.management.commands.purge_deleted_files.process_file_deletion.delay",
-        side_effect=process_file_deletion,
-    ) as mock_delay:
-        call_command("purge_deleted_files", stdout=out)
+    default_storage.save(purgeable_file.temporary_file_key, BytesIO(b"hello"))
+
+    call_command("purge_deleted_files", stdout=out)
 
     assert "Purged 2 deleted file(s)." in out.getvalue()
-    assert mock_delay.call_count == 2
-    called_ids = {call.args[0] for call in mock_delay.call_args_list}
-    assert called_ids == {purgeable_file.id, hard_deleted_file.id}
 
     assert models.File.objects.filter(id=not_deleted_file.id).exists()
     assert models.File.objects.filter(id=not_purgeable_file.id).exists()
@@ -83,3 +78,96 @@ def test_purge_deleted_files_success(settings):
     assert default_storage.exists(not_purgeable_file.file_key)
     assert not default_storage.exists(purgeable_file.file_key)
     assert not default_storage.exists(hard_deleted_file.file_key)
+    assert not default_storage.exists(purgeable_file.temporary_file_key)
+
+
+def _create_hard_deleted_files(count):
+    """Create hard deleted files, with their object uploaded."""
+    files = factories.FileFactory.create_batch(
+        count,
+        type=models.FileTypeChoices.BACKGROUND_IMAGE,
+        upload_bytes=b"hello",
+    )
+    for file in files:
+        file.soft_delete()
+        file.hard_delete()
+    return sorted(files, key=lambda file: file.pk)
+
+
+def test_purge_deleted_files_batches(django_assert_num_queries):
+    """
+    Files should be purged by batches, with one DeleteObjects request and a
+    constant number of queries per batch.
+    """
+    files = _create_hard_deleted_files(5)
+    out = StringIO()
+
+    s3_client = default_storage.connection.meta.client
+    with (
+        patch.object(
+            s3_client, "delete_objects", wraps=s3_client.delete_objects
+        ) as delete_objects,
+        django_assert_num_queries(10),
+    ):
+        call_command("purge_deleted_files", "--batch-size=2", stdout=out)
+
+    assert delete_objects.call_count == 3
+    assert [
+        len(call.kwargs["Delete"]["Objects"]) for call in delete_objects.call_args_list
+    ] == [4, 4, 2]
+
+    output = out.getvalue()
+    assert "2 file(s) purged, 0 failed" in output
+    assert f"last ID: {files[1].pk!s}" in output
+    assert "5 file(s) purged, 0 failed" in output
+    assert f"last ID: {files[4].pk!s}" in output
+    assert "Purged 5 deleted file(s)." in output
+
+    assert not models.File.objects.exists()
+    for file in files:
+        assert not default_storage.exists(file.file_key)
+
+
+def test_purge_deleted_files_resume_after():
+    """The purge should resume after the file ID reported by a previous run."""
+    files = _create_hard_deleted_files(3)
+    out = StringIO()
+
+    call_command("purge_deleted_files", f"--after={files[0].pk!s}", stdout=out)
+
+    assert "Purged 2 deleted file(s)." in out.getvalue()
+    assert list(models.File.objects.values_list("pk", flat=True)) == [files[0].pk]
+    assert default_storage.exists(files[0].file_key)
+
+
+def test_purge_deleted_files_storage_errors():
+    """Files whose objects could not be deleted should be kept to purge them again."""
+    files = _create_hard_deleted_files(2)
+    out = StringIO()
+    err = StringIO()
+
+    s3_client = default_storage.connection.meta.client
+    with patch.object(
+        s3_client,
+        "delete_objects",
+        return_value={
+            "Errors": [
+                {"Key": files[0].file_key, "Code": "InternalError", "Message": "Oops"}
+            ]
+        },
+    ):
+        call_command("purge_deleted_files", stdout=out, stderr=err)
+
+    assert "Purged 1 deleted file(s)." in out.getvalue()
+    assert "Failed to purge 1 file(s)" in err.getvalue()
+    assert list(models.File.objects.values_list("pk", flat=True)) == [files[0].pk]
+
+    file = models.File.objects.get()
+    assert file.hard_deleted_at is not None
+
+
+@pytest.mark.parametrize("batch_size", [0, 501])
+def test_purge_deleted_files_invalid_batch_size(batch_size):
+    """Batches should fit in a single DeleteObjects request."""
+    with pytest.raises(CommandError, match="between 1 and 500"):
+        call_command("purge_deleted_files", f"--batch-size={batch_size:d}")
@@ -0,0 +1,50 @@
+"""Tests for the reconcile_sip_dispatch_rules management command."""
+
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+
+import pytest
+
+from core.services.sip_management import SIPException
+
+
+@mock.patch("core.management.commands.reconcile_sip_dispatch_rules.SIPManagement")
+def test_reconcile_sip_dispatch_rules_telephony_disabled(mock_sip_management, settings):
+    """Nothing happens when neither telephony nor roomkit are enabled."""
+    settings.ROOM_TELEPHONY_ENABLED = False
+    settings.ROOMKIT_ENABLED = False
+
+    call_command("reconcile_sip_dispatch_rules")
+
+    mock_sip_management.assert_not_called()
+
+
+@mock.patch("core.management.commands.reconcile_sip_dispatch_rules.SIPManagement")
+def test_reconcile_sip_dispatch_rules(mock_sip_management, settings):
+    """The registry is reconciled when telephony is enabled."""
+    settings.ROOM_TELEPHONY_ENABLED = True
+    mock_sip_management.return_value.reconcile_dispatch_rules.return_value = {
+        "added": 2,
+        "updated": 1,
+        "removed": 3,
+    }
+    stdout = StringIO()
+
+    call_command("reconcile_sip_dispatch_rules", stdout=stdout)
+
+    mock_sip_management.return_value.reconcile_dispatch_rules.assert_called_once()
+    assert "2 added, 1 updated, 3 removed" in stdout.getvalue()
+
+
+@mock.patch("core.management.commands.reconcile_sip_dispatch_rules.SIPManagement")
+def test_reconcile_sip_dispatch_rules_failure(mock_sip_management, settings):
+    """The command fails when LiveKit rules can't be listed."""
+    settings.ROOMKIT_ENABLED = True
+    mock_sip_management.return_value.reconcile_dispatch_rules.side_effect = (
+        SIPException("Could not list dispatch rules")
+    )
+
+    with pytest.raises(CommandError, match="Could not list SIP dispatch rules"):
+        call_command("reconcile_sip_dispatch_rules")
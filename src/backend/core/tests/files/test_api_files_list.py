@@ -93,6 +93,7 @@ def test_api_files_list_format():
             "filename": file.filename,
             "size": None,
             "description": None,
+            "rejection_reason": None,
             "deleted_at": None,
             "hard_deleted_at": None,
             "abilities": {
@@ -158,3 +159,38 @@ def test_api_files_list_pagination(
     for item in content["results"]:
         file_ids.remove(item["id"])
     assert file_ids == []
+
+
+def test_api_files_list_pagination_cursor():
+    """
+    Users passing a cursor should walk their files by creation date, whatever the
+    ordering requested, without counting them.
+    """
+    user = factories.UserFactory()
+
+    client = APIClient()
+    client.force_login(user)
+
+    file_ids = [
+        str(file.id)
+        for file in factories.FileFactory.create_batch(
+            3,
+            creator=user,
+            type=models.FileTypeChoices.BACKGROUND_IMAGE,
+        )
+    ]
+
+    response = client.get("/api/v1.0/files/?cursor=&page_size=2&ordering=title")
+
+    assert response.status_code == 200
+    content = response.json()
+    assert "count" not in content
+    assert content["previous"] is None
+    assert [item["id"] for item in content["results"]] == file_ids[:0:-1]
+
+    response = client.get(content["next"])
+
+    assert response.status_code == 200
+    content = response.json()
+    assert content["next"] is None
+    assert [item["id"] for item in content["results"]] == file_ids[:1]
@@ -143,3 +143,63 @@ def test_api_files_media_auth_own_file_deleted():
     )
 
     assert response.status_code == 403
+
+
+def test_api_files_media_auth_num_queries(django_assert_num_queries):
+    """
+    Authorizing a file should fetch it in a single query, and following
+    byte-range requests should be authorized from the cache.
+    """
+    user = factories.UserFactory()
+
+    file = factories.FileFactory(
+        type=models.FileTypeChoices.BACKGROUND_IMAGE,
+        update_upload_state=models.FileUploadStateChoices.READY,
+        creator=user,
+    )
+
+    client = APIClient()
+    client.force_login(user)
+
+    original_url = f"http://localhost/media/{file.file_key:s}"
+
+    # The user, then the file
+    with django_assert_num_queries(2):
+        response = client.get(
+            "/api/v1.0/files/media-auth/", HTTP_X_ORIGINAL_URL=original_url
+        )
+    assert response.status_code == 200
+
+    # Only the user
+    with django_assert_num_queries(1):
+        response = client.get(
+            "/api/v1.0/files/media-auth/", HTTP_X_ORIGINAL_URL=original_url
+        )
+    assert response.status_code == 200
+    assert "AWS4-HMAC-SHA256 Credential=" in response["Authorization"]
+
+
+def test_api_files_media_auth_cached_per_user():
+    """A file authorized to its creator should not be authorized to other users."""
+    user = factories.UserFactory()
+
+    file = factories.FileFactory(
+        type=models.FileTypeChoices.BACKGROUND_IMAGE,
+        update_upload_state=models.FileUploadStateChoices.READY,
+        creator=user,
+    )
+
+    original_url = f"http://localhost/media/{file.file_key:s}"
+
+    client = APIClient()
+    client.force_login(user)
+    response = client.get(
+        "/api/v1.0/files/media-auth/", HTTP_X_ORIGINAL_URL=original_url
+    )
+    assert response.status_code == 200
+
+    client.force_login(factories.UserFactory())
+    response = client.get(
+        "/api/v1.0/files/media-auth/", HTTP_X_ORIGINAL_URL=original_url
+    )
+    assert response.status_code == 403
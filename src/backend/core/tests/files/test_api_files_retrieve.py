@@ -0,0 +1,107 @@
+"""
+Tests for files API endpoint in meet's core app: retrieve
+"""
+
+import pytest
+from rest_framework.test import APIClient
+
+from core import factories
+from core.models import FileUploadStateChoices
+
+pytestmark = pytest.mark.django_db
+
+
+def test_api_files_retrieve_anonymous():
+    """Anonymous users should not be allowed to retrieve a file."""
+    file = factories.FileFactory()
+
+    response = APIClient().get(f"/api/v1.0/files/{file.id!s}/")
+
+    assert response.status_code == 401
+
+
+def test_api_files_retrieve_other_user():
+    """Users should not be allowed to retrieve the files of other users."""
+    user = factories.UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    file = factories.FileFactory()
+
+    response = client.get(f"/api/v1.0/files/{file.id!s}/")
+
+    assert response.status_code == 404
+
+
+def test_api_files_retrieve_upload_state():
+    """Creators should be able to poll the upload state of their files."""
+    user = factories.UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    file = factories.FileFactory(
+        creator=user, update_upload_state=FileUploadStateChoices.ANALYZING
+    )
+
+    response = client.get(f"/api/v1.0/files/{file.id!s}/")
+
+    assert response.status_code == 200
+    assert response.json()["id"] == str(file.id)
+    assert response.json()["upload_state"] == "analyzing"
+
+
+def test_api_files_retrieve_soft_deleted():
+    """Soft deleted files should not be retrieved."""
+    user = factories.UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    file = factories.FileFactory(creator=user)
+    file.soft_delete()
+
+    response = client.get(f"/api/v1.0/files/{file.id!s}/")
+
+    assert response.status_code == 404
+
+
+def test_api_files_retrieve_rejected():
+    """Rejected files should be retrieved by their creator, with the reason."""
+    user = factories.UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    file = factories.FileFactory(
+        creator=user, update_upload_state=FileUploadStateChoices.REJECTED
+    )
+    file.rejection_reason = "file_type_not_allowed"
+    file.save()
+    file.soft_delete()
+
+    response = client.get(f"/api/v1.0/files/{file.id!s}/")
+
+    assert response.status_code == 200
+    assert response.json()["upload_state"] == "rejected"
+    assert response.json()["rejection_reason"] == "file_type_not_allowed"
+    assert response.json()["url"] is None
+
+    other_client = APIClient()
+    other_client.force_login(factories.UserFactory())
+    response = other_client.get(f"/api/v1.0/files/{file.id!s}/")
+
+    assert response.status_code == 404
+
+
+def test_api_files_delete_rejected():
+    """Rejected files should not be deleted again by their creator."""
+    user = factories.UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    file = factories.FileFactory(
+        creator=user, update_upload_state=FileUploadStateChoices.REJECTED
+    )
+    file.soft_delete()
+
+    response = client.delete(f"/api/v1.0/files/{file.id!s}/")
+
+    assert response.status_code == 404
@@ -3,10 +3,12 @@
 import logging
 from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from unittest import mock
 
 from django.core.files.storage import default_storage
 
 import pytest
+from botocore.exceptions import ClientError
 from rest_framework.test import APIClient
 
 from core import factories, models
@@ -98,11 +100,156 @@ def test_api_file_upload_ended_success(settings):
     assert response.json()["mimetype"] == "text/plain"
 
 
+def test_api_file_upload_ended_copies_once_after_verification(settings):
+    """
+    The uploaded object should be verified in place, then copied once to its final
+    key with the detected content type, and its temporary object deleted.
+    """
+    settings.FILE_UPLOAD_APPLY_RESTRICTIONS = True
+    settings.FILE_UPLOAD_RESTRICTIONS = {
+        "background_image": {
+            **settings.FILE_UPLOAD_RESTRICTIONS["background_image"],
+            "allowed_mimetypes": ["text/plain"],
+        },
+    }
+
+    user = factories.UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    file = factories.FileFactory(
+        type=FileTypeChoices.BACKGROUND_IMAGE, filename="my_file.txt", creator=user
+    )
+
+    s3_client = default_storage.connection.meta.client
+    s3_client.put_object(
+        Bucket=default_storage.bucket_name,
+        Key=file.temporary_file_key,
+        ContentType="application/octet-stream",
+        Body=BytesIO(b"my prose" * 1000),
+    )
+    etag = s3_client.head_object(
+        Bucket=default_storage.bucket_name, Key=file.temporary_file_key
+    )["ETag"]
+
+    with mock.patch.object(
+        s3_client, "copy_object", wraps=s3_client.copy_object
+    ) as copy_object:
+        response = client.post(f"/api/v1.0/files/{file.id!s}/upload-ended/")
+
+    assert response.status_code == 200
+
+    copy_object.assert_called_once()
+    assert copy_object.call_args.kwargs["Key"] == file.file_key
+    assert copy_object.call_args.kwargs["ContentType"] == "text/plain"
+    assert copy_object.call_args.kwargs["CopySourceIfMatch"] == etag
+
+    head_object = s3_client.head_object(
+        Bucket=default_storage.bucket_name, Key=file.file_key
+    )
+    assert head_object["ContentType"] == "text/plain"
+    assert head_object["ContentLength"] == 8000
+    assert not default_storage.exists(file.temporary_file_key)
+
+
+def test_api_file_upload_ended_object_replaced_during_verification(settings):
+    """
+    An object replaced after its inspection fails the conditional copy, and the
+    file should be reverted to the PENDING state so that the upload can be ended again.
+    """
+    settings.FILE_UPLOAD_APPLY_RESTRICTIONS = False
+
+    user = factories.UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    file = factories.FileFactory(
+        type=FileTypeChoices.BACKGROUND_IMAGE, filename="my_file.txt", creator=user
+    )
+    default_storage.save(file.temporary_file_key, BytesIO(b"my prose"))
+
+    s3_client = default_storage.connection.meta.client
+    precondition_failed = ClientError(
+        {"Error": {"Code": "PreconditionFailed"}}, "CopyObject"
+    )
+
+    with (
+        mock.patch.object(s3_client, "copy_object", side_effect=precondition_failed),
+        pytest.raises(ClientError),
+    ):
+        client.post(f"/api/v1.0/files/{file.id!s}/upload-ended/")
+
+    file.refresh_from_db()
+    assert file.upload_state == FileUploadStateChoices.PENDING
+    assert not default_storage.exists(file.file_key)
+
+
+def test_api_file_upload_ended_large_file_verified_asynchronously(
+    settings, django_capture_on_commit_callbacks
+):
+    """
+    Files from the async verification size should be left ANALYZING and handed to
+    a Celery task.
+    """
+    settings.CELERY_ENABLED = True
+    settings.FILE_UPLOAD_ASYNC_VERIFICATION_MIN_SIZE = 8
+
+    user = factories.UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    file = factories.FileFactory(
+        type=FileTypeChoices.BACKGROUND_IMAGE, filename="my_file.txt", creator=user
+    )
+    default_storage.save(file.temporary_file_key, BytesIO(b"my prose"))
+
+    with (
+        mock.patch(
+            "core.api.viewsets.process_file_upload_verification"
+        ) as mock_verification,
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        response = client.post(f"/api/v1.0/files/{file.id!s}/upload-ended/")
+
+    assert response.status_code == 202
+    assert response.json()["upload_state"] == "analyzing"
+    mock_verification.delay.assert_called_once_with(file.id)
+
+    file.refresh_from_db()
+    assert file.upload_state == FileUploadStateChoices.ANALYZING
+    assert not default_storage.exists(file.file_key)
+
+
+def test_api_file_upload_ended_small_file_verified_synchronously(settings):
+    """Files below the async verification size should be verified in the request."""
+    settings.CELERY_ENABLED = True
+    settings.FILE_UPLOAD_APPLY_RESTRICTIONS = False
+    settings.FILE_UPLOAD_ASYNC_VERIFICATION_MIN_SIZE = 9
+
+    user = factories.UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    file = factories.FileFactory(
+        type=FileTypeChoices.BACKGROUND_IMAGE, filename="my_file.txt", creator=user
+    )
+    default_storage.save(file.temporary_file_key, BytesIO(b"my prose"))
+
+    with mock.patch(
+        "core.api.viewsets.process_file_upload_verification"
+    ) as mock_verification:
+        response = client.post(f"/api/v1.0/files/{file.id!s}/upload-ended/")
+
+    assert response.status_code == 200
+    assert response.json()["upload_state"] == "ready"
+    mock_verification.delay.assert_not_called()
+
+
 @pytest.mark.django_db(transaction=True)
 def test_api_file_upload_ended_mimetype_not_allowed(settings, caplog):
     """
     Test that the API returns a 400 when the mimetype is not allowed.
-    File should be deleted and the file should be deleted from the storage.
+    File should be rejected and its object should be deleted from the storage.
     """
     settings.RESTRICT_UPLOAD_FILE_TYPE = True
     settings.FILE_UPLOAD_RESTRICTIONS = {
@@ -134,8 +281,12 @@ def test_api_file_upload_ended_mimetype_not_allowed(settings, caplog):
         in caplog.text
     )
 
-    assert not models.File.objects.filter(id=file.id).exists()
+    file.refresh_from_db()
+    assert file.upload_state == "rejected"
+    assert file.rejection_reason == "file_type_not_allowed"
+    assert file.deleted_at is not None
     assert not default_storage.exists(file.file_key)
+    assert not default_storage.exists(file.temporary_file_key)
 
 
 def test_api_file_upload_ended_mimetype_not_allowed_not_checking_mimetype(settings):
@@ -217,7 +368,7 @@ def test_api_upload_ended_mismatch_mimetype_with_object_storage(settings, caplog
     )
 
     assert head_object["ContentType"] == "text/html"
-    with caplog.at_level(logging.INFO, logger="core.api.viewsets"):
+    with caplog.at_level(logging.INFO, logger="core.services.file_upload"):
         response = client.post(f"/api/v1.0/files/{file.id!s}/upload-ended/")
     assert (
         "upload_ended: content type mismatch between object storage and file,"
@@ -240,7 +391,7 @@ def test_api_upload_ended_mismatch_mimetype_with_object_storage(settings, caplog
 def test_api_upload_ended_file_size_exceeded(settings, caplog):
     """
     Test when the file size exceeds the allowed max upload file size
-    should return a 400 and delete the file.
+    should return a 400 and reject the file.
     """
 
     settings.FILE_UPLOAD_RESTRICTIONS = {
@@ -263,7 +414,7 @@ def test_api_upload_ended_file_size_exceeded(settings, caplog):
         BytesIO(b"my prose"),
     )
 
-    with caplog.at_level(logging.INFO, logger="core.api.viewsets"):
+    with caplog.at_level(logging.INFO, logger="core.services.file_upload"):
         response = client.post(f"/api/v1.0/files/{file.id!s}/upload-ended/")
     assert (
         f"upload_ended: file size (8) for file {file.file_key} higher than the allowed max size"
@@ -271,7 +422,10 @@ def test_api_upload_ended_file_size_exceeded(settings, caplog):
     )
     assert response.status_code == 400
 
-    assert not models.File.objects.filter(id=file.id).exists()
+    file.refresh_from_db()
+    assert file.upload_state == "rejected"
+    assert file.rejection_reason == "file_size_exceeded"
+    assert file.deleted_at is not None
     assert not default_storage.exists(file.file_key)
 
 
@@ -10,6 +10,7 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.test import APIClient
 
 from core import factories
+from core.services.team_membership import TeamMembershipService
 
 pytestmark = pytest.mark.django_db
 
@@ -130,6 +131,29 @@ def test_api_recording_list_authenticated_via_team(mock_user_get_teams):
     assert expected_ids == results_id
 
 
+def test_api_recording_list_authenticated_via_cached_team():
+    """
+    Authenticated users should be able to list recordings of the teams pushed
+    to the team membership cache.
+    """
+    user = factories.UserFactory()
+    TeamMembershipService().set_teams(user, ["team1"])
+
+    client = APIClient()
+    client.force_login(user)
+
+    recording_ids = {
+        str(access.recording_id)
+        for access in factories.TeamRecordingAccessFactory.create_batch(3, team="team1")
+    }
+    factories.TeamRecordingAccessFactory(team="team2")
+
+    response = client.get("/api/v1.0/recordings/")
+
+    assert response.status_code == 200
+    assert {result["id"] for result in response.json()["results"]} == recording_ids
+
+
 @mock.patch.object(PageNumberPagination, "get_page_size", return_value=2)
 def test_api_recordings_list_pagination(_mock_page_size):
     """Pagination should work as expected."""
@@ -205,3 +229,33 @@ def test_api_recordings_list_ordering_default():
     # Check that results are sorted by descending "updated_at" as expected
     for i in range(4):
         assert operator.ge(results[i]["updated_at"], results[i + 1]["updated_at"])
+
+
+def test_api_recordings_list_pagination_cursor():
+    """
+    Users passing a cursor should walk their recordings by creation date, without
+    counting them.
+    """
+    user = factories.UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    recording_ids = [
+        str(access.recording_id)
+        for access in factories.UserRecordingAccessFactory.create_batch(3, user=user)
+    ]
+
+    response = client.get("/api/v1.0/recordings/?cursor=&page_size=2")
+
+    assert response.status_code == 200
+    content = response.json()
+    assert "count" not in content
+    assert content["previous"] is None
+    assert [result["id"] for result in content["results"]] == recording_ids[:0:-1]
+
+    response = client.get(content["next"])
+
+    assert response.status_code == 200
+    content = response.json()
+    assert content["next"] is None
+    assert [result["id"] for result in content["results"]] == recording_ids[:1]
@@ -8,6 +8,7 @@ from uuid import uuid4
 
 from django.conf import settings
 from django.core.files.storage import default_storage
+from django.test import override_settings
 from django.utils import timezone
 
 import pytest
@@ -282,3 +283,75 @@ def test_api_recordings_media_auth_success_administrator(mode):
         timeout=1,
     )
     assert response.content.decode("utf-8") == "my prose"
+
+
+def test_api_recordings_media_auth_num_queries(django_assert_num_queries):
+    """
+    Authorizing a media should fetch the recording along the user's roles, and
+    following byte-range requests should be authorized from the cache.
+    """
+    user = UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    recording = RecordingFactory(status=models.RecordingStatusChoices.SAVED)
+    UserRecordingAccessFactory(user=user, recording=recording, role="owner")
+    original_url = f"http://localhost/media/{recording.key:s}"
+
+    # The user, then the recording with its roles
+    with django_assert_num_queries(2):
+        response = client.get(
+            "/api/v1.0/recordings/media-auth/", HTTP_X_ORIGINAL_URL=original_url
+        )
+    assert response.status_code == 200
+
+    # Only the user
+    with django_assert_num_queries(1):
+        response = client.get(
+            "/api/v1.0/recordings/media-auth/", HTTP_X_ORIGINAL_URL=original_url
+        )
+    assert response.status_code == 200
+    assert "AWS4-HMAC-SHA256 Credential=" in response["Authorization"]
+
+
+@override_settings(MEDIA_AUTH_CACHE_TIMEOUT=0)
+def test_api_recordings_media_auth_cache_disabled(django_assert_num_queries):
+    """Each request should be authorized from the database when caching is disabled."""
+    user = UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    recording = RecordingFactory(status=models.RecordingStatusChoices.SAVED)
+    UserRecordingAccessFactory(user=user, recording=recording, role="owner")
+    original_url = f"http://localhost/media/{recording.key:s}"
+
+    for _ in range(2):
+        with django_assert_num_queries(2):
+            response = client.get(
+                "/api/v1.0/recordings/media-auth/", HTTP_X_ORIGINAL_URL=original_url
+            )
+        assert response.status_code == 200
+
+
+def test_api_recordings_media_auth_denials_not_cached():
+    """A recording becoming saved should be served at once."""
+    user = UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    recording = RecordingFactory(status=models.RecordingStatusChoices.STOPPED)
+    UserRecordingAccessFactory(user=user, recording=recording, role="owner")
+    original_url = f"http://localhost/media/{recording.key:s}"
+
+    response = client.get(
+        "/api/v1.0/recordings/media-auth/", HTTP_X_ORIGINAL_URL=original_url
+    )
+    assert response.status_code == 403
+
+    recording.status = models.RecordingStatusChoices.SAVED
+    recording.save()
+
+    response = client.get(
+        "/api/v1.0/recordings/media-auth/", HTTP_X_ORIGINAL_URL=original_url
+    )
+    assert response.status_code == 200
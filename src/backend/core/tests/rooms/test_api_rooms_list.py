@@ -8,8 +8,8 @@ import pytest
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.test import APIClient
 
-from ...factories import RoomFactory, UserFactory
-from ...models import RoomAccessLevel
+from ...factories import RoomFactory, UserFactory, UserResourceAccessFactory
+from ...models import RoleChoices, RoomAccessLevel
 
 pytestmark = pytest.mark.django_db
 
@@ -156,3 +156,87 @@ def test_api_rooms_list_pagination_page_size():
     assert len(content["results"]) == 3
     assert content["next"] == "http://testserver/api/v1.0/rooms/?page=2&page_size=3"
     assert content["previous"] is None
+
+
+@pytest.mark.parametrize("rooms_count", [1, 10])
+@mock.patch("core.utils.generate_token", return_value="foo")
+def test_api_rooms_list_num_queries(
+    _mock_token, rooms_count, django_assert_num_queries
+):
+    """
+    Listing rooms should issue a constant number of queries, whatever the number of
+    rooms and of their accesses: roles are annotated and accesses are prefetched.
+    """
+    user = UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    for role in [RoleChoices.OWNER, RoleChoices.ADMIN, RoleChoices.MEMBER]:
+        for _ in range(rooms_count):
+            room = RoomFactory(users=[(user, role)])
+            UserResourceAccessFactory.create_batch(3, resource=room)
+
+    with django_assert_num_queries(4):
+        response = client.get("/api/v1.0/rooms/?page_size=30")
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 3 * rooms_count
+    assert sorted(len(result.get("accesses", [])) for result in results) == sorted(
+        [0] * rooms_count + [4] * 2 * rooms_count
+    )
+
+
+def test_api_rooms_list_accesses_administrators():
+    """Accesses of a room should only be listed to its administrators and owners."""
+    user = UserFactory()
+    other_user = UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    administered_room = RoomFactory(
+        users=[(user, RoleChoices.ADMIN), (other_user, RoleChoices.MEMBER)]
+    )
+    RoomFactory(users=[(user, RoleChoices.MEMBER), (other_user, RoleChoices.OWNER)])
+
+    response = client.get("/api/v1.0/rooms/")
+
+    assert response.status_code == 200
+    results = {result["id"]: result for result in response.json()["results"]}
+    assert len(results) == 2
+    assert sorted(
+        access["user"]["id"]
+        for access in results.pop(str(administered_room.id))["accesses"]
+    ) == sorted([str(user.id), str(other_user.id)])
+    assert "accesses" not in results.popitem()[1]
+
+
+def test_api_rooms_list_pagination_cursor():
+    """
+    Users passing a cursor should walk their rooms by creation date, without
+    counting them.
+    """
+    user = UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    rooms = RoomFactory.create_batch(3, users=[user])
+    room_ids = [
+        str(room.id) for room in sorted(rooms, key=lambda room: room.created_at)
+    ]
+
+    response = client.get("/api/v1.0/rooms/?cursor=&page_size=2")
+
+    assert response.status_code == 200
+    content = response.json()
+    assert "count" not in content
+    assert content["previous"] is None
+    assert [result["id"] for result in content["results"]] == room_ids[:0:-1]
+
+    response = client.get(content["next"])
+
+    assert response.status_code == 200
+    content = response.json()
+    assert content["next"] is None
+    assert content["previous"] is not None
+    assert [result["id"] for result in content["results"]] == room_ids[:1]
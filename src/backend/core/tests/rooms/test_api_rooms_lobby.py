@@ -192,6 +192,41 @@ def test_request_entry_with_existing_participants(settings):
     assert participant_data.get("username") == "test_user"
 
 
+def test_request_entry_long_poll(settings):
+    """Waiting participants can long poll until the host takes a decision."""
+    room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED)
+    client = APIClient()
+
+    settings.LOBBY_COOKIE_NAME = "mocked-cookie"
+    settings.LOBBY_LONG_POLL_ENABLED = True
+
+    with mock.patch.object(utils, "notify_participants", return_value=None):
+        response = client.post(
+            f"/api/v1.0/rooms/{room.id}/request-entry/",
+            {"username": "test_user", "wait": True},
+        )
+    assert response.status_code == 200
+    assert response.json()["status"] == "waiting"
+    participant_id = response.cookies.get("mocked-cookie").value
+
+    with mock.patch.object(
+        LobbyService, "wait_for_decision", autospec=True
+    ) as mock_wait:
+        mock_wait.side_effect = lambda service, room_id, participant_id: (
+            service.handle_participant_entry(room_id, participant_id, False)
+            or service._get_participant(room_id, participant_id)
+        )
+        response = client.post(
+            f"/api/v1.0/rooms/{room.id}/request-entry/",
+            {"username": "test_user", "wait": True},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "denied"
+    assert response.json()["livekit"] is None
+    mock_wait.assert_called_once_with(mock.ANY, room.id, participant_id)
+
+
 def test_request_entry_public_room(settings):
     """Entry requests to public rooms should return ACCEPTED status with LiveKit config."""
     room = RoomFactory(access_level=RoomAccessLevel.PUBLIC)
@@ -589,6 +624,11 @@ def test_list_waiting_participants_success(settings):
             "color": "#654321",
         },
     )
+    lobby_service = LobbyService()
+    lobby_service._index_participant(
+        room.id, "2f7f162f-e7d1-421b-90e7-02bfbfbf8def", 60
+    )
+    lobby_service._index_participant(room.id, "f4ca3ab8a6c04ad88097b8da33f60f10", 60)
 
     response = client.get(f"/api/v1.0/rooms/{room.id}/waiting-participants/")
 
@@ -4,6 +4,7 @@ Test rooms API endpoints in the Meet core app: participants management.
 
 # pylint: disable=redefined-outer-name,unused-argument,protected-access,no-name-in-module,too-many-lines
 
+import asyncio
 import random
 from unittest import mock
 from uuid import uuid4
@@ -28,7 +29,7 @@ pytestmark = pytest.mark.django_db
 @pytest.fixture
 def mock_livekit_client():
     """Mock LiveKit API client."""
-    with mock.patch("core.utils.create_livekit_client") as mock_create:
+    with mock.patch("core.utils.get_livekit_client") as mock_create:
         mock_client = mock.AsyncMock()
         mock_create.return_value = mock_client
         yield mock_client
@@ -55,7 +56,7 @@ def test_mute_participant_success_as_admin(mock_livekit_client):
     assert response.data == {"status": "success"}
 
     mock_livekit_client.room.mute_published_track.assert_called_once()
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_mute_participant_anonymous_no_token_forbidden(mock_livekit_client):
@@ -224,7 +225,7 @@ def test_mute_participant_unexpected_twirp_error(mock_livekit_client):
     assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert response.data == {"error": "Failed to mute participant"}
 
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_mute_participant_participant_not_found(mock_livekit_client):
@@ -252,7 +253,7 @@ def test_mute_participant_participant_not_found(mock_livekit_client):
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.data == {"error": "Participant not found"}
 
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_mute_participant_management_exception(mock_livekit_client):
@@ -280,7 +281,7 @@ def test_mute_participant_management_exception(mock_livekit_client):
     assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert response.data == {"error": "Failed to mute participant"}
 
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_mute_participant_admin_with_token_for_this_room(mock_livekit_client):
@@ -537,7 +538,7 @@ def test_update_participant_success(mock_livekit_client):
     assert response.data == {"status": "success"}
 
     mock_livekit_client.room.update_participant.assert_called_once()
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 @pytest.mark.parametrize(
@@ -585,7 +586,7 @@ def test_update_participant_permission_fields_are_optional(
     (request_arg,), _ = mock_livekit_client.room.update_participant.call_args
     assert isinstance(request_arg, UpdateParticipantRequest)
 
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_update_participant_permission_fields_invalid_case(mock_livekit_client):
@@ -828,7 +829,7 @@ def test_update_participant_unexpected_twirp_error(mock_livekit_client):
     assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert response.data == {"error": "Failed to update participant"}
 
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_remove_participant_success_lobby_cache(mock_livekit_client):
@@ -864,7 +865,7 @@ def test_remove_participant_success_lobby_cache(mock_livekit_client):
 
     mock_livekit_client.room.remove_participant.assert_called_once()
     # called twice: once for Lobby, once for ParticipantManagement
-    mock_livekit_client.aclose.assert_called()
+    mock_livekit_client.aclose.assert_not_called()
 
     # Verify lobby cache was cleared - participant should no longer exist
     participant = LobbyService()._get_participant(room.id, participant_identity)
@@ -890,7 +891,7 @@ def test_remove_participant_success(mock_livekit_client):
     assert response.data == {"status": "success"}
 
     mock_livekit_client.room.remove_participant.assert_called_once()
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_remove_participant_forbidden_without_access():
@@ -967,7 +968,7 @@ def test_remove_participant_unexpected_twirp_error(mock_livekit_client):
     assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert response.data == {"error": "Failed to remove participant"}
 
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_update_participant_not_found(mock_livekit_client):
@@ -993,7 +994,7 @@ def test_update_participant_not_found(mock_livekit_client):
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.data == {"error": "Participant not found"}
 
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_remove_participant_not_found(mock_livekit_client):
@@ -1019,4 +1020,314 @@ def test_remove_participant_not_found(mock_livekit_client):
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.data == {"error": "Participant not found"}
 
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
+
+
+def test_mute_participants_success_as_admin(mock_livekit_client):
+    """Admins and owners should be able to mute many tracks at once."""
+    client = APIClient()
+    room = RoomFactory()
+    user = UserFactory()
+    UserResourceAccessFactory(
+        resource=room, user=user, role=random.choice(["administrator", "owner"])
+    )
+    client.force_authenticate(user=user)
+
+    identities = [str(uuid4()) for _ in range(3)]
+    payload = {
+        "participants": [
+            {"participant_identity": identity, "track_sid": f"track-{index}"}
+            for index, identity in enumerate(identities)
+        ]
+    }
+
+    url = reverse("rooms-mute-participants", kwargs={"pk": room.id})
+    response = client.post(url, payload, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "results": [
+            {
+                "participant_identity": identity,
+                "track_sid": f"track-{index}",
+                "status": "success",
+            }
+            for index, identity in enumerate(identities)
+        ]
+    }
+    assert mock_livekit_client.room.mute_published_track.call_count == 3
+
+
+def test_mute_participants_anonymous_no_token_forbidden(mock_livekit_client):
+    """Should forbid bulk muting when user is anonymous and no LiveKit token."""
+    client = APIClient()
+    room = RoomFactory()
+
+    url = reverse("rooms-mute-participants", kwargs={"pk": room.id})
+    response = client.post(
+        url,
+        {
+            "participants": [
+                {"participant_identity": str(uuid4()), "track_sid": "track"}
+            ]
+        },
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    mock_livekit_client.room.mute_published_track.assert_not_called()
+
+
+def test_mute_participants_livekit_token_presence_check_forbidden(
+    mock_livekit_client,
+):
+    """Should deny bulk muting when the LiveKit token holder isn't in the room."""
+    client = APIClient()
+    room = RoomFactory()
+
+    mock_livekit_client.room.get_participant.side_effect = TwirpError(
+        msg="participant does not exist", code="not_found", status=404
+    )
+
+    token = utils.generate_token(str(room.id), AnonymousUser())
+
+    url = reverse("rooms-mute-participants", kwargs={"pk": room.id})
+    response = client.post(
+        url,
+        {
+            "participants": [
+                {"participant_identity": str(uuid4()), "track_sid": "track"}
+            ]
+        },
+        format="json",
+        HTTP_AUTHORIZATION=f"Bearer {token}",
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert response.data == {"error": "Could not verify caller presence"}
+    mock_livekit_client.room.mute_published_track.assert_not_called()
+
+
+def test_mute_participants_reports_each_outcome(mock_livekit_client):
+    """A failing track should not prevent the others from being muted."""
+    client = APIClient()
+    room = RoomFactory()
+    user = UserFactory()
+    UserResourceAccessFactory(resource=room, user=user, role="owner")
+    client.force_authenticate(user=user)
+
+    async def mute_published_track(request):
+        if request.track_sid == "missing":
+            raise TwirpError(msg="not found", code="not_found", status=404)
+        if request.track_sid == "broken":
+            raise TwirpError(msg="internal", code="internal", status=500)
+
+    mock_livekit_client.room.mute_published_track.side_effect = mute_published_track
+
+    track_sids = ["missing", "ok", "broken"]
+    payload = {
+        "participants": [
+            {"participant_identity": str(uuid4()), "track_sid": track_sid}
+            for track_sid in track_sids
+        ]
+    }
+
+    url = reverse("rooms-mute-participants", kwargs={"pk": room.id})
+    response = client.post(url, payload, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [result["status"] for result in response.json()["results"]] == [
+        "not_found",
+        "success",
+        "error",
+    ]
+
+
+def test_mute_participants_empty_list():
+    """Should reject a bulk request without any participant."""
+    client = APIClient()
+    room = RoomFactory()
+    user = UserFactory()
+    UserResourceAccessFactory(resource=room, user=user, role="owner")
+    client.force_authenticate(user=user)
+
+    url = reverse("rooms-mute-participants", kwargs={"pk": room.id})
+    response = client.post(url, {"participants": []}, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_mute_participants_too_many(mock_livekit_client, settings):
+    """Should reject a bulk request exceeding the configured maximum size."""
+    settings.PARTICIPANTS_MANAGEMENT_BULK_MAX_SIZE = 2
+
+    client = APIClient()
+    room = RoomFactory()
+    user = UserFactory()
+    UserResourceAccessFactory(resource=room, user=user, role="owner")
+    client.force_authenticate(user=user)
+
+    payload = {
+        "participants": [
+            {"participant_identity": str(uuid4()), "track_sid": "track"}
+            for _ in range(3)
+        ]
+    }
+
+    url = reverse("rooms-mute-participants", kwargs={"pk": room.id})
+    response = client.post(url, payload, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {
+        "participants": ["Ensure this field has no more than 2 elements."]
+    }
+    mock_livekit_client.room.mute_published_track.assert_not_called()
+
+
+def test_remove_participants_concurrency_is_capped(mock_livekit_client, settings):
+    """No more than the configured number of calls should be in flight at once."""
+    settings.PARTICIPANTS_MANAGEMENT_BULK_CONCURRENCY = 2
+
+    client = APIClient()
+    room = RoomFactory()
+    user = UserFactory()
+    UserResourceAccessFactory(resource=room, user=user, role="owner")
+    client.force_authenticate(user=user)
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def remove_participant(request):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    mock_livekit_client.room.remove_participant.side_effect = remove_participant
+
+    identities = [str(uuid4()) for _ in range(6)]
+    payload = {
+        "participants": [{"participant_identity": identity} for identity in identities]
+    }
+
+    url = reverse("rooms-remove-participants", kwargs={"pk": room.id})
+    response = client.post(url, payload, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "results": [
+            {"participant_identity": identity, "status": "success"}
+            for identity in identities
+        ]
+    }
+    assert mock_livekit_client.room.remove_participant.call_count == 6
+    assert max_in_flight == 2
+
+
+def test_remove_participants_clears_lobby_cache(mock_livekit_client):
+    """Removed participants should not be able to re-enter from the lobby cache."""
+    client = APIClient()
+    room = RoomFactory()
+    user = UserFactory()
+    UserResourceAccessFactory(resource=room, user=user, role="owner")
+    client.force_authenticate(user=user)
+
+    participant_identity = str(uuid4())
+    LobbyService().enter(room.id, participant_identity, "John doe")
+    LobbyService().handle_participant_entry(room.id, participant_identity, True)
+
+    url = reverse("rooms-remove-participants", kwargs={"pk": room.id})
+    response = client.post(
+        url,
+        {"participants": [{"participant_identity": participant_identity}]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert LobbyService()._get_participant(room.id, participant_identity) is None
+
+
+def test_remove_participants_forbidden_without_access(mock_livekit_client):
+    """Users without privileges on the room should not remove participants."""
+    client = APIClient()
+    room = RoomFactory()
+    client.force_authenticate(user=UserFactory())
+
+    url = reverse("rooms-remove-participants", kwargs={"pk": room.id})
+    response = client.post(
+        url, {"participants": [{"participant_identity": str(uuid4())}]}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    mock_livekit_client.room.remove_participant.assert_not_called()
+
+
+def test_update_participants_success(mock_livekit_client):
+    """Should update every participant with its own payload."""
+    client = APIClient()
+    room = RoomFactory()
+    user = UserFactory()
+    UserResourceAccessFactory(resource=room, user=user, role="owner")
+    client.force_authenticate(user=user)
+
+    identities = [str(uuid4()) for _ in range(2)]
+    payload = {
+        "participants": [
+            {
+                "participant_identity": identities[0],
+                "metadata": {"role": "speaker"},
+            },
+            {
+                "participant_identity": identities[1],
+                "name": "Jane",
+                "permission": {"can_publish": False},
+            },
+        ]
+    }
+
+    mock_livekit_client.room.update_participant.side_effect = [
+        None,
+        TwirpError(msg="participant does not exist", code="not_found", status=404),
+    ]
+
+    url = reverse("rooms-update-participants", kwargs={"pk": room.id})
+    response = client.post(url, payload, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "results": [
+            {"participant_identity": identities[0], "status": "success"},
+            {"participant_identity": identities[1], "status": "not_found"},
+        ]
+    }
+
+    requests = {
+        call.args[0].identity: call.args[0]
+        for call in mock_livekit_client.room.update_participant.call_args_list
+    }
+    assert isinstance(requests[identities[0]], UpdateParticipantRequest)
+    assert requests[identities[0]].metadata == '{"role": "speaker"}'
+    assert requests[identities[1]].name == "Jane"
+    assert requests[identities[1]].permission.can_publish is False
+
+
+def test_update_participants_invalid_item():
+    """A single invalid item should reject the whole bulk request."""
+    client = APIClient()
+    room = RoomFactory()
+    user = UserFactory()
+    UserResourceAccessFactory(resource=room, user=user, role="owner")
+    client.force_authenticate(user=user)
+
+    payload = {
+        "participants": [
+            {"participant_identity": str(uuid4()), "name": "Jane"},
+            {"participant_identity": str(uuid4())},
+        ]
+    }
+
+    url = reverse("rooms-update-participants", kwargs={"pk": room.id})
+    response = client.post(url, payload, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,124 @@
+"""
+Test rooms API endpoints in the Meet core app: bulk participants tokens.
+"""
+
+from django.conf import settings as django_settings
+from django.urls import reverse
+
+import jwt
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.factories import RoomFactory, UserFactory, UserResourceAccessFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def decode_token(token: str) -> dict:
+    """Decode a LiveKit JWT access token for inspection."""
+    return jwt.decode(
+        token,
+        django_settings.LIVEKIT_CONFIGURATION["api_secret"],
+        algorithms=["HS256"],
+    )
+
+
+@pytest.mark.parametrize("role", ["administrator", "owner"])
+def test_participants_tokens_success(role):
+    """Administrators and owners should issue tokens for many participants at once."""
+    client = APIClient()
+    room = RoomFactory(configuration={"can_publish_sources": ["microphone"]})
+    user = UserFactory()
+    UserResourceAccessFactory(resource=room, user=user, role=role)
+    client.force_authenticate(user=user)
+
+    url = reverse("rooms-participants-tokens", kwargs={"pk": room.id})
+    response = client.post(
+        url,
+        {"participants": [{"username": "Alice"}, {}, {"username": "Bob"}]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    content = response.json()
+    assert content["url"] == django_settings.LIVEKIT_CONFIGURATION["url"]
+    assert content["room"] == str(room.id)
+    assert [result["username"] for result in content["results"]] == [
+        "Alice",
+        "",
+        "Bob",
+    ]
+    assert len({result["participant_id"] for result in content["results"]}) == 3
+
+    for result in content["results"]:
+        claims = decode_token(result["token"])
+        assert claims["sub"] == result["participant_id"]
+        assert claims["video"]["room"] == str(room.id)
+        assert claims["video"]["roomAdmin"] is False
+        assert claims["video"]["canPublishSources"] == ["microphone"]
+
+
+def test_participants_tokens_member_forbidden():
+    """Members without privileges on the room should not issue tokens."""
+    client = APIClient()
+    room = RoomFactory()
+    user = UserFactory()
+    UserResourceAccessFactory(resource=room, user=user, role="member")
+    client.force_authenticate(user=user)
+
+    url = reverse("rooms-participants-tokens", kwargs={"pk": room.id})
+    response = client.post(
+        url, {"participants": [{"username": "Alice"}]}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_participants_tokens_anonymous_forbidden():
+    """Anonymous users should not issue tokens."""
+    room = RoomFactory()
+
+    url = reverse("rooms-participants-tokens", kwargs={"pk": room.id})
+    response = APIClient().post(
+        url, {"participants": [{"username": "Alice"}]}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_participants_tokens_empty_list():
+    """At least one participant should be given."""
+    client = APIClient()
+    room = RoomFactory()
+    user = UserFactory()
+    UserResourceAccessFactory(resource=room, user=user, role="owner")
+    client.force_authenticate(user=user)
+
+    url = reverse("rooms-participants-tokens", kwargs={"pk": room.id})
+    response = client.post(url, {"participants": []}, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {
+        "participants": {"non_field_errors": ["This list may not be empty."]}
+    }
+
+
+def test_participants_tokens_too_many(settings):
+    """The number of tokens issued by a single request should be capped."""
+    settings.LIVEKIT_TOKEN_BULK_MAX_SIZE = 2
+    client = APIClient()
+    room = RoomFactory()
+    user = UserFactory()
+    UserResourceAccessFactory(resource=room, user=user, role="owner")
+    client.force_authenticate(user=user)
+
+    url = reverse("rooms-participants-tokens", kwargs={"pk": room.id})
+    response = client.post(
+        url, {"participants": [{"username": "Alice"}] * 3}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {
+        "participants": ["Ensure this field has no more than 2 elements."]
+    }
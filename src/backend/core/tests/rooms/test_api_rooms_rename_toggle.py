@@ -25,7 +25,7 @@ pytestmark = pytest.mark.django_db
 @pytest.fixture
 def mock_livekit_client():
     """Mock LiveKit API client."""
-    with mock.patch("core.utils.create_livekit_client") as mock_create:
+    with mock.patch("core.utils.get_livekit_client") as mock_create:
         mock_client = mock.AsyncMock()
         mock_create.return_value = mock_client
         yield mock_client
@@ -76,7 +76,7 @@ def test_toggle_hand_raise_success(mock_livekit_client, room, token):
     assert response.data == {"status": "success"}
 
     mock_livekit_client.room.update_participant.assert_called_once()
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_toggle_hand_lower_success(mock_livekit_client, room, token):
@@ -93,7 +93,7 @@ def test_toggle_hand_lower_success(mock_livekit_client, room, token):
     call_kwargs = mock_livekit_client.room.update_participant.call_args
     assert call_kwargs[0][0].attributes["handRaisedAt"] == ""
 
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_toggle_hand_raise_sets_timestamp(mock_livekit_client, room, token):
@@ -187,7 +187,7 @@ def test_toggle_hand_unexpected_twirp_error(mock_livekit_client, room, token):
     assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert response.data == {"error": "Failed to update participant hand state"}
 
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_toggle_hand_raise_success_anonymous(
@@ -207,7 +207,7 @@ def test_toggle_hand_raise_success_anonymous(
     assert response.data == {"status": "success"}
 
     mock_livekit_client.room.update_participant.assert_called_once()
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_toggle_hand_lower_success_anonymous(
@@ -264,7 +264,7 @@ def test_rename_participant_success(mock_livekit_client, room, token):
     assert response.data == {"status": "success"}
 
     mock_livekit_client.room.update_participant.assert_called_once()
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_rename_participant_sets_correct_name(mock_livekit_client, room, token):
@@ -369,7 +369,7 @@ def test_rename_participant_unexpected_twirp_error(mock_livekit_client, room, to
     assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert response.data == {"error": "Failed to rename participant"}
 
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_rename_participant_success_anonymous(
@@ -389,7 +389,7 @@ def test_rename_participant_success_anonymous(
     assert response.data == {"status": "success"}
 
     mock_livekit_client.room.update_participant.assert_called_once()
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_rename_participant_uses_identity_from_token_anonymous(
@@ -525,7 +525,7 @@ def test_toggle_hand_participant_not_found(mock_livekit_client, room, token):
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.data == {"error": "Participant not found"}
 
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
 
 
 def test_rename_participant_malformed_token(room):
@@ -571,4 +571,4 @@ def test_rename_participant_not_found(mock_livekit_client, room, token):
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.data == {"error": "Participant not found"}
 
-    mock_livekit_client.aclose.assert_called_once()
+    mock_livekit_client.aclose.assert_not_called()
@@ -377,7 +377,7 @@ def test_api_rooms_retrieve_members(mock_token, django_assert_num_queries, setti
     client = APIClient()
     client.force_login(user)
 
-    with django_assert_num_queries(3):
+    with django_assert_num_queries(2):
         response = client.get(
             f"/api/v1.0/rooms/{room.id!s}/",
         )
@@ -441,7 +441,7 @@ def test_api_rooms_retrieve_administrators(
     client = APIClient()
     client.force_login(user)
 
-    with django_assert_num_queries(4):
+    with django_assert_num_queries(3):
         response = client.get(
             f"/api/v1.0/rooms/{room.id!s}/",
         )
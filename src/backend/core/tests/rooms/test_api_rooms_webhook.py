@@ -6,21 +6,26 @@ Test LiveKit webhook endpoint on the rooms API.
 import base64
 import hashlib
 import json
+import uuid
 from unittest import mock
 
 import pytest
 from livekit import api
 
+from ... import models
 from ...services.livekit_events import ActionFailedError, LiveKitEventsService
 
 
 @pytest.fixture
 def webhook_event_data():
-    """Sample webhook event data for testing."""
+    """Sample webhook event data for testing.
+
+    Ids are unique, so that events are not dropped as duplicates of other tests.
+    """
     return {
         "event": "room_finished",
         "room": {
-            "sid": "RM_hycBMAjmt6Ub",
+            "sid": f"RM_{uuid.uuid4().hex}",
             "name": "00000000-0000-0000-0000-000000000000",
             "emptyTimeout": 300,
             "creationTime": "1692627281",
@@ -31,7 +36,7 @@ def webhook_event_data():
                 {"mime": "video/VP8"},
             ],
         },
-        "id": "EV_eugWmGhovZmm",
+        "id": f"EV_{uuid.uuid4().hex}",
         "createdAt": "1692985556",
     }
 
@@ -141,7 +146,7 @@ def test_handled_event_type(
 
 def test_unhandled_event_type(client, mock_livekit_config):
     """Should return 200 for event types that have no handler."""
-    event_data = json.dumps({"event": "participant_joined"})
+    event_data = json.dumps({"event": "track_published"})
 
     hash64 = base64.b64encode(hashlib.sha256(event_data.encode()).digest()).decode()
     token = api.AccessToken(
@@ -166,7 +171,7 @@ def test_action_error(client, mock_livekit_config):
     event_data = json.dumps(
         {
             "event": "room_finished",
-            "room": {"sid": "RM_hycBMAjmt6Ub", "name": "invalid-uuid"},
+            "room": {"sid": f"RM_{uuid.uuid4().hex}", "name": "invalid-uuid"},
         }
     )
     hash64 = base64.b64encode(hashlib.sha256(event_data.encode()).digest()).decode()
@@ -186,3 +191,38 @@ def test_action_error(client, mock_livekit_config):
             content_type="application/json",
             HTTP_AUTHORIZATION=auth_token,
         )
+
+
+@pytest.mark.django_db
+@mock.patch("core.api.viewsets.process_livekit_webhook_events.delay")
+@mock.patch.object(LiveKitEventsService, "_handle_room_finished")
+def test_async_processing_acknowledges_stored_event(  # noqa: PLR0913, PLR0917
+    mock_handle_room_finished,
+    mock_delay,
+    client,
+    webhook_event_data,
+    serialized_event_data,
+    auth_token,
+    settings,
+    django_capture_on_commit_callbacks,
+):
+    """Should store the event, acknowledge it and leave its handling to a worker."""
+    settings.LIVEKIT_WEBHOOK_ASYNC_PROCESSING_ENABLED = True
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            "/api/v1.0/rooms/webhooks-livekit/",
+            data=serialized_event_data,
+            content_type="application/json",
+            HTTP_AUTHORIZATION=auth_token,
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "success"}
+
+    mock_handle_room_finished.assert_not_called()
+    mock_delay.assert_called_once_with("00000000-0000-0000-0000-000000000000")
+
+    event = models.LiveKitWebhookEvent.objects.get(event_id=webhook_event_data["id"])
+    assert event.event_type == "room_finished"
+    assert event.payload == serialized_event_data
@@ -1,14 +1,20 @@
 """
 Test LiveKitEvents service.
 """
-# pylint: disable=W0621,W0613, W0212, E0611
+# pylint: disable=W0621,W0613, W0212, E0611, C0302
 
 import uuid
 from unittest import mock
 
+from django.utils import timezone
+
 import pytest
+from google.protobuf import json_format
 from livekit.api import EgressStatus
+from livekit.protocol.models import Room
+from livekit.protocol.webhook import WebhookEvent
 
+from core import models
 from core.factories import RecordingFactory, RoomFactory
 from core.recording.services.recording_events import RecordingEventsService
 from core.services.livekit_events import (
@@ -20,7 +26,9 @@ from core.services.livekit_events import (
     api,
 )
 from core.services.lobby import LobbyService
+from core.services.room_liveness import RoomLivenessService
 from core.services.room_management import RoomManagementException
+from core.services.room_presence import RoomPresenceService
 from core.services.sip_management import (
     SIPException,
     SIPManagement,
@@ -575,6 +583,60 @@ def test_handle_room_finished_raises_error_when_telephony_deletion_fails(
     mock_clear_cache.assert_not_called()
 
 
+@mock.patch.object(LobbyService, "clear_room_cache")
+def test_handle_room_finished_marks_room_finished(mock_clear_cache, service):
+    """Should forget the room was running, so that later calls ask LiveKit."""
+    mock_data = mock.MagicMock()
+    mock_data.room.name = str(uuid.uuid4())
+    RoomLivenessService().mark_started(mock_data.room.name)
+
+    service._handle_room_finished(mock_data)
+
+    assert RoomLivenessService().is_alive(mock_data.room.name) is None
+
+
+@mock.patch.object(LobbyService, "clear_room_cache")
+def test_handle_room_finished_clears_presence(mock_clear_cache, service):
+    """Should forget the participants of the finished room."""
+    mock_data = mock.MagicMock()
+    mock_data.room.name = str(uuid.uuid4())
+    RoomPresenceService().mark_joined(mock_data.room.name, "participant-1")
+
+    service._handle_room_finished(mock_data)
+
+    assert (
+        RoomPresenceService().is_present(mock_data.room.name, "participant-1") is False
+    )
+
+
+def test_handle_participant_joined(service):
+    """Should remember the participant is connected and the room is running."""
+    mock_data = mock.MagicMock()
+    mock_data.room.name = str(uuid.uuid4())
+    mock_data.participant.identity = "participant-1"
+
+    service._handle_participant_joined(mock_data)
+
+    assert (
+        RoomPresenceService().is_present(mock_data.room.name, "participant-1") is True
+    )
+    assert RoomLivenessService().is_alive(mock_data.room.name) is True
+
+
+def test_handle_participant_left(service):
+    """Should forget the participant who left."""
+    mock_data = mock.MagicMock()
+    mock_data.room.name = str(uuid.uuid4())
+    mock_data.participant.identity = "participant-1"
+    RoomPresenceService().mark_joined(mock_data.room.name, "participant-1")
+
+    service._handle_participant_left(mock_data)
+
+    assert (
+        RoomPresenceService().is_present(mock_data.room.name, "participant-1") is False
+    )
+
+
 def test_handle_room_finished_raises_error_for_invalid_room_name(service):
     """Should raise ActionFailedError when room name format is invalid when room finishes."""
     mock_data = mock.MagicMock()
@@ -669,6 +731,20 @@ def test_handle_room_started_skips_dispatch_rule_when_telephony_disabled(
     mock_ensure_dispatch_rule.assert_not_called()
 
 
+def test_handle_room_started_marks_room_running(service, settings):
+    """Should remember the room is running, to skip later ListRooms calls."""
+    settings.ROOM_TELEPHONY_ENABLED = False
+    settings.ROOMKIT_ENABLED = False
+    room = RoomFactory()
+    RoomLivenessService().mark_finished(str(room.id))
+    mock_data = mock.MagicMock()
+    mock_data.room.name = str(room.id)
+
+    service._handle_room_started(mock_data)
+
+    assert RoomLivenessService().is_alive(str(room.id)) is True
+
+
 def test_handle_room_started_raises_error_for_invalid_room_name(service):
     """Should raise ActionFailedError when room name format is invalid  when room starts."""
     mock_data = mock.MagicMock()
@@ -854,3 +930,384 @@ def test_receive_ignores_connection_test_room(
 
     mock_handle_room_started.assert_not_called()
     mock_handle_room_finished.assert_not_called()
+
+
+def _webhook_event(event, room_name, created_at=0):
+    """Build a LiveKit webhook event, and its body as sent by LiveKit."""
+    data = WebhookEvent(
+        id=str(uuid.uuid4()),
+        event=event,
+        room=Room(name=room_name),
+        created_at=created_at,
+    )
+    return data, json_format.MessageToJson(data)
+
+
+@mock.patch.object(api.WebhookReceiver, "receive")
+@mock.patch.object(LiveKitEventsService, "_handle_room_started")
+def test_receive_async_stores_event(
+    mock_handle_room_started, mock_receive, mock_livekit_config, settings
+):
+    """Should store the event instead of handling it in async mode."""
+    settings.LIVEKIT_WEBHOOK_ASYNC_PROCESSING_ENABLED = True
+    room_name = str(uuid.uuid4())
+    data, body = _webhook_event("room_started", room_name, created_at=1234)
+    mock_receive.return_value = data
+
+    mock_request = mock.MagicMock()
+    mock_request.headers = {"Authorization": "test_token"}
+    mock_request.body = body.encode("utf-8")
+
+    stored_event = LiveKitEventsService().receive(mock_request)
+
+    mock_handle_room_started.assert_not_called()
+
+    event = models.LiveKitWebhookEvent.objects.get()
+    assert stored_event == event
+    assert event.event_id == data.id
+    assert event.event_type == "room_started"
+    assert event.room_name == room_name
+    assert event.emitted_at == 1234
+    assert event.payload == body
+    assert event.status == "pending"
+
+
+@mock.patch.object(api.WebhookReceiver, "receive")
+def test_receive_async_stores_retried_event_once(
+    mock_receive, mock_livekit_config, settings
+):
+    """A webhook retried by LiveKit should be stored once, and returned again."""
+    settings.LIVEKIT_WEBHOOK_ASYNC_PROCESSING_ENABLED = True
+    data, body = _webhook_event("room_finished", str(uuid.uuid4()))
+    mock_receive.return_value = data
+
+    mock_request = mock.MagicMock()
+    mock_request.headers = {"Authorization": "test_token"}
+    mock_request.body = body.encode("utf-8")
+
+    service = LiveKitEventsService()
+    first_event = service.receive(mock_request)
+    retried_event = service.receive(mock_request)
+
+    assert models.LiveKitWebhookEvent.objects.count() == 1
+    assert retried_event == first_event
+
+
+@mock.patch.object(api.WebhookReceiver, "receive")
+def test_receive_async_skips_unhandled_events(
+    mock_receive, mock_livekit_config, settings
+):
+    """Events without a handler should not be stored."""
+    settings.LIVEKIT_WEBHOOK_ASYNC_PROCESSING_ENABLED = True
+    data, body = _webhook_event("track_published", str(uuid.uuid4()))
+    mock_receive.return_value = data
+
+    mock_request = mock.MagicMock()
+    mock_request.headers = {"Authorization": "test_token"}
+    mock_request.body = body.encode("utf-8")
+
+    assert LiveKitEventsService().receive(mock_request) is None
+    assert not models.LiveKitWebhookEvent.objects.exists()
+
+
+@mock.patch.object(LiveKitEventsService, "_handle_room_finished")
+@mock.patch.object(LiveKitEventsService, "_handle_room_started")
+def test_process_pending_events_in_emission_order(
+    mock_handle_room_started, mock_handle_room_finished, mock_livekit_config
+):
+    """Pending events of a room should be handled in the order LiveKit emitted them."""
+    room_name = str(uuid.uuid4())
+    handled = []
+    mock_handle_room_started.side_effect = lambda data: handled.append(data.id)
+    mock_handle_room_finished.side_effect = lambda data: handled.append(data.id)
+
+    events = {}
+    for event_type, created_at in (
+        ("room_finished", 20),
+        ("room_started", 10),
+        ("room_started", 30),
+    ):
+        data, body = _webhook_event(event_type, room_name, created_at=created_at)
+        events[created_at] = models.LiveKitWebhookEvent.objects.create(
+            event_id=data.id,
+            event_type=event_type,
+            room_name=room_name,
+            emitted_at=created_at,
+            payload=body,
+        )
+
+    events[30].status = "processed"
+    events[30].save()
+
+    LiveKitEventsService().process_pending_events(room_name)
+
+    assert handled == [events[10].event_id, events[20].event_id]
+    for event in events.values():
+        event.refresh_from_db()
+        assert event.status == "processed"
+    assert events[10].processed_at is not None
+
+
+@mock.patch.object(LiveKitEventsService, "_handle_room_finished")
+@mock.patch.object(LiveKitEventsService, "_handle_room_started")
+def test_process_pending_events_failure_holds_back_later_events(
+    mock_handle_room_started, mock_handle_room_finished, mock_livekit_config
+):
+    """The events following a failing event should wait until it's handled."""
+    room_name = str(uuid.uuid4())
+    handled = []
+
+    def handle_room_started(data):
+        if not handled:
+            handled.append("failed")
+            raise ActionFailedError("boom")
+        handled.append(data.event)
+
+    mock_handle_room_started.side_effect = handle_room_started
+    mock_handle_room_finished.side_effect = lambda data: handled.append(data.event)
+
+    stored = []
+    for event_type, created_at in (("room_started", 1), ("room_finished", 2)):
+        data, body = _webhook_event(event_type, room_name, created_at=created_at)
+        stored.append(
+            models.LiveKitWebhookEvent.objects.create(
+                event_id=data.id,
+                event_type=event_type,
+                room_name=room_name,
+                emitted_at=created_at,
+                payload=body,
+            )
+        )
+    service = LiveKitEventsService()
+
+    assert service.process_pending_events(room_name) == pytest.approx(10, abs=1)
+
+    mock_handle_room_finished.assert_not_called()
+    assert not service.has_due_events(room_name)
+    for event in stored:
+        event.refresh_from_db()
+    assert [event.status for event in stored] == ["pending", "pending"]
+    assert stored[0].attempts == 1
+    assert stored[0].next_attempt_at is not None
+    assert stored[1].attempts == 0
+
+    models.LiveKitWebhookEvent.objects.filter(pk=stored[0].pk).update(
+        next_attempt_at=timezone.now()
+    )
+    assert service.has_due_events(room_name)
+    assert service.process_pending_events(room_name) is None
+
+    assert handled == ["failed", "room_started", "room_finished"]
+    for event in stored:
+        event.refresh_from_db()
+    assert [event.status for event in stored] == ["processed", "processed"]
+
+
+@mock.patch.object(LiveKitEventsService, "_handle_room_finished")
+@mock.patch.object(LiveKitEventsService, "_handle_room_started")
+def test_process_pending_events_failed_event_releases_later_events(
+    mock_handle_room_started, mock_handle_room_finished, mock_livekit_config, settings
+):
+    """The events following an event marked failed should then be handled."""
+    settings.LIVEKIT_WEBHOOK_PROCESSING_MAX_ATTEMPTS = 1
+    room_name = str(uuid.uuid4())
+    mock_handle_room_started.side_effect = ActionFailedError("boom")
+
+    for event_type, created_at in (("room_started", 1), ("room_finished", 2)):
+        data, body = _webhook_event(event_type, room_name, created_at=created_at)
+        models.LiveKitWebhookEvent.objects.create(
+            event_id=data.id,
+            event_type=event_type,
+            room_name=room_name,
+            emitted_at=created_at,
+            payload=body,
+        )
+
+    assert LiveKitEventsService().process_pending_events(room_name) is None
+
+    mock_handle_room_finished.assert_called_once()
+    assert list(
+        models.LiveKitWebhookEvent.objects.filter(room_name=room_name)
+        .order_by("emitted_at")
+        .values_list("status", flat=True)
+    ) == ["failed", "processed"]
+
+
+@mock.patch.object(LiveKitEventsService, "_handle_room_started")
+def test_process_pending_events_retries_failed_event(
+    mock_handle_room_started, mock_livekit_config, settings
+):
+    """A failing event should be retried with backoff, then marked failed."""
+    settings.LIVEKIT_WEBHOOK_PROCESSING_MAX_ATTEMPTS = 3
+    settings.LIVEKIT_WEBHOOK_PROCESSING_RETRY_DELAY = 10
+    room_name = str(uuid.uuid4())
+    mock_handle_room_started.side_effect = ActionFailedError("boom")
+
+    data, body = _webhook_event("room_started", room_name)
+    event = models.LiveKitWebhookEvent.objects.create(
+        event_id=data.id,
+        event_type="room_started",
+        room_name=room_name,
+        emitted_at=1,
+        payload=body,
+    )
+    service = LiveKitEventsService()
+
+    # The event is not handled again before its retry is due
+    assert service.process_pending_events(room_name) == pytest.approx(10, abs=1)
+    assert service.process_pending_events(room_name) == pytest.approx(10, abs=1)
+    assert mock_handle_room_started.call_count == 1
+
+    event.refresh_from_db()
+    event.next_attempt_at = timezone.now()
+    event.save()
+    assert service.process_pending_events(room_name) == pytest.approx(20, abs=1)
+
+    event.refresh_from_db()
+    assert event.attempts == 2
+    event.next_attempt_at = timezone.now()
+    event.save()
+    assert service.process_pending_events(room_name) is None
+
+    event.refresh_from_db()
+    assert mock_handle_room_started.call_count == 3
+    assert event.status == "failed"
+    assert event.attempts == 3
+    assert event.next_attempt_at is None
+    assert event.processed_at is not None
+
+
+@mock.patch.object(LiveKitEventsService, "_handle_room_started")
+def test_process_pending_events_retry_succeeds(
+    mock_handle_room_started, mock_livekit_config
+):
+    """A failed event whose retry succeeds should be marked processed."""
+    room_name = str(uuid.uuid4())
+    mock_handle_room_started.side_effect = [ActionFailedError("boom"), None]
+
+    data, body = _webhook_event("room_started", room_name)
+    event = models.LiveKitWebhookEvent.objects.create(
+        event_id=data.id,
+        event_type="room_started",
+        room_name=room_name,
+        emitted_at=1,
+        payload=body,
+    )
+    service = LiveKitEventsService()
+    service.process_pending_events(room_name)
+
+    models.LiveKitWebhookEvent.objects.filter(pk=event.pk).update(
+        next_attempt_at=timezone.now()
+    )
+    assert service.process_pending_events(room_name) is None
+
+    event.refresh_from_db()
+    assert event.status == "processed"
+    assert event.attempts == 1
+
+
+@mock.patch.object(api.WebhookReceiver, "receive")
+@mock.patch.object(LiveKitEventsService, "_handle_room_started")
+def test_receive_drops_room_started_from_another_node(
+    mock_handle_room_started, mock_receive, mock_livekit_config
+):
+    """A room_started emitted by each node hosting the room should be handled once."""
+    room_name = str(uuid.uuid4())
+    room_sid = f"RM_{uuid.uuid4().hex}"
+
+    mock_request = mock.MagicMock()
+    mock_request.headers = {"Authorization": "test_token"}
+
+    service = LiveKitEventsService()
+    for _ in range(2):
+        mock_receive.return_value = WebhookEvent(
+            id=str(uuid.uuid4()),
+            event="room_started",
+            room=Room(sid=room_sid, name=room_name),
+        )
+        service.receive(mock_request)
+
+    mock_handle_room_started.assert_called_once()
+
+
+@mock.patch.object(api.WebhookReceiver, "receive")
+@mock.patch.object(LiveKitEventsService, "_handle_room_finished")
+def test_receive_handles_retry_of_failed_event(
+    mock_handle_room_finished, mock_receive, mock_livekit_config
+):
+    """An event whose handling failed should be handled again when LiveKit retries."""
+    data, _body = _webhook_event("room_finished", str(uuid.uuid4()))
+    mock_receive.return_value = data
+    mock_handle_room_finished.side_effect = [ActionFailedError("boom"), None]
+
+    mock_request = mock.MagicMock()
+    mock_request.headers = {"Authorization": "test_token"}
+
+    service = LiveKitEventsService()
+    with pytest.raises(ActionFailedError):
+        service.receive(mock_request)
+    service.receive(mock_request)
+    service.receive(mock_request)
+
+    assert mock_handle_room_finished.call_count == 2
+
+
+@mock.patch.object(LiveKitEventsService, "_handle_room_started")
+def test_process_pending_events_drops_duplicates(
+    mock_handle_room_started, mock_livekit_config
+):
+    """Stored room_started events of the same room session should be handled once."""
+    room_name = str(uuid.uuid4())
+    room_sid = f"RM_{uuid.uuid4().hex}"
+
+    for created_at in (1, 2):
+        data = WebhookEvent(
+            id=str(uuid.uuid4()),
+            event="room_started",
+            room=Room(sid=room_sid, name=room_name),
+            created_at=created_at,
+        )
+        models.LiveKitWebhookEvent.objects.create(
+            event_id=data.id,
+            event_type="room_started",
+            room_name=room_name,
+            emitted_at=created_at,
+            payload=json_format.MessageToJson(data),
+        )
+
+    LiveKitEventsService().process_pending_events(room_name)
+
+    mock_handle_room_started.assert_called_once()
+    assert not models.LiveKitWebhookEvent.objects.filter(
+        room_name=room_name, status="pending"
+    ).exists()
+
+
+@mock.patch.object(LiveKitEventsService, "_handle_room_finished")
+@mock.patch.object(LiveKitEventsService, "_handle_room_started")
+def test_process_pending_events_stored_while_processing(
+    mock_handle_room_started, mock_handle_room_finished, mock_livekit_config
+):
+    """Events stored while the room is processed should be handled in the same run."""
+    room_name = str(uuid.uuid4())
+    heartbeat = mock.Mock()
+
+    def store_event(event_type, created_at):
+        data, body = _webhook_event(event_type, room_name, created_at=created_at)
+        return models.LiveKitWebhookEvent.objects.create(
+            event_id=data.id,
+            event_type=event_type,
+            room_name=room_name,
+            emitted_at=created_at,
+            payload=body,
+        )
+
+    mock_handle_room_started.side_effect = lambda data: store_event("room_finished", 2)
+    store_event("room_started", 1)
+
+    service = LiveKitEventsService()
+    assert service.process_pending_events(room_name, heartbeat=heartbeat) is None
+
+    mock_handle_room_finished.assert_called_once()
+    assert heartbeat.call_count == 2
+    assert not service.has_due_events(room_name)
@@ -5,6 +5,8 @@ Test lobby service.
 # pylint: disable=W0621,W0613, W0212, R0913
 # ruff: noqa: PLR0913, PLR0917
 
+import threading
+import time
 import uuid
 from unittest import mock
 
@@ -383,6 +385,230 @@ def test_request_entry_waiting_participant(
     lobby_service._get_participant.assert_called_once_with(room.id, participant_id)
 
 
+@mock.patch("core.services.lobby.LobbyService.wait_for_decision")
+@mock.patch("core.services.lobby.LobbyService.refresh_waiting_status")
+def test_request_entry_waiting_participant_long_poll_disabled(
+    mock_refresh, mock_wait, settings, lobby_service, participant_id, username
+):
+    """Test waiting is ignored when long polling is disabled."""
+    settings.LOBBY_LONG_POLL_ENABLED = False
+    request = mock.Mock()
+    request.COOKIES = {settings.LOBBY_COOKIE_NAME: participant_id}
+    request.user = AnonymousUser()
+
+    room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED)
+
+    lobby_service._get_participant = mock.Mock(
+        return_value=LobbyParticipant(
+            status=LobbyParticipantStatus.WAITING,
+            username=username,
+            id=participant_id,
+            color="#123456",
+        )
+    )
+
+    participant, livekit_config = lobby_service.request_entry(
+        room, request, username, wait=True
+    )
+
+    assert participant.status == LobbyParticipantStatus.WAITING
+    assert livekit_config is None
+    mock_wait.assert_not_called()
+
+
+@mock.patch("core.utils.generate_livekit_config")
+@mock.patch("core.services.lobby.LobbyService.wait_for_decision")
+@mock.patch("core.services.lobby.LobbyService.refresh_waiting_status")
+def test_request_entry_waiting_participant_long_poll_accepted(
+    mock_refresh,
+    mock_wait,
+    mock_generate_config,
+    settings,
+    lobby_service,
+    participant_id,
+    username,
+):
+    """Test a long polling participant accepted while waiting gets its token."""
+    settings.LOBBY_LONG_POLL_ENABLED = True
+    request = mock.Mock()
+    request.COOKIES = {settings.LOBBY_COOKIE_NAME: participant_id}
+    request.user = AnonymousUser()
+
+    room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED)
+
+    lobby_service._get_participant = mock.Mock(
+        return_value=LobbyParticipant(
+            status=LobbyParticipantStatus.WAITING,
+            username=username,
+            id=participant_id,
+            color="#123456",
+        )
+    )
+    mock_wait.return_value = LobbyParticipant(
+        status=LobbyParticipantStatus.ACCEPTED,
+        username=username,
+        id=participant_id,
+        color="#123456",
+    )
+    mock_generate_config.return_value = {"token": "test-token"}
+
+    participant, livekit_config = lobby_service.request_entry(
+        room, request, username, wait=True
+    )
+
+    assert participant.status == LobbyParticipantStatus.ACCEPTED
+    assert livekit_config == {"token": "test-token"}
+    mock_refresh.assert_called_once_with(room.id, participant_id)
+    mock_wait.assert_called_once_with(room.id, participant_id)
+
+
+@mock.patch("core.services.lobby.LobbyService.wait_for_decision")
+@mock.patch("core.services.lobby.LobbyService.refresh_waiting_status")
+def test_request_entry_waiting_participant_long_poll_slots(
+    mock_refresh, mock_wait, settings, lobby_service, participant_id, username
+):
+    """Test waiting requests beyond LOBBY_LONG_POLL_MAX_WAITERS are answered at once."""
+    settings.LOBBY_LONG_POLL_ENABLED = True
+    settings.LOBBY_LONG_POLL_MAX_WAITERS = 1
+    request = mock.Mock()
+    request.COOKIES = {settings.LOBBY_COOKIE_NAME: participant_id}
+    request.user = AnonymousUser()
+
+    room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED)
+
+    lobby_service._get_participant = mock.Mock(
+        return_value=LobbyParticipant(
+            status=LobbyParticipantStatus.WAITING,
+            username=username,
+            id=participant_id,
+            color="#123456",
+        )
+    )
+    mock_wait.return_value = None
+
+    slot_id = lobby_service._acquire_long_poll_slot()
+    assert slot_id is not None
+    try:
+        participant, _ = lobby_service.request_entry(room, request, username, True)
+        assert participant.status == LobbyParticipantStatus.WAITING
+        mock_wait.assert_not_called()
+    finally:
+        lobby_service._release_long_poll_slot(slot_id)
+
+    # The slot of a finished wait is released
+    for _ in range(2):
+        lobby_service.request_entry(room, request, username, wait=True)
+    assert mock_wait.call_count == 2
+
+
+def test_acquire_long_poll_slot_expires(settings, lobby_service):
+    """Test the slot of a worker which died while waiting frees itself."""
+    settings.LOBBY_LONG_POLL_MAX_WAITERS = 1
+    settings.LOBBY_LONG_POLL_TIMEOUT = 10
+
+    with mock.patch("core.services.lobby.time.time", return_value=1000):
+        assert lobby_service._acquire_long_poll_slot() is not None
+        assert lobby_service._acquire_long_poll_slot() is None
+
+    with mock.patch("core.services.lobby.time.time", return_value=1011):
+        slot_id = lobby_service._acquire_long_poll_slot()
+
+    assert slot_id is not None
+    lobby_service._release_long_poll_slot(slot_id)
+
+
+def test_wait_for_decision_already_decided(settings, lobby_service, participant_id):
+    """Test waiting returns immediately when the decision was already made."""
+    settings.LOBBY_LONG_POLL_TIMEOUT = 10
+    room_id = uuid.uuid4()
+
+    with mock.patch("core.utils.notify_participants"):
+        lobby_service.enter(room_id, participant_id, "username")
+    lobby_service.handle_participant_entry(room_id, participant_id, allow_entry=False)
+
+    participant = lobby_service.wait_for_decision(room_id, participant_id)
+
+    assert participant.status == LobbyParticipantStatus.DENIED
+
+
+def test_wait_for_decision_timeout(settings, lobby_service, participant_id):
+    """Test waiting keeps the entry alive and gives up at the deadline."""
+    settings.LOBBY_WAITING_TIMEOUT = 1
+    settings.LOBBY_LONG_POLL_TIMEOUT = 2
+    room_id = uuid.uuid4()
+
+    with mock.patch("core.utils.notify_participants"):
+        lobby_service.enter(room_id, participant_id, "username")
+
+    participant = lobby_service.wait_for_decision(room_id, participant_id)
+
+    # The entry outlived LOBBY_WAITING_TIMEOUT thanks to the heartbeats
+    assert participant.status == LobbyParticipantStatus.WAITING
+    assert lobby_service._get_participant(room_id, participant_id) is not None
+
+
+def test_wait_for_decision_busy_room(settings, lobby_service, participant_id):
+    """Test the entry is kept alive while decisions on others keep arriving."""
+    settings.LOBBY_WAITING_TIMEOUT = 1
+    settings.LOBBY_LONG_POLL_TIMEOUT = 2
+    room_id = uuid.uuid4()
+
+    with mock.patch("core.utils.notify_participants"):
+        lobby_service.enter(room_id, participant_id, "username")
+        lobby_service.enter(room_id, "other-participant", "username")
+
+    stopped = threading.Event()
+
+    def decide_on_other_participant():
+        while not stopped.wait(0.1):
+            lobby_service.handle_participant_entry(
+                room_id, "other-participant", allow_entry=True
+            )
+
+    thread = threading.Thread(target=decide_on_other_participant)
+    thread.start()
+    try:
+        participant = lobby_service.wait_for_decision(room_id, participant_id)
+    finally:
+        stopped.set()
+        thread.join()
+
+    # Messages arriving more often than the heartbeat don't delay the refreshes
+    assert participant.status == LobbyParticipantStatus.WAITING
+    assert lobby_service._get_participant(room_id, participant_id) is not None
+
+
+def test_wait_for_decision_woken_up_by_decision(
+    settings, lobby_service, participant_id
+):
+    """Test a parked participant is released as soon as a decision is published."""
+    settings.LOBBY_LONG_POLL_TIMEOUT = 10
+    room_id = uuid.uuid4()
+
+    with mock.patch("core.utils.notify_participants"):
+        lobby_service.enter(room_id, participant_id, "username")
+        lobby_service.enter(room_id, "other-participant", "username")
+
+    def decide():
+        time.sleep(0.2)
+        lobby_service.handle_participant_entry(
+            room_id, "other-participant", allow_entry=True
+        )
+        time.sleep(0.2)
+        lobby_service.handle_participant_entry(
+            room_id, participant_id, allow_entry=True
+        )
+
+    thread = threading.Thread(target=decide)
+    started_at = time.monotonic()
+    thread.start()
+    participant = lobby_service.wait_for_decision(room_id, participant_id)
+    thread.join()
+
+    assert participant.status == LobbyParticipantStatus.ACCEPTED
+    assert time.monotonic() - started_at < 5
+
+
 @mock.patch("core.utils.generate_livekit_config")
 def test_request_entry_accepted_participant(
     mock_generate_config, lobby_service, participant_id, username
@@ -470,6 +696,18 @@ def test_refresh_waiting_status(mock_cache, lobby_service, participant_id):
     mock_cache.touch.assert_called_once_with(
         "mocked_cache_key", settings.LOBBY_WAITING_TIMEOUT
     )
+    # An expired participant must not be resurrected in the room index
+    assert lobby_service._get_indexed_participant_ids(room.id) == []
+
+
+def test_refresh_waiting_status_extends_index(lobby_service, participant_id):
+    """Test refreshing waiting status pushes back the indexed expiry."""
+    room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED)
+    lobby_service._index_participant(room.id, participant_id, 1)
+
+    with mock.patch("core.services.lobby.time.time", return_value=10**10):
+        lobby_service.refresh_waiting_status(room.id, participant_id)
+        assert lobby_service._get_indexed_participant_ids(room.id) == [participant_id]
 
 
 # pylint: disable=R0917
@@ -578,14 +816,11 @@ def test_get_participant_parsing_error(
 @mock.patch("core.services.lobby.cache")
 def test_list_waiting_participants_empty(mock_cache, lobby_service):
     """Test listing waiting participants when none exist."""
-    mock_cache.keys.return_value = []
-
     room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED)
     result = lobby_service.list_waiting_participants(room.id)
 
     assert result == []
-    pattern = f"{settings.LOBBY_KEY_PREFIX}_{room.id!s}_*"
-    mock_cache.keys.assert_called_once_with(pattern)
+    mock_cache.keys.assert_not_called()
     mock_cache.get_many.assert_not_called()
 
 
@@ -594,7 +829,7 @@ def test_list_waiting_participants(mock_cache, lobby_service, participant_dict):
     """Test listing waiting participants with valid data."""
     room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED)
     cache_key = f"{settings.LOBBY_KEY_PREFIX}_{room.id!s}_participant1"
-    mock_cache.keys.return_value = [cache_key]
+    lobby_service._index_participant(room.id, "participant1", 10)
     mock_cache.get_many.return_value = {cache_key: participant_dict}
 
     result = lobby_service.list_waiting_participants(room.id)
@@ -602,8 +837,7 @@ def test_list_waiting_participants(mock_cache, lobby_service, participant_dict):
     assert len(result) == 1
     assert result[0]["status"] == "waiting"
     assert result[0]["username"] == "test-username"
-    pattern = f"{settings.LOBBY_KEY_PREFIX}_{room.id!s}_*"
-    mock_cache.keys.assert_called_once_with(pattern)
+    mock_cache.keys.assert_not_called()
     mock_cache.get_many.assert_called_once_with([cache_key])
 
 
@@ -628,7 +862,8 @@ def test_list_waiting_participants_multiple(mock_cache, lobby_service):
         "color": "#654321",
     }
 
-    mock_cache.keys.return_value = [cache_key1, cache_key2]
+    lobby_service._index_participant(room.id, "participant1", 10)
+    lobby_service._index_participant(room.id, "participant2", 20)
     mock_cache.get_many.return_value = {
         cache_key1: participant1,
         cache_key2: participant2,
@@ -645,8 +880,7 @@ def test_list_waiting_participants_multiple(mock_cache, lobby_service):
     # Verify all participants have waiting status
     assert all(p["status"] == "waiting" for p in result)
 
-    pattern = f"{settings.LOBBY_KEY_PREFIX}_{room.id!s}_*"
-    mock_cache.keys.assert_called_once_with(pattern)
+    mock_cache.keys.assert_not_called()
     mock_cache.get_many.assert_called_once_with([cache_key1, cache_key2])
 
 
@@ -655,13 +889,14 @@ def test_list_waiting_participants_corrupted_data(mock_cache, lobby_service):
     """Test listing waiting participants with corrupted data."""
     room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED)
     cache_key = f"{settings.LOBBY_KEY_PREFIX}_{room.id!s}_participant1"
-    mock_cache.keys.return_value = [cache_key]
+    lobby_service._index_participant(room.id, "participant1", 10)
     mock_cache.get_many.return_value = {cache_key: {"invalid": "data"}}
 
     result = lobby_service.list_waiting_participants(room.id)
 
     assert result == []
     mock_cache.delete.assert_called_once_with(cache_key)
+    assert lobby_service._get_indexed_participant_ids(room.id) == []
 
 
 @mock.patch("core.services.lobby.cache")
@@ -680,7 +915,8 @@ def test_list_waiting_participants_partially_corrupted(mock_cache, lobby_service
 
     corrupted_participant = {"invalid": "data"}
 
-    mock_cache.keys.return_value = [cache_key1, cache_key2]
+    lobby_service._index_participant(room.id, "participant1", 10)
+    lobby_service._index_participant(room.id, "participant2", 20)
     mock_cache.get_many.return_value = {
         cache_key1: corrupted_participant,
         cache_key2: valid_participant,
@@ -698,8 +934,6 @@ def test_list_waiting_participants_partially_corrupted(mock_cache, lobby_service
     mock_cache.delete.assert_called_once_with(cache_key1)
 
     # Verify both cache keys were queried
-    pattern = f"{settings.LOBBY_KEY_PREFIX}_{room.id!s}_*"
-    mock_cache.keys.assert_called_once_with(pattern)
     mock_cache.get_many.assert_called_once_with([cache_key1, cache_key2])
 
 
@@ -723,7 +957,8 @@ def test_list_waiting_participants_non_waiting(mock_cache, lobby_service):
         "color": "#654321",
     }
 
-    mock_cache.keys.return_value = [cache_key1, cache_key2]
+    lobby_service._index_participant(room.id, "participant1", 10)
+    lobby_service._index_participant(room.id, "participant2", 20)
     mock_cache.get_many.return_value = {
         cache_key1: participant1,
         cache_key2: participant2,
@@ -736,6 +971,44 @@ def test_list_waiting_participants_non_waiting(mock_cache, lobby_service):
     assert result[0]["status"] == "waiting"
 
 
+@mock.patch("core.services.lobby.cache")
+def test_list_waiting_participants_expired_entries(mock_cache, lobby_service):
+    """Test expired or evicted entries are pruned from the room index."""
+    room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED)
+    cache_key = f"{settings.LOBBY_KEY_PREFIX}_{room.id!s}_participant1"
+
+    lobby_service._index_participant(room.id, "participant1", 10)
+    lobby_service._index_participant(room.id, "participant2", 10)
+    lobby_service._index_participant(room.id, "expired", -1)
+    mock_cache.get_many.return_value = {}
+
+    result = lobby_service.list_waiting_participants(room.id)
+
+    assert result == []
+    mock_cache.get_many.assert_called_once_with(
+        [cache_key, f"{settings.LOBBY_KEY_PREFIX}_{room.id!s}_participant2"]
+    )
+    assert lobby_service._get_indexed_participant_ids(room.id) == []
+
+
+def test_list_waiting_participants_does_not_scan_keyspace(
+    lobby_service, participant_id, username
+):
+    """Test listing waiting participants reads the room index, not KEYS."""
+    room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED)
+    other_room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED)
+
+    with mock.patch("core.utils.notify_participants"):
+        lobby_service.enter(room.id, participant_id, username)
+        lobby_service.enter(other_room.id, "other-participant", username)
+
+    with mock.patch.object(cache, "keys") as mock_keys:
+        result = lobby_service.list_waiting_participants(room.id)
+
+    mock_keys.assert_not_called()
+    assert [p["id"] for p in result] == [participant_id]
+
+
 @mock.patch("core.services.lobby.LobbyService._update_participant_status")
 def test_handle_participant_entry_allow(mock_update, lobby_service, participant_id):
     """Test handling allowed participant entry."""
@@ -849,40 +1122,19 @@ def test_clear_room_cache(settings, lobby_service):
 
     room_id = uuid.uuid4()
 
-    cache.set(
-        f"test-lobby_{room_id!s}_participant1",
-        LobbyParticipant(
-            status=LobbyParticipantStatus.WAITING,
-            username="participant1",
-            id="participant1",
-            color="#123456",
-        ),
-        timeout=settings.LOBBY_WAITING_TIMEOUT,
-    )
-    cache.set(
-        f"test-lobby_{room_id!s}_participant2",
-        LobbyParticipant(
-            status=LobbyParticipantStatus.ACCEPTED,
-            username="participant2",
-            id="participant2",
-            color="#123456",
-        ),
-        timeout=settings.LOBBY_ACCEPTED_TIMEOUT,
-    )
-    cache.set(
-        f"test-lobby_{room_id!s}_participant3",
-        LobbyParticipant(
-            status=LobbyParticipantStatus.DENIED,
-            username="participant3",
-            id="participant3",
-            color="#123456",
-        ),
-        timeout=settings.LOBBY_DENIED_TIMEOUT,
-    )
+    with mock.patch("core.utils.notify_participants"):
+        for participant_id in ["participant1", "participant2", "participant3"]:
+            lobby_service.enter(room_id, participant_id, participant_id)
+
+    lobby_service.handle_participant_entry(room_id, "participant2", allow_entry=True)
+    lobby_service.handle_participant_entry(room_id, "participant3", allow_entry=False)
+
+    assert len(cache.keys(f"test-lobby_{room_id!s}_*")) == 3
 
     lobby_service.clear_room_cache(room_id)
 
     assert cache.keys(f"test-lobby_{room_id!s}_*") == []
+    assert lobby_service._get_indexed_participant_ids(room_id) == []
 
 
 def test_clear_room_empty(settings, lobby_service):
@@ -911,8 +1163,11 @@ def test_clear_participant_cache(lobby_service):
     cache.set(cache_key, participant_data, timeout=settings.LOBBY_WAITING_TIMEOUT)
     assert cache.get(cache_key) is not None
 
+    lobby_service._index_participant(room_id, participant_id, 10)
+
     lobby_service.clear_participant_cache(room_id, participant_id)
     assert cache.get(cache_key) is None
+    assert lobby_service._get_indexed_participant_ids(room_id) == []
 
 
 def test_clear_participant_cache_nonexistent(lobby_service):
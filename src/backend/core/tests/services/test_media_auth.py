@@ -0,0 +1,62 @@
+"""
+Test media authorization cache.
+"""
+
+import uuid
+
+from django.contrib.auth.models import AnonymousUser
+
+import pytest
+
+from core.factories import UserFactory
+from core.services.media_auth import MediaAuthorizationCache
+
+pytestmark = pytest.mark.django_db
+
+
+def _original_url():
+    """Return a unique media URL."""
+    return f"http://localhost/media/recordings/{uuid.uuid4()!s}.mp4"
+
+
+def test_get_unknown_authorization():
+    """Media never authorized should not be found in the cache."""
+    assert MediaAuthorizationCache().get(UserFactory(), _original_url()) is None
+
+
+def test_set_authorization():
+    """Authorizations should be cached per user and media URL."""
+    user = UserFactory()
+    original_url = _original_url()
+
+    MediaAuthorizationCache().set(user, original_url, "recordings/key.mp4")
+
+    assert MediaAuthorizationCache().get(user, original_url) == "recordings/key.mp4"
+    assert MediaAuthorizationCache().get(UserFactory(), original_url) is None
+    assert MediaAuthorizationCache().get(user, _original_url()) is None
+
+
+def test_authorization_missing_url():
+    """Subrequests without original URL should never be found in the cache."""
+    assert MediaAuthorizationCache().get(UserFactory(), None) is None
+
+
+def test_authorization_anonymous_user():
+    """Anonymous users should never be authorized from the cache."""
+    original_url = _original_url()
+
+    MediaAuthorizationCache().set(AnonymousUser(), original_url, "key")
+
+    assert MediaAuthorizationCache().get(AnonymousUser(), original_url) is None
+
+
+def test_authorization_cache_disabled(settings):
+    """Authorizations should not be cached when the cache is disabled."""
+    settings.MEDIA_AUTH_CACHE_TIMEOUT = 0
+    user = UserFactory()
+    original_url = _original_url()
+
+    MediaAuthorizationCache().set(user, original_url, "key")
+
+    settings.MEDIA_AUTH_CACHE_TIMEOUT = 30
+    assert MediaAuthorizationCache().get(user, original_url) is None
@@ -0,0 +1,113 @@
+"""
+Test participants management service.
+"""
+
+import uuid
+from unittest import mock
+
+from livekit.protocol.models import ParticipantInfo
+
+from core.services.participants_management import ParticipantsManagement
+from core.services.room_presence import RoomPresenceService
+
+
+def create_mock_livekit_client(participant):
+    """Factory for creating LiveKit client mock returning a participant."""
+    mock_api = mock.Mock()
+    mock_api.room = mock.Mock()
+    mock_api.room.get_participant = mock.AsyncMock(return_value=participant)
+    mock_api.aclose = mock.AsyncMock()
+    return mock_api
+
+
+def test_check_if_in_meeting_missing_arguments():
+    """Should return False without asking LiveKit when arguments are missing."""
+    with mock.patch("core.utils.get_livekit_client") as mock_client_factory:
+        assert ParticipantsManagement().check_if_in_meeting("", "participant") is False
+        assert ParticipantsManagement().check_if_in_meeting("room", "") is False
+
+    mock_client_factory.assert_not_called()
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_check_if_in_meeting_known_participant(mock_client_factory):
+    """Should not ask LiveKit about participants known to be connected."""
+    room_name = str(uuid.uuid4())
+    RoomPresenceService().mark_joined(room_name, "participant-1")
+
+    assert ParticipantsManagement().check_if_in_meeting(room_name, "participant-1")
+
+    mock_client_factory.assert_not_called()
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_check_if_in_meeting_remembers_connected_participant(mock_client_factory):
+    """Should ask LiveKit once about an unknown participant found connected."""
+    room_name = str(uuid.uuid4())
+    mock_client_factory.return_value = create_mock_livekit_client(
+        ParticipantInfo(identity="participant-1", state=ParticipantInfo.State.ACTIVE)
+    )
+
+    service = ParticipantsManagement()
+    assert service.check_if_in_meeting(room_name, "participant-1") is True
+    assert service.check_if_in_meeting(room_name, "participant-1") is True
+
+    mock_client_factory.return_value.room.get_participant.assert_called_once()
+    assert RoomPresenceService().is_present(room_name, "participant-1") is True
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_check_if_in_meeting_disconnected_participant(mock_client_factory):
+    """Should not remember a participant found disconnected."""
+    room_name = str(uuid.uuid4())
+    mock_client_factory.return_value = create_mock_livekit_client(
+        ParticipantInfo(
+            identity="participant-1", state=ParticipantInfo.State.DISCONNECTED
+        )
+    )
+
+    assert (
+        ParticipantsManagement().check_if_in_meeting(room_name, "participant-1")
+        is False
+    )
+    assert RoomPresenceService().is_present(room_name, "participant-1") is False
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_remove_forgets_participant_presence(mock_client_factory):
+    """A removed participant should stop passing presence checks at once."""
+    room_name = str(uuid.uuid4())
+    mock_client_factory.return_value = create_mock_livekit_client(
+        ParticipantInfo(identity="participant-1", state=ParticipantInfo.State.ACTIVE)
+    )
+    mock_client_factory.return_value.room.remove_participant = mock.AsyncMock()
+    service = ParticipantsManagement()
+    RoomPresenceService().mark_joined(room_name, "participant-1")
+
+    service.remove(room_name, "participant-1")
+
+    assert RoomPresenceService().is_present(room_name, "participant-1") is False
+    mock_client_factory.return_value.room.get_participant.return_value = (
+        ParticipantInfo(
+            identity="participant-1", state=ParticipantInfo.State.DISCONNECTED
+        )
+    )
+    assert service.check_if_in_meeting(room_name, "participant-1") is False
+    mock_client_factory.return_value.room.get_participant.assert_called_once()
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_bulk_remove_forgets_participants_presence(mock_client_factory):
+    """Participants removed at once should all stop passing presence checks."""
+    room_name = str(uuid.uuid4())
+    mock_client_factory.return_value = create_mock_livekit_client(None)
+    mock_client_factory.return_value.room.remove_participant = mock.AsyncMock()
+    room_presence = RoomPresenceService()
+    for identity in ("participant-1", "participant-2", "participant-3"):
+        room_presence.mark_joined(room_name, identity)
+
+    ParticipantsManagement().bulk_remove(room_name, ["participant-1", "participant-2"])
+
+    assert room_presence.is_present(room_name, "participant-1") is False
+    assert room_presence.is_present(room_name, "participant-2") is False
+    assert room_presence.is_present(room_name, "participant-3") is True
@@ -1,10 +1,13 @@
 """Tests for the RoomManagement service."""
 
+import json
 from unittest import mock
+from uuid import uuid4
 
 import pytest
 from livekit.api import TwirpError
 
+from core.services.room_liveness import RoomLivenessService
 from core.services.room_management import (
     RoomManagement,
     RoomManagementException,
@@ -12,49 +15,100 @@ from core.services.room_management import (
 )
 
 
-@mock.patch("core.services.room_management.utils.create_livekit_client")
-def test_delete_room_calls_livekit(mock_create_livekit_client):
+@mock.patch("core.services.room_management.utils.get_livekit_client")
+def test_delete_room_calls_livekit(mock_get_livekit_client):
     """DeleteRoom is forwarded to the LiveKit API."""
     mock_api = mock.MagicMock()
     mock_api.room.delete_room = mock.AsyncMock()
     mock_api.aclose = mock.AsyncMock()
-    mock_create_livekit_client.return_value = mock_api
+    mock_get_livekit_client.return_value = mock_api
 
     RoomManagement().delete_room("room-abc")
 
     mock_api.room.delete_room.assert_awaited_once()
     request = mock_api.room.delete_room.await_args.args[0]
     assert request.room == "room-abc"
-    mock_api.aclose.assert_awaited_once()
+    mock_api.aclose.assert_not_called()
 
 
-@mock.patch("core.services.room_management.utils.create_livekit_client")
-def test_delete_room_raises_not_found(mock_create_livekit_client):
+@mock.patch("core.services.room_management.utils.get_livekit_client")
+def test_delete_room_raises_not_found(mock_get_livekit_client):
     """Missing rooms raise RoomNotFoundException."""
     mock_api = mock.MagicMock()
     mock_api.room.delete_room = mock.AsyncMock(
         side_effect=TwirpError("not_found", "room not found", status=404)
     )
     mock_api.aclose = mock.AsyncMock()
-    mock_create_livekit_client.return_value = mock_api
+    mock_get_livekit_client.return_value = mock_api
 
     with pytest.raises(RoomNotFoundException):
         RoomManagement().delete_room("missing-room")
 
-    mock_api.aclose.assert_awaited_once()
+    mock_api.aclose.assert_not_called()
 
 
-@mock.patch("core.services.room_management.utils.create_livekit_client")
-def test_delete_room_raises_management_exception(mock_create_livekit_client):
+@mock.patch("core.services.room_management.utils.get_livekit_client")
+def test_delete_room_raises_management_exception(mock_get_livekit_client):
     """Unexpected Twirp errors raise RoomManagementException."""
     mock_api = mock.MagicMock()
     mock_api.room.delete_room = mock.AsyncMock(
         side_effect=TwirpError("internal", "boom", status=500)
     )
     mock_api.aclose = mock.AsyncMock()
-    mock_create_livekit_client.return_value = mock_api
+    mock_get_livekit_client.return_value = mock_api
 
     with pytest.raises(RoomManagementException):
         RoomManagement().delete_room("room-abc")
 
-    mock_api.aclose.assert_awaited_once()
+    mock_api.aclose.assert_not_called()
+
+
+@mock.patch("core.services.room_management.utils.get_livekit_client")
+def test_update_metadata_merges_metadata(mock_get_livekit_client):
+    """Metadata is merged into the existing room metadata, and the room remembered."""
+    room_name = str(uuid4())
+    mock_api = mock.MagicMock()
+    mock_api.room.list_rooms = mock.AsyncMock(
+        return_value=mock.Mock(rooms=[mock.Mock(metadata='{"a": 1, "b": 2}')])
+    )
+    mock_api.room.update_room_metadata = mock.AsyncMock()
+    mock_get_livekit_client.return_value = mock_api
+
+    RoomManagement().update_metadata(room_name, {"c": 3}, remove_keys=["b"])
+
+    request = mock_api.room.update_room_metadata.await_args.args[0]
+    assert request.room == room_name
+    assert json.loads(request.metadata) == {"a": 1, "c": 3}
+    assert RoomLivenessService().is_alive(room_name) is True
+
+
+@mock.patch("core.services.room_management.utils.get_livekit_client")
+def test_update_metadata_finished_room_asks_livekit(mock_get_livekit_client):
+    """Rooms which finished are looked up in LiveKit, as they may run again."""
+    room_name = str(uuid4())
+    mock_api = mock.MagicMock()
+    mock_api.room.list_rooms = mock.AsyncMock(return_value=mock.Mock(rooms=[]))
+    mock_get_livekit_client.return_value = mock_api
+
+    RoomLivenessService().mark_finished(room_name)
+
+    with pytest.raises(RoomNotFoundException):
+        RoomManagement().update_metadata(room_name, {"c": 3})
+
+    mock_api.room.list_rooms.assert_called_once()
+
+
+@mock.patch("core.services.room_management.utils.get_livekit_client")
+def test_update_metadata_missing_room_forgets_liveness(mock_get_livekit_client):
+    """A cached room missing from LiveKit is forgotten."""
+    room_name = str(uuid4())
+    mock_api = mock.MagicMock()
+    mock_api.room.list_rooms = mock.AsyncMock(return_value=mock.Mock(rooms=[]))
+    mock_get_livekit_client.return_value = mock_api
+
+    RoomLivenessService().mark_started(room_name)
+
+    with pytest.raises(RoomNotFoundException):
+        RoomManagement().update_metadata(room_name, {"c": 3})
+
+    assert RoomLivenessService().is_alive(room_name) is None
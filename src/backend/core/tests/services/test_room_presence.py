@@ -0,0 +1,84 @@
+"""
+Test room presence service.
+"""
+
+# pylint: disable=W0621
+
+import uuid
+from unittest import mock
+
+import pytest
+
+from core.services.room_presence import RoomPresenceService
+
+
+@pytest.fixture
+def room_name():
+    """Unique room name, as the test redis is shared."""
+    return str(uuid.uuid4())
+
+
+def test_is_present_unknown_participant(room_name):
+    """Participants never seen should not be known as present."""
+    assert RoomPresenceService().is_present(room_name, "participant-1") is False
+
+
+def test_mark_joined(room_name):
+    """Joined participants should be known as present, in their room only."""
+    service = RoomPresenceService()
+
+    service.mark_joined(room_name, "participant-1")
+
+    assert service.is_present(room_name, "participant-1") is True
+    assert service.is_present(room_name, "participant-2") is False
+    assert service.is_present(str(uuid.uuid4()), "participant-1") is False
+
+
+def test_mark_left(room_name):
+    """Participants who left should not be known as present anymore."""
+    service = RoomPresenceService()
+    service.mark_joined(room_name, "participant-1")
+    service.mark_joined(room_name, "participant-2")
+
+    service.mark_left(room_name, "participant-1")
+
+    assert service.is_present(room_name, "participant-1") is False
+    assert service.is_present(room_name, "participant-2") is True
+
+
+def test_clear(room_name):
+    """Participants of a finished room should be forgotten."""
+    service = RoomPresenceService()
+    service.mark_joined(room_name, "participant-1")
+
+    service.clear(room_name)
+
+    assert service.is_present(room_name, "participant-1") is False
+
+
+def test_presence_expires(room_name, settings):
+    """Presence should not be trusted past the cache timeout."""
+    settings.ROOM_PRESENCE_CACHE_TIMEOUT = 60
+    service = RoomPresenceService()
+
+    with mock.patch("core.services.room_presence.time.time", return_value=1000):
+        service.mark_joined(room_name, "participant-1")
+
+    with mock.patch("core.services.room_presence.time.time", return_value=1059):
+        assert service.is_present(room_name, "participant-1") is True
+
+    with mock.patch("core.services.room_presence.time.time", return_value=1061):
+        assert service.is_present(room_name, "participant-1") is False
+
+
+def test_presence_cache_disabled(room_name, settings):
+    """No participant should be known as present when the cache is disabled."""
+    service = RoomPresenceService()
+    service.mark_joined(room_name, "participant-1")
+
+    settings.ROOM_PRESENCE_CACHE_TIMEOUT = 0
+    service.mark_joined(room_name, "participant-2")
+
+    assert service.is_present(room_name, "participant-1") is False
+    settings.ROOM_PRESENCE_CACHE_TIMEOUT = 300
+    assert service.is_present(room_name, "participant-2") is False
@@ -2,12 +2,14 @@
 Test SIP mamagement service.
 """
 
-# pylint: disable=W0212
+# pylint: disable=W0212,W0621
 
+import uuid
 from unittest import mock
 
 import pytest
 from asgiref.sync import async_to_sync
+from django_redis import get_redis_connection
 from livekit.api import TwirpError
 from livekit.protocol.sip import (
     CreateSIPDispatchRuleRequest,
@@ -29,6 +31,17 @@ from core.services.sip_management import (
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture(autouse=True)
+def registry_key():
+    """Isolate the dispatch rules registry, as the test redis is shared."""
+    key = f"sip_dispatch_rules_{uuid.uuid4()}"
+    with mock.patch(
+        "core.services.sip_management.SIP_DISPATCH_RULES_REGISTRY_KEY", key
+    ):
+        yield key
+    get_redis_connection("default").delete(key)
+
+
 def create_mock_livekit_client():
     """Factory for creating LiveKit client mock."""
     mock_api = mock.Mock()
@@ -46,18 +59,21 @@ def test_rule_name():
     assert rule_name == f"SIP_{str(room.id)}"
 
 
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_create_dispatch_rule_success(mock_client_factory):
     """Test successful dispatch rule creation."""
     sip_management = SIPManagement()
     room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED, pin_code="1234")
 
     mock_api = create_mock_livekit_client()
-    mock_api.sip.create_sip_dispatch_rule = mock.AsyncMock()
+    mock_api.sip.create_sip_dispatch_rule = mock.AsyncMock(
+        return_value=SIPDispatchRuleInfo(sip_dispatch_rule_id="rule-1")
+    )
     mock_client_factory.return_value = mock_api
 
     sip_management.create_dispatch_rule(room)
 
+    assert sip_management._get_registered_rules_ids(room.id) == ["rule-1"]
     mock_api.sip.create_sip_dispatch_rule.assert_called_once()
     create_request = mock_api.sip.create_sip_dispatch_rule.call_args[1]["create"]
 
@@ -65,10 +81,10 @@ def test_create_dispatch_rule_success(mock_client_factory):
     assert create_request.name == f"SIP_{str(room.id)}"
     assert create_request.rule.dispatch_rule_direct.room_name == str(room.id)
     assert create_request.rule.dispatch_rule_direct.pin == str(room.pin_code)
-    mock_api.aclose.assert_called_once()
+    mock_api.aclose.assert_not_called()
 
 
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_create_dispatch_rule_api_failure(mock_client_factory):
     """Test dispatch rule creation when API fails."""
     sip_management = SIPManagement()
@@ -84,10 +100,10 @@ def test_create_dispatch_rule_api_failure(mock_client_factory):
         sip_management.create_dispatch_rule(room)
 
     mock_api.sip.create_sip_dispatch_rule.assert_called_once()
-    mock_api.aclose.assert_called_once()
+    mock_api.aclose.assert_not_called()
 
 
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_list_dispatch_rules_ids_success(mock_client_factory):
     """Test successful listing of dispatch rule IDs."""
     sip_management = SIPManagement()
@@ -125,10 +141,10 @@ def test_list_dispatch_rules_ids_success(mock_client_factory):
     mock_api.sip.list_sip_dispatch_rule.assert_called_once()
     list_request = mock_api.sip.list_sip_dispatch_rule.call_args[1]["list"]
     assert isinstance(list_request, ListSIPDispatchRuleRequest)
-    mock_api.aclose.assert_called_once()
+    mock_api.aclose.assert_not_called()
 
 
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_list_dispatch_rules_ids_empty_response(mock_client_factory):
     """Test listing dispatch rule IDs when no rules exist."""
     sip_management = SIPManagement()
@@ -143,10 +159,10 @@ def test_list_dispatch_rules_ids_empty_response(mock_client_factory):
     result = async_to_sync(sip_management._list_dispatch_rules_ids)(room.id)
 
     assert result == []
-    mock_api.aclose.assert_called_once()
+    mock_api.aclose.assert_not_called()
 
 
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_list_dispatch_rules_ids_no_matching_rules(mock_client_factory):
     """Test listing dispatch rule IDs when no rules match the room."""
     sip_management = SIPManagement()
@@ -170,10 +186,10 @@ def test_list_dispatch_rules_ids_no_matching_rules(mock_client_factory):
     result = async_to_sync(sip_management._list_dispatch_rules_ids)(room.id)
 
     assert result == []
-    mock_api.aclose.assert_called_once()
+    mock_api.aclose.assert_not_called()
 
 
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_list_dispatch_rules_ids_api_failure(mock_client_factory):
     """Test listing dispatch rule IDs when API fails."""
     sip_management = SIPManagement()
@@ -189,11 +205,11 @@ def test_list_dispatch_rules_ids_api_failure(mock_client_factory):
         async_to_sync(sip_management._list_dispatch_rules_ids)(room.id)
 
     mock_api.sip.list_sip_dispatch_rule.assert_called_once()
-    mock_api.aclose.assert_called_once()
+    mock_api.aclose.assert_not_called()
 
 
 @mock.patch("core.services.sip_management.SIPManagement._list_dispatch_rules_ids")
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_delete_dispatch_rule_no_rules(mock_client_factory, mock_list_rules):
     """Test deleting dispatch rules when no rules exist."""
     sip_management = SIPManagement()
@@ -209,7 +225,7 @@ def test_delete_dispatch_rule_no_rules(mock_client_factory, mock_list_rules):
 
 
 @mock.patch("core.services.sip_management.SIPManagement._list_dispatch_rules_ids")
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_delete_dispatch_rule_single_rule(mock_client_factory, mock_list_rules):
     """Test deleting a single dispatch rule."""
     sip_management = SIPManagement()
@@ -227,11 +243,11 @@ def test_delete_dispatch_rule_single_rule(mock_client_factory, mock_list_rules):
     delete_request = mock_api.sip.delete_sip_dispatch_rule.call_args[1]["delete"]
     assert isinstance(delete_request, DeleteSIPDispatchRuleRequest)
     assert delete_request.sip_dispatch_rule_id == "rule-1"
-    mock_api.aclose.assert_called_once()
+    mock_api.aclose.assert_not_called()
 
 
 @mock.patch("core.services.sip_management.SIPManagement._list_dispatch_rules_ids")
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_delete_dispatch_rule_multiple_rules(mock_client_factory, mock_list_rules):
     """Test deleting multiple dispatch rules."""
     sip_management = SIPManagement()
@@ -254,11 +270,11 @@ def test_delete_dispatch_rule_multiple_rules(mock_client_factory, mock_list_rule
     assert all(
         rule_id in deleted_rule_ids for rule_id in ["rule-1", "rule-2", "rule-3"]
     )
-    mock_api.aclose.assert_called_once()
+    mock_api.aclose.assert_not_called()
 
 
 @mock.patch("core.services.sip_management.SIPManagement._list_dispatch_rules_ids")
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_delete_dispatch_rule_partial_failure(mock_client_factory, mock_list_rules):
     """Test deleting multiple dispatch rules when one deletion fails."""
     sip_management = SIPManagement()
@@ -285,11 +301,11 @@ def test_delete_dispatch_rule_partial_failure(mock_client_factory, mock_list_rul
         sip_management.delete_dispatch_rule(room.id)
 
     assert mock_api.sip.delete_sip_dispatch_rule.call_count == 2
-    mock_api.aclose.assert_called_once()
+    mock_api.aclose.assert_not_called()
 
 
 @mock.patch("core.services.sip_management.SIPManagement._list_dispatch_rules_ids")
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_delete_dispatch_rule_api_failure(mock_client_factory, mock_list_rules):
     """Test deleting dispatch rules when API fails immediately."""
     sip_management = SIPManagement()
@@ -306,10 +322,10 @@ def test_delete_dispatch_rule_api_failure(mock_client_factory, mock_list_rules):
         sip_management.delete_dispatch_rule(room.id)
 
     mock_api.sip.delete_sip_dispatch_rule.assert_called_once()
-    mock_api.aclose.assert_called_once()
+    mock_api.aclose.assert_not_called()
 
 
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_create_dispatch_rule_conflict_raises_dedicated_error(mock_client_factory):
     """Test that a LiveKit conflict error raises DispatchRuleConflictError."""
     sip_management = SIPManagement()
@@ -331,25 +347,27 @@ def test_create_dispatch_rule_conflict_raises_dedicated_error(mock_client_factor
     with pytest.raises(DispatchRuleConflictError):
         sip_management.create_dispatch_rule(room)
 
-    mock_api.aclose.assert_called_once()
+    mock_api.aclose.assert_not_called()
 
 
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_ensure_dispatch_rule_creates_when_missing(mock_client_factory):
     """Test that ensure_dispatch_rule creates the rule when none exists."""
     sip_management = SIPManagement()
     room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED, pin_code="1234")
 
     mock_api = create_mock_livekit_client()
-    mock_api.sip.list_sip_dispatch_rule = mock.AsyncMock(
-        return_value=ListSIPDispatchRuleResponse(items=[])
+    mock_api.sip.list_sip_dispatch_rule = mock.AsyncMock()
+    mock_api.sip.create_sip_dispatch_rule = mock.AsyncMock(
+        return_value=SIPDispatchRuleInfo(sip_dispatch_rule_id="rule-1")
     )
-    mock_api.sip.create_sip_dispatch_rule = mock.AsyncMock()
     mock_client_factory.return_value = mock_api
 
     created = sip_management.ensure_dispatch_rule(room)
 
     assert created is True
+    assert sip_management._get_registered_rules_ids(room.id) == ["rule-1"]
+    mock_api.sip.list_sip_dispatch_rule.assert_not_called()
     mock_api.sip.create_sip_dispatch_rule.assert_called_once()
     create_request = mock_api.sip.create_sip_dispatch_rule.call_args[1]["create"]
 
@@ -359,42 +377,43 @@ def test_ensure_dispatch_rule_creates_when_missing(mock_client_factory):
     assert create_request.rule.dispatch_rule_direct.pin == str(room.pin_code)
 
 
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_ensure_dispatch_rule_skips_when_existing(mock_client_factory):
-    """Test that ensure_dispatch_rule is idempotent when the rule already exists."""
+    """Test that ensure_dispatch_rule is idempotent when the rule is registered."""
     sip_management = SIPManagement()
     room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED, pin_code="1234")
+    sip_management._register_rules_ids(room.id, ["rule-1"])
 
-    existing_rule = SIPDispatchRuleInfo(
-        sip_dispatch_rule_id="rule-1", name=f"SIP_{str(room.id)}"
-    )
     mock_api = create_mock_livekit_client()
-    mock_api.sip.list_sip_dispatch_rule = mock.AsyncMock(
-        return_value=ListSIPDispatchRuleResponse(items=[existing_rule])
-    )
+    mock_api.sip.list_sip_dispatch_rule = mock.AsyncMock()
     mock_api.sip.create_sip_dispatch_rule = mock.AsyncMock()
     mock_client_factory.return_value = mock_api
 
     created = sip_management.ensure_dispatch_rule(room)
 
     assert created is False
+    mock_api.sip.list_sip_dispatch_rule.assert_not_called()
     mock_api.sip.create_sip_dispatch_rule.assert_not_called()
 
 
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_ensure_dispatch_rule_returns_false_on_conflict(mock_client_factory):
     """Test that ensure_dispatch_rule tolerates a concurrent rule creation.
 
     If the rule is created by a concurrent caller (e.g. the LiveKit webhook)
     between the existence check and the creation, LiveKit rejects the
-    duplicate and ensure_dispatch_rule reports the rule as already existing.
+    duplicate and ensure_dispatch_rule reports the rule as already existing,
+    registering it for next calls.
     """
     sip_management = SIPManagement()
     room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED, pin_code="1234")
 
+    existing_rule = SIPDispatchRuleInfo(
+        sip_dispatch_rule_id="rule-1", name=f"SIP_{str(room.id)}"
+    )
     mock_api = create_mock_livekit_client()
     mock_api.sip.list_sip_dispatch_rule = mock.AsyncMock(
-        return_value=ListSIPDispatchRuleResponse(items=[])
+        return_value=ListSIPDispatchRuleResponse(items=[existing_rule])
     )
     mock_api.sip.create_sip_dispatch_rule = mock.AsyncMock(
         side_effect=TwirpError(
@@ -411,9 +430,10 @@ def test_ensure_dispatch_rule_returns_false_on_conflict(mock_client_factory):
     created = sip_management.ensure_dispatch_rule(room)
 
     assert created is False
+    assert sip_management._get_registered_rules_ids(room.id) == ["rule-1"]
 
 
-@mock.patch("core.utils.create_livekit_client")
+@mock.patch("core.utils.get_livekit_client")
 def test_ensure_dispatch_rule_raises_on_other_failures(mock_client_factory):
     """Test that ensure_dispatch_rule propagates unexpected LiveKit failures."""
     sip_management = SIPManagement()
@@ -430,3 +450,204 @@ def test_ensure_dispatch_rule_raises_on_other_failures(mock_client_factory):
 
     with pytest.raises(SIPException, match="Could not create dispatch rule"):
         sip_management.ensure_dispatch_rule(room)
+
+
+def test_has_dispatch_rule_reads_registry():
+    """Test that has_dispatch_rule only looks up the registry."""
+    sip_management = SIPManagement()
+    room = RoomFactory()
+
+    with mock.patch("core.utils.get_livekit_client") as mock_client_factory:
+        assert sip_management.has_dispatch_rule(room.id) is False
+        sip_management._register_rules_ids(room.id, ["rule-1"])
+        assert sip_management.has_dispatch_rule(room.id) is True
+
+    mock_client_factory.assert_not_called()
+
+
+@mock.patch("core.services.sip_management.SIPManagement._list_dispatch_rules_ids")
+@mock.patch("core.utils.get_livekit_client")
+def test_delete_dispatch_rule_registered(mock_client_factory, mock_list_rules):
+    """Test deleting registered dispatch rules without listing them from LiveKit."""
+    sip_management = SIPManagement()
+    room = RoomFactory()
+    sip_management._register_rules_ids(room.id, ["rule-1", "rule-2"])
+
+    mock_api = create_mock_livekit_client()
+    mock_api.sip.delete_sip_dispatch_rule = mock.AsyncMock()
+    mock_client_factory.return_value = mock_api
+
+    result = sip_management.delete_dispatch_rule(room.id)
+
+    assert result is True
+    mock_list_rules.assert_not_called()
+    deleted_rule_ids = [
+        call_args[1]["delete"].sip_dispatch_rule_id
+        for call_args in mock_api.sip.delete_sip_dispatch_rule.call_args_list
+    ]
+    assert deleted_rule_ids == ["rule-1", "rule-2"]
+    assert sip_management.has_dispatch_rule(room.id) is False
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_delete_dispatch_rule_failure_keeps_registry(mock_client_factory):
+    """Test that rules failing to be deleted stay registered."""
+    sip_management = SIPManagement()
+    room = RoomFactory()
+    sip_management._register_rules_ids(room.id, ["rule-1"])
+
+    mock_api = create_mock_livekit_client()
+    mock_api.sip.delete_sip_dispatch_rule = mock.AsyncMock(
+        side_effect=TwirpError(msg="Internal server error", code="unknown", status=500)
+    )
+    mock_client_factory.return_value = mock_api
+
+    with pytest.raises(SIPException, match="Could not delete dispatch rules"):
+        sip_management.delete_dispatch_rule(room.id)
+
+    assert sip_management._get_registered_rules_ids(room.id) == ["rule-1"]
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_reconcile_dispatch_rules(mock_client_factory, registry_key):
+    """Test that the registry is repaired against the rules existing in LiveKit."""
+    sip_management = SIPManagement()
+    stale_room_id, drifted_room_id, missing_room_id, synced_room_id = (
+        uuid.uuid4() for _ in range(4)
+    )
+    sip_management._register_rules_ids(stale_room_id, ["rule-0"])
+    sip_management._register_rules_ids(drifted_room_id, ["rule-1"])
+    sip_management._register_rules_ids(synced_room_id, ["rule-4"])
+
+    mock_api = create_mock_livekit_client()
+    mock_api.sip.list_sip_dispatch_rule = mock.AsyncMock(
+        return_value=ListSIPDispatchRuleResponse(
+            items=[
+                SIPDispatchRuleInfo(
+                    sip_dispatch_rule_id="rule-2", name=f"SIP_{drifted_room_id}"
+                ),
+                SIPDispatchRuleInfo(
+                    sip_dispatch_rule_id="rule-3", name=f"SIP_{missing_room_id}"
+                ),
+                SIPDispatchRuleInfo(
+                    sip_dispatch_rule_id="rule-4", name=f"SIP_{synced_room_id}"
+                ),
+                SIPDispatchRuleInfo(sip_dispatch_rule_id="rule-5", name="other"),
+            ]
+        )
+    )
+    mock_client_factory.return_value = mock_api
+
+    counts = sip_management.reconcile_dispatch_rules()
+
+    assert counts == {"added": 1, "updated": 1, "removed": 1}
+    mock_api.sip.list_sip_dispatch_rule.assert_called_once()
+    assert get_redis_connection("default").hgetall(registry_key) == {
+        str(drifted_room_id).encode(): b"rule-2",
+        str(missing_room_id).encode(): b"rule-3",
+        str(synced_room_id).encode(): b"rule-4",
+    }
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_reconcile_dispatch_rules_skips_rooms_changed_meanwhile(
+    mock_client_factory, registry_key
+):
+    """Rooms whose rules change while LiveKit is listed should be left untouched."""
+    sip_management = SIPManagement()
+    replaced_room_id, deleted_room_id = uuid.uuid4(), uuid.uuid4()
+    sip_management._register_rules_ids(replaced_room_id, ["rule-1"])
+    sip_management._register_rules_ids(deleted_room_id, ["rule-2"])
+
+    async def list_rules(**kwargs):
+        # The rules of both rooms change between the listing and the repair
+        sip_management._register_rules_ids(replaced_room_id, ["rule-3"])
+        sip_management._register_rules_ids(deleted_room_id, [])
+        return ListSIPDispatchRuleResponse(
+            items=[
+                SIPDispatchRuleInfo(
+                    sip_dispatch_rule_id="rule-1", name=f"SIP_{replaced_room_id}"
+                ),
+                SIPDispatchRuleInfo(
+                    sip_dispatch_rule_id="rule-2", name=f"SIP_{deleted_room_id}"
+                ),
+            ]
+        )
+
+    mock_api = create_mock_livekit_client()
+    mock_api.sip.list_sip_dispatch_rule = mock.AsyncMock(side_effect=list_rules)
+    mock_client_factory.return_value = mock_api
+
+    counts = sip_management.reconcile_dispatch_rules()
+
+    assert counts == {"added": 0, "updated": 0, "removed": 0}
+    assert get_redis_connection("default").hgetall(registry_key) == {
+        str(replaced_room_id).encode(): b"rule-3",
+    }
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_reconcile_dispatch_rules_room_locked(mock_client_factory):
+    """A room whose rules are being changed should fail the repair, not skip it."""
+    sip_management = SIPManagement()
+    room_id = uuid.uuid4()
+
+    mock_api = create_mock_livekit_client()
+    mock_api.sip.list_sip_dispatch_rule = mock.AsyncMock(
+        return_value=ListSIPDispatchRuleResponse(
+            items=[
+                SIPDispatchRuleInfo(
+                    sip_dispatch_rule_id="rule-1", name=f"SIP_{room_id}"
+                )
+            ]
+        )
+    )
+    mock_client_factory.return_value = mock_api
+
+    with (
+        mock.patch("core.services.sip_management.SIP_DISPATCH_RULES_LOCK_TIMEOUT", 1),
+        sip_management._lock_room_rules(room_id),
+        pytest.raises(SIPException, match="Could not lock the dispatch rules"),
+    ):
+        sip_management.reconcile_dispatch_rules()
+
+    assert sip_management._get_registered_rules_ids(room_id) == []
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_ensure_dispatch_rule_created_while_waiting_for_lock(mock_client_factory):
+    """A rule registered while waiting for the room lock should not be created again."""
+    sip_management = SIPManagement()
+    room = RoomFactory(access_level=RoomAccessLevel.RESTRICTED, pin_code="1234")
+
+    mock_api = create_mock_livekit_client()
+    mock_api.sip.create_sip_dispatch_rule = mock.AsyncMock()
+    mock_client_factory.return_value = mock_api
+
+    with mock.patch.object(
+        SIPManagement,
+        "has_dispatch_rule",
+        side_effect=[False, True],
+    ):
+        assert sip_management.ensure_dispatch_rule(room) is False
+
+    mock_api.sip.create_sip_dispatch_rule.assert_not_called()
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_reconcile_dispatch_rules_api_failure(mock_client_factory):
+    """Test that the registry is left untouched when rules can't be listed."""
+    sip_management = SIPManagement()
+    room_id = uuid.uuid4()
+    sip_management._register_rules_ids(room_id, ["rule-1"])
+
+    mock_api = create_mock_livekit_client()
+    mock_api.sip.list_sip_dispatch_rule = mock.AsyncMock(
+        side_effect=TwirpError(msg="Internal server error", code="unknown", status=500)
+    )
+    mock_client_factory.return_value = mock_api
+
+    with pytest.raises(SIPException, match="Could not list dispatch rules"):
+        sip_management.reconcile_dispatch_rules()
+
+    assert sip_management._get_registered_rules_ids(room_id) == ["rule-1"]
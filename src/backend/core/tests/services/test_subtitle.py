@@ -16,7 +16,7 @@ pytestmark = pytest.mark.django_db
 @pytest.fixture
 def mock_livekit_client():
     """Mock LiveKit API client."""
-    with mock.patch("core.utils.create_livekit_client") as mock_create:
+    with mock.patch("core.utils.get_livekit_client") as mock_create:
         mock_client = mock.AsyncMock()
         mock_create.return_value = mock_client
         yield mock_client
@@ -0,0 +1,109 @@
+"""
+Test team membership service.
+"""
+
+# pylint: disable=W0621
+
+from unittest import mock
+
+import pytest
+
+from core.factories import UserFactory
+from core.services.team_membership import (
+    NoTeamMembershipProvider,
+    TeamMembershipService,
+    get_team_membership_provider,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def mock_provider():
+    """Replace the configured team membership provider."""
+    with mock.patch(
+        "core.services.team_membership.get_team_membership_provider"
+    ) as mock_get_provider:
+        yield mock_get_provider.return_value
+
+
+def test_get_team_membership_provider_default():
+    """The default provider should put users in no team."""
+    provider = get_team_membership_provider()
+
+    assert isinstance(provider, NoTeamMembershipProvider)
+    assert provider.get_teams(UserFactory()) == []
+
+
+def test_get_teams_cached(mock_provider):
+    """Teams should be fetched from the provider once, then read from the cache."""
+    user = UserFactory()
+    mock_provider.get_teams.return_value = ["team2", "team1", "team2"]
+
+    assert TeamMembershipService().get_teams(user) == ["team1", "team2"]
+    assert TeamMembershipService().get_teams(user) == ["team1", "team2"]
+
+    mock_provider.get_teams.assert_called_once_with(user)
+
+
+def test_get_teams_cached_per_user(mock_provider):
+    """Each user should have their own cached teams."""
+    user, other_user = UserFactory.create_batch(2)
+    mock_provider.get_teams.side_effect = lambda user_: [str(user_.pk)]
+
+    assert TeamMembershipService().get_teams(user) == [str(user.pk)]
+    assert TeamMembershipService().get_teams(other_user) == [str(other_user.pk)]
+
+
+def test_get_teams_cache_disabled(mock_provider, settings):
+    """Teams should be fetched on each call when the cache is disabled."""
+    settings.TEAM_MEMBERSHIP_CACHE_TIMEOUT = 0
+    user = UserFactory()
+    mock_provider.get_teams.return_value = ["team1"]
+
+    TeamMembershipService().get_teams(user)
+    TeamMembershipService().get_teams(user)
+
+    assert mock_provider.get_teams.call_count == 2
+
+
+def test_set_teams(mock_provider):
+    """Pushed teams should be served without asking the provider."""
+    user = UserFactory()
+
+    TeamMembershipService().set_teams(user, ["team2", "team1"])
+
+    assert TeamMembershipService().get_teams(user) == ["team1", "team2"]
+    mock_provider.get_teams.assert_not_called()
+
+
+def test_set_teams_expire(mock_provider, settings):
+    """Pushed teams should expire, then be fetched from the provider."""
+    settings.TEAM_MEMBERSHIP_PUSHED_CACHE_TIMEOUT = 60
+    user = UserFactory()
+    mock_provider.get_teams.return_value = []
+
+    with mock.patch("core.services.team_membership.cache.set") as mock_cache_set:
+        TeamMembershipService().set_teams(user, ["team1"])
+
+    mock_cache_set.assert_called_once_with(
+        f"team_membership_{user.pk!s}", ["team1"], timeout=60
+    )
+
+    settings.TEAM_MEMBERSHIP_PUSHED_CACHE_TIMEOUT = 0
+    TeamMembershipService().set_teams(user, ["team1"])
+
+    assert TeamMembershipService().get_teams(user) == []
+    mock_provider.get_teams.assert_called_once_with(user)
+
+
+def test_invalidate(mock_provider):
+    """Invalidated teams should be fetched again from the provider."""
+    user = UserFactory()
+    TeamMembershipService().set_teams(user, ["team1"])
+    mock_provider.get_teams.return_value = ["team2"]
+
+    TeamMembershipService().invalidate(user)
+
+    assert TeamMembershipService().get_teams(user) == ["team2"]
+    mock_provider.get_teams.assert_called_once_with(user)
@@ -0,0 +1,99 @@
+"""Tests for the WebhookDeduplicationService."""
+
+# pylint: disable=redefined-outer-name
+
+import uuid
+from unittest import mock
+
+import pytest
+from livekit.protocol.models import Room
+from livekit.protocol.webhook import WebhookEvent
+
+from core.services.webhook_deduplication import WebhookDeduplicationService
+
+
+@pytest.fixture
+def deduplication():
+    """Deduplication service using cache keys unique to the test."""
+    with mock.patch(
+        "core.services.webhook_deduplication.WEBHOOK_DEDUPLICATION_KEY_PREFIX",
+        f"livekit_webhook_{uuid.uuid4().hex}",
+    ):
+        yield WebhookDeduplicationService()
+
+
+def _event(event="egress_ended", room_sid=None, event_id=None):
+    """Build a LiveKit webhook event with unique ids by default."""
+    return WebhookEvent(
+        id=event_id or str(uuid.uuid4()),
+        event=event,
+        room=Room(sid=room_sid or f"RM_{uuid.uuid4().hex}", name=str(uuid.uuid4())),
+    )
+
+
+def test_claim_new_event(deduplication):
+    """A new event should be claimed."""
+    assert deduplication.claim(_event()) is True
+
+
+def test_claim_retried_event(deduplication):
+    """An event retried by LiveKit should be dropped and counted."""
+    data = _event()
+
+    assert deduplication.claim(data) is True
+    assert deduplication.claim(data) is False
+
+    assert deduplication.get_duplicate_counts() == {"event_id": 1, "room_event": 0}
+
+
+def test_claim_room_event_from_another_node(deduplication):
+    """A room lifecycle event emitted again for the same session should be dropped."""
+    room_sid = f"RM_{uuid.uuid4().hex}"
+
+    assert deduplication.claim(_event("room_started", room_sid)) is True
+    assert deduplication.claim(_event("room_started", room_sid)) is False
+
+    # Another event type, or another session of the room, is not a duplicate.
+    assert deduplication.claim(_event("room_finished", room_sid)) is True
+    assert deduplication.claim(_event("room_started")) is True
+
+    assert deduplication.get_duplicate_counts() == {"event_id": 0, "room_event": 1}
+
+
+def test_claim_egress_events_of_same_room(deduplication):
+    """Distinct egress events of a room should all be handled."""
+    room_sid = f"RM_{uuid.uuid4().hex}"
+
+    assert deduplication.claim(_event("egress_ended", room_sid)) is True
+    assert deduplication.claim(_event("egress_ended", room_sid)) is True
+
+
+def test_claim_duplicate_releases_other_claims(deduplication):
+    """A duplicate should not keep the claim on its own event id."""
+    room_sid = f"RM_{uuid.uuid4().hex}"
+    duplicate = _event("room_started", room_sid)
+
+    assert deduplication.claim(_event("room_started", room_sid)) is True
+    assert deduplication.claim(duplicate) is False
+
+    deduplication.release(_event("room_started", room_sid))
+    assert deduplication.claim(duplicate) is True
+
+
+def test_release_allows_retry(deduplication):
+    """An event whose handling failed should be handled when retried."""
+    data = _event("room_finished")
+
+    assert deduplication.claim(data) is True
+    deduplication.release(data)
+
+    assert deduplication.claim(data) is True
+
+
+def test_claim_disabled(deduplication, settings):
+    """A zero window should disable deduplication."""
+    settings.LIVEKIT_WEBHOOK_DEDUPLICATION_WINDOW = 0
+    data = _event()
+
+    assert deduplication.claim(data) is True
+    assert deduplication.claim(data) is True
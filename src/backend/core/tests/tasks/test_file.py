@@ -0,0 +1,95 @@
+"""Tests for file Celery tasks."""
+
+from io import BytesIO
+
+from django.core.files.storage import default_storage
+
+import pytest
+from botocore.exceptions import ClientError
+
+from core import factories, models
+from core.models import FileTypeChoices, FileUploadStateChoices
+from core.tasks.file import process_file_upload_verification
+
+pytestmark = pytest.mark.django_db
+
+
+def test_process_file_upload_verification_ready(settings):
+    """An analyzing file complying with its restrictions should be marked as ready."""
+    settings.FILE_UPLOAD_RESTRICTIONS = {
+        "background_image": {
+            **settings.FILE_UPLOAD_RESTRICTIONS["background_image"],
+            "allowed_mimetypes": ["text/plain"],
+        },
+    }
+
+    file = factories.FileFactory(
+        type=FileTypeChoices.BACKGROUND_IMAGE,
+        filename="my_file.txt",
+        update_upload_state=FileUploadStateChoices.ANALYZING,
+    )
+    default_storage.save(file.temporary_file_key, BytesIO(b"my prose"))
+
+    process_file_upload_verification(file.id)
+
+    file.refresh_from_db()
+    assert file.upload_state == FileUploadStateChoices.READY
+    assert file.mimetype == "text/plain"
+    assert file.size == 8
+    assert default_storage.exists(file.file_key)
+    assert not default_storage.exists(file.temporary_file_key)
+
+
+def test_process_file_upload_verification_rejected(settings):
+    """An analyzing file not complying with its restrictions should be rejected."""
+    settings.FILE_UPLOAD_RESTRICTIONS = {
+        "background_image": {
+            **settings.FILE_UPLOAD_RESTRICTIONS["background_image"],
+            "allowed_mimetypes": ["application/pdf"],
+        },
+    }
+
+    file = factories.FileFactory(
+        type=FileTypeChoices.BACKGROUND_IMAGE,
+        filename="my_file.txt",
+        update_upload_state=FileUploadStateChoices.ANALYZING,
+    )
+    default_storage.save(file.temporary_file_key, BytesIO(b"my prose"))
+
+    process_file_upload_verification(file.id)
+
+    file.refresh_from_db()
+    assert file.upload_state == FileUploadStateChoices.REJECTED
+    assert file.rejection_reason == "file_type_not_allowed"
+    assert file.deleted_at is not None
+    assert not default_storage.exists(file.file_key)
+    assert not default_storage.exists(file.temporary_file_key)
+
+
+def test_process_file_upload_verification_not_analyzing():
+    """Files which are not being analyzed should be left untouched."""
+    file = factories.FileFactory(
+        type=FileTypeChoices.BACKGROUND_IMAGE, filename="my_file.txt"
+    )
+    default_storage.save(file.temporary_file_key, BytesIO(b"my prose"))
+
+    process_file_upload_verification(file.id)
+
+    file.refresh_from_db()
+    assert file.upload_state == FileUploadStateChoices.PENDING
+    assert not default_storage.exists(file.file_key)
+
+
+def test_process_file_upload_verification_missing_object():
+    """Files whose object cannot be inspected should be reverted to pending."""
+    file = factories.FileFactory(
+        type=FileTypeChoices.BACKGROUND_IMAGE,
+        filename="my_file.txt",
+        update_upload_state=FileUploadStateChoices.ANALYZING,
+    )
+
+    with pytest.raises(ClientError):
+        process_file_upload_verification(file.id)
+
+    file.refresh_from_db()
+    assert file.upload_state == FileUploadStateChoices.PENDING
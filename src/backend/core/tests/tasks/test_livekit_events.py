@@ -0,0 +1,123 @@
+"""Tests for LiveKit webhook events Celery tasks."""
+
+from unittest import mock
+
+from django.core.cache import cache
+
+from core.tasks.livekit_events import process_livekit_webhook_events
+
+
+@mock.patch("core.tasks.livekit_events.LiveKitEventsService")
+def test_process_livekit_webhook_events_processes_room(mock_service):
+    """Pending events of the room are processed, and the room lock released."""
+    mock_service.return_value.has_due_events.return_value = False
+    process_livekit_webhook_events("room-abc")
+
+    mock_service.return_value.process_pending_events.assert_called_once_with(
+        "room-abc", heartbeat=mock.ANY
+    )
+    assert cache.lock("livekit_webhook_events_room-abc").locked() is False
+
+
+@mock.patch("core.tasks.livekit_events.process_livekit_webhook_events.apply_async")
+@mock.patch("core.tasks.livekit_events.LiveKitEventsService")
+def test_process_livekit_webhook_events_schedules_retry(
+    mock_service, mock_apply_async, settings
+):
+    """The room is scheduled again when its failed events are due to be retried."""
+    settings.CELERY_ENABLED = True
+    mock_service.return_value.process_pending_events.return_value = 20
+    mock_service.return_value.has_due_events.return_value = False
+
+    process_livekit_webhook_events("room-retry")
+
+    mock_apply_async.assert_called_once_with(args=("room-retry",), countdown=20)
+
+
+@mock.patch("core.tasks.livekit_events.process_livekit_webhook_events.apply_async")
+@mock.patch("core.tasks.livekit_events.LiveKitEventsService")
+def test_process_livekit_webhook_events_retry_without_celery(
+    mock_service, mock_apply_async, settings
+):
+    """Without Celery, failed events wait for the next event of the room."""
+    settings.CELERY_ENABLED = False
+    mock_service.return_value.process_pending_events.return_value = 20
+    mock_service.return_value.has_due_events.return_value = False
+
+    process_livekit_webhook_events("room-retry")
+
+    mock_apply_async.assert_not_called()
+
+
+@mock.patch("core.tasks.livekit_events.process_livekit_webhook_events.apply_async")
+@mock.patch("core.tasks.livekit_events.LiveKitEventsService")
+def test_process_livekit_webhook_events_room_already_processed(
+    mock_service, mock_apply_async
+):
+    """A room processed by another worker is left to it, without rescheduling."""
+    lock = cache.lock("livekit_webhook_events_room-busy", timeout=5)
+    assert lock.acquire(blocking=False)
+
+    try:
+        process_livekit_webhook_events("room-busy")
+    finally:
+        lock.release()
+
+    mock_service.return_value.process_pending_events.assert_not_called()
+    mock_apply_async.assert_not_called()
+
+
+@mock.patch("core.tasks.livekit_events.LiveKitEventsService")
+def test_process_livekit_webhook_events_extends_lock(mock_service, settings):
+    """The room lock is extended to its full timeout before each event."""
+    settings.LIVEKIT_WEBHOOK_PROCESSING_LOCK_TIMEOUT = 60
+    lock_ttls = []
+
+    def process_pending_events(room_name, heartbeat):
+        lock = cache.lock(f"livekit_webhook_events_{room_name}")
+        lock_client = lock.redis
+        lock_client.pexpire(lock.name, 1000)
+        heartbeat()
+        lock_ttls.append(lock_client.pttl(lock.name))
+
+    mock_service.return_value.process_pending_events.side_effect = (
+        process_pending_events
+    )
+    mock_service.return_value.has_due_events.return_value = False
+
+    process_livekit_webhook_events("room-long")
+
+    assert lock_ttls[0] > 50000
+    assert cache.lock("livekit_webhook_events_room-long").locked() is False
+
+
+@mock.patch("core.tasks.livekit_events.LiveKitEventsService")
+def test_process_livekit_webhook_events_lock_expired(mock_service):
+    """A holder whose lock expired stops, leaving the room to the new holder."""
+
+    def process_pending_events(room_name, heartbeat):
+        cache.delete_pattern(f"*livekit_webhook_events_{room_name}*")
+        new_holder = cache.lock(f"livekit_webhook_events_{room_name}", timeout=5)
+        assert new_holder.acquire(blocking=False)
+        heartbeat()
+
+    mock_service.return_value.process_pending_events.side_effect = (
+        process_pending_events
+    )
+
+    process_livekit_webhook_events("room-expired")
+
+    mock_service.return_value.has_due_events.assert_not_called()
+    assert cache.lock("livekit_webhook_events_room-expired").locked() is True
+    cache.delete_pattern("*livekit_webhook_events_room-expired*")
+
+
+@mock.patch("core.tasks.livekit_events.LiveKitEventsService")
+def test_process_livekit_webhook_events_stored_meanwhile(mock_service):
+    """Events stored right before the lock is released are handled after it."""
+    mock_service.return_value.process_pending_events.return_value = None
+    mock_service.return_value.has_due_events.side_effect = [True, False]
+
+    process_livekit_webhook_events("room-abc")
+
+    assert mock_service.return_value.process_pending_events.call_count == 2
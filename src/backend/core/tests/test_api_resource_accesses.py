@@ -226,6 +226,41 @@ def test_api_room_user_accesses_list_pagination(_mock_page_size):
     assert access_ids == []
 
 
+def test_api_room_user_accesses_list_pagination_cursor():
+    """
+    Users passing a cursor should walk accesses by creation date, without
+    counting them.
+    """
+
+    user = UserFactory()
+    client = APIClient()
+    client.force_login(user)
+
+    room = RoomFactory()
+    accesses = [
+        UserResourceAccessFactory(
+            resource=room, user=user, role=random.choice(["administrator", "owner"])
+        ),
+        *UserResourceAccessFactory.create_batch(2, resource=room),
+    ]
+    access_ids = [str(access.id) for access in accesses]
+
+    response = client.get("/api/v1.0/resource-accesses/?cursor=&page_size=2")
+
+    assert response.status_code == 200
+    content = response.json()
+    assert "count" not in content
+    assert content["previous"] is None
+    assert [item["id"] for item in content["results"]] == access_ids[:0:-1]
+
+    response = client.get(content["next"])
+
+    assert response.status_code == 200
+    content = response.json()
+    assert content["next"] is None
+    assert [item["id"] for item in content["results"]] == access_ids[:1]
+
+
 # Retrieve
 
 
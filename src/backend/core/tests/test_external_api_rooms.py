@@ -111,6 +111,32 @@ def test_api_rooms_list_with_valid_token():
     assert response.data["results"][0]["id"] == str(room.id)
 
 
+def test_api_rooms_list_with_cursor():
+    """Listing rooms with a cursor should walk them by creation date."""
+
+    user = UserFactory()
+    rooms = RoomFactory.create_batch(3, users=[(user, RoleChoices.OWNER)])
+    room_ids = [
+        str(room.id) for room in sorted(rooms, key=lambda room: room.created_at)
+    ]
+
+    token = generate_test_token(user, [ApplicationScope.ROOMS_LIST])
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    response = client.get("/external-api/v1.0/rooms/?cursor=&page_size=2")
+
+    assert response.status_code == 200
+    assert "count" not in response.data
+    assert [room["id"] for room in response.data["results"]] == room_ids[:0:-1]
+
+    response = client.get(response.data["next"])
+
+    assert response.status_code == 200
+    assert response.data["next"] is None
+    assert [room["id"] for room in response.data["results"]] == room_ids[:1]
+
+
 def test_api_rooms_list_with_no_rooms():
     """Listing rooms with a valid token returns an empty list when there are no rooms."""
 
@@ -2,6 +2,8 @@
 Unit tests for the Recording model
 """
 
+from unittest import mock
+
 from django.core.exceptions import ValidationError
 
 import pytest
@@ -9,10 +11,16 @@ import pytest
 from core.factories import (
     RecordingFactory,
     RoomFactory,
+    TeamRecordingAccessFactory,
     UserFactory,
     UserRecordingAccessFactory,
 )
-from core.models import Recording, RecordingModeChoices, RecordingStatusChoices
+from core.models import (
+    Recording,
+    RecordingModeChoices,
+    RecordingStatusChoices,
+    User,
+)
 from core.recording.enums import FileExtension
 
 pytestmark = pytest.mark.django_db
@@ -288,3 +296,26 @@ def test_models_recording_is_saved_false_error_states(status):
     """Test is_saved property returns False for error statuses."""
     recording = RecordingFactory(status=status)
     assert recording.is_saved is False
+
+
+def test_models_recording_annotate_user_roles(django_assert_num_queries):
+    """Roles annotated along recordings should be used to compute abilities."""
+    user = UserFactory()
+    recording = RecordingFactory(status=RecordingStatusChoices.SAVED)
+    UserRecordingAccessFactory(recording=recording, user=user, role="owner")
+    TeamRecordingAccessFactory(recording=recording, team="team1", role="member")
+    other_recording = RecordingFactory()
+
+    with mock.patch.object(User, "get_teams", return_value=["team1"]):
+        with django_assert_num_queries(1):
+            recordings = {
+                r.id: r for r in Recording.objects.annotate_user_roles(user).all()
+            }
+
+        with django_assert_num_queries(0):
+            assert sorted(recordings[recording.id].user_roles) == ["member", "owner"]
+            assert recordings[recording.id].get_abilities(user)["retrieve"] is True
+            assert recordings[other_recording.id].user_roles == []
+            assert (
+                recordings[other_recording.id].get_abilities(user)["retrieve"] is False
+            )
@@ -13,7 +13,7 @@ from django.core.exceptions import ValidationError
 
 import pytest
 
-from core.factories import RoomFactory, UserFactory
+from core.factories import RoomFactory, UserFactory, UserResourceAccessFactory
 from core.models import Room, RoomAccessLevel
 
 pytestmark = pytest.mark.django_db
@@ -127,9 +127,9 @@ def test_models_rooms_access_rights_authenticated(django_assert_num_queries):
 
     with django_assert_num_queries(1):
         assert room.get_role(user) is None
-    with django_assert_num_queries(1):
+    with django_assert_num_queries(0):
         assert room.is_administrator_or_owner(user) is False
-    with django_assert_num_queries(1):
+    with django_assert_num_queries(0):
         assert room.is_owner(user) is False
 
 
@@ -140,9 +140,9 @@ def test_models_rooms_access_rights_member_direct(django_assert_num_queries):
 
     with django_assert_num_queries(1):
         assert room.get_role(user) == "member"
-    with django_assert_num_queries(1):
+    with django_assert_num_queries(0):
         assert room.is_administrator_or_owner(user) is False
-    with django_assert_num_queries(1):
+    with django_assert_num_queries(0):
         assert room.is_owner(user) is False
 
 
@@ -153,9 +153,9 @@ def test_models_rooms_access_rights_administrator_direct(django_assert_num_queri
 
     with django_assert_num_queries(1):
         assert room.get_role(user) == "administrator"
-    with django_assert_num_queries(1):
+    with django_assert_num_queries(0):
         assert room.is_administrator_or_owner(user) is True
-    with django_assert_num_queries(1):
+    with django_assert_num_queries(0):
         assert room.is_owner(user) is False
 
 
@@ -166,12 +166,69 @@ def test_models_rooms_access_rights_owner_direct(django_assert_num_queries):
 
     with django_assert_num_queries(1):
         assert room.get_role(user) == "owner"
-    with django_assert_num_queries(1):
+    with django_assert_num_queries(0):
         assert room.is_administrator_or_owner(user) is True
-    with django_assert_num_queries(1):
+    with django_assert_num_queries(0):
         assert room.is_owner(user) is True
 
 
+def test_models_rooms_access_rights_memoized_per_user(django_assert_num_queries):
+    """Roles are memoized for each user separately."""
+    user = UserFactory()
+    other_user = UserFactory()
+    room = RoomFactory(users=[(user, "owner"), (other_user, "member")])
+
+    with django_assert_num_queries(1):
+        assert room.get_role(user) == "owner"
+    with django_assert_num_queries(1):
+        assert room.get_role(other_user) == "member"
+    with django_assert_num_queries(0):
+        assert room.get_role(user) == "owner"
+        assert room.get_role(other_user) == "member"
+
+
+def test_models_rooms_access_rights_refresh_from_db(django_assert_num_queries):
+    """Reloading a room forgets the roles memoized before."""
+    user = UserFactory()
+    room = RoomFactory()
+
+    assert room.get_role(user) is None
+
+    UserResourceAccessFactory(resource=room, user=user, role="administrator")
+    room.refresh_from_db()
+
+    with django_assert_num_queries(1):
+        assert room.get_role(user) == "administrator"
+
+
+@pytest.mark.parametrize("role", ["member", "administrator", "owner", None])
+def test_models_rooms_access_rights_annotated(role, django_assert_num_queries):
+    """Roles annotated on the queryset are read back without any query."""
+    user = UserFactory()
+    room = RoomFactory(users=[(user, role)] if role else [])
+
+    with django_assert_num_queries(1):
+        room = Room.objects.annotate_user_role(user).get(pk=room.pk)
+
+    with django_assert_num_queries(0):
+        assert room.get_role(user) == role
+        assert room.is_administrator_or_owner(user) is (
+            role in ("administrator", "owner")
+        )
+
+
+def test_models_rooms_access_rights_annotated_other_user(django_assert_num_queries):
+    """A role annotated for a user is not used for another user."""
+    user = UserFactory()
+    other_user = UserFactory()
+    room = RoomFactory(users=[(user, "owner"), (other_user, "member")])
+
+    room = Room.objects.annotate_user_role(user).get(pk=room.pk)
+
+    with django_assert_num_queries(1):
+        assert room.get_role(other_user) == "member"
+
+
 def test_models_rooms_is_public_property():
     """Test the is_public property returns correctly based on access_level."""
     # Test public room
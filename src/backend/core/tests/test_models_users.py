@@ -9,6 +9,7 @@ from django.core.exceptions import ValidationError
 import pytest
 
 from core import factories
+from core.services.team_membership import TeamMembershipService
 
 pytestmark = pytest.mark.django_db
 
@@ -114,3 +115,16 @@ def test_models_users_sub_blank_is_accepted():
     """sub='' passes validation because blank=True; null is preferred but not enforced."""
     user = factories.UserFactory.build(sub="")
     user.full_clean()
+
+
+def test_models_users_get_teams_memoized():
+    """Teams should be resolved once per user instance."""
+    user = factories.UserFactory()
+
+    with mock.patch.object(
+        TeamMembershipService, "get_teams", return_value=["team1"]
+    ) as mock_get_teams:
+        assert user.get_teams() == ["team1"]
+        assert user.get_teams() == ["team1"]
+
+    mock_get_teams.assert_called_once_with(user)
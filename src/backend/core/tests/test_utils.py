@@ -2,22 +2,39 @@
 Test utils functions
 """
 
-# pylint: disable=W0621
+# pylint: disable=W0621,W0212
+import asyncio
 import json
+import os
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest import mock
+from urllib.parse import urlparse
+from uuid import uuid4
 
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 
+import boto3
 import jwt
 import pytest
-from livekit.api import TwirpError
+from asgiref.sync import async_to_sync
+from livekit.api import TwirpError, TwirpErrorCode
 
 from core.factories import UserFactory
+from core.services.room_liveness import RoomLivenessService
 from core.utils import (
+    LiveKitClientManager,
     NotificationError,
+    _get_token_cache_timeout,
+    _sign_token,
     create_livekit_client,
+    generate_download_s3_url,
+    generate_download_s3_urls,
     generate_token,
+    generate_tokens,
+    get_s3_client,
     notify_participants,
 )
 
@@ -107,6 +124,106 @@ def test_anonymous_falls_back_to_anonymous_label():
     assert claims["name"] == "Anonymous"
 
 
+def test_generate_token_reuses_identical_token():
+    """Identical tokens are signed once, and reused while cached."""
+    user = UserFactory()
+    room = str(uuid4())
+
+    with mock.patch("core.utils._sign_token", wraps=_sign_token) as mock_sign:
+        token = generate_token(room=room, user=user, username="Jane")
+        assert generate_token(room=room, user=user, username="Jane") == token
+
+    mock_sign.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"username": "John"},
+        {"role": "owner"},
+        {"sources": ["microphone"]},
+        {"color": "hsl(1, 50%, 50%)"},
+        {"ttl": timedelta(hours=1)},
+    ],
+)
+def test_generate_token_signs_again_when_claims_differ(changes):
+    """A token is only reused for the exact same claims."""
+    user = UserFactory()
+    room = str(uuid4())
+    token_args = {"room": room, "user": user, "username": "Jane"}
+
+    token = generate_token(**token_args)
+
+    assert generate_token(**{**token_args, **changes}) != token
+
+
+def test_generate_token_anonymous_participant_cached():
+    """Anonymous participants with a stable identity get their token reused."""
+    room = str(uuid4())
+    participant_id = str(uuid4())
+
+    token = generate_token(
+        room=room, user=AnonymousUser(), participant_id=participant_id
+    )
+
+    assert (
+        generate_token(room=room, user=AnonymousUser(), participant_id=participant_id)
+        == token
+    )
+    assert decode_token(token)["sub"] == participant_id
+
+
+def test_generate_token_anonymous_without_identity_not_cached():
+    """Anonymous participants without identity get a new identity on each call."""
+    room = str(uuid4())
+
+    first = decode_token(generate_token(room=room, user=AnonymousUser()))
+    second = decode_token(generate_token(room=room, user=AnonymousUser()))
+
+    assert first["sub"] != second["sub"]
+
+
+def test_generate_token_cache_disabled(settings):
+    """Tokens are signed on each call when the cache is disabled."""
+    settings.LIVEKIT_TOKEN_CACHE_TIMEOUT = 0
+    user = UserFactory()
+    room = str(uuid4())
+
+    with mock.patch("core.utils._sign_token", wraps=_sign_token) as mock_sign:
+        generate_token(room=room, user=user)
+        generate_token(room=room, user=user)
+
+    assert mock_sign.call_count == 2
+
+
+def test_get_token_cache_timeout(settings):
+    """Tokens are never reused past half of their validity."""
+    settings.LIVEKIT_TOKEN_CACHE_TIMEOUT = 60
+
+    assert _get_token_cache_timeout() == 60
+    assert _get_token_cache_timeout(timedelta(hours=1)) == 60
+    assert _get_token_cache_timeout(timedelta(seconds=30)) == 15
+
+
+def test_generate_tokens():
+    """Tokens are issued for new anonymous identities, in the given order."""
+    room = str(uuid4())
+
+    tokens = generate_tokens(
+        room=room, usernames=["Alice", "", "Bob"], sources=["microphone"]
+    )
+
+    assert len({token["participant_id"] for token in tokens}) == 3
+    claims = [decode_token(token["token"]) for token in tokens]
+    assert [claim["name"] for claim in claims] == ["Alice", "Anonymous", "Bob"]
+    for token, claim in zip(tokens, claims, strict=True):
+        assert claim["sub"] == token["participant_id"]
+        assert claim["video"]["room"] == room
+        assert claim["video"]["canPublishSources"] == ["microphone"]
+        assert claim["video"]["roomAdmin"] is False
+        assert claim["attributes"]["is_authenticated"] == "false"
+
+
 @mock.patch("asyncio.get_running_loop")
 @mock.patch("core.utils.LiveKitAPI")
 def test_create_livekit_client_ssl_enabled(
@@ -162,8 +279,14 @@ def test_create_livekit_client_custom_configuration(
     mock_livekit_api.assert_called_once_with(**custom_configuration, session=None)
 
 
-@mock.patch("core.utils.create_livekit_client")
-def test_notify_participants_error(mock_create_livekit_client):
+@pytest.fixture
+def room_name():
+    """Unique LiveKit room name, unknown to the room liveness cache."""
+    return str(uuid4())
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_notify_participants_error(mock_get_livekit_client, room_name):
     """Test participant notification with API error."""
 
     # Set up the mock LiveKitAPI and its behavior
@@ -181,11 +304,11 @@ def test_notify_participants_error(mock_create_livekit_client):
     mock_api_instance.room.list_rooms = mock.AsyncMock(return_value=MockResponse())
 
     mock_api_instance.aclose = mock.AsyncMock()
-    mock_create_livekit_client.return_value = mock_api_instance
+    mock_get_livekit_client.return_value = mock_api_instance
 
     # Call the function and expect an exception
     with pytest.raises(NotificationError, match="Failed to notify room participants"):
-        notify_participants(room_name="room-number-1", notification_data={"foo": "foo"})
+        notify_participants(room_name=room_name, notification_data={"foo": "foo"})
 
     # Verify that the service checked for existing rooms
     mock_api_instance.room.list_rooms.assert_called_once()
@@ -193,12 +316,12 @@ def test_notify_participants_error(mock_create_livekit_client):
     # Verify send_data was called
     mock_api_instance.room.send_data.assert_called_once()
 
-    # Verify aclose was still called after the exception
-    mock_api_instance.aclose.assert_called_once()
+    # The shared client is kept open for later calls
+    mock_api_instance.aclose.assert_not_called()
 
 
-@mock.patch("core.utils.create_livekit_client")
-def test_notify_participants_success_no_room(mock_create_livekit_client):
+@mock.patch("core.utils.get_livekit_client")
+def test_notify_participants_success_no_room(mock_get_livekit_client, room_name):
     """Test the notify_participants function when the LiveKit room doesn't exist."""
 
     # Set up the mock LiveKitAPI and its behavior
@@ -214,9 +337,9 @@ def test_notify_participants_success_no_room(mock_create_livekit_client):
 
     mock_api_instance.room.list_rooms = mock.AsyncMock(return_value=MockResponse())
     mock_api_instance.aclose = mock.AsyncMock()
-    mock_create_livekit_client.return_value = mock_api_instance
+    mock_get_livekit_client.return_value = mock_api_instance
 
-    notify_participants(room_name="room-number-1", notification_data={"foo": "foo"})
+    notify_participants(room_name=room_name, notification_data={"foo": "foo"})
 
     # Verify that the service checked for existing rooms
     mock_api_instance.room.list_rooms.assert_called_once()
@@ -225,11 +348,11 @@ def test_notify_participants_success_no_room(mock_create_livekit_client):
     mock_api_instance.room.send_data.assert_not_called()
 
     # Verify the connection was properly closed
-    mock_api_instance.aclose.assert_called_once()
+    mock_api_instance.aclose.assert_not_called()
 
 
-@mock.patch("core.utils.create_livekit_client")
-def test_notify_participants_success(mock_create_livekit_client):
+@mock.patch("core.utils.get_livekit_client")
+def test_notify_participants_success(mock_get_livekit_client, room_name):
     """Test successful participant notification."""
 
     # Set up the mock LiveKitAPI and its behavior
@@ -245,10 +368,10 @@ def test_notify_participants_success(mock_create_livekit_client):
     mock_api_instance.room.list_rooms = mock.AsyncMock(return_value=MockResponse())
 
     mock_api_instance.aclose = mock.AsyncMock()
-    mock_create_livekit_client.return_value = mock_api_instance
+    mock_get_livekit_client.return_value = mock_api_instance
 
     # Call the function
-    notify_participants(room_name="room-number-1", notification_data={"foo": "foo"})
+    notify_participants(room_name=room_name, notification_data={"foo": "foo"})
 
     # Verify that the service checked for existing rooms
     mock_api_instance.room.list_rooms.assert_called_once()
@@ -256,9 +379,332 @@ def test_notify_participants_success(mock_create_livekit_client):
     # Verify the send_data method was called
     mock_api_instance.room.send_data.assert_called_once()
     send_data_request = mock_api_instance.room.send_data.call_args[0][0]
-    assert send_data_request.room == "room-number-1"
+    assert send_data_request.room == room_name
     assert json.loads(send_data_request.data.decode("utf-8")) == {"foo": "foo"}
     assert send_data_request.kind == 0  # RELIABLE mode in Livekit protocol
 
-    # Verify aclose was called
-    mock_api_instance.aclose.assert_called_once()
+    # The shared client is kept open for later calls
+    mock_api_instance.aclose.assert_not_called()
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_notify_participants_running_room_skips_list_rooms(
+    mock_get_livekit_client, room_name
+):
+    """Rooms known to be running should be notified without listing rooms."""
+    mock_api_instance = mock.Mock()
+    mock_api_instance.room.list_rooms = mock.AsyncMock()
+    mock_api_instance.room.send_data = mock.AsyncMock()
+    mock_get_livekit_client.return_value = mock_api_instance
+
+    RoomLivenessService().mark_started(room_name)
+
+    notify_participants(room_name=room_name, notification_data={"foo": "foo"})
+
+    mock_api_instance.room.list_rooms.assert_not_called()
+    mock_api_instance.room.send_data.assert_called_once()
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_notify_participants_finished_room_started_again(
+    mock_get_livekit_client, room_name
+):
+    """Finished rooms should be looked up in LiveKit, as they may run again."""
+    mock_api_instance = mock.Mock()
+    mock_api_instance.room.list_rooms = mock.AsyncMock(
+        return_value=mock.Mock(rooms=["room-1"])
+    )
+    mock_api_instance.room.send_data = mock.AsyncMock()
+    mock_get_livekit_client.return_value = mock_api_instance
+
+    RoomLivenessService().mark_started(room_name)
+    RoomLivenessService().mark_finished(room_name)
+
+    notify_participants(room_name=room_name, notification_data={"foo": "foo"})
+
+    mock_api_instance.room.list_rooms.assert_called_once()
+    mock_api_instance.room.send_data.assert_called_once()
+    assert RoomLivenessService().is_alive(room_name) is True
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_notify_participants_caches_running_room(mock_get_livekit_client, room_name):
+    """A room found by ListRooms should be remembered for the next notifications."""
+    mock_api_instance = mock.Mock()
+    mock_api_instance.room.list_rooms = mock.AsyncMock(
+        return_value=mock.Mock(rooms=["room-1"])
+    )
+    mock_api_instance.room.send_data = mock.AsyncMock()
+    mock_get_livekit_client.return_value = mock_api_instance
+
+    notify_participants(room_name=room_name, notification_data={"foo": "foo"})
+    notify_participants(room_name=room_name, notification_data={"bar": "bar"})
+
+    mock_api_instance.room.list_rooms.assert_called_once()
+    assert mock_api_instance.room.send_data.call_count == 2
+    assert RoomLivenessService().is_alive(room_name) is True
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_notify_participants_does_not_cache_missing_room(
+    mock_get_livekit_client, room_name
+):
+    """A room missing from ListRooms may start at any time, and isn't remembered."""
+    mock_api_instance = mock.Mock()
+    mock_api_instance.room.list_rooms = mock.AsyncMock(return_value=mock.Mock(rooms=[]))
+    mock_api_instance.room.send_data = mock.AsyncMock()
+    mock_get_livekit_client.return_value = mock_api_instance
+
+    notify_participants(room_name=room_name, notification_data={"foo": "foo"})
+    notify_participants(room_name=room_name, notification_data={"foo": "foo"})
+
+    assert mock_api_instance.room.list_rooms.call_count == 2
+    mock_api_instance.room.send_data.assert_not_called()
+    assert RoomLivenessService().is_alive(room_name) is None
+
+
+@mock.patch("core.utils.get_livekit_client")
+def test_notify_participants_stale_running_room(mock_get_livekit_client, room_name):
+    """A cached room gone from LiveKit should be forgotten without raising."""
+    mock_api_instance = mock.Mock()
+    mock_api_instance.room.list_rooms = mock.AsyncMock()
+    mock_api_instance.room.send_data = mock.AsyncMock(
+        side_effect=TwirpError(msg="room not found", code="not_found", status=404)
+    )
+    mock_get_livekit_client.return_value = mock_api_instance
+
+    RoomLivenessService().mark_started(room_name)
+
+    notify_participants(room_name=room_name, notification_data={"foo": "foo"})
+
+    mock_api_instance.room.list_rooms.assert_not_called()
+    assert RoomLivenessService().is_alive(room_name) is None
+
+
+def test_room_liveness_cache_disabled(room_name, settings):
+    """A zero timeout should disable the room liveness cache."""
+    settings.ROOM_LIVENESS_CACHE_TIMEOUT = 0
+
+    RoomLivenessService().mark_started(room_name)
+
+    assert RoomLivenessService().is_alive(room_name) is None
+
+
+@pytest.fixture
+def livekit_client_manager():
+    """Return a standalone LiveKit client manager, closed after the test."""
+    manager = LiveKitClientManager()
+    yield manager
+    manager.close()
+
+
+async def _get_client(manager, custom_configuration=None):
+    return manager.get_client(custom_configuration)
+
+
+def test_livekit_client_manager_reuses_client_across_calls(livekit_client_manager):
+    """The same client should be shared by successive synchronous calls."""
+    first = livekit_client_manager.run(_get_client, livekit_client_manager)
+    second = livekit_client_manager.run(_get_client, livekit_client_manager)
+
+    assert first is second
+    assert livekit_client_manager.get_metrics()["clients"] == 1
+
+
+def test_livekit_client_manager_one_client_per_configuration(livekit_client_manager):
+    """Custom configurations should get their own client."""
+    default = livekit_client_manager.run(_get_client, livekit_client_manager)
+    custom = livekit_client_manager.run(
+        _get_client,
+        livekit_client_manager,
+        {
+            "api_key": "mock_key",
+            "api_secret": "mock_secret",
+            "url": "http://mock-url.com",
+        },
+    )
+
+    assert default is not custom
+    assert livekit_client_manager.get_metrics()["clients"] == 2
+
+
+def test_livekit_client_manager_forked_process(livekit_client_manager):
+    """Clients inherited from a parent process should never be reused."""
+    parent_client = livekit_client_manager.run(_get_client, livekit_client_manager)
+    parent_loop = livekit_client_manager._loop
+
+    # Simulate running in a forked child
+    livekit_client_manager._pid = -1
+
+    child_client = livekit_client_manager.run(_get_client, livekit_client_manager)
+
+    assert child_client is not parent_client
+    assert livekit_client_manager._loop is not parent_loop
+    parent_loop.call_soon_threadsafe(parent_loop.stop)
+
+
+def test_livekit_client_manager_get_client_outside_loop(livekit_client_manager):
+    """Shared clients should not leak to foreign event loops."""
+    with pytest.raises(RuntimeError, match="livekit_async_to_sync"):
+        async_to_sync(_get_client)(livekit_client_manager)
+
+
+def test_livekit_client_manager_run_from_loop_thread(livekit_client_manager):
+    """Waiting on the manager's loop from itself would deadlock."""
+
+    async def nested():
+        livekit_client_manager.run(_get_client, livekit_client_manager)
+
+    with pytest.raises(RuntimeError, match="cannot be waited on"):
+        livekit_client_manager.run(nested)
+
+
+def test_livekit_client_manager_run_timeout(livekit_client_manager, settings):
+    """Calls outlasting LIVEKIT_API_TIMEOUT should be cancelled and fail."""
+    settings.LIVEKIT_API_TIMEOUT = 1
+    cancelled = threading.Event()
+
+    async def stuck():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TwirpError) as excinfo:
+        livekit_client_manager.run(stuck)
+
+    assert excinfo.value.code == TwirpErrorCode.DEADLINE_EXCEEDED
+    assert cancelled.wait(timeout=5)
+
+
+def test_livekit_client_manager_dead_loop_thread(livekit_client_manager):
+    """A loop whose thread died should be replaced, along with its clients."""
+    client = livekit_client_manager.run(_get_client, livekit_client_manager)
+    loop, thread = livekit_client_manager._loop, livekit_client_manager._thread
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+    assert livekit_client_manager.run(_get_client, livekit_client_manager) is not client
+    assert livekit_client_manager._loop is not loop
+
+
+def test_livekit_client_manager_pool_metrics(livekit_client_manager):
+    """Connections should be kept alive and reused, and counted as such."""
+
+    class Handler(BaseHTTPRequestHandler):
+        """Minimal keep-alive HTTP handler."""
+
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            """Answer with an empty body."""
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            """Silence request logs."""
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    async def ping():
+        client = livekit_client_manager.get_client()
+        async with client._session.get(
+            f"http://127.0.0.1:{server.server_port}/"
+        ) as response:
+            await response.read()
+
+    try:
+        for _ in range(3):
+            livekit_client_manager.run(ping)
+    finally:
+        server.shutdown()
+
+    assert livekit_client_manager.get_metrics() == {
+        "clients": 1,
+        "hits": 2,
+        "misses": 1,
+        "hit_rate": 2 / 3,
+    }
+
+
+def test_get_s3_client_cached_per_config():
+    """S3 clients should be built once per endpoint and signature config."""
+    get_s3_client.cache_clear()
+    config = {
+        "region_name": "us-east-1",
+        "signature_version": "s3v4",
+        "access_key_id": "key",
+        "secret_access_key": "secret",
+    }
+
+    with mock.patch("core.utils.boto3.client", side_effect=mock.Mock) as mock_client:
+        client = get_s3_client("http://storage.test", **config)
+        assert get_s3_client("http://storage.test", **config) is client
+        assert get_s3_client("http://other.test", **config) is not client
+
+    assert mock_client.call_count == 2
+    get_s3_client.cache_clear()
+
+
+def test_get_s3_client_cleared_after_fork():
+    """Forked children should not reuse the S3 clients of their parent."""
+    config = {
+        "endpoint_url": "http://storage.test",
+        "region_name": "us-east-1",
+        "signature_version": "s3v4",
+        "access_key_id": "key",
+        "secret_access_key": "secret",
+    }
+    client = get_s3_client(**config)
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        os._exit(int(get_s3_client(**config) is client))
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert get_s3_client(**config) is client
+    get_s3_client.cache_clear()
+
+
+def test_generate_download_s3_urls_domain_replace(settings):
+    """Urls signed for the frontend should share a single client on its domain."""
+    settings.AWS_S3_DOMAIN_REPLACE = "http://localhost:9000"
+    get_s3_client.cache_clear()
+
+    with mock.patch("core.utils.boto3.client", wraps=boto3.client) as mock_client:
+        urls = generate_download_s3_urls(["a.mp4", "b.mp4"], expires_in=60)
+        url = generate_download_s3_url("c.mp4", expires_in=60)
+
+    mock_client.assert_called_once()
+    assert [urlparse(url).path for url in [*urls, url]] == [
+        "/meet-media-storage/a.mp4",
+        "/meet-media-storage/b.mp4",
+        "/meet-media-storage/c.mp4",
+    ]
+    assert all(url.startswith("http://localhost:9000/") for url in [*urls, url])
+    get_s3_client.cache_clear()
+
+
+def test_generate_download_s3_urls_default_client(settings):
+    """Urls signed for the backend should use the storage client."""
+    settings.AWS_S3_DOMAIN_REPLACE = "http://localhost:9000"
+
+    with mock.patch("core.utils.boto3.client") as mock_client:
+        (url,) = generate_download_s3_urls(
+            ["a.mp4"], expires_in=60, override_domain=False
+        )
+
+    mock_client.assert_not_called()
+    assert url.startswith(settings.AWS_S3_ENDPOINT_URL)
+
+
+def test_generate_download_s3_urls_empty_key():
+    """An empty key should be rejected."""
+    with pytest.raises(ValueError, match="key cannot be empty"):
+        generate_download_s3_urls(["a.mp4", ""], expires_in=60)
@@ -3,6 +3,9 @@ Test utils.detect_mimetype
 Originally taken from https://github.com/suitenumerique/drive/blob/564822d31f071c6dfacd112ef4b7146c73077cd9/src/backend/core/api/utils.py#L166  # pylint:disable=line-too-long
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
 import pytest
 
 from core import utils
@@ -164,3 +167,40 @@ def test_detect_mimetype_ole_storage():
     mimetype = utils.detect_mimetype(xls_ole_content, filename="document.xls")
 
     assert mimetype == "application/vnd.ms-excel"
+
+
+def test_detect_mimetype_reuses_thread_detector():
+    """The libmagic detector should be created once per thread and reused."""
+    utils.detect_mimetype(b"%PDF-1.4\n", filename="document.pdf")
+    detector = utils.get_mime_detector()
+
+    with mock.patch("core.utils.magic.Magic") as mock_magic:
+        mimetype = utils.detect_mimetype(b"%PDF-1.4\n", filename="document.pdf")
+
+    mock_magic.assert_not_called()
+    assert mimetype == "application/pdf"
+    assert utils.get_mime_detector() is detector
+
+
+def test_detect_mimetype_detector_per_thread():
+    """Each thread should use its own libmagic detector."""
+    detector = utils.get_mime_detector()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        thread_detector = executor.submit(utils.get_mime_detector).result()
+
+    assert thread_detector is not detector
+    assert thread_detector.from_buffer(b"%PDF-1.4\n") == "application/pdf"
+
+
+def test_detect_mimetypes():
+    """Test detect_mimetypes detects the MIME types of files in order."""
+    mimetypes = utils.detect_mimetypes(
+        [
+            (b"%PDF-1.4\n", "document.pdf"),
+            (b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR", "image.png"),
+            (b"This is plain text content", None),
+        ]
+    )
+
+    assert mimetypes == ["application/pdf", "image/png", "text/plain"]
@@ -5,19 +5,26 @@ Utils functions used in the core app
 # pylint: disable=R0913, R0917
 # ruff: noqa:S311, PLR0913
 
+import asyncio
+import atexit
+import functools
 import hashlib
 import json
 import logging
 import mimetypes
+import os
 import random
 import secrets
 import string
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import timedelta
 from functools import lru_cache
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache import caches
 from django.core.files.storage import default_storage
 
 import aiohttp
@@ -25,18 +32,23 @@ import boto3
 import botocore
 import magic
 import phonenumbers
-from asgiref.sync import async_to_sync
 from livekit.api import (  # pylint: disable=E0611
     AccessToken,
     ListRoomsRequest,
     LiveKitAPI,
     SendDataRequest,
     TwirpError,
+    TwirpErrorCode,
     VideoGrants,
 )
+from livekit.api.access_token import DEFAULT_TTL as DEFAULT_TOKEN_TTL
+
+from core.services.room_liveness import RoomLivenessService
 
 logger = logging.getLogger(__name__)
 
+LIVEKIT_TOKENS_CACHE = "livekit_tokens"
+
 
 def generate_color(identity: str) -> str:
     """Generates a consistent HSL color based on a given identity string.
@@ -97,16 +109,6 @@ def generate_token(  # noqa: PLR0917
     if sources is None:
         sources = settings.LIVEKIT_DEFAULT_SOURCES
 
-    video_grants = VideoGrants(
-        room=room,
-        room_join=True,
-        room_admin=is_admin_or_owner,
-        can_update_own_metadata=False,
-        can_publish=bool(sources),
-        can_publish_sources=sources,
-        can_subscribe=True,
-    )
-
     if user.is_anonymous:
         identity = participant_id or str(uuid4())
         default_username = "Anonymous"
@@ -122,6 +124,115 @@ def generate_token(  # noqa: PLR0917
     )
     display_name = (username or default_username) if can_edit else default_username
 
+    attributes = {
+        "color": color,
+        "room_role": role,
+        "is_authenticated": "true" if user.is_authenticated else "false",
+    }
+
+    token_cache = caches[LIVEKIT_TOKENS_CACHE]
+    cache_timeout = _get_token_cache_timeout(ttl)
+    # Identities generated on the fly are never requested again, don't cache them
+    cache_key = (
+        _get_token_cache_key(room, identity, display_name, attributes, sources, ttl)
+        if cache_timeout and (participant_id or not user.is_anonymous)
+        else None
+    )
+
+    if cache_key and (token := token_cache.get(cache_key)) is not None:
+        return token
+
+    token = _sign_token(
+        _build_video_grants(room, sources, is_admin_or_owner),
+        identity,
+        display_name,
+        attributes,
+        ttl,
+    )
+
+    if cache_key:
+        token_cache.set(cache_key, token, timeout=cache_timeout)
+
+    return token
+
+
+def generate_tokens(
+    room: str,
+    usernames: List[str],
+    sources: Optional[List[str]] = None,
+    ttl: Optional[timedelta] = None,
+) -> List[dict]:
+    """Issue LiveKit access tokens for many anonymous participants of a room at once.
+
+    Used to pre-provision attendees, e.g. of a webinar. Each participant gets a
+    new identity, and the grants, shared by all participants, are built once.
+
+    Args:
+        room (str): The name of the room.
+        usernames (List[str]): The usernames to be displayed in the room,
+                         one per participant.
+        sources: (Optional[List[str]]): List of media sources participants can publish
+                         If none, defaults to LIVEKIT_DEFAULT_SOURCES.
+        ttl (Optional[timedelta]): Token validity duration. Defaults to LiveKit SDK default.
+
+    Returns:
+        List[dict]: The participant ID and the LiveKit JWT access token of each
+                         participant, in the order of the usernames.
+    """
+
+    if sources is None:
+        sources = settings.LIVEKIT_DEFAULT_SOURCES
+
+    video_grants = _build_video_grants(room, sources, is_admin_or_owner=False)
+
+    tokens = []
+    for username in usernames:
+        participant_id = str(uuid4())
+        attributes = {
+            "color": generate_color(participant_id),
+            "room_role": None,
+            "is_authenticated": "false",
+        }
+        tokens.append(
+            {
+                "participant_id": participant_id,
+                "token": _sign_token(
+                    video_grants,
+                    participant_id,
+                    username or "Anonymous",
+                    attributes,
+                    ttl,
+                ),
+            }
+        )
+
+    return tokens
+
+
+def _build_video_grants(
+    room: str, sources: List[str], is_admin_or_owner: bool
+) -> VideoGrants:
+    """Build the grants of a participant in a room."""
+    return VideoGrants(
+        room=room,
+        room_join=True,
+        room_admin=is_admin_or_owner,
+        can_update_own_metadata=False,
+        can_publish=bool(sources),
+        can_publish_sources=sources,
+        can_subscribe=True,
+    )
+
+
+def _sign_token(
+    video_grants: VideoGrants,
+    identity: str,
+    display_name: str,
+    attributes: dict,
+    ttl: Optional[timedelta] = None,
+) -> str:
+    """Sign a LiveKit access token with the configured API credentials."""
+
     token = (
         AccessToken(
             api_key=settings.LIVEKIT_CONFIGURATION["api_key"],
@@ -130,13 +241,7 @@ def generate_token(  # noqa: PLR0917
         .with_grants(video_grants)
         .with_identity(identity)
         .with_name(display_name)
-        .with_attributes(
-            {
-                "color": color,
-                "room_role": role,
-                "is_authenticated": "true" if user.is_authenticated else "false",
-            }
-        )
+        .with_attributes(attributes)
     )
     if ttl is not None:
         token = token.with_ttl(ttl)
@@ -144,6 +249,42 @@ def generate_token(  # noqa: PLR0917
     return token.to_jwt()
 
 
+def _get_token_cache_timeout(ttl: Optional[timedelta] = None) -> int:
+    """Return how long a token can be reused, keeping it valid for half its TTL.
+
+    A reused token is never handed out with less than half of its validity left,
+    so that clients don't get tokens about to expire.
+    """
+    ttl = ttl if ttl is not None else DEFAULT_TOKEN_TTL
+    return min(settings.LIVEKIT_TOKEN_CACHE_TIMEOUT, int(ttl.total_seconds() // 2))
+
+
+def _get_token_cache_key(  # noqa: PLR0917
+    room: str,
+    identity: str,
+    display_name: str,
+    attributes: dict,
+    sources: List[str],
+    ttl: Optional[timedelta] = None,
+) -> str:
+    """Generate cache key for a token, covering every claim it's signed with."""
+
+    claims = json.dumps(
+        [
+            settings.LIVEKIT_CONFIGURATION["api_key"],
+            settings.LIVEKIT_CONFIGURATION["api_secret"],
+            room,
+            identity,
+            display_name,
+            attributes,
+            list(sources),
+            ttl.total_seconds() if ttl is not None else None,
+        ],
+        sort_keys=True,
+    )
+    return f"livekit_token_{hashlib.sha256(claims.encode('utf-8')).hexdigest()}"
+
+
 def generate_livekit_config(  # noqa: PLR0917
     room_id: str,
     user,
@@ -233,26 +374,226 @@ def create_livekit_client(custom_configuration=None):
     return LiveKitAPI(session=custom_session, **configuration)
 
 
+class LiveKitClientManager:
+    """Process-wide LiveKit API clients sharing keep-alive connection pools.
+
+    aiohttp sessions are bound to the event loop they were created on, while
+    async_to_sync spins up a fresh event loop for each call. The manager thus
+    owns a long-lived event loop, running in a daemon thread, on which LiveKit
+    calls are scheduled so that their connections are reused across requests.
+
+    The loop and its clients are discarded in forked children (e.g. gunicorn
+    workers), as the parent's loop thread does not survive a fork, and when its
+    thread died. Calls are waited on for LIVEKIT_API_TIMEOUT seconds at most, so
+    that a stuck loop fails requests instead of blocking their threads forever.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """Drop the loop, its thread and clients, without closing them."""
+        self._loop = None
+        self._thread = None
+        self._clients = {}
+        self._pid = os.getpid()
+        self.hits = 0
+        self.misses = 0
+
+    def after_fork(self):
+        """Start from a clean state in a forked child process."""
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _get_loop(self):
+        """Return the manager's event loop, starting it on first use."""
+        with self._lock:
+            if self._pid != os.getpid() or (
+                self._thread is not None and not self._thread.is_alive()
+            ):
+                self._reset()
+
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="livekit-client-loop",
+                    daemon=True,
+                )
+                self._thread.start()
+
+            return self._loop
+
+    def run(self, coroutine_function, *args, **kwargs):
+        """Run a coroutine function on the manager's loop and wait for its result.
+
+        Raises:
+            TwirpError: With the DEADLINE_EXCEEDED code when the call does not end
+                within LIVEKIT_API_TIMEOUT seconds, the call is then cancelled.
+        """
+        loop = self._get_loop()
+
+        if threading.current_thread() is self._thread:
+            raise RuntimeError(
+                "LiveKit calls cannot be waited on from the LiveKit client loop, "
+                "await the coroutine instead."
+            )
+
+        future = asyncio.run_coroutine_threadsafe(
+            coroutine_function(*args, **kwargs), loop
+        )
+        try:
+            return future.result(timeout=settings.LIVEKIT_API_TIMEOUT)
+        except FutureTimeoutError as e:
+            future.cancel()
+            logger.error(
+                "LiveKit call %s did not end within %s seconds",
+                coroutine_function.__qualname__,
+                settings.LIVEKIT_API_TIMEOUT,
+            )
+            raise TwirpError(
+                TwirpErrorCode.DEADLINE_EXCEEDED,
+                "LiveKit call timed out",
+                status=504,
+            ) from e
+
+    async def _on_connection_reused(self, *_):
+        """Count a request served by an already open connection."""
+        self.hits += 1
+
+    async def _on_connection_created(self, *_):
+        """Count a request that had to open a new connection."""
+        self.misses += 1
+
+    def get_client(self, custom_configuration=None) -> LiveKitAPI:
+        """Return the shared LiveKit API client for a configuration.
+
+        Must be called from a coroutine running on the manager's loop.
+        """
+        if asyncio.get_running_loop() is not self._loop:
+            raise RuntimeError(
+                "Shared LiveKit clients can only be used from coroutines run "
+                "with livekit_async_to_sync."
+            )
+
+        configuration = custom_configuration or settings.LIVEKIT_CONFIGURATION
+        key = json.dumps(configuration, sort_keys=True, default=str)
+
+        if (client := self._clients.get(key)) is not None:
+            return client
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                ssl=settings.LIVEKIT_VERIFY_SSL,
+                limit=settings.LIVEKIT_CLIENT_MAX_CONNECTIONS,
+                keepalive_timeout=settings.LIVEKIT_CLIENT_KEEPALIVE_TIMEOUT,
+            ),
+            trace_configs=[trace_config],
+        )
+        client = LiveKitAPI(session=session, **configuration)
+        self._clients[key] = client
+
+        return client
+
+    def get_metrics(self) -> dict:
+        """Return connection pool hit/miss counters for this process."""
+        total = self.hits + self.misses
+        return {
+            "clients": len(self._clients),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else None,
+        }
+
+    def close(self):
+        """Close all clients and stop the manager's loop."""
+        with self._lock:
+            loop, clients = self._loop, list(self._clients.values())
+            if loop is None or self._pid != os.getpid():
+                return
+
+            async def _aclose_all():
+                for client in clients:
+                    await client.aclose()
+
+            try:
+                asyncio.run_coroutine_threadsafe(_aclose_all(), loop).result(timeout=5)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.warning("Could not close LiveKit clients", exc_info=True)
+            finally:
+                loop.call_soon_threadsafe(loop.stop)
+                self._reset()
+
+
+livekit_clients = LiveKitClientManager()
+os.register_at_fork(after_in_child=livekit_clients.after_fork)
+atexit.register(livekit_clients.close)
+
+
+def livekit_async_to_sync(coroutine_function):
+    """Like async_to_sync, but runs on the loop owning the shared LiveKit clients."""
+
+    @functools.wraps(coroutine_function)
+    def wrapper(*args, **kwargs):
+        return livekit_clients.run(coroutine_function, *args, **kwargs)
+
+    return wrapper
+
+
+def get_livekit_client(custom_configuration=None) -> LiveKitAPI:
+    """Return the process-wide LiveKit API client, with pooled connections.
+
+    Unlike create_livekit_client, the returned client must not be closed.
+    """
+    return livekit_clients.get_client(custom_configuration)
+
+
 class NotificationError(Exception):
     """Notification delivery to room participants fails."""
 
 
-@async_to_sync
-async def notify_participants(room_name: str, notification_data: dict):
-    """Send notification data to all participants in a LiveKit room."""
+def notify_participants(room_name: str, notification_data: dict):
+    """Send notification data to all participants in a LiveKit room.
+
+    Rooms known to be running from the liveness cache skip the ListRooms
+    lookup. Nothing is sent when the room doesn't exist.
+    """
+
+    room_liveness = RoomLivenessService()
+    is_alive = room_liveness.is_alive(room_name)
 
-    lkapi = create_livekit_client()
+    sent = _send_data(room_name, notification_data, check_room_exists=is_alive is None)
+
+    if sent and is_alive is None:
+        room_liveness.mark_started(room_name)
+    elif not sent and is_alive:
+        room_liveness.forget(room_name)
+
+
+@livekit_async_to_sync
+async def _send_data(
+    room_name: str, notification_data: dict, check_room_exists: bool
+) -> bool:
+    """Send data to a LiveKit room, returning whether the room exists."""
+
+    lkapi = get_livekit_client()
 
     try:
-        room_response = await lkapi.room.list_rooms(
-            ListRoomsRequest(
-                names=[room_name],
+        if check_room_exists:
+            room_response = await lkapi.room.list_rooms(
+                ListRoomsRequest(
+                    names=[room_name],
+                )
             )
-        )
 
-        # Check if the room exists
-        if not room_response.rooms:
-            return
+            # Check if the room exists
+            if not room_response.rooms:
+                return False
 
         await lkapi.room.send_data(
             SendDataRequest(
@@ -262,9 +603,11 @@ async def notify_participants(room_name: str, notification_data: dict):
             )
         )
     except TwirpError as e:
+        if e.code == "not_found":
+            return False
         raise NotificationError("Failed to notify room participants") from e
-    finally:
-        await lkapi.aclose()
+
+    return True
 
 
 ALPHANUMERIC_CHARSET = string.ascii_letters + string.digits
@@ -317,6 +660,24 @@ def generate_room_slug():
     return "-".join(parts)
 
 
+_mime_detectors = threading.local()
+
+
+def get_mime_detector() -> magic.Magic:
+    """
+    Return the libmagic mime detector of the current thread.
+
+    Creating a detector loads the libmagic database, which costs far more than a
+    detection, so each thread creates its own once and reuses it. Detectors are
+    not shared between threads, as python-magic serializes calls on a detector.
+    """
+    mime_detector = getattr(_mime_detectors, "detector", None)
+    if mime_detector is None:
+        mime_detector = magic.Magic(mime=True)
+        _mime_detectors.detector = mime_detector
+    return mime_detector
+
+
 def detect_mimetype(file_buffer: bytes, filename: str | None = None) -> str:
     """
     Detect MIME type using multiple methods for better accuracy.
@@ -335,11 +696,8 @@ def detect_mimetype(file_buffer: bytes, filename: str | None = None) -> str:
     Notes:
         Originally from https://github.com/suitenumerique/drive/blob/564822d31f071c6dfacd112ef4b7146c73077cd9/src/backend/core/api/utils.py#L166 # pylint:disable=line-too-long
     """
-    # Initialize magic detector
-    mime_detector = magic.Magic(mime=True)
-
     # Method 1: Detect from file content (magic bytes) - most reliable
-    mimetype_from_content = mime_detector.from_buffer(file_buffer)
+    mimetype_from_content = get_mime_detector().from_buffer(file_buffer)
 
     # If we have a filename, try extension-based detection as well
     mimetype_from_extension = None
@@ -381,36 +739,80 @@ def detect_mimetype(file_buffer: bytes, filename: str | None = None) -> str:
     return mimetype_from_content or "application/octet-stream"
 
 
-def generate_upload_policy(file):
+def detect_mimetypes(files: Iterable[tuple[bytes, str | None]]) -> List[str]:
     """
-    Generate a S3 upload policy for a given file.
+    Detect the MIME types of many files, for bulk processing.
 
-    Notes:
-        Originally taken from https://github.com/suitenumerique/drive/blob/564822d31f071c6dfacd112ef4b7146c73077cd9/src/backend/core/api/utils.py#L102  # pylint: disable=line-too-long
+    Args:
+        files: The first bytes and optional filename of each file
+
+    Returns:
+        List[str]: The detected MIME types, in the order of the files
     """
+    return [
+        detect_mimetype(file_buffer, filename=filename)
+        for file_buffer, filename in files
+    ]
 
-    key = file.temporary_file_key
 
-    # This settings should be used if the backend application and the frontend application
+@lru_cache(maxsize=8)
+def get_s3_client(
+    endpoint_url, region_name, signature_version, access_key_id, secret_access_key
+):
+    """
+    Return a S3 client for an endpoint and signature config, shared by the process.
+
+    Building a client takes tens of milliseconds, whereas a client is thread-safe
+    and can sign any number of urls. Cached clients are dropped in forked children,
+    which must not share their parent's connection pool.
+    """
+    return boto3.client(
+        "s3",
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=secret_access_key,
+        endpoint_url=endpoint_url,
+        config=botocore.client.Config(
+            region_name=region_name,
+            signature_version=signature_version,
+        ),
+    )
+
+
+os.register_at_fork(after_in_child=get_s3_client.cache_clear)
+
+
+def _get_presigning_s3_client(override_domain=True):
+    """Return the S3 client signing urls for the frontend application."""
+
+    # This setting should be used if the backend application and the frontend application
     # can't connect to the object storage with the same domain. This is the case in the
     # docker compose stack used in development. The frontend application will use localhost
     # to connect to the object storage while the backend application will use the object storage
     # service name declared in the docker compose stack.
     # This is needed because the domain name is used to compute the signature. So it can't be
     # changed dynamically by the frontend application.
-    if settings.AWS_S3_DOMAIN_REPLACE:
-        s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=settings.AWS_S3_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_S3_SECRET_ACCESS_KEY,
-            endpoint_url=settings.AWS_S3_DOMAIN_REPLACE,
-            config=botocore.client.Config(
-                region_name=settings.AWS_S3_REGION_NAME,
-                signature_version=settings.AWS_S3_SIGNATURE_VERSION,
-            ),
+    if settings.AWS_S3_DOMAIN_REPLACE and override_domain:
+        return get_s3_client(
+            settings.AWS_S3_DOMAIN_REPLACE,
+            settings.AWS_S3_REGION_NAME,
+            settings.AWS_S3_SIGNATURE_VERSION,
+            settings.AWS_S3_ACCESS_KEY_ID,
+            settings.AWS_S3_SECRET_ACCESS_KEY,
         )
-    else:
-        s3_client = default_storage.connection.meta.client
+
+    return default_storage.connection.meta.client
+
+
+def generate_upload_policy(file):
+    """
+    Generate a S3 upload policy for a given file.
+
+    Notes:
+        Originally taken from https://github.com/suitenumerique/drive/blob/564822d31f071c6dfacd112ef4b7146c73077cd9/src/backend/core/api/utils.py#L102  # pylint: disable=line-too-long
+    """
+
+    key = file.temporary_file_key
+    s3_client = _get_presigning_s3_client()
 
     # Generate the policy
     policy = s3_client.generate_presigned_url(
@@ -428,35 +830,32 @@ def generate_download_s3_url(
     """
     Generate a S3 signed download url for a given key.
     """
-    if not key:
+    return generate_download_s3_urls(
+        [key], expires_in=expires_in, override_domain=override_domain
+    )[0]
+
+
+def generate_download_s3_urls(
+    keys: List[str], *, expires_in: int, override_domain: bool = True
+) -> List[str]:
+    """
+    Generate S3 signed download urls for many keys, in the order of the keys.
+
+    All urls are signed by the same client, so that each one only costs a signature.
+    """
+    if not all(keys):
         raise ValueError("key cannot be empty")
 
-    # This setting should be used if the backend application and the frontend application
-    # can't connect to the object storage with the same domain. This is the case in the
-    # docker compose stack used in development. The frontend application will use localhost
-    # to connect to the object storage while the backend application will use the object storage
-    # service name declared in the docker compose stack.
-    # This is needed because the domain name is used to compute the signature. So it can't be
-    # changed dynamically by the frontend application.
-    if settings.AWS_S3_DOMAIN_REPLACE and override_domain:
-        s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=settings.AWS_S3_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_S3_SECRET_ACCESS_KEY,
-            endpoint_url=settings.AWS_S3_DOMAIN_REPLACE,
-            config=botocore.client.Config(
-                region_name=settings.AWS_S3_REGION_NAME,
-                signature_version=settings.AWS_S3_SIGNATURE_VERSION,
-            ),
-        )
-    else:
-        s3_client = default_storage.connection.meta.client
+    s3_client = _get_presigning_s3_client(override_domain)
 
-    return s3_client.generate_presigned_url(
-        ClientMethod="get_object",
-        Params={"Bucket": default_storage.bucket_name, "Key": key},
-        ExpiresIn=expires_in,
-    )
+    return [
+        s3_client.generate_presigned_url(
+            ClientMethod="get_object",
+            Params={"Bucket": default_storage.bucket_name, "Key": key},
+            ExpiresIn=expires_in,
+        )
+        for key in keys
+    ]
 
 
 @lru_cache(maxsize=1)
@@ -0,0 +1,368 @@
+"""Benchmarks of the backend hot paths: lobby, LiveKit, webhooks and uploads.
+
+LiveKit is replaced by an in-memory stub, so benchmarks run offline against the
+database and redis configured for the project. Objects created while
+benchmarking are rolled back or deleted once done.
+"""
+
+# pylint: disable=protected-access
+# ruff: noqa: SLF001
+
+import base64
+import hashlib
+import json
+import platform
+import statistics
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from unittest import mock
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+
+from django_redis import get_redis_connection
+from livekit import api
+from livekit.protocol.models import Room as LiveKitRoom
+from livekit.protocol.room import ListRoomsResponse, SendDataResponse
+from livekit.protocol.sip import ListSIPDispatchRuleResponse, SIPDispatchRuleInfo
+from rest_framework.request import Request
+
+from core import factories, models, utils
+from core.api.serializers import RoomSerializer
+from core.services.livekit_events import LiveKitEventsService
+from core.services.lobby import (
+    LobbyParticipant,
+    LobbyParticipantStatus,
+    LobbyService,
+)
+from core.services.sip_management import SIPManagement
+
+DEFAULT_LOBBY_SIZES = (10, 1000, 10000)
+ROOM_ACCESSES_COUNT = 10
+MIMETYPE_BATCH_SIZE = 100
+PNG_HEAD = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR" + bytes(2032)
+
+
+class StubRoomService:
+    """In-memory stand-in of the LiveKit room service, where every room runs."""
+
+    async def list_rooms(self, request):
+        """List the requested rooms as running."""
+        return ListRoomsResponse(rooms=[LiveKitRoom(name=n) for n in request.names])
+
+    async def send_data(self, request):  # pylint: disable=unused-argument
+        """Accept data sent to a room."""
+        return SendDataResponse()
+
+
+class StubSIPService:
+    """In-memory stand-in of the LiveKit SIP service, holding dispatch rules."""
+
+    def __init__(self):
+        self.dispatch_rules = {}
+
+    async def create_sip_dispatch_rule(self, create):
+        """Create a dispatch rule."""
+        rule = SIPDispatchRuleInfo(
+            sip_dispatch_rule_id=f"SDR_{uuid.uuid4().hex}",
+            name=create.name,
+            rule=create.rule,
+        )
+        self.dispatch_rules[rule.sip_dispatch_rule_id] = rule
+        return rule
+
+    async def list_sip_dispatch_rule(self, list):  # pylint: disable=redefined-builtin,unused-argument
+        """List every dispatch rule."""
+        return ListSIPDispatchRuleResponse(items=self.dispatch_rules.values())
+
+    async def delete_sip_dispatch_rule(self, delete):
+        """Delete a dispatch rule."""
+        return self.dispatch_rules.pop(
+            delete.sip_dispatch_rule_id, SIPDispatchRuleInfo()
+        )
+
+
+class StubLiveKitAPI:  # pylint: disable=too-few-public-methods
+    """In-memory stand-in of the LiveKit API client."""
+
+    def __init__(self):
+        self.room = StubRoomService()
+        self.sip = StubSIPService()
+
+
+def measure(func, iterations, warmup):
+    """Time calls of a function, returning the duration of each one in seconds."""
+
+    for _ in range(warmup):
+        func()
+
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+
+    return durations
+
+
+def summarize(name, params, durations):
+    """Summarize the durations of a benchmark in milliseconds."""
+
+    ordered = sorted(durations)
+    mean = statistics.fmean(ordered)
+
+    return {
+        "name": name,
+        "params": params,
+        "iterations": len(ordered),
+        "min_ms": ordered[0] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "mean_ms": mean * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[max(0, round(len(ordered) * 0.95) - 1)] * 1000,
+        "stdev_ms": statistics.pstdev(ordered) * 1000,
+        "ops_per_second": 1 / mean if mean else None,
+    }
+
+
+class HotPathsBenchmark:
+    """Run the hot paths benchmarks and collect their results."""
+
+    def __init__(self, iterations=100, warmup=10, lobby_sizes=DEFAULT_LOBBY_SIZES):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.lobby_sizes = lobby_sizes
+        self.request_factory = RequestFactory()
+        self.results = []
+
+    def run(self, label=None):
+        """Run every benchmark and return the results with their metadata."""
+
+        with (
+            mock.patch("core.utils.get_livekit_client", return_value=StubLiveKitAPI()),
+            override_settings(
+                LOBBY_KEY_PREFIX=f"benchmark_lobby_{uuid.uuid4().hex}",
+                LOBBY_WAITING_TIMEOUT=3600,
+            ),
+            self._rollback(),
+        ):
+            self.benchmark_lobby()
+            self.benchmark_generate_token()
+            self.benchmark_webhook_receive()
+            self.benchmark_room_serializer()
+            self.benchmark_detect_mimetype()
+
+        return {
+            "metadata": {
+                "label": label,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python_version": platform.python_version(),
+                "django_version": django.get_version(),
+                "iterations": self.iterations,
+                "warmup": self.warmup,
+            },
+            "benchmarks": self.results,
+        }
+
+    @staticmethod
+    @contextmanager
+    def _rollback():
+        """Roll back the objects created in database while benchmarking."""
+        with transaction.atomic():
+            yield
+            transaction.set_rollback(True)
+
+    def _record(self, name, params, func):
+        """Measure a function and record its results."""
+        durations = measure(func, self.iterations, self.warmup)
+        self.results.append(summarize(name, params, durations))
+
+    @staticmethod
+    def _populate_lobby(room, size):
+        """Add waiting participants to the lobby of a room, in bulk."""
+
+        lobby_service = LobbyService()
+        participant_ids = [str(uuid.uuid4()) for _ in range(size)]
+
+        cache.set_many(
+            {
+                lobby_service._get_cache_key(room.id, participant_id): LobbyParticipant(
+                    status=LobbyParticipantStatus.WAITING,
+                    username=f"Participant {i:d}",
+                    id=participant_id,
+                    color=utils.generate_color(participant_id),
+                ).to_dict()
+                for i, participant_id in enumerate(participant_ids)
+            },
+            timeout=settings.LOBBY_WAITING_TIMEOUT,
+        )
+
+        expires_at = time.time() + settings.LOBBY_WAITING_TIMEOUT
+        get_redis_connection("default").zadd(
+            lobby_service._get_index_key(room.id),
+            dict.fromkeys(participant_ids, expires_at),
+        )
+
+    def benchmark_lobby(self):
+        """Benchmark polling the lobby and listing its waiting participants."""
+
+        lobby_service = LobbyService()
+
+        for size in self.lobby_sizes:
+            room = factories.RoomFactory(access_level=models.RoomAccessLevel.RESTRICTED)
+            self._populate_lobby(room, size)
+
+            request = self.request_factory.get("/")
+            request.user = AnonymousUser()
+            request.COOKIES[settings.LOBBY_COOKIE_NAME] = str(uuid.uuid4())
+            lobby_service.request_entry(room, request, "Polling participant")
+
+            try:
+                self._record(
+                    "lobby.request_entry",
+                    {"waiting_participants": size},
+                    lambda room=room, request=request: lobby_service.request_entry(
+                        room, request, "Polling participant"
+                    ),
+                )
+                self._record(
+                    "lobby.list_waiting_participants",
+                    {"waiting_participants": size},
+                    lambda room=room: lobby_service.list_waiting_participants(room.id),
+                )
+            finally:
+                lobby_service.clear_room_cache(room.id)
+
+    def benchmark_generate_token(self):
+        """Benchmark issuing LiveKit tokens, with and without the token cache."""
+
+        user = factories.UserFactory()
+        room = str(uuid.uuid4())
+
+        for cache_timeout in (0, settings.LIVEKIT_TOKEN_CACHE_TIMEOUT):
+            with override_settings(LIVEKIT_TOKEN_CACHE_TIMEOUT=cache_timeout):
+                self._record(
+                    "utils.generate_token",
+                    {"cached": bool(cache_timeout)},
+                    lambda: utils.generate_token(room=room, user=user, role="member"),
+                )
+
+    def _build_webhook_request(self, room):
+        """Build a signed 'room_started' webhook request, unique to be handled."""
+
+        body = json.dumps(
+            {
+                "event": "room_started",
+                "id": f"EV_{uuid.uuid4().hex}",
+                "room": {"sid": f"RM_{uuid.uuid4().hex}", "name": str(room.id)},
+                "createdAt": str(int(time.time())),
+            }
+        )
+
+        token = api.AccessToken(
+            settings.LIVEKIT_CONFIGURATION["api_key"],
+            settings.LIVEKIT_CONFIGURATION["api_secret"],
+        )
+        token.claims.sha256 = base64.b64encode(
+            hashlib.sha256(body.encode()).digest()
+        ).decode()
+
+        return self.request_factory.post(
+            "/",
+            data=body,
+            content_type="application/json",
+            HTTP_AUTHORIZATION=token.to_jwt(),
+        )
+
+    def benchmark_webhook_receive(self):
+        """Benchmark verifying and handling a LiveKit webhook."""
+
+        room = factories.RoomFactory()
+        service = LiveKitEventsService()
+        requests = iter(
+            [
+                self._build_webhook_request(room)
+                for _ in range(self.warmup + self.iterations)
+            ]
+        )
+
+        try:
+            self._record(
+                "livekit_events.receive",
+                {"event": "room_started"},
+                lambda: service.receive(next(requests)),
+            )
+        finally:
+            # With telephony enabled, the room got a dispatch rule registered
+            SIPManagement().delete_dispatch_rule(room.id)
+
+    def benchmark_room_serializer(self):
+        """Benchmark serializing a room for its owner, with its accesses."""
+
+        owner = factories.UserFactory()
+        room = factories.RoomFactory(users=[(owner, models.RoleChoices.OWNER)])
+        for _ in range(ROOM_ACCESSES_COUNT - 1):
+            factories.UserResourceAccessFactory(
+                resource=room, role=models.RoleChoices.MEMBER
+            )
+
+        request = Request(self.request_factory.get("/"))
+        request.user = owner
+
+        self._record(
+            "serializers.RoomSerializer",
+            {"accesses": ROOM_ACCESSES_COUNT},
+            lambda: RoomSerializer(room, context={"request": request}).data,
+        )
+
+    def benchmark_detect_mimetype(self):
+        """Benchmark detecting the mimetype of uploaded files, one by one and in bulk."""
+
+        files = [(PNG_HEAD, f"image_{i:d}.png") for i in range(MIMETYPE_BATCH_SIZE)]
+
+        self._record(
+            "utils.detect_mimetype",
+            {"files": 1},
+            lambda: utils.detect_mimetype(PNG_HEAD, filename="image.png"),
+        )
+        self._record(
+            "utils.detect_mimetypes",
+            {"files": MIMETYPE_BATCH_SIZE},
+            lambda: utils.detect_mimetypes(files),
+        )
+
+
+def compare(results, baseline):
+    """Compare the median duration of each benchmark to a baseline run.
+
+    Returns:
+        list: The name, params and ratio to the baseline median of the benchmarks
+            found in both runs.
+    """
+
+    baseline_medians = {
+        (result["name"], json.dumps(result["params"], sort_keys=True)): result[
+            "median_ms"
+        ]
+        for result in baseline["benchmarks"]
+    }
+
+    comparisons = []
+    for result in results["benchmarks"]:
+        key = (result["name"], json.dumps(result["params"], sort_keys=True))
+        if baseline_medians.get(key):
+            comparisons.append(
+                {
+                    "name": result["name"],
+                    "params": result["params"],
+                    "ratio": result["median_ms"] / baseline_medians[key],
+                }
+            )
+
+    return comparisons
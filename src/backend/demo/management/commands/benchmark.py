@@ -0,0 +1,98 @@
+"""benchmark management command"""
+
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from demo.benchmarks import DEFAULT_LOBBY_SIZES, HotPathsBenchmark, compare
+
+
+class Command(BaseCommand):
+    """Benchmark the backend hot paths, with LiveKit stubbed out."""
+
+    help = __doc__
+
+    def add_arguments(self, parser):
+        """Add arguments to tune the benchmarks and store their results."""
+        parser.add_argument(
+            "-f",
+            "--force",
+            action="store_true",
+            default=False,
+            help="Force command execution despite DEBUG is set to False",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=100,
+            help="Number of timed calls of each benchmark (default: 100)",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=10,
+            help="Number of untimed calls before timing each benchmark (default: 10)",
+        )
+        parser.add_argument(
+            "--lobby-sizes",
+            type=int,
+            nargs="+",
+            default=list(DEFAULT_LOBBY_SIZES),
+            help="Numbers of waiting participants in the lobby benchmarks",
+        )
+        parser.add_argument(
+            "--label",
+            help="Label stored with the results, e.g. the benchmarked commit",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the results as JSON to this file instead of the output",
+        )
+        parser.add_argument(
+            "--compare",
+            help="Compare results to a previous run stored as JSON in this file",
+        )
+
+    def handle(self, *args, **options):
+        """Handling of the management command."""
+        if not settings.DEBUG and not options["force"]:
+            raise CommandError(
+                (
+                    "This command is not meant to be used in production environment "
+                    "except you know what you are doing, if so use --force parameter"
+                )
+            )
+
+        if options["iterations"] < 1:
+            raise CommandError("Iterations must be greater than 0")
+
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as baseline_file:
+                baseline = json.load(baseline_file)
+
+        results = HotPathsBenchmark(
+            iterations=options["iterations"],
+            warmup=options["warmup"],
+            lobby_sizes=options["lobby_sizes"],
+        ).run(label=options["label"])
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output_file:
+                json.dump(results, output_file, indent=2)
+            for result in results["benchmarks"]:
+                self.stdout.write(
+                    f"{result['name']} {json.dumps(result['params'])}: "
+                    f"median {result['median_ms']:.3f} ms, "
+                    f"p95 {result['p95_ms']:.3f} ms"
+                )
+        else:
+            self.stdout.write(json.dumps(results, indent=2))
+
+        if baseline is not None:
+            for comparison in compare(results, baseline):
+                self.stdout.write(
+                    f"{comparison['name']} {json.dumps(comparison['params'])}: "
+                    f"{comparison['ratio']:.2f}x the baseline median"
+                )
@@ -0,0 +1,87 @@
+"""Test the `benchmark` management command"""
+
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+
+import pytest
+from django_redis import get_redis_connection
+
+from core import models
+from core.services.sip_management import SIP_DISPATCH_RULES_REGISTRY_KEY
+
+pytestmark = pytest.mark.django_db
+
+BENCHMARK_ARGS = ["--iterations", "2", "--warmup", "1", "--lobby-sizes", "3", "5"]
+
+
+def test_commands_benchmark_production():
+    """The benchmark command should refuse to run without DEBUG unless forced."""
+    with pytest.raises(CommandError, match="use --force parameter"):
+        call_command("benchmark", *BENCHMARK_ARGS)
+
+
+@override_settings(DEBUG=True)
+def test_commands_benchmark(tmp_path):
+    """The benchmark command should store machine-readable results."""
+    output = tmp_path / "results.json"
+
+    call_command(
+        "benchmark", *BENCHMARK_ARGS, "--label", "abc123", "--output", str(output)
+    )
+
+    results = json.loads(output.read_text())
+    assert results["metadata"]["label"] == "abc123"
+    assert results["metadata"]["iterations"] == 2
+    assert [(result["name"], result["params"]) for result in results["benchmarks"]] == [
+        ("lobby.request_entry", {"waiting_participants": 3}),
+        ("lobby.list_waiting_participants", {"waiting_participants": 3}),
+        ("lobby.request_entry", {"waiting_participants": 5}),
+        ("lobby.list_waiting_participants", {"waiting_participants": 5}),
+        ("utils.generate_token", {"cached": False}),
+        ("utils.generate_token", {"cached": True}),
+        ("livekit_events.receive", {"event": "room_started"}),
+        ("serializers.RoomSerializer", {"accesses": 10}),
+        ("utils.detect_mimetype", {"files": 1}),
+        ("utils.detect_mimetypes", {"files": 100}),
+    ]
+    for result in results["benchmarks"]:
+        assert result["iterations"] == 2
+        assert 0 < result["min_ms"] <= result["median_ms"] <= result["max_ms"]
+
+    # Objects created while benchmarking are rolled back
+    assert not models.Room.objects.exists()
+    assert not models.User.objects.exists()
+
+
+@override_settings(DEBUG=True, ROOM_TELEPHONY_ENABLED=True)
+def test_commands_benchmark_telephony_enabled(tmp_path):
+    """The benchmark command should run, and clean up, with SIP dispatch rules."""
+    output = tmp_path / "results.json"
+
+    call_command("benchmark", *BENCHMARK_ARGS, "--output", str(output))
+
+    results = json.loads(output.read_text())
+    assert ("livekit_events.receive", {"event": "room_started"}) in [
+        (result["name"], result["params"]) for result in results["benchmarks"]
+    ]
+    assert not get_redis_connection("default").hlen(SIP_DISPATCH_RULES_REGISTRY_KEY)
+
+
+@override_settings(DEBUG=True)
+def test_commands_benchmark_compare(tmp_path):
+    """The benchmark command should compare results to a previous run."""
+    baseline = tmp_path / "baseline.json"
+    call_command("benchmark", *BENCHMARK_ARGS, "--output", str(baseline))
+
+    stdout = StringIO()
+    call_command(
+        "benchmark", *BENCHMARK_ARGS, "--compare", str(baseline), stdout=stdout
+    )
+
+    output = stdout.getvalue()
+    assert '"benchmarks"' in output
+    assert "lobby.request_entry" in output
+    assert "x the baseline median" in output
@@ -193,6 +193,14 @@ class Base(Configuration):
         "tmp/files", environ_name="FILE_UPLOAD_TMP_PATH", environ_prefix=None
     )
 
+    # Uploaded files from this size (in bytes) are verified by a Celery task,
+    # 0 verifies all files during the upload-ended request
+    FILE_UPLOAD_ASYNC_VERIFICATION_MIN_SIZE = values.PositiveIntegerValue(
+        default=0,
+        environ_name="FILE_UPLOAD_ASYNC_VERIFICATION_MIN_SIZE",
+        environ_prefix=None,
+    )
+
     FILE_UPLOAD_APPLY_RESTRICTIONS = values.BooleanValue(
         default=True, environ_name="FILE_UPLOAD_APPLY_RESTRICTIONS", environ_prefix=None
     )
@@ -320,6 +328,18 @@ class Base(Configuration):
                 "CLIENT_CLASS": "django_redis.client.DefaultClient",
             },
         },
+        # Signed LiveKit tokens are cheaper to compute again than to fetch from redis
+        "livekit_tokens": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "livekit_tokens",
+            "OPTIONS": {
+                "MAX_ENTRIES": values.PositiveIntegerValue(
+                    10000,
+                    environ_name="LIVEKIT_TOKEN_CACHE_MAX_ENTRIES",
+                    environ_prefix=None,
+                ),
+            },
+        },
     }
 
     REST_FRAMEWORK = {
@@ -599,6 +619,35 @@ class Base(Configuration):
         environ_name="OIDC_USERINFO_ESSENTIAL_CLAIMS",
         environ_prefix=None,
     )
+    # Claim listing the user's teams, pushed to the team membership cache on login
+    OIDC_USERINFO_TEAMS_FIELD = values.Value(
+        None, environ_name="OIDC_USERINFO_TEAMS_FIELD", environ_prefix=None
+    )
+
+    # Media authorization
+    # How long a user authorized to fetch a media is trusted, 0 disables caching
+    MEDIA_AUTH_CACHE_TIMEOUT = values.PositiveIntegerValue(
+        30, environ_name="MEDIA_AUTH_CACHE_TIMEOUT", environ_prefix=None
+    )
+
+    # Team membership
+    TEAM_MEMBERSHIP_PROVIDER_CLASS = values.Value(
+        "core.services.team_membership.NoTeamMembershipProvider",
+        environ_name="TEAM_MEMBERSHIP_PROVIDER_CLASS",
+        environ_prefix=None,
+    )
+    # How long teams fetched from the provider are cached per user, in seconds
+    TEAM_MEMBERSHIP_CACHE_TIMEOUT = values.PositiveIntegerValue(
+        300, environ_name="TEAM_MEMBERSHIP_CACHE_TIMEOUT", environ_prefix=None
+    )
+    # How long teams pushed by an OIDC login or a directory sync are trusted, in
+    # seconds. Defaults to the session duration, so that teams pushed at login
+    # last as long as the session.
+    TEAM_MEMBERSHIP_PUSHED_CACHE_TIMEOUT = values.PositiveIntegerValue(
+        60 * 60 * 12,
+        environ_name="TEAM_MEMBERSHIP_PUSHED_CACHE_TIMEOUT",
+        environ_prefix=None,
+    )
 
     # OIDC Resource Server Backend
     OIDC_RS_BACKEND_CLASS = "core.external_api.authentication.ResourceServerBackend"
@@ -692,10 +741,71 @@ class Base(Configuration):
     LIVEKIT_VERIFY_SSL = values.BooleanValue(
         True, environ_name="LIVEKIT_VERIFY_SSL", environ_prefix=None
     )
+    LIVEKIT_CLIENT_MAX_CONNECTIONS = values.PositiveIntegerValue(
+        100, environ_name="LIVEKIT_CLIENT_MAX_CONNECTIONS", environ_prefix=None
+    )
+    LIVEKIT_CLIENT_KEEPALIVE_TIMEOUT = values.PositiveIntegerValue(
+        30, environ_name="LIVEKIT_CLIENT_KEEPALIVE_TIMEOUT", environ_prefix=None
+    )
+    # Seconds a request waits for a LiveKit API call before failing it
+    LIVEKIT_API_TIMEOUT = values.PositiveIntegerValue(
+        30, environ_name="LIVEKIT_API_TIMEOUT", environ_prefix=None
+    )
+    # How long a room known to be running is trusted, 0 disables caching
+    ROOM_LIVENESS_CACHE_TIMEOUT = values.PositiveIntegerValue(
+        300, environ_name="ROOM_LIVENESS_CACHE_TIMEOUT", environ_prefix=None
+    )
+    # How long a participant known to be connected is trusted, 0 disables caching.
+    # Presence backs authorization checks, so a participant who left through a
+    # lost or delayed webhook keeps passing them for up to this long.
+    ROOM_PRESENCE_CACHE_TIMEOUT = values.PositiveIntegerValue(
+        30, environ_name="ROOM_PRESENCE_CACHE_TIMEOUT", environ_prefix=None
+    )
     # Regex to filter webhook events by room name. Only matching events are processed.
     LIVEKIT_WEBHOOK_EVENTS_FILTER_REGEX = values.Value(
         None, environ_name="LIVEKIT_WEBHOOK_EVENTS_FILTER_REGEX", environ_prefix=None
     )
+    # Acknowledge webhooks once stored, and handle them in a Celery worker
+    LIVEKIT_WEBHOOK_ASYNC_PROCESSING_ENABLED = values.BooleanValue(
+        False,
+        environ_name="LIVEKIT_WEBHOOK_ASYNC_PROCESSING_ENABLED",
+        environ_prefix=None,
+    )
+    LIVEKIT_WEBHOOK_PROCESSING_LOCK_TIMEOUT = values.PositiveIntegerValue(
+        300,
+        environ_name="LIVEKIT_WEBHOOK_PROCESSING_LOCK_TIMEOUT",
+        environ_prefix=None,
+    )
+    # Failed webhook events are handled again after a delay doubling each attempt
+    LIVEKIT_WEBHOOK_PROCESSING_MAX_ATTEMPTS = values.PositiveIntegerValue(
+        5,
+        environ_name="LIVEKIT_WEBHOOK_PROCESSING_MAX_ATTEMPTS",
+        environ_prefix=None,
+    )
+    LIVEKIT_WEBHOOK_PROCESSING_RETRY_DELAY = values.PositiveIntegerValue(
+        10,
+        environ_name="LIVEKIT_WEBHOOK_PROCESSING_RETRY_DELAY",
+        environ_prefix=None,
+    )
+    # Processed webhook events older than this are deleted by clean_livekit_webhook_events
+    LIVEKIT_WEBHOOK_EVENTS_RETENTION_DAYS = values.PositiveIntegerValue(
+        7,
+        environ_name="LIVEKIT_WEBHOOK_EVENTS_RETENTION_DAYS",
+        environ_prefix=None,
+    )
+    # How long an identical access token is reused, 0 disables it
+    LIVEKIT_TOKEN_CACHE_TIMEOUT = values.PositiveIntegerValue(
+        60, environ_name="LIVEKIT_TOKEN_CACHE_TIMEOUT", environ_prefix=None
+    )
+    LIVEKIT_TOKEN_BULK_MAX_SIZE = values.PositiveIntegerValue(
+        500, environ_name="LIVEKIT_TOKEN_BULK_MAX_SIZE", environ_prefix=None
+    )
+    # Drop webhook events already received within this window, 0 disables it
+    LIVEKIT_WEBHOOK_DEDUPLICATION_WINDOW = values.PositiveIntegerValue(
+        300,
+        environ_name="LIVEKIT_WEBHOOK_DEDUPLICATION_WINDOW",
+        environ_prefix=None,
+    )
     RESOURCE_DEFAULT_ACCESS_LEVEL = values.Value(
         "public", environ_name="RESOURCE_DEFAULT_ACCESS_LEVEL", environ_prefix=None
     )
@@ -708,6 +818,16 @@ class Base(Configuration):
         environ_name="PARTICIPANT_FORBIDDEN_PERMISSION_FIELDS",
         environ_prefix=None,
     )
+    PARTICIPANTS_MANAGEMENT_BULK_MAX_SIZE = values.PositiveIntegerValue(
+        1000,
+        environ_name="PARTICIPANTS_MANAGEMENT_BULK_MAX_SIZE",
+        environ_prefix=None,
+    )
+    PARTICIPANTS_MANAGEMENT_BULK_CONCURRENCY = values.PositiveIntegerValue(
+        20,
+        environ_name="PARTICIPANTS_MANAGEMENT_BULK_CONCURRENCY",
+        environ_prefix=None,
+    )
     AUTHENTICATED_PARTICIPANTS_CAN_EDIT_DISPLAY_NAME = values.BooleanValue(
         True,
         environ_name="AUTHENTICATED_PARTICIPANTS_CAN_EDIT_DISPLAY_NAME",
@@ -880,6 +1000,17 @@ class Base(Configuration):
         environ_name="LOBBY_COOKIE_NAME",
         environ_prefix=None,
     )
+    LOBBY_LONG_POLL_ENABLED = values.BooleanValue(
+        False, environ_name="LOBBY_LONG_POLL_ENABLED", environ_prefix=None
+    )
+    LOBBY_LONG_POLL_TIMEOUT = values.PositiveIntegerValue(
+        25, environ_name="LOBBY_LONG_POLL_TIMEOUT", environ_prefix=None
+    )
+    # Each waiting lobby entry request holds a backend worker: keep this well below
+    # the total number of workers, unless they are asynchronous (e.g. gevent).
+    LOBBY_LONG_POLL_MAX_WAITERS = values.PositiveIntegerValue(
+        2, environ_name="LOBBY_LONG_POLL_MAX_WAITERS", environ_prefix=None
+    )
 
     # Calendar integrations
     ROOM_CREATION_CALLBACK_CACHE_TIMEOUT = values.PositiveIntegerValue(
@@ -1371,6 +1502,18 @@ class Production(Base):
                 "CLIENT_CLASS": "django_redis.client.DefaultClient",
             },
         },
+        # Signed LiveKit tokens are cheaper to compute again than to fetch from redis
+        "livekit_tokens": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "livekit_tokens",
+            "OPTIONS": {
+                "MAX_ENTRIES": values.PositiveIntegerValue(
+                    10000,
+                    environ_name="LIVEKIT_TOKEN_CACHE_MAX_ENTRIES",
+                    environ_prefix=None,
+                ),
+            },
+        },
     }
 
 
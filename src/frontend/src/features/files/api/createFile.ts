@@ -4,6 +4,21 @@ import { ApiFileItem } from '@/features/files/api/types.ts'
 import { keys } from '@/api/queryKeys.ts'
 import { queryClient } from '@/api/queryClient.ts'
 
+const UPLOAD_VERIFICATION_POLLING_INTERVAL = 1000
+const UPLOAD_VERIFICATION_TIMEOUT = 120000 // 2 minutes
+
+/**
+ * Raised when the server refused an uploaded file, `reason` tells why,
+ * e.g. `file_size_exceeded` or `file_type_not_allowed`.
+ */
+export class FileRejectedError extends Error {
+  reason: string | null
+  constructor(reason: string | null) {
+    super(`The uploaded file was rejected: ${reason ?? 'unknown reason'}`)
+    this.reason = reason
+  }
+}
+
 /**
  * Upload a file, using XHR so we can report on progress through a handler.
  *
@@ -48,6 +63,36 @@ export const uploadFile = (
     xhr.send(file)
   })
 
+/**
+ * Poll a file until the server is done verifying its upload.
+ * Large files are verified asynchronously, and stay analyzing meanwhile.
+ * Gives up after UPLOAD_VERIFICATION_TIMEOUT, in case the verification is lost.
+ *
+ * @param file The file returned when its upload ended.
+ * @throws {FileRejectedError} If the server refused the file.
+ */
+const waitForVerification = async (
+  file: ApiFileItem
+): Promise<ApiFileItem> => {
+  const deadline = Date.now() + UPLOAD_VERIFICATION_TIMEOUT
+  let verifiedFile = file
+  while (verifiedFile.upload_state === 'analyzing') {
+    if (Date.now() >= deadline) {
+      throw new Error(
+        `The verification of file ${file.id} did not end in time.`
+      )
+    }
+    await new Promise((resolve) =>
+      setTimeout(resolve, UPLOAD_VERIFICATION_POLLING_INTERVAL)
+    )
+    verifiedFile = await fetchApi<ApiFileItem>(`/files/${file.id}/`)
+  }
+  if (verifiedFile.upload_state === 'rejected') {
+    throw new FileRejectedError(verifiedFile.rejection_reason)
+  }
+  return verifiedFile
+}
+
 /**
  * Asynchronously creates a new file and uploads it to the server.
  *
@@ -72,11 +117,10 @@ export const createFile = async ({
   }
   const policy = res.policy
   await uploadFile(policy, file, onProgress)
-  const createdFile = await fetchApi<ApiFileItem>(
-    `/files/${res.id}/upload-ended/`,
-    {
+  const createdFile = await waitForVerification(
+    await fetchApi<ApiFileItem>(`/files/${res.id}/upload-ended/`, {
       method: 'POST',
-    }
+    })
   )
 
   // We invalidate the files query to make sure the new file is immediately available.
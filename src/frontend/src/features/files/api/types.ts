@@ -5,7 +5,7 @@ export type ApiFileCreator = {
 }
 
 export type ApiFileType = 'background_image'
-export type ApiFileUploadState = 'pending' | 'analyzing' | 'ready'
+export type ApiFileUploadState = 'pending' | 'analyzing' | 'ready' | 'rejected'
 
 export type ApiFileItem = {
   id: string // UUID
@@ -21,6 +21,7 @@ export type ApiFileItem = {
   mimetype: string // e.g. "image/png"
   size: number // file size in bytes
   description: string | null
+  rejection_reason: string | null
 } & (
   | {
       upload_state: 'ready'
@@ -31,4 +32,12 @@ export type ApiFileItem = {
       policy: string
       url: null
     }
+  | {
+      upload_state: 'analyzing'
+      url: null
+    }
+  | {
+      upload_state: 'rejected'
+      url: null
+    }
 )
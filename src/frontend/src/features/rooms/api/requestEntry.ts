@@ -4,6 +4,9 @@ import type { ApiLiveKit } from '@/features/rooms/api/ApiRoom'
 export interface RequestEntryParams {
   roomId: string
   username?: string
+  // Ask the backend to hold the request until the host decides, when it
+  // supports long polling. It answers at once otherwise.
+  wait?: boolean
 }
 
 export enum ApiLobbyStatus {
@@ -22,11 +25,13 @@ export interface ApiRequestEntry {
 export const requestEntry = async ({
   roomId,
   username = '',
+  wait = false,
 }: RequestEntryParams) => {
   return fetchApi<ApiRequestEntry>(`/rooms/${roomId}/request-entry/`, {
     method: 'POST',
     body: JSON.stringify({
       username,
+      wait,
     }),
   })
 }
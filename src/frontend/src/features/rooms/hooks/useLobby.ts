@@ -39,9 +39,12 @@ export const useLobby = ({
   const { data: waitingData } = useQuery({
     queryKey: [keys.requestEntry, roomId],
     queryFn: async () => {
+      // While waiting, each request may be held until the host decides, the
+      // next one is then sent on the following poll tick.
       const response = await requestEntry({
         roomId,
         username,
+        wait: true,
       })
       if (response.status === ApiLobbyStatus.ACCEPTED) {
         clearWaitingTimeout()
@@ -19,12 +19,19 @@ from summary.core.analytics import MetadataManager, get_analytics
 from summary.core.config import get_settings
 from summary.core.docs_service import create_document_in_lasuite_docs
 from summary.core.file_service import (
+    STREAMING_AUDIO_CONTENT_TYPE,
     CorruptedAudioFile,
     FileService,
     FileServiceException,
     TranscribeError,
+    encode_multipart_stream,
+)
+from summary.core.llm_service import (
+    LLMCallExecutor,
+    LLMException,
+    LLMObservability,
+    LLMService,
 )
-from summary.core.llm_service import LLMException, LLMObservability, LLMService
 from summary.core.locales import get_locale
 from summary.core.models import (
     PushToDocsBaseConfig,
@@ -35,6 +42,7 @@ from summary.core.models import (
 from summary.core.prompt import (
     FORMAT_NEXT_STEPS,
     FORMAT_PLAN,
+    PROMPT_SYSTEM_CHUNK,
     PROMPT_SYSTEM_CLEANING,
     PROMPT_SYSTEM_NEXT_STEP,
     PROMPT_SYSTEM_PART,
@@ -50,6 +58,7 @@ from summary.core.shared_models import (
     WhisperXResponse,
     webhook_payload_adapter,
 )
+from summary.core.transcript_chunker import estimate_tokens, split_transcript
 from summary.core.transcript_formatter import TranscriptFormatter
 from summary.core.user_assign import resolve_speaker_identities
 from summary.core.webhook_service import (
@@ -97,16 +106,25 @@ def transcribe_audio(
 
     Downloads the audio from a cloud storage URL, sends it to
     WhisperX for transcription, and tracks metadata throughout the process.
+    With streaming enabled, the audio is extracted from the cloud storage URL
+    and sent to WhisperX on the fly, instead of being downloaded first.
 
     Returns the transcription object, or None if the file could not be retrieved.
     """
     logger.info("Initiating WhisperX client")
 
     # Transcription
-    try:
-        with file_service.prepare_audio_file(
+    if settings.transcribe_streaming_enabled:
+        prepared_audio_file = file_service.stream_audio_file(
+            cloud_storage_url=cloud_storage_url,
+        )
+    else:
+        prepared_audio_file = file_service.prepare_audio_file(
             cloud_storage_url=cloud_storage_url,
-        ) as (audio_file, metadata):
+        )
+
+    try:
+        with prepared_audio_file as (audio_file, metadata):
             metadata_manager.track(task_id, {"audio_length": metadata["duration"]})
 
             # Compute language parameter
@@ -139,18 +157,27 @@ def transcribe_audio(
             # At the same time "diarized_json" should be the value
             # provided to STT endpoints in our context.
             url = urljoin(base_url.rstrip("/") + "/", "audio/transcriptions")
+            form = {
+                "model": settings.whisperx_asr_model,
+                "language": language,
+                "timestamp_granularities": ["word", "segment"],
+                "response_format": "diarized_json",
+            }
+            headers = {"Authorization": f"Bearer {api_key}"}
+            if settings.transcribe_streaming_enabled:
+                body, headers["Content-Type"] = encode_multipart_stream(
+                    form, "file", audio_file, STREAMING_AUDIO_CONTENT_TYPE
+                )
+                request_kwargs = {"data": body}
+            else:
+                request_kwargs = {"data": form, "files": {"file": audio_file}}
+
             res = requests.post(
                 url,
-                data={
-                    "model": settings.whisperx_asr_model,
-                    "language": language,
-                    "timestamp_granularities": ["word", "segment"],
-                    "response_format": "diarized_json",
-                },
-                files={"file": audio_file},
-                headers={"Authorization": f"Bearer {api_key}"},
+                headers=headers,
                 # Mimic OpenAI's timeout settings
                 timeout=(60, 10 * 60),
+                **request_kwargs,
             )
             if res.status_code == 400:
                 logger.info(
@@ -303,8 +330,40 @@ def format_actions(llm_output: dict) -> str:
     return ""
 
 
+# Levels of condensed notes produced at most for very long transcripts
+MAX_CONDENSE_LEVELS = 3
+
+
+def condense_transcript(executor: LLMCallExecutor, transcript: str) -> str:
+    """Condense a transcript exceeding the LLM token budget, hierarchically.
+
+    The transcript is split into chunks on speaker turns, and chunks are
+    condensed into notes independently. Notes which still exceed the budget
+    are split and condensed again, up to MAX_CONDENSE_LEVELS times.
+    """
+    max_tokens = settings.llm_transcript_max_tokens
+
+    for level in range(MAX_CONDENSE_LEVELS):
+        if estimate_tokens(transcript) <= max_tokens:
+            break
+
+        chunks = split_transcript(transcript, max_tokens)
+        logger.info("Condensing %s chunks (level %s)", len(chunks), level + 1)
+        chunk_futures = [
+            executor.submit(PROMPT_SYSTEM_CHUNK, chunk, name="chunk")
+            for chunk in chunks
+        ]
+        transcript = "\n\n".join(future.result() for future in chunk_futures)
+
+    return transcript
+
+
 def summarize_transcription_internals(
-    *, distinct_id: str, transcript: str, session_id: str
+    *,
+    distinct_id: str,
+    transcript: str,
+    session_id: str,
+    tenant_id: str | None = None,
 ) -> str:
     """Generate a summary from the provided transcription text.
 
@@ -312,6 +371,16 @@ def summarize_transcription_internals(
     2. Breaks the transcription into parts and summarizes each part.
     3. Cleans up the combined summary
     4. Generates next steps.
+
+    Independent LLM calls run concurrently, within the concurrency cap of the
+    tenant: the TL;DR, the plan and the next steps are requested together, and
+    parts are summarized in parallel once the plan is known. Results are
+    assembled in the plan order, so the summary does not depend on which call
+    completes first. Transcripts exceeding the LLM token budget are condensed
+    first, see condense_transcript.
+
+    The hits and misses of the LLM response cache are tracked in the metadata of
+    the task whose ID is the session ID, and exported with its analytics event.
     """
     logger.info(
         "Starting summarization task | Owner: %s",
@@ -334,48 +403,62 @@ def summarize_transcription_internals(
     )
     llm_service = LLMService(llm_observability=llm_observability)
 
-    tldr = llm_service.call(PROMPT_SYSTEM_TLDR, transcript, name="tldr")
+    with LLMCallExecutor(llm_service, tenant_id=tenant_id) as executor:
+        transcript = condense_transcript(executor, transcript)
 
-    logger.info("TLDR generated")
-
-    parts = llm_service.call(
-        PROMPT_SYSTEM_PLAN, transcript, name="parts", response_format=FORMAT_PLAN
-    )
-    logger.info("Plan generated")
-
-    res = json.loads(parts)
-    parts = res.get("titles", [])
-    logger.info("Parts to summarize: %s", parts)
-    parts_summarized = []
-    for part in parts:
-        prompt_user_part = PROMPT_USER_PART.format(part=part, transcript=transcript)
-        logger.info("Summarizing part: %s", part)
-        parts_summarized.append(
-            llm_service.call(PROMPT_SYSTEM_PART, prompt_user_part, name="part")
+        tldr_future = executor.submit(PROMPT_SYSTEM_TLDR, transcript, name="tldr")
+        parts_future = executor.submit(
+            PROMPT_SYSTEM_PLAN, transcript, name="parts", response_format=FORMAT_PLAN
         )
+        next_steps_future = executor.submit(
+            PROMPT_SYSTEM_NEXT_STEP,
+            transcript,
+            name="next-steps",
+            response_format=FORMAT_NEXT_STEPS,
+        )
+
+        res = json.loads(parts_future.result())
+        logger.info("Plan generated")
 
-    logger.info("Parts summarized")
+        parts = res.get("titles", [])
+        logger.info("Parts to summarize: %s", parts)
+        part_futures = [
+            executor.submit(
+                PROMPT_SYSTEM_PART,
+                PROMPT_USER_PART.format(part=part, transcript=transcript),
+                name="part",
+            )
+            for part in parts
+        ]
+        parts_summarized = [future.result() for future in part_futures]
 
-    raw_summary = "\n\n".join(parts_summarized)
+        logger.info("Parts summarized")
 
-    next_steps = llm_service.call(
-        PROMPT_SYSTEM_NEXT_STEP,
-        transcript,
-        name="next-steps",
-        response_format=FORMAT_NEXT_STEPS,
-    )
+        raw_summary = "\n\n".join(parts_summarized)
 
-    next_steps = format_actions(json.loads(next_steps))
+        cleaned_summary_future = executor.submit(
+            PROMPT_SYSTEM_CLEANING, raw_summary, name="cleaning"
+        )
 
-    logger.info("Next steps generated")
+        tldr = tldr_future.result()
+        logger.info("TLDR generated")
 
-    cleaned_summary = llm_service.call(
-        PROMPT_SYSTEM_CLEANING, raw_summary, name="cleaning"
-    )
-    logger.info("Summary cleaned")
+        next_steps = format_actions(json.loads(next_steps_future.result()))
+        logger.info("Next steps generated")
+
+        cleaned_summary = cleaned_summary_future.result()
+        logger.info("Summary cleaned")
 
     summary = tldr + "\n\n" + cleaned_summary + "\n\n" + next_steps
 
+    cache_stats = llm_service.cache_stats
+    logger.info(
+        "LLM response cache: %s hits, %s misses",
+        cache_stats["llm_cache_hits"],
+        cache_stats["llm_cache_misses"],
+    )
+    metadata_manager.track(session_id, cache_stats)
+
     llm_observability.flush()
     logger.debug("LLM observability flushed")
 
@@ -633,6 +716,7 @@ def summarize_v2_task(
         distinct_id=payload.user_sub,
         transcript=payload.content,
         session_id=self.request.id,
+        tenant_id=payload.tenant_id,
     )
     job_id = self.request.id
     file_service.store_summary(summary=summary, job_id=job_id)
@@ -39,6 +39,13 @@ class AuthorizedTenant(BaseModel):
         " and summaries to docs for this tenant.",
         default=False,
     )
+    llm_max_concurrency: Optional[int] = Field(
+        title="LLM max concurrency",
+        description="Maximum number of concurrent LLM calls for this tenant,"
+        " defaults to the llm_max_concurrency setting.",
+        default=None,
+        ge=1,
+    )
 
 
 class Settings(BaseSettings):
@@ -56,6 +63,12 @@ class Settings(BaseSettings):
 
     # Audio recordings
     recording_max_duration: Optional[int] = None
+    # Stream recordings from the storage through ffmpeg to WhisperX, instead of
+    # downloading them to temporary files first
+    transcribe_streaming_enabled: bool = False
+    # Cache of recordings media info by object ETag, in seconds, 0 disables it
+    media_info_cache_redis_url: str = "redis://redis/0"
+    media_info_cache_ttl: int = Field(default=24 * 60 * 60, ge=0)
     codec_to_extension: dict[str, str] = Field(
         default_factory=lambda: {
             "aac": ".m4a",
@@ -97,6 +110,15 @@ class Settings(BaseSettings):
     llm_base_url: str
     llm_api_key: SecretStr
     llm_model: str
+    # Maximum number of concurrent LLM calls per tenant and worker process
+    llm_max_concurrency: int = Field(default=4, ge=1)
+    # Transcripts longer than this estimated number of tokens are condensed
+    # chunk by chunk before being summarized
+    llm_transcript_max_tokens: int = Field(default=24000, ge=1)
+    llm_chars_per_token: float = Field(default=4.0, gt=0)
+    # Cache of LLM responses, in seconds, 0 disables it
+    llm_cache_redis_url: str = "redis://redis/0"
+    llm_cache_ttl: int = Field(default=24 * 60 * 60, ge=0)
 
     # Transcription processing
     hallucination_patterns: List[str] = ["Vap'n'Roll Thierry"]
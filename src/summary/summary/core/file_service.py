@@ -6,12 +6,15 @@ import logging
 import os
 import subprocess
 import tempfile
+import uuid
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import timedelta
 from pathlib import Path
+from typing import Any, Iterator, Mapping
 from urllib.parse import urlparse
 
+import redis
 import requests
 from minio import Minio
 
@@ -47,36 +50,41 @@ class CorruptedAudioFile(TranscribeError):
     error_code = "corrupted_audio_file"
 
 
-def _get_duration_from_packets(local_path: Path) -> float:
-    """Estimate duration from audio packet timestamps."""
-    # Run ffprobe to inspect the first audio stream in the file.
+def probe_media(local_path: Path | str) -> dict[str, Any]:
+    """Inspect the streams, the format and the last packets of a media at once.
+
+    A single ffprobe run returns everything get_media_info needs, including the
+    packets at the end of the media, to estimate its duration when the container
+    does not store it.
+    """
+    # Run ffprobe on the file.
     # ffprobe is part of FFmpeg and can output media metadata as JSON.
     #
     # ruff: noqa: S607 Hard to know the ffprobe path, it depends on the deployment
+    # ruff: noqa: S603 Input can be trusted
     result = subprocess.run(
         [
             "ffprobe",
-            # Suppress normal ffprobe logging output.
             "-v",
-            "quiet",
+            "error",
             # Ask ffprobe to return JSON.
             "-print_format",
             "json",
-            # Select only the first audio stream.
-            "-select_streams",
-            "a:0",
-            # Include packet-level information in the output.
-            "-show_packets",
-            # Only include each packet's start timestamp and duration.
+            # Include the type and codec of each stream, the container duration,
+            # and each packet's stream, start timestamp and duration.
             "-show_entries",
-            "packet=pts_time,duration_time",
-            # Read only the last ~10 packets 99999999 is to go to the end of the file
+            (
+                "stream=index,codec_type,codec_name:format=duration"
+                ":packet=stream_index,pts_time,duration_time"
+            ),
+            # Read only the last ~20 packets of all streams, 99999999 is to go
+            # to the end of the file
             "-read_intervals",
-            "99999999%+#10",
+            "99999999%+#20",
             # Skip non-reference frames for speed
             "-skip_frame",
             "noref",
-            local_path,
+            str(local_path),
         ],
         check=False,
         stdout=subprocess.PIPE,
@@ -84,44 +92,41 @@ def _get_duration_from_packets(local_path: Path) -> float:
         text=True,  # Decode stdout/stderr as strings instead of bytes.
     )
 
-    data = json.loads(result.stdout)
-    # Build a list containing the end time of each audio packet.
-    #
-    # For each packet:
-    #   end time = packet start time + packet duration
-    #
-    # pts_time is the packet presentation timestamp, meaning when that packet
-    # starts during playback.
-    #
-    # duration_time may be missing, so it defaults to 0.
-    packet_ends = [
-        float(packet["pts_time"]) + float(packet.get("duration_time", 0))
-        for packet in data.get("packets", [])
-        if "pts_time" in packet
-    ]
-
-    # If no usable packets were found, the duration cannot be estimated.
-    if not packet_ends:
-        raise ValueError("Unable to determine recording duration.")
+    return json.loads(result.stdout)
 
-    # The recording duration is estimated as the latest packet end time.
-    return max(packet_ends)
 
+def probe_audio_packets(local_path: Path | str) -> list[dict[str, Any]]:
+    """Return the last packets of the first audio stream of a media.
 
-def get_media_duration_seconds(local_path: Path) -> float:
-    """Get media (audio or video) file duration in seconds."""
+    The packets returned by probe_media are the last ones of all streams, which
+    may all belong to a video stream on recordings with sparse audio.
+    """
     # ruff: noqa: S607 Hard to know the ffprobe path, it depends on the deployment
+    # ruff: noqa: S603 Input can be trusted
     result = subprocess.run(
         [
             "ffprobe",
-            # Suppress normal ffprobe logging output.
             "-v",
-            "quiet",
+            "error",
             # Ask ffprobe to return JSON.
             "-print_format",
             "json",
-            "-show_format",
-            local_path,
+            # Select only the first audio stream.
+            "-select_streams",
+            "a:0",
+            # Include packet-level information in the output.
+            "-show_packets",
+            # Only include each packet's stream, start timestamp and duration.
+            "-show_entries",
+            "packet=stream_index,pts_time,duration_time",
+            # Read only the last ~10 packets, 99999999 is to go to the end of
+            # the file
+            "-read_intervals",
+            "99999999%+#10",
+            # Skip non-reference frames for speed
+            "-skip_frame",
+            "noref",
+            str(local_path),
         ],
         check=False,
         stdout=subprocess.PIPE,
@@ -129,20 +134,60 @@ def get_media_duration_seconds(local_path: Path) -> float:
         text=True,
     )
 
-    data = json.loads(result.stdout)
-    duration_value = data.get("format", {}).get("duration")
+    return json.loads(result.stdout).get("packets", [])
+
+
+def _get_packet_ends(
+    packets: list[dict[str, Any]], stream_index: int | None
+) -> list[float]:
+    """List the end time of each packet of a stream."""
+    # For each packet:
+    #   end time = packet start time + packet duration
+    #
+    # pts_time is the packet presentation timestamp, meaning when that packet
+    # starts during playback.
+    #
+    # duration_time may be missing, so it defaults to 0.
+    return [
+        float(packet["pts_time"]) + float(packet.get("duration_time", 0))
+        for packet in packets
+        if packet.get("stream_index") == stream_index and "pts_time" in packet
+    ]
+
+
+def get_media_duration_seconds(
+    local_path: Path | str, probe: dict[str, Any], audio_stream_index: int | None
+) -> float:
+    """Get media (audio or video) file duration in seconds from its probe.
+
+    When the container does not store its duration, it is estimated from the
+    last audio packets of the probe, or of an audio-only probe if the last
+    packets of the media all belong to other streams.
+    """
+    duration_value = probe.get("format", {}).get("duration")
 
     if duration_value not in (None, "N/A"):
         return float(duration_value)
 
-    return _get_duration_from_packets(local_path)
+    packet_ends = _get_packet_ends(probe.get("packets", []), audio_stream_index)
+    if not packet_ends:
+        packet_ends = _get_packet_ends(
+            probe_audio_packets(local_path), audio_stream_index
+        )
+
+    # If no usable packets were found, the duration cannot be estimated.
+    if not packet_ends:
+        raise ValueError("Unable to determine recording duration.")
+
+    # The recording duration is estimated as the latest packet end time.
+    return max(packet_ends)
 
 
 @dataclass(frozen=True)
 class MediaInfo:
     """Object containing information about the media file."""
 
-    path: Path
+    path: Path | str
     has_audio: bool
     has_video: bool
     audio_duration_seconds: float | None
@@ -150,7 +195,7 @@ class MediaInfo:
     has_bad_stream: bool = False
 
 
-def get_media_info(local_path: Path) -> MediaInfo:
+def get_media_info(local_path: Path | str) -> MediaInfo:
     """Determines if a media file contains an audio and / or a video stream.
 
     This function checks if the given media file contains at least one
@@ -158,52 +203,83 @@ def get_media_info(local_path: Path) -> MediaInfo:
     its metadata to detect the presence of audio / video content.
     If appropriate, it also retrieves the codec name for the audio stream
     and its duration.
+    The media can also be given by URL, ffprobe then only reads the ranges
+    of the media it needs.
     """
-    # ruff: noqa: S607 Hard to know the ffprobe path, it depends on the deployment
-    # ruff: noqa: S603 Input can be trusted
-    result = subprocess.run(
-        [
-            "ffprobe",
-            "-v",
-            "error",
-            "-show_entries",
-            "stream=codec_type,codec_name",
-            "-print_format",
-            "json",
-            str(local_path),
-        ],
-        check=False,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-    data = json.loads(result.stdout)
+    probe = probe_media(local_path)
 
-    streams = data.get("streams", [])
+    streams = probe.get("streams", [])
     has_audio = any(el.get("codec_type") == "audio" for el in streams)
     has_video = any(el.get("codec_type") == "video" for el in streams)
     has_bad_stream = any(el.get("codec_type", None) is None for el in streams)
-    audio_codec_name = next(
-        (
-            stream.get("codec_name")
-            for stream in streams
-            if stream.get("codec_type") == "audio"
-        ),
-        None,
+    audio_stream = next(
+        (stream for stream in streams if stream.get("codec_type") == "audio"),
+        {},
     )
     audio_duration_seconds = None
     if has_audio:
-        audio_duration_seconds = get_media_duration_seconds(local_path)
+        audio_duration_seconds = get_media_duration_seconds(
+            local_path, probe, audio_stream.get("index")
+        )
     return MediaInfo(
         path=local_path,
         has_audio=has_audio,
         has_video=has_video,
         audio_duration_seconds=audio_duration_seconds,
-        audio_codec_name=audio_codec_name,
+        audio_codec_name=audio_stream.get("codec_name"),
         has_bad_stream=has_bad_stream,
     )
 
 
+MEDIA_INFO_CACHE_KEY_PREFIX = "media_info:"
+
+
+class MediaInfoCache:
+    """Store the media info of objects in Redis, keyed on their ETag.
+
+    An ETag identifies the content of an object, so retried jobs on the same
+    object reuse its media info for media_info_cache_ttl seconds instead of
+    probing it again. The cache is best effort: Redis errors are logged and
+    handled as misses.
+    """
+
+    def __init__(self, redis_client=None):
+        """Initialize the cache, with the configured Redis by default."""
+        self._redis = redis_client or redis.from_url(
+            settings.media_info_cache_redis_url
+        )
+
+    @staticmethod
+    def _get_key(etag: str) -> str:
+        """Return the cache key of an object ETag."""
+        return MEDIA_INFO_CACHE_KEY_PREFIX + etag.strip('"')
+
+    def get(self, etag: str, path: Path | str) -> MediaInfo | None:
+        """Return the cached media info of an object, for its file at path."""
+        try:
+            cached = self._redis.get(self._get_key(etag))
+        except redis.RedisError:
+            logger.exception("Failed to read the media info cache")
+            return None
+
+        if cached is None:
+            return None
+        return MediaInfo(path=path, **json.loads(cached))
+
+    def set(self, etag: str, media_info: MediaInfo) -> None:
+        """Cache the media info of an object."""
+        data = asdict(media_info)
+        del data["path"]
+        try:
+            self._redis.set(
+                self._get_key(etag),
+                json.dumps(data),
+                ex=settings.media_info_cache_ttl,
+            )
+        except redis.RedisError:
+            logger.exception("Failed to write the media info cache")
+
+
 def extract_audio_from_media(media_info: MediaInfo) -> Path:
     """Extracts the audio track from a video file and saves it as a separate audio file.
 
@@ -260,6 +336,137 @@ def extract_audio_from_media(media_info: MediaInfo) -> Path:
     return output_path
 
 
+# Speech is transcribed from mono audio sampled at 16 kHz, which a low bitrate
+# Opus stream carries without degrading the transcription
+STREAMING_AUDIO_FILENAME = "audio.ogg"
+STREAMING_AUDIO_CONTENT_TYPE = "audio/ogg"
+STREAMING_AUDIO_BITRATE = "32k"
+
+
+def stream_audio_from_media(media_url: str) -> "AudioStream":
+    """Start extracting the audio track of a media to a compressed stream.
+
+    ffmpeg reads the media from its URL, with range requests when the container
+    needs seeking, and writes the first audio track as Ogg Opus on its standard
+    output while it reads, so that the media is never staged on disk.
+    Errors are written to a temporary file, which cannot fill up and block
+    ffmpeg as an unread pipe would.
+    """
+    errors_file = tempfile.TemporaryFile()
+    # ruff: noqa: S607 Hard to know the ffmpeg path, it depends on the deployment
+    process = subprocess.Popen(
+        [
+            "ffmpeg",
+            "-v",
+            "error",
+            "-i",
+            media_url,
+            # Select only the first audio stream.
+            "-map",
+            "0:a:0",
+            "-ac",
+            "1",
+            "-ar",
+            "16000",
+            "-c:a",
+            "libopus",
+            "-b:a",
+            STREAMING_AUDIO_BITRATE,
+            "-f",
+            "ogg",
+            "pipe:1",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=errors_file,
+    )
+    return AudioStream(process, errors_file)
+
+
+class AudioStream:
+    """Read the audio stream written by an ffmpeg process, as a file.
+
+    Reaching the end of the stream waits for the process, and raises if the
+    extraction failed, so that a truncated stream is never sent for the whole
+    audio.
+    """
+
+    name = STREAMING_AUDIO_FILENAME
+
+    def __init__(self, process: subprocess.Popen, errors_file):
+        """Wrap the standard output of an ffmpeg process and its errors file."""
+        self._process = process
+        self._errors_file = errors_file
+
+    def read(self, size: int = -1) -> bytes:
+        """Read bytes of the audio stream."""
+        data = self._process.stdout.read(size)
+        if not data:
+            self._check_returncode()
+        return data
+
+    def _check_returncode(self) -> None:
+        """Raise if the ffmpeg process failed."""
+        if self._process.wait() == 0:
+            return
+
+        self._errors_file.seek(0)
+        logger.error(
+            "Audio extraction failed: %s",
+            self._errors_file.read().decode(errors="replace"),
+        )
+        raise RuntimeError("Failed to extract audio from file")
+
+    def close(self) -> None:
+        """Stop the ffmpeg process, if still running, and release its files."""
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        self._process.stdout.close()
+        self._errors_file.close()
+
+
+def encode_multipart_stream(
+    data: Mapping[str, Any],
+    name: str,
+    file,
+    content_type: str,
+    chunk_size: int = 64 * 1024,
+) -> tuple[Iterator[bytes], str]:
+    """Encode form fields and a file as a multipart body, read while it is sent.
+
+    requests reads files entirely in memory to encode them, this iterator only
+    holds one chunk of the file at a time. Posted as data, it is sent with the
+    chunked transfer encoding. List values are encoded as repeated fields, as
+    requests does.
+
+    Returns:
+        tuple: The body iterator, and the content type of the body
+    """
+    boundary = uuid.uuid4().hex
+
+    def iter_body():
+        for field, values in data.items():
+            if values is None:
+                continue
+            for value in values if isinstance(values, list) else [values]:
+                yield (
+                    f"--{boundary}\r\n"
+                    f'Content-Disposition: form-data; name="{field}"\r\n\r\n'
+                    f"{value}\r\n"
+                ).encode()
+
+        yield (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{name}"; filename="{file.name}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        while chunk := file.read(chunk_size):
+            yield chunk
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    return iter_body(), f"multipart/form-data; boundary={boundary}"
+
+
 class FileServiceException(Exception):
     """Base exception for file service operations."""
 
@@ -289,9 +496,46 @@ class FileService:
         self._stream_chunk_size = 32 * 1024
 
         self._max_duration_seconds = settings.recording_max_duration
+        self._media_info_cache = MediaInfoCache()
+
+    def _check_cloud_storage_url(self, cloud_storage_url: str) -> str | None:
+        """Check a cloud storage URL can be read, without downloading the file.
 
-    def _download_from_cloud_storage_url(self, cloud_storage_url: str) -> Path:
-        """Download file from a cloud storage URL to local temporary file."""
+        Returns:
+            str | None: The ETag of the object, if any
+        """
+        logger.info(
+            "Stream recording from URL | cloud_storage_url: %s",
+            cloud_storage_url,
+        )
+
+        if not cloud_storage_url:
+            logger.warning("Invalid cloud_storage_url '%s'", cloud_storage_url)
+            raise ValueError("Invalid cloud_storage_url")
+
+        try:
+            with requests.get(
+                cloud_storage_url,
+                headers={"Range": "bytes=0-0"},
+                stream=True,
+                timeout=(10, 30),
+            ) as response:
+                response.raise_for_status()
+                return response.headers.get("ETag")
+
+        except requests.RequestException as e:
+            raise FileServiceException(
+                "Unexpected error while reading object from cloud_storage_url."
+            ) from e
+
+    def _download_from_cloud_storage_url(
+        self, cloud_storage_url: str
+    ) -> tuple[Path, str | None]:
+        """Download file from a cloud storage URL to local temporary file.
+
+        Returns:
+            tuple: The local path of the file, and the ETag of the object, if any
+        """
         logger.info(
             "Download recording from URL | cloud_storage_url: %s",
             cloud_storage_url,
@@ -330,7 +574,7 @@ class FileService:
                         "Recording successfully downloaded from cloud_storage_url"
                     )
                     logger.debug("Recording local file path: %s", local_path)
-                    return local_path
+                    return local_path, response.headers.get("ETag")
 
         except requests.RequestException as e:
             raise FileServiceException(
@@ -354,6 +598,20 @@ class FileService:
             logger.error(error_msg)
             raise MediaDurationTooLongError(error_msg)
 
+    def _get_media_info(self, path: Path | str, etag: str | None) -> MediaInfo:
+        """Get the media info of an object, from the cache when already probed."""
+        if etag is None or not settings.media_info_cache_ttl:
+            return get_media_info(path)
+
+        media_info = self._media_info_cache.get(etag, path)
+        if media_info is not None:
+            logger.info("Media info served from cache for ETag %s", etag)
+            return media_info
+
+        media_info = get_media_info(path)
+        self._media_info_cache.set(etag, media_info)
+        return media_info
+
     def read_cloud_storage_json(self, cloud_storage_url: str) -> dict:
         """Read and parse a JSON file from a url."""
         logger.info("Reading JSON: %s", cloud_storage_url)
@@ -377,9 +635,11 @@ class FileService:
         file_handle = None
 
         try:
-            downloaded_path = self._download_from_cloud_storage_url(cloud_storage_url)
+            downloaded_path, etag = self._download_from_cloud_storage_url(
+                cloud_storage_url
+            )
 
-            media_info = get_media_info(downloaded_path)
+            media_info = self._get_media_info(downloaded_path, etag)
 
             if not media_info.has_audio:
                 raise NoAudioInFileError("Media file does not contain audio")
@@ -415,6 +675,34 @@ class FileService:
                 except OSError as e:
                     logger.warning("Failed to remove temporary file %s: %s", path, e)
 
+    @contextmanager
+    def stream_audio_file(
+        self,
+        cloud_storage_url: str,
+    ):
+        """Stream the audio of a file for processing, without staging it on disk.
+
+        Probes the file from its URL and validates its duration, then yields the
+        audio track extracted and compressed on the fly by a single ffmpeg
+        process, with metadata. Disk and memory usage stay bounded whatever the
+        size of the file. The ffmpeg process is stopped when the context exits.
+        """
+        etag = self._check_cloud_storage_url(cloud_storage_url)
+
+        media_info = self._get_media_info(cloud_storage_url, etag)
+
+        if not media_info.has_audio:
+            raise NoAudioInFileError("Media file does not contain audio")
+        self._validate_duration(media_info.audio_duration_seconds)
+
+        metadata = {"duration": media_info.audio_duration_seconds}
+
+        audio_stream = stream_audio_from_media(cloud_storage_url)
+        try:
+            yield audio_stream, metadata
+        finally:
+            audio_stream.close()
+
     def store_transcript(self, *, transcript: WhisperXResponse, job_id: str) -> None:
         """Store transcript in MinIO."""
         logger.info("Storing transcript for job id %s", job_id)
@@ -0,0 +1,67 @@
+"""Cache of LLM responses, addressed by the content of the requests."""
+
+import hashlib
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+import redis
+
+from summary.core.config import get_settings
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_KEY_PREFIX = "llm_response:"
+
+
+class LLMResponseCache:
+    """Store LLM responses in Redis, keyed on a hash of their request.
+
+    The same request to the same model is answered from the cache for
+    llm_cache_ttl seconds, so that retried tasks do not pay again for the calls
+    which already succeeded. The cache is best effort: Redis errors are logged
+    and handled as misses.
+    """
+
+    def __init__(self, redis_client=None):
+        """Initialize the cache, with the configured Redis by default."""
+        self._redis = redis_client or redis.from_url(settings.llm_cache_redis_url)
+
+    @staticmethod
+    def get_key(
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        response_format: Optional[Mapping[str, Any]] = None,
+    ) -> str:
+        """Return the cache key of an LLM request."""
+        request = json.dumps(
+            [model, system_prompt, user_prompt, response_format], sort_keys=True
+        )
+        return LLM_CACHE_KEY_PREFIX + hashlib.sha256(request.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response of a request, if any."""
+        try:
+            response = self._redis.get(key)
+        except redis.RedisError:
+            logger.exception("Failed to read the LLM response cache")
+            return None
+
+        return response.decode("utf-8") if response is not None else None
+
+    def set(self, key: str, response: str) -> None:
+        """Cache the response of a request."""
+        try:
+            self._redis.set(key, response, ex=settings.llm_cache_ttl)
+        except redis.RedisError:
+            logger.exception("Failed to write the LLM response cache")
+
+
+@lru_cache
+def get_llm_response_cache():
+    """Init LLM response cache once."""
+    return LLMResponseCache()
@@ -1,12 +1,16 @@
 """LLM service to encapsulate LLM's calls."""
 
+import contextvars
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Mapping, Optional
 
 import openai
 from langfuse import Langfuse
 
 from summary.core.config import get_settings
+from summary.core.llm_cache import get_llm_response_cache
 
 settings = get_settings()
 
@@ -105,6 +109,25 @@ class LLMService:
         """Init the LLMService once."""
         self._client = llm_observability.get_openai_client()
         self._observability = llm_observability
+        self._cache_stats = {"hits": 0, "misses": 0}
+        self._cache_stats_lock = threading.Lock()
+
+    @property
+    def cache_stats(self) -> dict[str, int | float]:
+        """Return the LLM response cache hits, misses and hit rate of the service."""
+        with self._cache_stats_lock:
+            hits, misses = self._cache_stats["hits"], self._cache_stats["misses"]
+        lookups = hits + misses
+        return {
+            "llm_cache_hits": hits,
+            "llm_cache_misses": misses,
+            "llm_cache_hit_rate": round(hits / lookups, 2) if lookups else 0,
+        }
+
+    def _count_cache_lookup(self, hit: bool):
+        """Count a lookup of the LLM response cache."""
+        with self._cache_stats_lock:
+            self._cache_stats["hits" if hit else "misses"] += 1
 
     def call(
         self,
@@ -112,12 +135,27 @@ class LLMService:
         user_prompt: str,
         name: str,
         response_format: Optional[Mapping[str, Any]] = None,
+        cache: bool = True,
     ):
         """Call the LLM service.
 
         Takes a system prompt and a user prompt, and returns the LLM's response
         Returns None if the call fails.
+        Unless cache is disabled, an identical request answered before is served
+        from the LLM response cache, so that retried and duplicate tasks do not
+        pay again for the calls which already succeeded.
         """
+        cache_key = None
+        if cache and settings.llm_cache_ttl:
+            cache_key = get_llm_response_cache().get_key(
+                settings.llm_model, system_prompt, user_prompt, response_format
+            )
+            cached_response = get_llm_response_cache().get(cache_key)
+            self._count_cache_lookup(hit=cached_response is not None)
+            if cached_response is not None:
+                logger.debug("LLM response served from cache: %s", name)
+                return cached_response
+
         try:
             params: dict[str, Any] = {
                 "model": settings.llm_model,
@@ -138,8 +176,77 @@ class LLMService:
                 }
 
             response = self._client.chat.completions.create(**params)
-            return response.choices[0].message.content
+            content = response.choices[0].message.content
 
         except Exception as e:
             logger.exception("LLM call failed: %s", e)
             raise LLMException(f"LLM call failed: {e}") from e
+
+        if cache_key is not None and content is not None:
+            get_llm_response_cache().set(cache_key, content)
+
+        return content
+
+
+_tenant_semaphores: dict[Optional[str], threading.BoundedSemaphore] = {}
+_tenant_semaphores_lock = threading.Lock()
+
+
+def get_llm_max_concurrency(tenant_id: Optional[str] = None) -> int:
+    """Return the maximum number of concurrent LLM calls allowed for a tenant."""
+    if tenant_id is not None:
+        tenant = settings.get_authorized_tenant(tenant_id=tenant_id)
+        if tenant.llm_max_concurrency is not None:
+            return tenant.llm_max_concurrency
+    return settings.llm_max_concurrency
+
+
+def get_tenant_semaphore(tenant_id: Optional[str] = None) -> threading.BoundedSemaphore:
+    """Return the semaphore capping the concurrent LLM calls of a tenant.
+
+    Semaphores are shared by all the tasks of a tenant run by the worker process.
+    """
+    with _tenant_semaphores_lock:
+        if tenant_id not in _tenant_semaphores:
+            _tenant_semaphores[tenant_id] = threading.BoundedSemaphore(
+                get_llm_max_concurrency(tenant_id)
+            )
+        return _tenant_semaphores[tenant_id]
+
+
+class LLMCallExecutor:
+    """Run LLM calls concurrently, within the concurrency cap of a tenant.
+
+    Calls are submitted to a thread pool and return futures, so that independent
+    calls overlap instead of waiting for each other. Each call runs in a copy of
+    the submitting context, to keep tracing context, and holds the semaphore of
+    the tenant while it is in flight. Pending calls are cancelled when leaving the
+    executor on an error.
+    """
+
+    def __init__(self, llm_service: LLMService, tenant_id: Optional[str] = None):
+        """Init the executor for the LLM calls of a tenant."""
+        self._llm_service = llm_service
+        self._semaphore = get_tenant_semaphore(tenant_id)
+        self._pool = ThreadPoolExecutor(
+            max_workers=get_llm_max_concurrency(tenant_id),
+            thread_name_prefix="llm-call",
+        )
+
+    def __enter__(self):
+        """Enter the executor context."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Wait for running calls, and cancel pending ones on error."""
+        self._pool.shutdown(wait=True, cancel_futures=exc_type is not None)
+
+    def _call(self, *args, **kwargs):
+        """Call the LLM once a slot of the tenant is available."""
+        with self._semaphore:
+            return self._llm_service.call(*args, **kwargs)
+
+    def submit(self, *args, **kwargs) -> Future:
+        """Submit an LLM call, taking the arguments of LLMService.call."""
+        context = contextvars.copy_context()
+        return self._pool.submit(context.run, self._call, *args, **kwargs)
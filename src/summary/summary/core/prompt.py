@@ -17,6 +17,8 @@ PROMPT_USER_PART = """Titre de la partie à résumer : {part}
 Transcript complet :
 {transcript}"""
 
+PROMPT_SYSTEM_CHUNK = """Tu es un agent dont le rôle est de condenser un extrait d'un long transcript de réunion. Tu recevras en entrée un extrait du transcript, ou des notes déjà condensées de plusieurs extraits. Ta tâche est de rédiger des notes fidèles et détaillées de cet extrait, dans l'ordre chronologique, en conservant les noms des intervenants, les sujets abordés, les décisions prises, les actions à entreprendre avec les personnes assignées et leurs échéances, ainsi que les chiffres et dates mentionnés. N'ajoute aucune information absente de l'extrait. Tu répondras uniquement avec les notes, dans la langue de l'extrait, sans rien ajouter d'autre."""
+
 PROMPT_SYSTEM_CLEANING = """Tu es un agent dont le rôle est de nettoyer un résumé de compte rendu de réunion. Tu recevras en entrée le résumé brut, potentiellement avec des erreurs de formatage, des incohérences ou des redondances. Ta tâche est de corriger les erreurs de formatage, d'améliorer la clarté et la cohérence du texte, et de t'assurer que le résumé est bien structuré et facile à lire. Ton but principal est de retirer les redondances et les répétitions. Assure la cohérence entre les titres et homogénéise le style d’écriture entre les parties. Supprime les doublons d’informations entre les parties si présents. Si certaines parties sont plus secondaires, tu peux les fusionner ou les réduire en 1 à 2 phrases. Mets en avant les points centraux qui ont fait l’objet de décisions ou d’actions. Tu répondras uniquement avec le résumé sans rien ajouter d'autre"""
 
 PROMPT_SYSTEM_NEXT_STEP = """Tu es un agent dont le rôle est d'extraire les prochaines étapes d'un transcript de réunion. Tu utiliseras un style synthétique, administratif, à la troisième personne, sans affect. Tu recevras en entrée le transcript. Ta tâche est d'identifier et de lister toutes les actions à entreprendre, en indiquant la ou les personnes assignées et en précisant les échéances si elles sont mentionnées. Ne retiens que les actions concrètes et à venir. Ignore les remarques générales ou les constats sans suite."""
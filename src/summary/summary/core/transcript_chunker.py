@@ -0,0 +1,67 @@
+"""Split formatted transcripts into chunks fitting in an LLM token budget."""
+
+import math
+
+from summary.core.config import get_settings
+
+settings = get_settings()
+
+# Speaker turns are separated by a blank line, see TranscriptFormatter, as are
+# the paragraphs of condensed transcripts
+TURN_SEPARATOR = "\n\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text for the configured LLM.
+
+    Tokenizers depend on the model served behind the OpenAI-compatible API, so
+    the count is estimated from the text length rather than computed.
+    """
+    return math.ceil(len(text) / settings.llm_chars_per_token)
+
+
+def _pack(pieces: list[str], separator: str, max_chars: int) -> list[str]:
+    """Pack consecutive pieces, joined by a separator, into chunks of max_chars."""
+    chunks = []
+    current: list[str] = []
+    current_length = 0
+
+    for piece in pieces:
+        length = current_length + len(separator) + len(piece) if current else len(piece)
+        if current and length > max_chars:
+            chunks.append(separator.join(current))
+            current, length = [], len(piece)
+        current.append(piece)
+        current_length = length
+
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+
+def split_transcript(transcript: str, max_tokens: int) -> list[str]:
+    """Split a formatted transcript on speaker turns, within a token budget.
+
+    Consecutive speaker turns are packed in the same chunk while it fits in the
+    budget. A single turn exceeding the budget is split on word boundaries.
+    Condensed transcripts are split on their paragraphs the same way.
+
+    Args:
+        transcript: The transcript, as formatted by TranscriptFormatter
+        max_tokens: The maximum estimated number of tokens of each chunk
+
+    Returns:
+        list[str]: The chunks, in the transcript order
+    """
+    max_chars = int(max_tokens * settings.llm_chars_per_token)
+
+    pieces = []
+    for turn in transcript.strip().split(TURN_SEPARATOR):
+        if not turn.strip():
+            continue
+        if len(turn) > max_chars:
+            pieces.extend(_pack(turn.split(" "), " ", max_chars))
+        else:
+            pieces.append(turn)
+
+    return _pack(pieces, TURN_SEPARATOR, max_chars)
@@ -29,3 +29,27 @@ def client():
     app.dependency_overrides[get_settings] = get_settings_override
 
     return client
+
+
+class FakeRedis:
+    """In-memory stand-in of a Redis client."""
+
+    def __init__(self):
+        """Init the fake Redis with an empty store."""
+        self.store = {}
+        self.expiries = {}
+
+    def get(self, key):
+        """Return the value of a key, if any."""
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        """Set the value of a key, with its expiry in seconds."""
+        self.store[key] = value.encode("utf-8")
+        self.expiries[key] = ex
+
+
+@pytest.fixture()
+def fake_redis():
+    """Provide an in-memory stand-in of a Redis client."""
+    return FakeRedis()
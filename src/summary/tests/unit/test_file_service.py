@@ -1,14 +1,24 @@
 """Unit tests for the file service."""
 
 import json
+import subprocess
+import sys
+import tempfile
 from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
+import responses
 
 from summary.core import file_service
 from summary.core.file_service import (
+    AudioStream,
+    FileService,
+    FileServiceException,
     MediaInfo,
+    MediaInfoCache,
+    NoAudioInFileError,
+    encode_multipart_stream,
     extract_audio_from_media,
     get_media_info,
 )
@@ -122,15 +132,13 @@ def test_media_info_ignores_empty_stream_entry(monkeypatch: pytest.MonkeyPatch)
             {"codec_name": "vorbis", "codec_type": "audio"},
             {},
         ],
+        "format": {"duration": "2.5"},
     }
 
     run_mock = Mock(
         return_value=Mock(stdout=json.dumps(ffprobe_payload), stderr="", returncode=0)
     )
     monkeypatch.setattr(file_service.subprocess, "run", run_mock)
-    monkeypatch.setattr(
-        file_service, "get_media_duration_seconds", Mock(return_value=2.5)
-    )
 
     media_info = get_media_info(BASE_PATH / "audio-sample-android-firefox.ogg")
 
@@ -141,6 +149,139 @@ def test_media_info_ignores_empty_stream_entry(monkeypatch: pytest.MonkeyPatch)
     assert media_info.audio_duration_seconds == 2.5
 
 
+def test_media_info_duration_from_packets(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a single probe estimates the duration from the last audio packets."""
+    ffprobe_payload = {
+        "streams": [
+            {"index": 0, "codec_name": "h264", "codec_type": "video"},
+            {"index": 1, "codec_name": "opus", "codec_type": "audio"},
+        ],
+        "format": {"duration": "N/A"},
+        "packets": [
+            {"stream_index": 1, "pts_time": "11.5", "duration_time": "0.02"},
+            {"stream_index": 0, "pts_time": "12.0", "duration_time": "0.04"},
+            {"stream_index": 1, "pts_time": "11.52", "duration_time": "0.02"},
+            {"stream_index": 1},
+        ],
+    }
+
+    run_mock = Mock(
+        return_value=Mock(stdout=json.dumps(ffprobe_payload), stderr="", returncode=0)
+    )
+    monkeypatch.setattr(file_service.subprocess, "run", run_mock)
+
+    media_info = get_media_info(BASE_PATH / "video-sample-visio.mp4")
+
+    run_mock.assert_called_once()
+    assert media_info.has_audio is True
+    assert media_info.has_video is True
+    assert media_info.audio_codec_name == "opus"
+    assert media_info.audio_duration_seconds == pytest.approx(11.54)
+
+
+def test_media_info_duration_from_audio_packets(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the audio packets are probed alone when the tail has only video."""
+    ffprobe_payload = {
+        "streams": [
+            {"index": 0, "codec_name": "h264", "codec_type": "video"},
+            {"index": 1, "codec_name": "opus", "codec_type": "audio"},
+        ],
+        "format": {"duration": "N/A"},
+        "packets": [
+            {"stream_index": 0, "pts_time": "12.0", "duration_time": "0.04"},
+            {"stream_index": 0, "pts_time": "12.04", "duration_time": "0.04"},
+        ],
+    }
+    audio_packets_payload = {
+        "packets": [
+            {"stream_index": 1, "pts_time": "9.5", "duration_time": "0.02"},
+            {"stream_index": 1, "pts_time": "9.52", "duration_time": "0.02"},
+        ],
+    }
+
+    run_mock = Mock(
+        side_effect=[
+            Mock(stdout=json.dumps(ffprobe_payload), stderr="", returncode=0),
+            Mock(stdout=json.dumps(audio_packets_payload), stderr="", returncode=0),
+        ]
+    )
+    monkeypatch.setattr(file_service.subprocess, "run", run_mock)
+
+    media_info = get_media_info(BASE_PATH / "video-sample-visio.mp4")
+
+    assert run_mock.call_count == 2
+    audio_probe_args = run_mock.call_args_list[1].args[0]
+    assert audio_probe_args[audio_probe_args.index("-select_streams") + 1] == "a:0"
+    assert media_info.audio_duration_seconds == pytest.approx(9.54)
+
+
+def test_media_info_duration_unknown(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test media whose audio duration cannot be determined are rejected."""
+    ffprobe_payload = {
+        "streams": [{"index": 0, "codec_name": "opus", "codec_type": "audio"}],
+        "format": {},
+        "packets": [],
+    }
+
+    run_mock = Mock(
+        return_value=Mock(stdout=json.dumps(ffprobe_payload), stderr="", returncode=0)
+    )
+    monkeypatch.setattr(file_service.subprocess, "run", run_mock)
+
+    with pytest.raises(ValueError, match="Unable to determine recording duration"):
+        get_media_info(BASE_PATH / "audio-sample-firefox.ogg")
+
+
+def test_media_info_cached_by_etag(monkeypatch: pytest.MonkeyPatch, fake_redis):
+    """Media info are probed once per object ETag, then served from the cache."""
+    monkeypatch.setattr(
+        file_service, "get_media_info", Mock(return_value=MEDIA_INFO_SAMPLE_VISIO)
+    )
+    service = FileService()
+    service._media_info_cache = MediaInfoCache(redis_client=fake_redis)
+
+    assert service._get_media_info(MEDIA_INFO_SAMPLE_VISIO.path, '"etag"') == (
+        MEDIA_INFO_SAMPLE_VISIO
+    )
+    assert service._get_media_info(BASE_PATH / "retry.mp4", '"etag"') == MediaInfo(
+        path=BASE_PATH / "retry.mp4",
+        has_audio=True,
+        has_video=True,
+        audio_duration_seconds=5.34059,
+        audio_codec_name="aac",
+    )
+    file_service.get_media_info.assert_called_once()
+    assert fake_redis.expiries == {
+        "media_info:etag": file_service.settings.media_info_cache_ttl
+    }
+
+    # Objects without ETag are always probed
+    service._get_media_info(MEDIA_INFO_SAMPLE_VISIO.path, None)
+    assert file_service.get_media_info.call_count == 2
+
+
+def test_media_info_cache_disabled(monkeypatch: pytest.MonkeyPatch, fake_redis):
+    """A zero TTL disables the media info cache."""
+    monkeypatch.setattr(
+        file_service, "get_media_info", Mock(return_value=MEDIA_INFO_SAMPLE_VISIO)
+    )
+    monkeypatch.setattr(
+        file_service,
+        "settings",
+        file_service.settings.model_copy(update={"media_info_cache_ttl": 0}),
+    )
+    service = FileService()
+    service._media_info_cache = MediaInfoCache(redis_client=fake_redis)
+
+    service._get_media_info(MEDIA_INFO_SAMPLE_VISIO.path, '"etag"')
+    service._get_media_info(MEDIA_INFO_SAMPLE_VISIO.path, '"etag"')
+
+    assert file_service.get_media_info.call_count == 2
+    assert not fake_redis.store
+
+
 def test_extract_audio_from_video():
     """Test that extract_audio_from_video can extract audio from a video file."""
     path = extract_audio_from_media(MEDIA_INFO_SAMPLE_VISIO)
@@ -149,3 +290,150 @@ def test_extract_audio_from_video():
         assert path.name.endswith(".m4a")
     finally:
         path.unlink(missing_ok=True)
+
+
+RECORDING_URL = "https://storage.example.com/recordings/recording.mp4?X-Amz-Signature=x"
+
+
+def start_audio_stream(script: str) -> AudioStream:
+    """Stream the output of a Python process standing in for ffmpeg."""
+    errors_file = tempfile.TemporaryFile()
+    process = subprocess.Popen(  # noqa: S603
+        [sys.executable, "-c", script],
+        stdout=subprocess.PIPE,
+        stderr=errors_file,
+    )
+    return AudioStream(process, errors_file)
+
+
+def test_audio_stream_reads_process_output():
+    """The audio stream reads the output of the process until its end."""
+    audio_stream = start_audio_stream(
+        "import sys; sys.stdout.buffer.write(b'audio' * 1000)"
+    )
+
+    try:
+        assert audio_stream.read(4000) + audio_stream.read() == b"audio" * 1000
+        assert audio_stream.read() == b""
+    finally:
+        audio_stream.close()
+
+
+def test_audio_stream_failed_extraction():
+    """A failed extraction raises at the end of the stream, not as its end."""
+    audio_stream = start_audio_stream(
+        "import sys; sys.stdout.buffer.write(b'audio'); sys.stdout.flush();"
+        " sys.stderr.write('Invalid data'); sys.exit(1)"
+    )
+
+    try:
+        assert audio_stream.read() == b"audio"
+        with pytest.raises(RuntimeError, match="Failed to extract audio"):
+            audio_stream.read()
+    finally:
+        audio_stream.close()
+
+
+def test_audio_stream_close_stops_process():
+    """Closing the audio stream stops a process still running."""
+    audio_stream = start_audio_stream("import time; time.sleep(60)")
+
+    audio_stream.close()
+
+    assert audio_stream._process.returncode is not None
+
+
+def test_encode_multipart_stream():
+    """Fields and file are encoded as a multipart body, read by chunks."""
+    audio_file = Mock(read=Mock(side_effect=[b"au", b"dio", b""]))
+    audio_file.name = "audio.ogg"
+
+    body, content_type = encode_multipart_stream(
+        {"model": "large-v2", "language": None, "granularities": ["word", "segment"]},
+        "file",
+        audio_file,
+        "audio/ogg",
+        chunk_size=3,
+    )
+    boundary = content_type.removeprefix("multipart/form-data; boundary=")
+
+    assert b"".join(body).decode() == (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="model"\r\n\r\nlarge-v2\r\n'
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="granularities"\r\n\r\nword\r\n'
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="granularities"\r\n\r\nsegment\r\n'
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="audio.ogg"\r\n'
+        "Content-Type: audio/ogg\r\n\r\n"
+        f"audio\r\n--{boundary}--\r\n"
+    )
+    audio_file.read.assert_called_with(3)
+
+
+@responses.activate
+def test_stream_audio_file(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The audio is probed and extracted from the URL, without any download."""
+    responses.get(RECORDING_URL, body=b"\x00", status=206)
+    monkeypatch.setattr(
+        file_service,
+        "get_media_info",
+        Mock(return_value=MEDIA_INFO_SAMPLE_VISIO),
+    )
+    stream_audio_from_media = Mock(
+        return_value=start_audio_stream("import sys; sys.stdout.buffer.write(b'audio')")
+    )
+    monkeypatch.setattr(
+        file_service, "stream_audio_from_media", stream_audio_from_media
+    )
+
+    with FileService().stream_audio_file(RECORDING_URL) as (audio_file, metadata):
+        assert audio_file.read() == b"audio"
+        assert metadata == {"duration": 5.34059}
+
+    file_service.get_media_info.assert_called_once_with(RECORDING_URL)
+    stream_audio_from_media.assert_called_once_with(RECORDING_URL)
+    assert responses.calls[0].request.headers["Range"] == "bytes=0-0"
+
+
+@responses.activate
+def test_stream_audio_file_no_audio(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Media without audio are rejected before any extraction."""
+    responses.get(RECORDING_URL, body=b"\x00", status=206)
+    monkeypatch.setattr(
+        file_service,
+        "get_media_info",
+        Mock(
+            return_value=MediaInfo(
+                path=RECORDING_URL,
+                has_audio=False,
+                has_video=True,
+                audio_duration_seconds=None,
+                audio_codec_name=None,
+            )
+        ),
+    )
+    stream_audio_from_media = Mock()
+    monkeypatch.setattr(
+        file_service, "stream_audio_from_media", stream_audio_from_media
+    )
+
+    with pytest.raises(NoAudioInFileError):
+        with FileService().stream_audio_file(RECORDING_URL):
+            pass
+
+    stream_audio_from_media.assert_not_called()
+
+
+@responses.activate
+def test_stream_audio_file_unreadable_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An unreadable URL fails like a failed download, before any probing."""
+    responses.get(RECORDING_URL, status=403)
+    monkeypatch.setattr(file_service, "get_media_info", Mock())
+
+    with pytest.raises(FileServiceException):
+        with FileService().stream_audio_file(RECORDING_URL):
+            pass
+
+    file_service.get_media_info.assert_not_called()
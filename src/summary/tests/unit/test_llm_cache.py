@@ -0,0 +1,113 @@
+"""Unit tests for the LLM response cache."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+
+from summary.core import llm_service
+from summary.core.llm_cache import LLMResponseCache
+from summary.core.llm_service import LLMException, LLMObservability, LLMService
+
+
+@pytest.fixture(name="response_cache")
+def response_cache_fixture(fake_redis):
+    """Provide an in-memory LLM response cache to the LLM service."""
+    response_cache = LLMResponseCache(redis_client=fake_redis)
+    with patch.object(
+        llm_service, "get_llm_response_cache", return_value=response_cache
+    ):
+        yield response_cache
+
+
+@pytest.fixture(name="service")
+def service_fixture():
+    """Provide an LLM service whose client returns a fixed response."""
+    service = LLMService(LLMObservability(session_id="session", user_id="user"))
+    service._client = MagicMock()
+    service._client.chat.completions.create.return_value.choices = [
+        MagicMock(message=MagicMock(content="response"))
+    ]
+    return service
+
+
+def test_llm_cache_key():
+    """Keys address the model, prompts and response format of a request."""
+    key = LLMResponseCache.get_key("model", "system", "user", {"type": "json"})
+
+    assert key.startswith("llm_response:")
+    assert key == LLMResponseCache.get_key("model", "system", "user", {"type": "json"})
+    assert (
+        len(
+            {
+                key,
+                LLMResponseCache.get_key("other", "system", "user", {"type": "json"}),
+                LLMResponseCache.get_key("model", "other", "user", {"type": "json"}),
+                LLMResponseCache.get_key("model", "system", "other", {"type": "json"}),
+                LLMResponseCache.get_key("model", "system", "user", None),
+            }
+        )
+        == 5
+    )
+
+
+def test_llm_cache_redis_errors():
+    """Redis errors are handled as cache misses."""
+    redis_client = MagicMock()
+    redis_client.get.side_effect = redis.ConnectionError()
+    redis_client.set.side_effect = redis.ConnectionError()
+    response_cache = LLMResponseCache(redis_client=redis_client)
+
+    assert response_cache.get("key") is None
+    response_cache.set("key", "response")
+
+
+def test_llm_service_call_cached(service, response_cache):
+    """Calls are answered once by the LLM, then from the cache."""
+    assert service.call("system", "user", name="tldr") == "response"
+    assert service.call("system", "user", name="tldr") == "response"
+
+    service._client.chat.completions.create.assert_called_once()
+    assert list(response_cache._redis.expiries.values()) == [
+        llm_service.settings.llm_cache_ttl
+    ]
+    assert service.cache_stats == {
+        "llm_cache_hits": 1,
+        "llm_cache_misses": 1,
+        "llm_cache_hit_rate": 0.5,
+    }
+
+
+def test_llm_service_call_cache_disabled(service, response_cache):
+    """Calls are not cached when the cache is disabled for the call."""
+    service.call("system", "user", name="tldr", cache=False)
+    service.call("system", "user", name="tldr", cache=False)
+
+    assert service._client.chat.completions.create.call_count == 2
+    assert not response_cache._redis.store
+    assert service.cache_stats["llm_cache_hit_rate"] == 0
+
+
+def test_llm_service_call_cache_ttl_zero(service, response_cache):
+    """A zero TTL disables the cache for all calls."""
+    with patch.object(
+        llm_service,
+        "settings",
+        llm_service.settings.model_copy(update={"llm_cache_ttl": 0}),
+    ):
+        service.call("system", "user", name="tldr")
+        service.call("system", "user", name="tldr")
+
+    assert service._client.chat.completions.create.call_count == 2
+    assert not response_cache._redis.store
+    assert service.cache_stats["llm_cache_misses"] == 0
+
+
+def test_llm_service_call_failure_not_cached(service, response_cache):
+    """Failed calls are not cached, so that they are retried."""
+    service._client.chat.completions.create.side_effect = RuntimeError("boom")
+
+    with pytest.raises(LLMException):
+        service.call("system", "user", name="tldr")
+
+    assert not response_cache._redis.store
@@ -0,0 +1,203 @@
+"""Unit tests for the summarization of transcripts."""
+
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from summary.core import celery_worker, llm_service
+from summary.core.llm_service import LLMException
+from summary.core.prompt import PROMPT_SYSTEM_PART
+from summary.core.transcript_chunker import estimate_tokens
+
+TRANSCRIPT = "Alice: hello\nBob: hi"
+TITLES = ["Introduction", "Budget", "Roadmap"]
+
+
+class FakeLLM:
+    """Answer LLM calls by name, tracking how many calls run at once."""
+
+    def __init__(self, delays=None):
+        """Init the fake LLM, with optional delays per part title or TL;DR."""
+        self.delays = delays or {}
+        self.calls = []
+        self.prompts = {}
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(
+        self, system_prompt, user_prompt, name, response_format=None, cache=True
+    ):
+        """Answer an LLM call."""
+        with self._lock:
+            self.calls.append(name)
+            self.prompts.setdefault(name, []).append(user_prompt)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+        try:
+            if name == "parts":
+                time.sleep(0.05)
+                return json.dumps({"titles": TITLES})
+            if name == "next-steps":
+                return json.dumps(
+                    {"actions": [{"title": "Ship", "assignees": ["Bob"]}]}
+                )
+            if name == "part":
+                assert system_prompt == PROMPT_SYSTEM_PART
+                title = next(title for title in TITLES if title in user_prompt)
+                time.sleep(self.delays.get(title, 0.01))
+                return f"## {title}"
+            if name == "cleaning":
+                return f"cleaned({user_prompt})"
+            if name == "chunk":
+                return f"notes({len(user_prompt):d})"
+            time.sleep(self.delays.get("tldr", 0.05))
+            return "TL;DR"
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+@pytest.fixture(autouse=True)
+def clear_tenant_semaphores():
+    """Reset the semaphores capping LLM calls per tenant between tests."""
+    llm_service._tenant_semaphores.clear()
+    yield
+    llm_service._tenant_semaphores.clear()
+
+
+def summarize(fake_llm, tenant_id=None, transcript=TRANSCRIPT):
+    """Summarize a transcript with a fake LLM."""
+    with patch.object(llm_service.LLMService, "call", side_effect=fake_llm):
+        return celery_worker.summarize_transcription_internals(
+            distinct_id="user",
+            transcript=transcript,
+            session_id="session",
+            tenant_id=tenant_id,
+        )
+
+
+def test_summarize_deterministic_order():
+    """Parts completing in any order are assembled in the plan order."""
+    fake_llm = FakeLLM(delays={"Introduction": 0.15, "Budget": 0.1, "Roadmap": 0})
+
+    summary = summarize(fake_llm)
+
+    assert summary == (
+        "TL;DR\n\n"
+        "cleaned(## Introduction\n\n## Budget\n\n## Roadmap)\n\n"
+        "### Prochaines étapes\n\n- [ ] Ship Assignée à : Bob, Échéance : -"
+    )
+    assert sorted(fake_llm.calls) == sorted(
+        ["tldr", "parts", "next-steps", "part", "part", "part", "cleaning"]
+    )
+
+
+def test_summarize_concurrent_calls():
+    """The TL;DR, plan and next steps are requested at once, then parts fan out."""
+    fake_llm = FakeLLM(delays={"tldr": 0.3, **dict.fromkeys(TITLES, 0.1)})
+
+    summarize(fake_llm)
+
+    assert set(fake_llm.calls[:3]) == {"tldr", "parts", "next-steps"}
+    # The parts are summarized while the TL;DR is still being generated
+    assert fake_llm.max_running == 4
+
+
+def test_summarize_tenant_concurrency_cap():
+    """A tenant's calls should not exceed its concurrency cap."""
+    fake_llm = FakeLLM(delays=dict.fromkeys(TITLES, 0.05))
+    tenant = llm_service.settings.get_authorized_tenant(tenant_id="test-tenant")
+
+    with patch.object(
+        llm_service.settings,
+        "authorized_tenant_by_id",
+        {"test-tenant": tenant.model_copy(update={"llm_max_concurrency": 2})},
+    ):
+        summarize(fake_llm, tenant_id="test-tenant")
+
+    assert fake_llm.max_running == 2
+    assert len(fake_llm.calls) == 7
+
+
+def test_summarize_failure_propagates():
+    """A failing call fails the summary, so that the task is retried."""
+    fake_llm = FakeLLM()
+
+    def failing_llm(system_prompt, user_prompt, name, **kwargs):
+        if name == "part":
+            raise LLMException("LLM call failed")
+        return fake_llm(system_prompt, user_prompt, name, **kwargs)
+
+    with pytest.raises(LLMException):
+        summarize(failing_llm)
+
+    assert "cleaning" not in fake_llm.calls
+
+
+def test_summarize_short_transcript_not_condensed():
+    """Transcripts within the token budget are summarized as they are."""
+    fake_llm = FakeLLM()
+
+    summarize(fake_llm)
+
+    assert "chunk" not in fake_llm.calls
+    assert fake_llm.prompts["tldr"] == [TRANSCRIPT]
+
+
+def test_summarize_long_transcript_condensed():
+    """Long transcripts are condensed by chunks, then summarized from the notes."""
+    fake_llm = FakeLLM()
+    turns = [f" **Speaker {i:d}**: " + "blabla " * 20 for i in range(10)]
+    transcript = "\n\n" + "\n\n".join(turns)
+
+    with patch.object(
+        celery_worker,
+        "settings",
+        celery_worker.settings.model_copy(update={"llm_transcript_max_tokens": 100}),
+    ):
+        summarize(fake_llm, transcript=transcript)
+
+    # Each chunk packs as many speaker turns as fit in the budget
+    assert len(fake_llm.prompts["chunk"]) == 5
+    assert "\n\n".join(fake_llm.prompts["chunk"]) == transcript.strip()
+
+    notes = "\n\n".join(f"notes({len(chunk):d})" for chunk in fake_llm.prompts["chunk"])
+    assert fake_llm.prompts["tldr"] == [notes]
+    assert fake_llm.prompts["next-steps"] == [notes]
+    assert all(prompt.endswith(notes) for prompt in fake_llm.prompts["part"])
+
+
+def test_condense_transcript_hierarchically():
+    """Notes exceeding the budget are split and condensed again."""
+    executor = MagicMock()
+    executor.submit.side_effect = lambda system_prompt, chunk, **kwargs: MagicMock(
+        result=MagicMock(return_value=chunk[: len(chunk) // 3])
+    )
+    turns = [f" **Speaker {i:d}**: " + "blabla " * 20 for i in range(40)]
+
+    with patch.object(
+        celery_worker,
+        "settings",
+        celery_worker.settings.model_copy(update={"llm_transcript_max_tokens": 100}),
+    ):
+        condensed = celery_worker.condense_transcript(executor, "\n\n".join(turns))
+
+    assert estimate_tokens(condensed) <= 100
+    # The notes of the first level were condensed again
+    assert executor.submit.call_count > len(turns) // 3
+
+
+def test_summarize_tracks_llm_cache_stats():
+    """The LLM response cache hits and misses are tracked in the task metadata."""
+    with patch.object(celery_worker.metadata_manager, "track") as track:
+        summarize(FakeLLM())
+
+    track.assert_called_once_with(
+        "session",
+        {"llm_cache_hits": 0, "llm_cache_misses": 0, "llm_cache_hit_rate": 0},
+    )
@@ -0,0 +1,59 @@
+"""Unit tests for the transcript chunker."""
+
+from summary.core.transcript_chunker import estimate_tokens, split_transcript
+
+TRANSCRIPT = (
+    "\n\n **Alice**: Bonjour à tous."
+    "\n\n **Bob**: Bonjour Alice, parlons du budget."
+    "\n\n **Alice**: Le budget est validé."
+    "\n\n **Bob**: Très bien, passons à la feuille de route."
+)
+
+
+def test_estimate_tokens():
+    """Tokens are estimated from the text length."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_split_transcript_fits_in_budget():
+    """A transcript fitting in the budget is a single chunk."""
+    assert split_transcript(TRANSCRIPT, max_tokens=1000) == [TRANSCRIPT.strip()]
+
+
+def test_split_transcript_on_speaker_turns():
+    """Chunks are split on speaker turns, packing turns within the budget."""
+    chunks = split_transcript(TRANSCRIPT, max_tokens=14)
+
+    assert chunks == [
+        "**Alice**: Bonjour à tous.",
+        " **Bob**: Bonjour Alice, parlons du budget.",
+        " **Alice**: Le budget est validé.",
+        " **Bob**: Très bien, passons à la feuille de route.",
+    ]
+
+    chunks = split_transcript(TRANSCRIPT, max_tokens=30)
+
+    assert chunks == [
+        (
+            "**Alice**: Bonjour à tous."
+            "\n\n **Bob**: Bonjour Alice, parlons du budget."
+            "\n\n **Alice**: Le budget est validé."
+        ),
+        " **Bob**: Très bien, passons à la feuille de route.",
+    ]
+    for chunk in chunks:
+        assert estimate_tokens(chunk) <= 30
+
+
+def test_split_transcript_long_turn():
+    """A single turn exceeding the budget is split on word boundaries."""
+    turn = " **Alice**: " + " ".join(f"mot{i}" for i in range(100))
+
+    chunks = split_transcript(turn, max_tokens=25)
+
+    assert len(chunks) > 1
+    assert " ".join(chunks) == turn.strip()
+    for chunk in chunks:
+        assert estimate_tokens(chunk) <= 25